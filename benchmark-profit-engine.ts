@@ -0,0 +1,99 @@
+/**
+ * Profit Engine Benchmark
+ *
+ * Compares the per-call path (calculateProfitScenario for every vehicle × approval)
+ * with the vectorized calculateProfitMatrix, and checks both produce identical figures.
+ * Both share the cached advance factor, so max advance is also checked against a frozen copy
+ * of the original annuity formula (the same check runs in the test suite).
+ *
+ * Usage: npm run bench:profit [-- <vehicles> <iterations>]
+ */
+
+import { calculateProfitScenario, calculateProfitMatrix, profitScenarioAt, ProfitScenario } from './src/modules/profit-maximizer';
+import { ApprovalSpec, TradeInfo, Vehicle } from './src/types/types';
+
+const VEHICLE_COUNT = parseInt(process.argv[2] || '2000', 10);
+const ITERATIONS = parseInt(process.argv[3] || '5', 10);
+
+const MAKES = ['Toyota', 'Honda', 'Ford', 'Jeep', 'Ram', 'Dodge', 'Hyundai', 'Chevrolet'];
+
+function buildInventory(count: number): Vehicle[] {
+  return Array.from({ length: count }, (_, i): Vehicle => ({
+    id: `BENCH-${i}`,
+    vin: `1BENCH${String(i).padStart(11, '0')}`,
+    year: 2015 + (i % 12),
+    make: MAKES[i % MAKES.length],
+    model: 'Bench',
+    trim: '',
+    mileage: 10000 + (i * 137) % 150000,
+    color: 'Black',
+    engine: '',
+    transmission: '',
+    yourCost: 8000 + (i * 211) % 30000,
+    suggestedPrice: 12000 + (i * 211) % 35000,
+    inStock: true,
+    blackBookValue: 10000 + (i * 173) % 32000,
+  }));
+}
+
+const APPROVALS: ApprovalSpec[] = [
+  { bank: 'TD', program: '5-Key', apr: 12.99, termMonths: 84, paymentMin: 0, paymentMax: 650, downPayment: 0, province: 'AB' },
+  { bank: 'TD', program: '4-Key', apr: 17.5, termMonths: 84, paymentMin: 0, paymentMax: 700, downPayment: 1000, province: 'AB' },
+  { bank: 'Santander', program: 'Tier 3', apr: 19.99, termMonths: 72, paymentMin: 0, paymentMax: 600, downPayment: 0, province: 'AB' },
+  { bank: 'iA Auto Finance', program: '4th Gear', apr: 15.49, termMonths: 84, paymentMin: 0, paymentMax: 750, downPayment: 500, province: 'AB' },
+  { bank: 'Eden Park', program: '2 Ride', apr: 21.99, termMonths: 72, paymentMin: 0, paymentMax: 550, downPayment: 0, province: 'AB' },
+  { bank: 'Prefera', program: 'P1', apr: 18.99, termMonths: 60, paymentMin: 0, paymentMax: 500, downPayment: 0, province: 'AB' },
+];
+
+const TRADE: TradeInfo = { allowance: 5000, acv: 4500, lienBalance: 2000 };
+const FIELDS: (keyof ProfitScenario)[] = [
+  'rate', 'isSubvented', 'maxAdvance', 'maxSellingPrice', 'frontGross', 'reserve',
+  'aftermarketCapacity', 'backGross', 'totalGross',
+];
+
+// calculateMaximumAdvance as it was before the cached advance factor
+function baselineMaxAdvance(payment: number, apr: number, term: number): number {
+  const monthlyRate = apr / 100 / 12;
+  if (monthlyRate === 0) return payment * term;
+  return Math.floor(payment * ((1 - Math.pow(1 + monthlyRate, -term)) / monthlyRate));
+}
+
+function time(fn: () => void): number {
+  const start = process.hrtime.bigint();
+  for (let i = 0; i < ITERATIONS; i++) fn();
+  return Number(process.hrtime.bigint() - start) / 1e6 / ITERATIONS;
+}
+
+function main(): void {
+  const inventory = buildInventory(VEHICLE_COUNT);
+  const cells = inventory.length * APPROVALS.length;
+  console.log(`📊 Profit engine benchmark: ${inventory.length} vehicles × ${APPROVALS.length} approvals (${cells} cells)\n`);
+
+  // Identity check
+  const matrix = calculateProfitMatrix(inventory, APPROVALS, TRADE);
+  let mismatches = 0;
+  inventory.forEach((vehicle, v) => {
+    APPROVALS.forEach((approval, a) => {
+      const expected = calculateProfitScenario(vehicle, approval, TRADE);
+      const actual = profitScenarioAt(matrix, v, a);
+      const baseline = baselineMaxAdvance(approval.paymentMax, actual.rate, approval.termMonths || 84);
+      if (FIELDS.some(f => !Object.is(expected[f], actual[f])) || actual.maxAdvance !== baseline) mismatches++;
+    });
+  });
+  console.log(mismatches === 0 ? '✅ Results identical to calculateProfitScenario and the original advance formula' : `❌ ${mismatches} mismatched cells`);
+
+  const perCallMs = time(() => {
+    for (const vehicle of inventory) {
+      for (const approval of APPROVALS) calculateProfitScenario(vehicle, approval, TRADE);
+    }
+  });
+  const matrixMs = time(() => calculateProfitMatrix(inventory, APPROVALS, TRADE));
+
+  console.log(`   Per-call:   ${perCallMs.toFixed(2)} ms`);
+  console.log(`   Vectorized: ${matrixMs.toFixed(2)} ms`);
+  console.log(`   Speedup:    ${(perCallMs / matrixMs).toFixed(1)}x`);
+
+  if (mismatches > 0) process.exit(1);
+}
+
+main();
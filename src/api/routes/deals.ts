@@ -1,9 +1,11 @@
 import { Router, Request, Response } from 'express';
-import { findOptimalDeals } from '../../modules/deal-maximizer';
+import { findOptimalDealsAsync } from '../../modules/scoring-pool';
 import { getAllLenderPrograms } from '../../modules/lender-programs';
+import { iterateAmortizationSchedule } from '../../modules/payment-calculator';
 import { saveDealToGHL } from '../../modules/ghl-integration';
 import { FindDealsRequest, FindDealsResponse } from '../../types/types';
 import { state } from '../state';
+import { inventoryStore } from '../../modules/inventory-store';
 
 const router = Router();
 
@@ -11,7 +13,7 @@ router.get('/ping', (_req: Request, res: Response) => {
   res.json({ success: true, scope: 'deals', pong: true });
 });
 
-router.post('/find', (req: Request, res: Response) => {
+router.post('/find', async (req: Request, res: Response) => {
   try {
     const request: FindDealsRequest = req.body;
 
@@ -22,7 +24,7 @@ router.post('/find', (req: Request, res: Response) => {
       });
     }
 
-    const deals = findOptimalDeals(request, state.inventory);
+    const deals = await findOptimalDealsAsync(request, state.inventory);
 
     const response: FindDealsResponse = {
       success: true,
@@ -59,7 +61,7 @@ router.post('/calculate', (req: Request, res: Response) => {
       });
     }
 
-    const vehicle = state.inventory.find(v => v.id === vehicleId);
+    const vehicle = inventoryStore.getByStock(vehicleId);
     if (!vehicle) {
       return res.status(404).json({
         success: false,
@@ -94,7 +96,7 @@ router.post('/compare-lenders', (req: Request, res: Response) => {
       });
     }
 
-    const vehicle = state.inventory.find(v => v.id === vehicleId);
+    const vehicle = inventoryStore.getByStock(vehicleId);
     if (!vehicle) {
       return res.status(404).json({
         success: false,
@@ -130,7 +132,7 @@ router.post('/optimize', (req: Request, res: Response) => {
       });
     }
 
-    const vehicle = state.inventory.find(v => v.id === vehicleId);
+    const vehicle = inventoryStore.getByStock(vehicleId);
     if (!vehicle) {
       return res.status(404).json({
         success: false,
@@ -160,6 +162,75 @@ router.post('/optimize', (req: Request, res: Response) => {
   }
 });
 
+/**
+ * Payment/principal/gross over a term × rate × down payment grid in one call (heatmap data)
+ */
+router.post('/sweep', (req: Request, res: Response) => {
+  try {
+    const { calculateSensitivitySweep } = require('../../modules/deal-calculator');
+    const { vehicleId, customer } = req.body;
+    const vehicle = req.body.vehicle || inventoryStore.getByStock(vehicleId);
+
+    if (!vehicle) {
+      return res.status(404).json({
+        success: false,
+        error: 'Vehicle not found',
+      });
+    }
+
+    const numbers = (value: any, fallback: number[]): number[] =>
+      Array.isArray(value) && value.length > 0 ? value.map(Number) : fallback;
+    const baseDown = Number(customer?.downPayment) || 0;
+
+    const matrix = calculateSensitivitySweep(vehicle, customer || { monthlyIncome: 0, downPayment: 0, tradeAllowance: 0, tradeLien: 0 }, {
+      terms: numbers(req.body.terms, [36, 48, 60, 66, 72, 78, 84]),
+      rates: numbers(req.body.rates, Array.from({ length: 20 }, (_, i) => Math.round((5.99 + i * 1.5) * 100) / 100)),
+      downPayments: numbers(req.body.downPayments, Array.from({ length: 10 }, (_, i) => baseDown + i * 1000)),
+    });
+
+    res.json({
+      success: true,
+      matrix,
+    });
+  } catch (error) {
+    res.status(400).json({
+      success: false,
+      error: (error as Error).message,
+    });
+  }
+});
+
+/**
+ * One page of an amortization schedule; rows are generated only for the requested months
+ */
+router.post('/amortization', (req: Request, res: Response) => {
+  try {
+    const { principal, apr, termMonths } = req.body;
+    const offset = Math.max(0, parseInt(req.body.offset, 10) || 0);
+    const limit = Math.min(120, Math.max(1, parseInt(req.body.limit, 10) || 12));
+
+    const rows = Array.from(iterateAmortizationSchedule(
+      Number(principal),
+      Number(apr),
+      Number(termMonths),
+      offset + 1,
+      offset + limit
+    ));
+
+    res.json({
+      success: true,
+      rows,
+      offset,
+      hasMore: offset + rows.length < Number(termMonths),
+    });
+  } catch (error) {
+    res.status(400).json({
+      success: false,
+      error: (error as Error).message,
+    });
+  }
+});
+
 router.get('/lenders', (_req: Request, res: Response) => {
   try {
     const lenders = getAllLenderPrograms();
@@ -1,5 +1,5 @@
 import { Router, Request, Response } from 'express';
-import { scoreInventory } from '../../modules/approvals-engine';
+import { scoreInventoryAsync } from '../../modules/scoring-pool';
 import { fetchInventoryFromSupabase } from '../../modules/supabase';
 import { ApprovalSpec, TradeInfo } from '../../types/types';
 
@@ -142,7 +142,7 @@ router.post('/score', async (req: Request, res: Response) => {
       lienBalance: 0
     };
 
-    const scoredRows = scoreInventory(inventory, approvalSpec, tradeInfo);
+    const scoredRows = await scoreInventoryAsync(inventory, approvalSpec, tradeInfo);
 
     // Filter for hot deals (high gross profit)
     const hotDeals = scoredRows
@@ -1,57 +1,114 @@
 import { Router, Request, Response } from 'express';
+import fs from 'fs';
 import multer from 'multer';
 import pdf from 'pdf-parse';
 import { state } from '../state';
 import { Vehicle } from '../../types/types';
-import { loadInventoryFromCSV, enrichWithVinAuditValuations } from '../../modules/inventory-manager';
+import { loadInventoryFromCSV, streamInventoryFromCSV } from '../../modules/inventory-manager';
+import { decodeVINs } from '../../modules/vin-decoder';
+import { getVinCacheStats } from '../../modules/vin-cache';
+import { applyCachedValuations, valueInBackground, getValuationStats } from '../../modules/valuation-service';
 import { saveInventoryToSupabase, fetchInventoryFromSupabase } from '../../modules/supabase';
+import { InventoryChange } from '../../modules/inventory-sync';
+import { mergeIntoStore, mergeChangeEvents, changedRows, vehicleChanged, StoreMergeResult } from '../../modules/inventory-merge';
+import { applyInventoryChanges } from '../../modules/incremental-scoring';
+import { inventoryStore } from '../../modules/inventory-store';
 
 const router = Router();
 const upload = multer({ storage: multer.memoryStorage(), limits: { fileSize: 15 * 1024 * 1024 } });
+// CSV feeds go to a temp file and are parsed as a stream, so large files never sit in memory
+const csvUpload = multer({ storage: multer.diskStorage({}), limits: { fileSize: 100 * 1024 * 1024 } });
+
+// Upsert a parsed batch into the store row by row; returns the merge result (only changed rows
+// need saving). Score lists are patched once per import by finishFeed, not per batch.
+function mergeFeed(parsed: Vehicle[]): StoreMergeResult {
+  const lastUpdated = new Date().toISOString();
+  return mergeIntoStore(inventoryStore, parsed, (existing, update) => ({ ...existing, ...update, lastUpdated }));
+}
+
+function finishFeed(changes: InventoryChange[], previousInventory: Vehicle[]): void {
+  if (changes.length > 0) applyInventoryChanges(changes, state.inventory, previousInventory);
+}
+
+// Fetch uncached valuations after the response; valued rows are patched in, re-scored and saved
+function scheduleValuations(vehicles: Vehicle[], dealershipId?: string): void {
+  valueInBackground(vehicles, async valued => {
+    const previousInventory = state.inventory;
+    const changes: InventoryChange[] = [];
+    const toSave: Vehicle[] = [];
+    for (const v of valued) {
+      const existing = inventoryStore.find(v);
+      if (!existing || existing.blackBookValue === v.blackBookValue) continue;
+      const updated = { ...existing, blackBookValue: v.blackBookValue };
+      inventoryStore.replace(existing, updated);
+      changes.push({ type: 'updated', vehicle: updated, timestamp: new Date() });
+      toSave.push(updated);
+    }
+    if (changes.length === 0) return;
+    applyInventoryChanges(changes, state.inventory, previousInventory);
+    if (dealershipId) await saveInventoryToSupabase(toSave, dealershipId);
+  });
+}
 
 router.get('/ping', (_req: Request, res: Response) => {
   res.json({ success: true, scope: 'inventory', pong: true });
 });
 
-router.post('/upload-file', upload.single('file'), async (req: Request, res: Response) => {
+router.post('/upload-file', csvUpload.single('file'), async (req: Request, res: Response) => {
+  const file = (req as any).file as Express.Multer.File | undefined;
   try {
-    const file = (req as any).file as Express.Multer.File | undefined;
     if (!file) return res.status(400).json({ success: false, error: 'No file provided' });
     const source = (req as any).body?.source || 'manual';
     const dealershipId = req.dealershipId;
+    if (!dealershipId) {
+      console.warn('[upload-file] No dealership context - inventory not persisted to Supabase');
+    }
     
-    const text = file.buffer.toString('utf8');
-    let parsed = loadInventoryFromCSV(text);
-    parsed = await enrichWithVinAuditValuations(parsed);
-    
-    // Tag vehicles with source
-    parsed = parsed.map((v: Vehicle) => ({ ...v, source }));
-    
-    // Merge with existing inventory - update existing VINs, add new ones
-    const existingVins = new Set(state.inventory.map((v: Vehicle) => v.vin).filter(Boolean));
-    const newVehicles = parsed.filter((v: Vehicle) => !v.vin || !existingVins.has(v.vin));
-    const updatedVehicles = state.inventory.map((existing: Vehicle) => {
-      const update = parsed.find((v: Vehicle) => v.vin && v.vin === existing.vin);
-      return update ? { ...existing, ...update, lastUpdated: new Date().toISOString() } : existing;
-    });
-    
-    state.inventory = [...updatedVehicles, ...newVehicles];
-    
-    // Save to Supabase with dealership context
-    if (dealershipId) {
-      try { 
-        await saveInventoryToSupabase(state.inventory, dealershipId);
-        console.log(`[upload-file] Saved ${state.inventory.length} vehicles to Supabase for dealership ${dealershipId}`);
-      } catch(e) {
-        console.error('[upload-file] Failed to save inventory to Supabase:', e);
+    // Parse, merge and save one batch at a time; the file is read only as fast as batches finish
+    const totals = { parsed: 0, added: 0, updated: 0, unchanged: 0, saved: 0 };
+    let valuationsPending = 0;
+    const previousInventory = state.inventory;
+    const changes: InventoryChange[] = [];
+    try {
+      for await (const batch of streamInventoryFromCSV(fs.createReadStream(file.path))) {
+        // Cached valuations apply now; the rest are fetched in the background
+        const valued = applyCachedValuations(batch);
+        const parsed = valued.vehicles.map((v: Vehicle) => ({ ...v, source }));
+
+        // Merge with existing inventory - update existing VINs, add new ones
+        const merge = mergeFeed(parsed);
+        changes.push(...merge.changes);
+        const toSave = changedRows(merge);
+        totals.parsed += parsed.length;
+        totals.added += merge.added.length;
+        totals.updated += merge.updated.length;
+        totals.unchanged += merge.unchanged.length;
+        valuationsPending += valued.pending.length;
+        scheduleValuations(valued.pending, dealershipId);
+
+        // Save only added/changed rows to Supabase with dealership context
+        if (dealershipId && toSave.length > 0) {
+          try { 
+            await saveInventoryToSupabase(toSave, dealershipId);
+            totals.saved += toSave.length;
+          } catch(e) {
+            console.error('[upload-file] Failed to save inventory batch to Supabase:', e);
+          }
+        }
       }
-    } else {
-      console.warn('[upload-file] No dealership context - inventory not persisted to Supabase');
+    } finally {
+      // Patch score lists once for the whole import, including batches merged before a failure
+      finishFeed(changes, previousInventory);
+    }
+    if (dealershipId) {
+      console.log(`[upload-file] Saved ${totals.saved} changed vehicles to Supabase for dealership ${dealershipId}`);
     }
     
-    res.json({ success: true, message: `Loaded ${parsed.length} vehicles (${newVehicles.length} new, ${parsed.length - newVehicles.length} updated). Total: ${state.inventory.length}`, persisted: !!dealershipId });
+    res.json({ success: true, message: `Loaded ${totals.parsed} vehicles (${totals.added} new, ${totals.updated} updated, ${totals.unchanged} unchanged). Total: ${inventoryStore.size}`, persisted: !!dealershipId, valuationsPending });
   } catch (e) {
     res.status(400).json({ success: false, error: (e as Error).message });
+  } finally {
+    if (file?.path) fs.promises.unlink(file.path).catch(() => {});
   }
 });
 
@@ -65,16 +122,29 @@ router.post('/upload-image', upload.single('file'), async (req: Request, res: Re
     const entry = { mime: (file as any).mimetype || 'image/jpeg', buf: file.buffer };
     if (keyVin) state.imageStoreByVin.set(keyVin, entry);
     if (keyId) state.imageStoreById.set(keyId, entry);
+    const changes: InventoryChange[] = [];
+    const previousInventory = state.inventory;
     if (keyVin) {
       const url = `/api/inventory/image-by-vin/${encodeURIComponent(keyVin)}`;
-      for (let i = 0; i < state.inventory.length; i++) if (state.inventory[i].vin === keyVin) state.inventory[i] = { ...state.inventory[i], imageUrl: url };
+      const existing = inventoryStore.getByVin(keyVin);
+      if (existing) {
+        const updated = { ...existing, imageUrl: url };
+        inventoryStore.replace(existing, updated);
+        changes.push({ type: 'updated', vehicle: updated, timestamp: new Date() });
+      }
       for (let i = 0; i < state.mirroredInventory.length; i++) if (state.mirroredInventory[i].vin === keyVin) state.mirroredInventory[i] = { ...state.mirroredInventory[i], imageUrl: url };
     }
     if (keyId) {
       const url2 = `/api/inventory/image/${encodeURIComponent(keyId)}`;
-      for (let i = 0; i < state.inventory.length; i++) if (String(state.inventory[i].id) === keyId) state.inventory[i] = { ...state.inventory[i], imageUrl: url2 };
+      const existing = inventoryStore.getByStock(keyId);
+      if (existing) {
+        const updated = { ...existing, imageUrl: url2 };
+        inventoryStore.replace(existing, updated);
+        changes.push({ type: 'updated', vehicle: updated, timestamp: new Date() });
+      }
       for (let i = 0; i < state.mirroredInventory.length; i++) if (String(state.mirroredInventory[i].id) === keyId) state.mirroredInventory[i] = { ...state.mirroredInventory[i], imageUrl: url2 };
     }
+    applyInventoryChanges(changes, state.inventory, previousInventory);
     res.json({ success: true, message: 'Image uploaded', byVin: !!keyVin, byId: !!keyId });
   } catch (e) {
     res.status(400).json({ success: false, error: (e as Error).message });
@@ -119,35 +189,32 @@ router.post('/upload', async (req: Request, res: Response) => {
     if (!csvContent) {
       return res.status(400).json({ success: false, error: 'CSV content required' });
     }
-    let parsed = loadInventoryFromCSV(csvContent);
-    parsed = await enrichWithVinAuditValuations(parsed);
+    // Cached valuations apply now; the rest are fetched in the background
+    const valued = applyCachedValuations(loadInventoryFromCSV(csvContent));
     
     // Tag vehicles with source
-    parsed = parsed.map((v: Vehicle) => ({ ...v, source: source || 'manual' }));
+    const parsed = valued.vehicles.map((v: Vehicle) => ({ ...v, source: source || 'manual' }));
     
-    // Merge with existing inventory
-    const existingVins = new Set(state.inventory.map((v: Vehicle) => v.vin).filter(Boolean));
-    const newVehicles = parsed.filter((v: Vehicle) => !v.vin || !existingVins.has(v.vin));
-    const updatedVehicles = state.inventory.map((existing: Vehicle) => {
-      const update = parsed.find((v: Vehicle) => v.vin && v.vin === existing.vin);
-      return update ? { ...existing, ...update, lastUpdated: new Date().toISOString() } : existing;
-    });
-    
-    state.inventory = [...updatedVehicles, ...newVehicles];
+    // Merge with existing inventory - update existing VINs, add new ones
+    const previousInventory = state.inventory;
+    const merge = mergeFeed(parsed);
+    finishFeed(merge.changes, previousInventory);
+    const toSave = changedRows(merge);
     
-    // Save to Supabase with dealership context
+    // Save only added/changed rows to Supabase with dealership context
     if (dealershipId) {
       try { 
-        await saveInventoryToSupabase(state.inventory, dealershipId);
-        console.log(`[upload] Saved ${state.inventory.length} vehicles to Supabase for dealership ${dealershipId}`);
+        if (toSave.length > 0) await saveInventoryToSupabase(toSave, dealershipId);
+        console.log(`[upload] Saved ${toSave.length} changed vehicles to Supabase for dealership ${dealershipId}`);
       } catch(e) {
         console.error('[upload] Failed to save inventory to Supabase:', e);
       }
     } else {
       console.warn('[upload] No dealership context - inventory not persisted to Supabase');
     }
+    scheduleValuations(valued.pending, dealershipId);
     
-    res.json({ success: true, message: `Loaded ${parsed.length} vehicles (${newVehicles.length} new, ${parsed.length - newVehicles.length} updated). Total: ${state.inventory.length}`, persisted: !!dealershipId });
+    res.json({ success: true, message: `Loaded ${parsed.length} vehicles (${merge.added.length} new, ${merge.updated.length} updated, ${merge.unchanged.length} unchanged). Total: ${inventoryStore.size}`, persisted: !!dealershipId, valuationsPending: valued.pending.length });
   } catch (error) {
     res.status(400).json({ success: false, error: (error as Error).message });
   }
@@ -175,24 +242,20 @@ router.post('/enrich', async (req: Request, res: Response) => {
     
     let enriched = 0;
     let notFound = 0;
+    const changes: InventoryChange[] = [];
+    const toSave: Vehicle[] = [];
+    const previousInventory = state.inventory;
     
     for (const scraped of vehicles) {
       const stock = String(scraped.id || scraped.stock || '').trim();
       const vin = String(scraped.vin || '').trim();
       
       // Find existing vehicle by stock number or VIN
-      const idx = state.inventory.findIndex((v: Vehicle) => {
-        const vStock = String(v.id || '').trim();
-        const vVin = String(v.vin || '').trim();
-        if (stock && vStock && vStock === stock) return true;
-        if (vin && vVin && vVin === vin) return true;
-        return false;
-      });
+      const existing = (stock && inventoryStore.getByStock(stock)) || (vin && inventoryStore.getByVin(vin)) || undefined;
       
-      if (idx >= 0) {
-        const existing = state.inventory[idx];
+      if (existing) {
         // Enrich with scraped data - only update missing fields
-        state.inventory[idx] = {
+        const updated: Vehicle = {
           ...existing,
           vin: existing.vin || scraped.vin || '',
           mileage: existing.mileage || scraped.mileage || 0,
@@ -202,21 +265,29 @@ router.post('/enrich', async (req: Request, res: Response) => {
           imageUrls: scraped.imageUrls || existing.imageUrls,
           color: existing.color || scraped.color
         };
+        if (vehicleChanged(existing, updated)) {
+          inventoryStore.replace(existing, updated);
+          changes.push({ type: 'updated', vehicle: updated, timestamp: new Date() });
+          toSave.push(updated);
+        }
         enriched++;
       } else {
         // Add new vehicle to inventory if not found
-        state.inventory.push(scraped);
+        inventoryStore.upsert(scraped);
+        changes.push({ type: 'added', vehicle: scraped, timestamp: new Date() });
+        toSave.push(scraped);
         enriched++;
         notFound++;
       }
     }
+    applyInventoryChanges(changes, state.inventory, previousInventory);
     
-    // Save to Supabase with dealership context
+    // Save only added/changed rows to Supabase with dealership context
     const dealershipId = req.dealershipId;
     if (dealershipId) {
       try { 
-        await saveInventoryToSupabase(state.inventory, dealershipId);
-        console.log(`[enrich] Saved ${state.inventory.length} vehicles to Supabase for dealership ${dealershipId}`);
+        if (toSave.length > 0) await saveInventoryToSupabase(toSave, dealershipId);
+        console.log(`[enrich] Saved ${toSave.length} changed vehicles to Supabase for dealership ${dealershipId}`);
       } catch(e) {
         console.error('[enrich] Failed to save inventory to Supabase:', e);
       }
@@ -261,8 +332,11 @@ router.post('/sync', (req: Request, res: Response) => {
     else state.mirroredInventory.push({ id, ...(updates as any) } as Vehicle);
 
     // Also update primary inventory if present
-    const pi = state.inventory.findIndex(x => x.id === id);
-    if (pi >= 0) state.inventory[pi] = { ...state.inventory[pi], ...updates } as Vehicle;
+    const previousInventory = state.inventory;
+    const patched = inventoryStore.patch({ id, vin: '' }, updates);
+    if (patched) {
+      applyInventoryChanges(mergeChangeEvents(patched.previous!, patched.vehicle), state.inventory, previousInventory);
+    }
 
     res.json({ success: true, message: 'Vehicle upserted', vehicleId: id });
   } catch (e) {
@@ -270,6 +344,26 @@ router.post('/sync', (req: Request, res: Response) => {
   }
 });
 
+router.post('/decode-vins', (req: Request, res: Response) => {
+  const { vins } = req.body || {};
+  if (!Array.isArray(vins)) {
+    return res.status(400).json({ success: false, error: 'vins array required' });
+  }
+  if (vins.length > 10000) {
+    return res.status(400).json({ success: false, error: 'At most 10000 VINs per request' });
+  }
+  const results = decodeVINs(vins.map((v: any) => String(v ?? '')));
+  res.json({ success: true, results, invalid: results.filter(r => r === null).length });
+});
+
+router.get('/valuations/status', (_req: Request, res: Response) => {
+  res.json({ success: true, ...getValuationStats() });
+});
+
+router.get('/vin-cache/stats', (_req: Request, res: Response) => {
+  res.json({ success: true, caches: getVinCacheStats() });
+});
+
 router.get('/mirrored', (_req: Request, res: Response) => {
   res.json({ success: true, total: state.mirroredInventory.length, vehicles: state.mirroredInventory });
 });
@@ -15,6 +15,7 @@ import {
   clearCompletedJobs,
   initializeScheduledJobs
 } from '../../modules/background-jobs';
+import { getCrawlProgress } from '../../modules/crawl-orchestrator';
 import logger from '../../utils/logger';
 
 const router = Router();
@@ -117,6 +118,19 @@ router.get('/stats/queue', (req: Request, res: Response) => {
   }
 });
 
+/**
+ * GET /api/jobs/crawl/progress
+ * Per-site progress of the running dealership crawl
+ */
+router.get('/crawl/progress', (req: Request, res: Response) => {
+  try {
+    res.json({ success: true, crawl: getCrawlProgress() });
+  } catch (error: any) {
+    logger.error('Get crawl progress failed', { error: error.message });
+    res.status(500).json({ success: false, error: error.message });
+  }
+});
+
 /**
  * DELETE /api/jobs/cleanup/completed
  * Clear completed jobs
@@ -1,5 +1,5 @@
 import { Router, Request, Response } from 'express';
-import { scoreInventory } from '../../modules/approvals-engine';
+import { scoreInventoryAsync } from '../../modules/scoring-pool';
 import { fetchInventoryFromSupabase } from '../../modules/supabase';
 import { ApprovalSpec, TradeInfo } from '../../types/types';
 import { state } from '../state';
@@ -67,7 +67,7 @@ router.post('/auto-deal', async (req: Request, res: Response) => {
       lienBalance: 0
     };
 
-    const scoredRows = scoreInventory(inventory, approvalSpec, tradeInfo);
+    const scoredRows = await scoreInventoryAsync(inventory, approvalSpec, tradeInfo);
 
     // Find the best deal (highest total gross)
     const bestDeal = scoredRows
@@ -157,7 +157,7 @@ router.post('/quick-score', async (req: Request, res: Response) => {
       lienBalance: 0
     };
 
-    const scoredRows = scoreInventory(inventory, approvalSpec, tradeInfo);
+    const scoredRows = await scoreInventoryAsync(inventory, approvalSpec, tradeInfo);
 
     // Get top 5 deals
     const topDeals = scoredRows
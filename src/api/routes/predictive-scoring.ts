@@ -1,5 +1,5 @@
 import { Router, Request, Response } from 'express';
-import { scoreInventory } from '../../modules/approvals-engine';
+import { scoreInventoryScenarios } from '../../modules/approvals-engine';
 import { fetchInventoryFromSupabase } from '../../modules/supabase';
 import { ApprovalSpec, TradeInfo } from '../../types/types';
 import { getLenderProgram } from '../../modules/lender-programs';
@@ -9,8 +9,10 @@ const router = Router();
 /**
  * POST /api/predictive-scoring/analyze
  * Proactive inventory profit analysis - scores all inventory against multiple lender programs
+ * Pass ?stream=1 to receive NDJSON results per vehicle as they are computed
  */
 router.post('/analyze', async (req: Request, res: Response) => {
+  let streaming = false;
   try {
     const dealershipId = req.dealershipId;
     
@@ -40,10 +42,44 @@ router.post('/analyze', async (req: Request, res: Response) => {
       { bank: 'SDA', program: 'Star5', paymentMax: 900 },
     ];
 
+    // Resolve lender programs and approval specs once per scenario, not per vehicle
+    const scenarioApprovals: Array<{ scenario: typeof testScenarios[number]; approval: ApprovalSpec }> = [];
+    for (const scenario of testScenarios) {
+      const lenderProgram = getLenderProgram(scenario.bank as any, scenario.program);
+      if (!lenderProgram) continue;
+      scenarioApprovals.push({
+        scenario,
+        approval: {
+          bank: scenario.bank,
+          program: scenario.program,
+          apr: lenderProgram.rate,
+          termMonths: lenderProgram.maxTerm || 84,
+          paymentMin: 0,
+          paymentMax: scenario.paymentMax,
+          downPayment: 0,
+          province: 'AB'
+        }
+      });
+    }
+
+    const tradeInfo: TradeInfo = {
+      allowance: 0,
+      acv: 0,
+      lienBalance: 0
+    };
+
+    // ?stream=1 sends one NDJSON line per vehicle as it is scored, then a summary line
+    const stream = req.query.stream === '1' || req.query.stream === 'true';
+    if (stream) {
+      res.setHeader('Content-Type', 'application/x-ndjson');
+      streaming = true;
+    }
+
     const analysis: any[] = [];
+    let scored = 0;
 
-    // Score each vehicle against all scenarios
-    for (const vehicle of inventory.slice(0, 50)) { // Limit to 50 vehicles for performance
+    // Score the whole inventory against all scenarios in one pass
+    for (const { vehicle, rows } of scoreInventoryScenarios(inventory, scenarioApprovals.map(s => s.approval), tradeInfo)) {
       const vehicleAnalysis: any = {
         vehicleId: vehicle.id,
         vin: vehicle.vin,
@@ -52,44 +88,20 @@ router.post('/analyze', async (req: Request, res: Response) => {
         scenarios: []
       };
 
-      for (const scenario of testScenarios) {
-        const lenderProgram = getLenderProgram(scenario.bank as any, scenario.program);
-        
-        if (!lenderProgram) continue;
-
-        const approvalSpec: ApprovalSpec = {
+      rows.forEach((result, i) => {
+        if (!result) return;
+        const { scenario } = scenarioApprovals[i];
+        vehicleAnalysis.scenarios.push({
           bank: scenario.bank,
           program: scenario.program,
-          apr: lenderProgram.rate,
-          termMonths: lenderProgram.maxTerm || 84,
-          paymentMin: 0,
           paymentMax: scenario.paymentMax,
-          downPayment: 0,
-          province: 'AB'
-        };
-
-        const tradeInfo: TradeInfo = {
-          allowance: 0,
-          acv: 0,
-          lienBalance: 0
-        };
-
-        const scoredRows = scoreInventory([vehicle], approvalSpec, tradeInfo);
-        
-        if (scoredRows.length > 0) {
-          const result = scoredRows[0];
-          vehicleAnalysis.scenarios.push({
-            bank: scenario.bank,
-            program: scenario.program,
-            paymentMax: scenario.paymentMax,
-            totalGross: result.totalGross,
-            monthlyPayment: result.monthlyPayment,
-            salePrice: result.salePrice,
-            compliant: result.flags.length === 0,
-            flags: result.flags
-          });
-        }
-      }
+          totalGross: result.totalGross,
+          monthlyPayment: result.monthlyPayment,
+          salePrice: result.salePrice,
+          compliant: result.flags.length === 0,
+          flags: result.flags
+        });
+      });
 
       // Calculate best scenario
       const compliantScenarios = vehicleAnalysis.scenarios.filter((s: any) => s.compliant);
@@ -102,18 +114,36 @@ router.post('/analyze', async (req: Request, res: Response) => {
       }
 
       analysis.push(vehicleAnalysis);
+      if (stream) res.write(JSON.stringify({ type: 'vehicle', analysis: vehicleAnalysis }) + '\n');
+
+      // Let other requests run between batches of vehicles
+      if (++scored % 25 === 0) {
+        await new Promise(resolve => setImmediate(resolve));
+      }
     }
 
     // Sort by max gross potential
     analysis.sort((a, b) => b.maxGross - a.maxGross);
 
-    res.json({
+    const summary = {
       success: true,
       analysis: analysis.slice(0, 20), // Return top 20
       totalAnalyzed: analysis.length,
       scenariosTested: testScenarios.length
-    });
+    };
+
+    if (stream) {
+      res.end(JSON.stringify({ type: 'summary', ...summary }) + '\n');
+      return;
+    }
+    res.json(summary);
   } catch (error: any) {
+    // Once the response is NDJSON, report the failure as a final NDJSON line
+    if (streaming || res.headersSent) {
+      if (!res.headersSent) res.status(500);
+      res.end(JSON.stringify({ type: 'error', error: error.message }) + '\n');
+      return;
+    }
     res.status(500).json({
       success: false,
       error: error.message
@@ -306,7 +306,7 @@ router.get('/deals/history', (req: Request, res: Response) => {
 /**
  * Excel Export Endpoints
  */
-import { exportInventoryToExcel, exportDealsToExcel, exportAnalyticsToExcel } from '../../modules/excel-export';
+import { exportInventoryToExcel, exportDealsToExcel, exportAnalyticsToExcel, streamAmortizationToExcel } from '../../modules/excel-export';
 import { state } from '../state';
 
 router.get('/export/excel/inventory', async (req: Request, res: Response) => {
@@ -337,6 +337,25 @@ router.post('/export/excel/deals', async (req: Request, res: Response) => {
   }
 });
 
+router.get('/export/excel/amortization', async (req: Request, res: Response) => {
+  const principal = parseFloat(req.query.principal as string);
+  const apr = parseFloat(req.query.apr as string);
+  const termMonths = parseInt(req.query.termMonths as string, 10);
+  try {
+    res.setHeader('Content-Type', 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet');
+    res.setHeader('Content-Disposition', `attachment; filename=amortization-${Date.now()}.xlsx`);
+    await streamAmortizationToExcel(res, principal, apr, termMonths);
+  } catch (error: any) {
+    logger.error('Export amortization to Excel failed', { error: error.message });
+    if (res.headersSent) {
+      res.end();
+      return;
+    }
+    res.removeHeader('Content-Disposition');
+    res.status(400).json({ success: false, error: error.message });
+  }
+});
+
 router.get('/export/excel/analytics', async (req: Request, res: Response) => {
   try {
     const dealMetrics = getDealMetrics();
@@ -1,13 +1,16 @@
 import express, { Request, Response } from 'express';
-import axios from 'axios';
 import { load as cheerioLoad } from 'cheerio';
 import { Vehicle } from '../../types/types';
+import { fetchPageHtml, getBrowserPoolStats } from '../../modules/browser-pool';
+import { getConditionalFetchStats } from '../../modules/conditional-fetch';
+import { createHttpClient, getHttpClientStats } from '../../modules/http-client';
+import { marketSnapshots, toMarketListings } from '../../modules/market-snapshots';
+import { inventoryStore } from '../../modules/inventory-store';
 
 const router = express.Router();
 
-const http = axios.create({
+const http = createHttpClient({
   timeout: 60000,
-  maxRedirects: 5,
   headers: {
     'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/121.0 Safari/537.36',
     'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,*/*;q=0.8',
@@ -18,31 +21,12 @@ const http = axios.create({
 });
 
 async function fetchHtmlHeadless(url: string, referer?: string): Promise<string> {
-  let browser: any = null;
-  try {
-    const mod: any = await import('puppeteer');
-    const puppeteer = mod.default || mod;
-    browser = await puppeteer.launch({
-      headless: true,
-      args: ['--no-sandbox', '--disable-setuid-sandbox', '--disable-dev-shm-usage'],
-    });
-    const page = await browser.newPage();
-    await page.setUserAgent('Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/121.0 Safari/537.36');
-    const extra: Record<string,string> = { 'Accept-Language': 'en-CA,en-US;q=0.9,en;q=0.8' };
-    if (referer) extra['Referer'] = referer;
-    await page.setExtraHTTPHeaders(extra);
-    await page.setRequestInterception(true);
-    page.on('request', (req: any) => {
-      const rt = req.resourceType();
-      if (rt === 'image' || rt === 'font' || rt === 'media' || rt === 'stylesheet') return req.abort();
-      req.continue();
-    });
-    await page.goto(url, { waitUntil: 'networkidle2', timeout: 120000 });
-    await page.waitForSelector('body', { timeout: 30000 });
-    return await page.content();
-  } finally {
-    if (browser) { try { await browser.close(); } catch(_e) {} }
-  }
+  return fetchPageHtml(url, {
+    headers: referer ? { Referer: referer } : undefined,
+    waitUntil: 'networkidle2',
+    timeout: 120000,
+    waitForSelector: 'body',
+  });
 }
 
 async function fetchHtml(url: string, referer?: string): Promise<string> {
@@ -440,11 +424,37 @@ function normalizeVehicleFromDom(html: string, pageUrl: string, idx: number): Ve
   }
 }
 
-import { getCachedVehicles, setCachedVehicles, getCacheStats } from '../../modules/scraper-cache';
+import { getOrScrapeVehicles, getCacheStats } from '../../modules/scraper-cache';
 import { retryWithBackoff, RateLimiter, validateVehicleData, normalizeStockNumber } from '../../modules/scraper-utils';
 
 const rateLimiter = new RateLimiter(500); // 500ms delay between requests
 
+/**
+ * Scrape a listing URL with the production scraper (all 7 fixes) and normalize stock numbers.
+ * Also used to refresh stale cache entries in the background.
+ */
+async function scrapeListing(url: string, limit: number, useCache: boolean): Promise<Vehicle[]> {
+  const { ProductionDealershipScraper } = await import('../../modules/production-scraper');
+  const scraper = new ProductionDealershipScraper({
+    baseUrl: url,
+    maxPages: Math.ceil(limit / 20),
+    minScore: 50, // Adjusted threshold (was 40)
+    headless: true,
+    useCache: useCache,
+  });
+
+  console.log('[SCRAPER] Using ProductionDealershipScraper with pagination support');
+  const vehicles = await scraper.scrapeInventory();
+
+  // Normalize stock numbers
+  vehicles.forEach(v => {
+    if (v.id) {
+      v.id = normalizeStockNumber(v.id);
+    }
+  });
+  return vehicles;
+}
+
 /**
  * Health check endpoint
  */
@@ -462,6 +472,9 @@ router.get('/health', async (_req: Request, res: Response) => {
         statusCode: response.status
       },
       cache: cacheStats,
+      browserPool: getBrowserPoolStats(),
+      conditionalFetch: getConditionalFetchStats(),
+      http: getHttpClientStats(),
       rateLimiter: {
         delayMs: 500
       }
@@ -511,48 +524,21 @@ router.get('/dealership', async (req: Request, res: Response) => {
     
     console.log('[SCRAPER] Dealership scrape started:', { url, limit, path, useCache });
     
-    // Check cache first
-    if (useCache) {
-      const cached = await getCachedVehicles(url);
-      if (cached) {
-        console.log('[SCRAPER] Returning cached vehicles:', cached.length);
-        return res.json({ 
-          success: true, 
-          total: cached.length, 
-          vehicles: cached, 
-          cached: true,
-          debug: { url, limit } 
-        });
-      }
+    // Cache first; concurrent requests for the same URL share one lookup and one scrape
+    const { vehicles, cached } = await getOrScrapeVehicles(url, () => scrapeListing(url, limit, useCache), useCache);
+    if (cached) {
+      console.log('[SCRAPER] Returning cached vehicles:', vehicles.length);
+      return res.json({ 
+        success: true, 
+        total: vehicles.length, 
+        vehicles, 
+        cached: true,
+        debug: { url, limit } 
+      });
     }
     
-    // Use production scraper with all 7 fixes
-    const { ProductionDealershipScraper } = await import('../../modules/production-scraper');
-    const scraper = new ProductionDealershipScraper({
-      baseUrl: url,
-      maxPages: Math.ceil(limit / 20),
-      minScore: 50,
-      headless: true,
-      useCache: useCache,
-    });
-    
-    console.log('[SCRAPER] Using ProductionDealershipScraper with pagination support');
-    const vehicles = await scraper.scrapeInventory();
-    
-    // Normalize stock numbers
-    vehicles.forEach(v => {
-      if (v.id) {
-        v.id = normalizeStockNumber(v.id);
-      }
-    });
-    
     console.log('[SCRAPER] Vehicles fetched:', vehicles.length);
     
-    // Save to cache
-    if (useCache && vehicles.length > 0) {
-      await setCachedVehicles(url, vehicles);
-    }
-    
     if (vehicles.length > 0) {
       console.log('[SCRAPER] Sample vehicle:', JSON.stringify(vehicles[0], null, 2));
     }
@@ -590,48 +576,21 @@ router.get('/devon', async (req: Request, res: Response) => {
     
     console.log('[SCRAPER] Devon scrape started (DEPRECATED - use /dealership):', { url, limit, path, useCache });
     
-    // Check cache first
-    if (useCache) {
-      const cached = await getCachedVehicles(url);
-      if (cached) {
-        console.log('[SCRAPER] Returning cached vehicles:', cached.length);
-        return res.json({ 
-          success: true, 
-          total: cached.length, 
-          vehicles: cached, 
-          cached: true,
-          debug: { url, limit } 
-        });
-      }
+    // Cache first; concurrent requests for the same URL share one lookup and one scrape
+    const { vehicles, cached } = await getOrScrapeVehicles(url, () => scrapeListing(url, limit, useCache), useCache);
+    if (cached) {
+      console.log('[SCRAPER] Returning cached vehicles:', vehicles.length);
+      return res.json({ 
+        success: true, 
+        total: vehicles.length, 
+        vehicles, 
+        cached: true,
+        debug: { url, limit } 
+      });
     }
     
-    // Use production scraper with all 7 fixes
-    const { ProductionDealershipScraper } = await import('../../modules/production-scraper');
-    const scraper = new ProductionDealershipScraper({
-      baseUrl: url,
-      maxPages: Math.ceil(limit / 20),
-      minScore: 50, // Adjusted threshold (was 40)
-      headless: true,
-      useCache: useCache,
-    });
-    
-    console.log('[SCRAPER] Using ProductionDealershipScraper with pagination support');
-    const vehicles = await scraper.scrapeInventory();
-    
-    // Normalize stock numbers
-    vehicles.forEach(v => {
-      if (v.id) {
-        v.id = normalizeStockNumber(v.id);
-      }
-    });
-    
     console.log('[SCRAPER] Vehicles fetched:', vehicles.length);
     
-    // Save to cache
-    if (useCache && vehicles.length > 0) {
-      await setCachedVehicles(url, vehicles);
-    }
-    
     if (vehicles.length > 0) {
       console.log('[SCRAPER] Sample vehicle:', JSON.stringify(vehicles[0], null, 2));
     }
@@ -710,6 +669,7 @@ router.get('/autotrader/pricing', async (req: Request, res: Response) => {
     }
     
     const result = await searchCompetitorPricing(year, make, model, radius, location);
+    marketSnapshots.ingest(toMarketListings('autotrader', result.listings));
     
     res.json({
       success: true,
@@ -785,6 +745,7 @@ router.get('/cargurus/market', async (req: Request, res: Response) => {
     }
     
     const result = await searchMarketData(year, make, model, radius, postalCode);
+    marketSnapshots.ingest(toMarketListings('cargurus', result.listings));
     
     res.json({
       success: true,
@@ -843,4 +804,29 @@ router.get('/cargurus/compare', async (req: Request, res: Response) => {
   }
 });
 
+/**
+ * Percentile price bands against the local market snapshot, for the posted vehicles or the whole
+ * inventory. Reads only stored listings; refreshes run as 'market' background jobs.
+ */
+router.post('/market/bands', (req: Request, res: Response) => {
+  try {
+    const vehicles = Array.isArray(req.body?.vehicles) ? req.body.vehicles : inventoryStore.toArray();
+    const region = req.body?.region as string | undefined;
+    const bands = marketSnapshots.priceBands(vehicles, region);
+    
+    res.json({
+      success: true,
+      total: bands.length,
+      covered: bands.filter(b => b.sampleSize > 0).length,
+      bands,
+      snapshot: marketSnapshots.stats(),
+    });
+  } catch (e: any) {
+    res.status(500).json({
+      success: false,
+      error: e.message || 'Market price bands failed'
+    });
+  }
+});
+
 export default router;
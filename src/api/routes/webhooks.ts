@@ -3,7 +3,8 @@ import multer from 'multer';
 import pdf from 'pdf-parse';
 import axios from 'axios';
 import { listRules, setRules, addRules } from '../../modules/rules-library';
-import { scoreInventory } from '../../modules/approvals-engine';
+import { registerApproval, getScoredRows, getIncrementalScoringStats } from '../../modules/incremental-scoring';
+import { scoreInventoryAsync, scoreProfitScenariosAsync, getScoringPoolStats } from '../../modules/scoring-pool';
 import { ApprovalIngestPayload, LenderRuleSet, ScoreRequest, ScoreResponse, ApprovalSpec, TradeInfo } from '../../types/types';
 import { state } from '../state';
 import { getLenderProgram } from '../../modules/lender-programs';
@@ -11,6 +12,11 @@ import { getLenderProgram } from '../../modules/lender-programs';
 const router = Router();
 const upload = multer({ storage: multer.memoryStorage(), limits: { fileSize: 15 * 1024 * 1024 } });
 
+// Materialized score list key for state.lastApproval
+function lastApprovalKey(): string {
+  return state.lastApproval ? `${state.lastApproval.locationId}:${state.lastApproval.contactId}` : 'last';
+}
+
 router.get('/ping', (_req: Request, res: Response) => {
   res.json({ success: true, scope: 'webhooks', pong: true });
 });
@@ -321,7 +327,8 @@ router.post('/approvals/ingest', async (req: Request, res: Response) => {
     
     if (inventoryToScore.length > 0) {
       try {
-        scoredRows = scoreInventory(inventoryToScore, approval, trade);
+        // Materialize the scored list so inventory changes only re-score affected vehicles
+        scoredRows = await registerApproval(lastApprovalKey(), approval, trade, inventoryToScore);
         console.log(`[APPROVAL] Auto-scored ${scoredRows.length} vehicles for ${bank} ${program}`);
       } catch (error) {
         console.error('[APPROVAL] Auto-scoring failed:', error);
@@ -344,12 +351,20 @@ router.post('/approvals/ingest', async (req: Request, res: Response) => {
   }
 });
 
+router.get('/scoring-pool/stats', (_req: Request, res: Response) => {
+  res.json({ success: true, stats: getScoringPoolStats() });
+});
+
+router.get('/approvals/scored-lists', (_req: Request, res: Response) => {
+  res.json({ success: true, lists: getIncrementalScoringStats() });
+});
+
 router.get('/approvals/last', (_req: Request, res: Response) => {
   if (!state.lastApproval) return res.json({ success: true, hasApproval: false });
   res.json({ success: true, hasApproval: true, lastApproval: state.lastApproval });
 });
 
-router.post('/approvals/score', (req: Request, res: Response) => {
+router.post('/approvals/score', async (req: Request, res: Response) => {
   try {
     const body: ScoreRequest = req.body || {};
     const approval = body.approval || state.lastApproval?.approval;
@@ -363,7 +378,9 @@ router.post('/approvals/score', (req: Request, res: Response) => {
       return res.status(400).json({ success: false, error: 'No inventory loaded. Please upload inventory first.' });
     }
     
-    const rows = scoreInventory(inventoryToScore, approval, trade);
+    // Last ingested approval is kept materialized; explicit approvals are scored on demand
+    const rows = (!body.approval && !body.trade && await getScoredRows(lastApprovalKey(), inventoryToScore))
+      || await scoreInventoryAsync(inventoryToScore, approval, trade);
     const response: ScoreResponse = { approval, rows };
     res.json({ success: true, ...response, inventoryCount: inventoryToScore.length });
   } catch (e) {
@@ -417,7 +434,7 @@ router.post('/approvals/profit-scenarios', (req: Request, res: Response) => {
 });
 
 // Score inventory with profit maximization across multiple approvals
-router.post('/approvals/score-multi', (req: Request, res: Response) => {
+router.post('/approvals/score-multi', async (req: Request, res: Response) => {
   try {
     const { approvals, trade, province, docFee } = req.body;
     
@@ -431,28 +448,14 @@ router.post('/approvals/score-multi', (req: Request, res: Response) => {
       return res.status(400).json({ success: false, error: 'No inventory loaded. Please upload inventory first.' });
     }
     
-    const { calculateAllProfitScenarios } = require('../../modules/profit-maximizer');
-    
-    // Score each vehicle against all approvals
-    const scoredDeals = inventoryToScore.map(vehicle => {
-      const scenarios = calculateAllProfitScenarios(
-        vehicle,
-        approvals,
-        trade || { allowance: 0, acv: 0, lienBalance: 0 },
-        province || 'AB',
-        docFee || 799
-      );
-      
-      return {
-        vehicle: vehicle,
-        bestScenario: scenarios[0], // Highest profit
-        allScenarios: scenarios,
-        profitPotential: scenarios[0]?.totalGross || 0,
-      };
-    });
-    
-    // Sort by profit potential (highest first)
-    scoredDeals.sort((a, b) => b.profitPotential - a.profitPotential);
+    // Score each vehicle against all approvals on the scoring pool (sorted by profit potential, highest first)
+    const scoredDeals = await scoreProfitScenariosAsync(
+      inventoryToScore,
+      approvals,
+      trade || { allowance: 0, acv: 0, lienBalance: 0 },
+      province || 'AB',
+      docFee || 799
+    );
     
     res.json({ 
       success: true, 
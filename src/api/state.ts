@@ -1,9 +1,17 @@
 import { Vehicle, ApprovalSpec, TradeInfo } from '../types/types';
+import { inventoryStore } from '../modules/inventory-store';
 
 export type ImageEntry = { mime: string; buf: Buffer };
 
 export const state = {
-  inventory: [] as Vehicle[],
+  // Backed by the indexed inventory store; reads return its snapshot, which keeps the same
+  // identity until the next change, and assignment replaces the whole store
+  get inventory(): Vehicle[] {
+    return inventoryStore.toArray();
+  },
+  set inventory(vehicles: Vehicle[]) {
+    inventoryStore.replaceAll(vehicles);
+  },
   mirroredInventory: [] as Vehicle[],
   lastApproval: null as null | { contactId: string; locationId: string; approval: ApprovalSpec; trade: TradeInfo },
   imageStoreByVin: new Map<string, ImageEntry>(),
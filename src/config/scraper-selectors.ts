@@ -1,9 +1,10 @@
 /**
- * CSS SELECTORS FOR AUTOTRADER.CA & CARGURUS.CA
+ * CSS SELECTORS FOR AUTOTRADER.CA, CARGURUS.CA & DEALER SITES
  * Updated: January 2026
  * 
  * These selectors are used by the free Puppeteer-based scrapers
- * to extract vehicle data without requiring API keys.
+ * to extract vehicle data without requiring API keys, and by the
+ * dealer website scraper for listing cards.
  */
 
 export const AUTOTRADER_SELECTORS = {
@@ -140,6 +141,26 @@ export const FALLBACK_SELECTORS = {
   }
 };
 
+/**
+ * Listing-card selector sets for dealer websites (ProductionDealershipScraper).
+ * The id is what gets remembered per domain once a set extracts vehicles.
+ */
+export interface DealerSelectorSet {
+  id: string;
+  card: string;
+  title: string;
+  price: string;
+  mileage: string;
+  vin: string;
+}
+
+export const DEALER_SELECTOR_SETS: DealerSelectorSet[] = [
+  { id: 'vehicle-card', card: 'div.vehicle-card, div.vehicle-listing, div[data-vehicle]', title: 'h2, h3, .title, .vehicle-title', price: '.price, .vehicle-price, [class*="price"]', mileage: '.mileage, .odometer, [class*="mileage"]', vin: '.vin, [data-vin]' },
+  { id: 'article', card: 'article.vehicle, article.car, article[data-vehicle-id]', title: 'h2, h3, .heading', price: '.price, .cost', mileage: '.km, .kms', vin: '.vin' },
+  { id: 'list-item', card: 'li.car-listing, li.vehicle-item', title: '.name, .title', price: '.price', mileage: '.mileage', vin: '.vin' },
+  { id: 'inventory-div', card: 'div[class*="inventory"], div[class*="listing"]', title: 'h2, h3', price: '[class*="price"]', mileage: '[class*="mile"], [class*="km"]', vin: '[class*="vin"]' },
+];
+
 /**
  * URL patterns for constructing search URLs
  */
@@ -139,3 +139,34 @@ export function validateProductFit(
     percentOfCBB,
   };
 }
+
+/**
+ * Order bundles by their gross contribution (highest first); ties keep the original order
+ */
+export function rankBundlesByContribution(
+  bundles: ProductBundle[],
+  contribution: (bundle: ProductBundle) => number = (b) => b.totalMargin
+): ProductBundle[] {
+  return bundles
+    .map((bundle, index) => ({ bundle, index, value: contribution(bundle) }))
+    .sort((a, b) => b.value - a.value || a.index - b.index)
+    .map((entry) => entry.bundle);
+}
+
+/**
+ * Highest-contribution bundle that passes the caller's compliance check.
+ * `ranked` must come from rankBundlesByContribution. Bundles whose retail exceeds
+ * `maxRetail` (an upper bound from LTV/payment caps) are pruned without evaluation, and the
+ * search stops at the first compliant bundle since every later one is dominated.
+ */
+export function selectBestBundle(
+  ranked: ProductBundle[],
+  maxRetail: number,
+  isCompliant: (bundle: ProductBundle) => boolean
+): ProductBundle | null {
+  for (const bundle of ranked) {
+    if (bundle.totalRetail > maxRetail) continue;
+    if (isCompliant(bundle)) return bundle;
+  }
+  return null;
+}
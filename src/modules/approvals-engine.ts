@@ -1,9 +1,10 @@
-import { Vehicle, ApprovalSpec, TradeInfo, ScoredVehicleRow, Province, BackCapRule } from '../types/types';
+import { Vehicle, ApprovalSpec, TradeInfo, ScoredVehicleRow, Province, BackCapRule, LenderRuleSet } from '../types/types';
 import { calculateTaxSavings } from './tax-calculator';
-import { getPaymentSummary } from './payment-calculator';
+import { calculatePaymentAmount } from './payment-calculator';
 import { findRule } from './rules-library';
 import { getMaxTermForVehicle } from './vehicle-booking-guide';
 import { getSubventedRate } from './lender-programs';
+import { compileReserveBrackets, findReserveBracketIndex, CompiledReserveBrackets } from './reserve-lookup';
 
 const DEFAULT_FEE = 810;
 const DEFAULT_PROVINCE: Province = 'AB';
@@ -22,12 +23,12 @@ function computeMonthlyPayment(
   const tax = calculateTaxSavings(salePrice, trade.allowance, province, approval.isNativeStatus || false);
   const principal = salePrice - down - equity + DEFAULT_FEE + tax.totalTax;
 
-  const { monthlyPayment } = getPaymentSummary(
+  // Payment only; the binary search never needs the amortization schedule
+  return calculatePaymentAmount(
     Math.max(0, principal),
     approval.apr,
     termOverride ?? approval.termMonths
   );
-  return monthlyPayment;
 }
 
 function computePrincipal(
@@ -97,156 +98,213 @@ function findMaxPriceWithinPayment(
   return best;
 }
 
-export function scoreInventory(
-  inventory: Vehicle[],
-  approval: ApprovalSpec,
-  trade: TradeInfo
-): ScoredVehicleRow[] {
-  const rows: ScoredVehicleRow[] = [];
+/**
+ * Per-approval values that do not depend on the vehicle; resolved once per scoring pass
+ */
+export interface ScoringContext {
+  approval: ApprovalSpec;
+  trade: TradeInfo;
+  rule: LenderRuleSet | undefined;
+  frontCapFactorEff: number | undefined;
+  backCapEff: BackCapRule | undefined;
+  paymentMaxEff: number;
+  province: Province;
+  overAllowance: number;
+  fixedReserve: CompiledReserveBrackets | null;
+  qualityBonus: CompiledReserveBrackets | null;
+}
 
-  for (const v of inventory) {
-    try {
-      const flags: string[] = [];
-      
-      // Set CBB (Canadian Black Book / Black Book) to $40,000 for all vehicles
-      // This is used for front cap calculations in payment matrix
-      let bb = v.blackBookValue || 0;
-      if (bb <= 0 || isNaN(bb)) {
-        bb = 40000; // Default CBB to $40,000
-        flags.push('estimated_black_book');
-      }
-      
-      // Set default cost to $10,000 if missing
-      // Cost is used for gross profit calculations
-      let cost = v.yourCost;
-      if (cost == null || isNaN(cost) || cost <= 0) {
-        cost = 10000; // Default cost to $10,000
-        flags.push('estimated_cost');
-      }
-
-    // Load dynamic lender rule if available
-    const rule = findRule(approval.bank, approval.program);
-    
-    // Get maximum term based on vehicle booking guide (year + mileage)
-    const maxTermForVehicle = getMaxTermForVehicle(
-      approval.bank,
-      approval.program,
-      v.year,
-      v.mileage
-    );
-    
-    // If vehicle is ineligible (returns 0), skip it
-    if (maxTermForVehicle === 0) {
-      flags.push('vehicle_ineligible_year_mileage');
-      continue;
-    }
-    
+export function prepareScoringContext(approval: ApprovalSpec, trade: TradeInfo): ScoringContext {
+  // Load dynamic lender rule if available
+  const rule = findRule(approval.bank, approval.program);
+  return {
+    approval,
+    trade,
+    rule,
     // Effective caps & constraints
-    const frontCapFactorEff = approval.frontCapFactor ?? rule?.frontCapFactor;
-    const backCapEff: BackCapRule | undefined = approval.backCap ?? rule?.backCap;
+    frontCapFactorEff: approval.frontCapFactor ?? rule?.frontCapFactor,
+    backCapEff: approval.backCap ?? rule?.backCap,
+    // Payment call cap from lender rule (if lower than approval)
+    paymentMaxEff: Math.min(approval.paymentMax, rule?.maxPayCall ?? Number.POSITIVE_INFINITY),
+    province: approval.province || DEFAULT_PROVINCE,
+    overAllowance: Math.max(0, trade.allowance - trade.acv),
+    // Reserve brackets compiled once per rule for binary-search lookups
+    fixedReserve: Array.isArray(rule?.reserve?.fixedByFinancedAmount)
+      ? compileReserveBrackets(rule!.reserve!.fixedByFinancedAmount!)
+      : null,
+    qualityBonus: Array.isArray(rule?.reserve?.qualityBonusByFinancedAmount)
+      ? compileReserveBrackets(rule!.reserve!.qualityBonusByFinancedAmount!)
+      : null,
+  };
+}
+
+/**
+ * Score one vehicle against a prepared approval; returns null when the vehicle is ineligible
+ */
+function scoreVehicle(v: Vehicle, ctx: ScoringContext): ScoredVehicleRow | null {
+  const { approval, trade, rule, frontCapFactorEff, backCapEff, paymentMaxEff } = ctx;
+  const flags: string[] = [];
+  
+  // Set CBB (Canadian Black Book / Black Book) to $40,000 for all vehicles
+  // This is used for front cap calculations in payment matrix
+  let bb = v.blackBookValue || 0;
+  if (bb <= 0 || isNaN(bb)) {
+    bb = 40000; // Default CBB to $40,000
+    flags.push('estimated_black_book');
+  }
+  
+  // Set default cost to $10,000 if missing
+  // Cost is used for gross profit calculations
+  let cost = v.yourCost;
+  if (cost == null || isNaN(cost) || cost <= 0) {
+    cost = 10000; // Default cost to $10,000
+    flags.push('estimated_cost');
+  }
 
-    // Use the lesser of approval term or vehicle's max eligible term
-    const termMonthsEff = Math.min(approval.termMonths, maxTermForVehicle);
+  // Get maximum term based on vehicle booking guide (year + mileage)
+  const maxTermForVehicle = getMaxTermForVehicle(
+    approval.bank,
+    approval.program,
+    v.year,
+    v.mileage
+  );
+  
+  // If vehicle is ineligible (returns 0), skip it
+  if (maxTermForVehicle === 0) {
+    return null;
+  }
 
-    // Payment call cap from lender rule (if lower than approval)
-    const paymentMaxEff = Math.min(approval.paymentMax, rule?.maxPayCall ?? Number.POSITIVE_INFINITY);
-
-    const frontCap = frontCapFactorEff != null ? bb * frontCapFactorEff : Number.POSITIVE_INFINITY;
-    const minPrice = Math.max(cost, 0);
-    const maxPrice = Math.max(minPrice, Math.min(frontCap, minPrice + 100000));
-
-    // Check for subvented rate (new vehicles only)
-    // Estimate amount financed for subvented rate check
-    const downPayment = approval.downPayment || 0;
-    const estimatedFinanced = bb - downPayment;
-    const subventedRate = getSubventedRate(
-      approval.bank,
-      approval.program,
-      v.year,
-      v.make,
-      estimatedFinanced,
-      v.model
-    );
-    
-    // Create modified approval with effective APR (subvented or standard)
-    const effectiveApproval = subventedRate !== null 
-      ? { ...approval, apr: subventedRate }
-      : approval;
-    
-    if (subventedRate !== null) {
-      flags.push('subvented_rate');
-    }
+  // Use the lesser of approval term or vehicle's max eligible term
+  const termMonthsEff = Math.min(approval.termMonths, maxTermForVehicle);
 
-    const best = findMaxPriceWithinPayment(
-      minPrice,
-      maxPrice,
-      v,
-      effectiveApproval,
-      trade,
-      approval.paymentMin,
-      paymentMaxEff,
-      termMonthsEff
-    );
-
-    // Front gross
-    const overAllowance = Math.max(0, trade.allowance - trade.acv);
-    const front = (best.price - cost) - overAllowance;
-
-    // Compute amount financed (principal) for reserve calculations
-    const province = approval.province || DEFAULT_PROVINCE;
-    const principal = computePrincipal(best.price, approval, trade, province);
-
-    // Reserve/bonus computation from rules
-    let reserve = 0;
-    if (rule?.reserve) {
-      if (rule.reserve.percentOfFinanced) {
-        reserve += rule.reserve.percentOfFinanced * principal;
-      }
-      if (Array.isArray(rule.reserve.fixedByFinancedAmount)) {
-        const br = rule.reserve.fixedByFinancedAmount.find(b => principal >= b.minFinanced && principal <= b.maxFinanced);
-        if (br) reserve += br.amount;
-      }
-      if (Array.isArray(rule.reserve.qualityBonusByFinancedAmount)) {
-        const qb = rule.reserve.qualityBonusByFinancedAmount.find(b => principal >= b.minFinanced && principal <= b.maxFinanced);
-        if (qb) reserve += qb.amount;
-      }
-    }
+  const frontCap = frontCapFactorEff != null ? bb * frontCapFactorEff : Number.POSITIVE_INFINITY;
+  const minPrice = Math.max(cost, 0);
+  const maxPrice = Math.max(minPrice, Math.min(frontCap, minPrice + 100000));
 
-    // Apply back-end cap if present
-    if (backCapEff) {
-      let capAmt = 0;
-      if (backCapEff.type === 'percent_of_bb') capAmt = backCapEff.percent * (bb ?? 0);
-      else capAmt = backCapEff.percent * best.price;
-      reserve = Math.min(reserve, capAmt);
-    }
+  // Check for subvented rate (new vehicles only)
+  // Estimate amount financed for subvented rate check
+  const downPayment = approval.downPayment || 0;
+  const estimatedFinanced = bb - downPayment;
+  const subventedRate = getSubventedRate(
+    approval.bank,
+    approval.program,
+    v.year,
+    v.make,
+    estimatedFinanced,
+    v.model
+  );
+  
+  // Create modified approval with effective APR (subvented or standard)
+  const effectiveApproval = subventedRate !== null 
+    ? { ...approval, apr: subventedRate }
+    : approval;
+  
+  if (subventedRate !== null) {
+    flags.push('subvented_rate');
+  }
+
+  const best = findMaxPriceWithinPayment(
+    minPrice,
+    maxPrice,
+    v,
+    effectiveApproval,
+    trade,
+    approval.paymentMin,
+    paymentMaxEff,
+    termMonthsEff
+  );
 
-    const back = Math.max(0, Math.round(reserve));
-    const totalGross = Math.max(0, Math.round((front + back) * 100) / 100);
+  // Front gross
+  const front = (best.price - cost) - ctx.overAllowance;
 
-    if (!best.fitsRange) {
-      flags.push('payment_out_of_range');
-    }
+  // Compute amount financed (principal) for reserve calculations
+  const principal = computePrincipal(best.price, approval, trade, ctx.province);
 
-    rows.push({
-      vehicleId: v.id,
-      vin: v.vin,
-      title: `${v.year} ${v.make} ${v.model}`,
-      imageUrl: v.imageUrl,
-      salePrice: Math.round(best.price),
-      monthlyPayment: Math.round(best.payment),
-      frontGross: Math.round(front),
-      backGross: Math.round(back),
-      totalGross,
-      term: termMonthsEff,
-      apr: approval.apr,
-      flags,
-    });
-    } catch (e) {
-      // Skip vehicles that cause errors in scoring (e.g., invalid data)
-      console.error(`Error scoring vehicle ${v.id || v.vin}:`, (e as Error).message);
-      continue;
+  // Reserve/bonus computation from rules
+  let reserve = 0;
+  if (rule?.reserve) {
+    if (rule.reserve.percentOfFinanced) {
+      reserve += rule.reserve.percentOfFinanced * principal;
+    }
+    if (ctx.fixedReserve) {
+      const br = findReserveBracketIndex(ctx.fixedReserve, principal);
+      if (br >= 0) reserve += ctx.fixedReserve.amounts[br];
     }
+    if (ctx.qualityBonus) {
+      const qb = findReserveBracketIndex(ctx.qualityBonus, principal);
+      if (qb >= 0) reserve += ctx.qualityBonus.amounts[qb];
+    }
+  }
+
+  // Apply back-end cap if present
+  if (backCapEff) {
+    let capAmt = 0;
+    if (backCapEff.type === 'percent_of_bb') capAmt = backCapEff.percent * (bb ?? 0);
+    else capAmt = backCapEff.percent * best.price;
+    reserve = Math.min(reserve, capAmt);
+  }
+
+  const back = Math.max(0, Math.round(reserve));
+  const totalGross = Math.max(0, Math.round((front + back) * 100) / 100);
+
+  if (!best.fitsRange) {
+    flags.push('payment_out_of_range');
+  }
+
+  return {
+    vehicleId: v.id,
+    vin: v.vin,
+    title: `${v.year} ${v.make} ${v.model}`,
+    imageUrl: v.imageUrl,
+    salePrice: Math.round(best.price),
+    monthlyPayment: Math.round(best.payment),
+    frontGross: Math.round(front),
+    backGross: Math.round(back),
+    totalGross,
+    term: termMonthsEff,
+    apr: approval.apr,
+    flags,
+  };
+}
+
+function scoreVehicleSafe(v: Vehicle, ctx: ScoringContext): ScoredVehicleRow | null {
+  try {
+    return scoreVehicle(v, ctx);
+  } catch (e) {
+    // Skip vehicles that cause errors in scoring (e.g., invalid data)
+    console.error(`Error scoring vehicle ${v.id || v.vin}:`, (e as Error).message);
+    return null;
+  }
+}
+
+export function scoreInventory(
+  inventory: Vehicle[],
+  approval: ApprovalSpec,
+  trade: TradeInfo
+): ScoredVehicleRow[] {
+  const ctx = prepareScoringContext(approval, trade);
+  const rows: ScoredVehicleRow[] = [];
+
+  for (const v of inventory) {
+    const row = scoreVehicleSafe(v, ctx);
+    if (row) rows.push(row);
   }
 
   return rows.sort((a, b) => b.totalGross - a.totalGross);
 }
+
+/**
+ * Batched scenario engine: scores every vehicle against every approval in one pass.
+ * Approval lookups are resolved once up front; yields one result per vehicle, with
+ * rows[i] holding the row for approvals[i] (null when ineligible or unscorable).
+ */
+export function* scoreInventoryScenarios(
+  inventory: Vehicle[],
+  approvals: ApprovalSpec[],
+  trade: TradeInfo
+): Generator<{ vehicle: Vehicle; rows: Array<ScoredVehicleRow | null> }> {
+  const contexts = approvals.map(approval => prepareScoringContext(approval, trade));
+  for (const vehicle of inventory) {
+    yield { vehicle, rows: contexts.map(ctx => scoreVehicleSafe(vehicle, ctx)) };
+  }
+}
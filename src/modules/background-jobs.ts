@@ -4,8 +4,9 @@
  */
 
 import cron from 'node-cron';
+import { CrawlTarget } from './crawl-orchestrator';
 
-export type JobType = 'scrape' | 'score' | 'export' | 'sync' | 'cleanup';
+export type JobType = 'scrape' | 'crawl' | 'market' | 'score' | 'export' | 'sync' | 'cleanup';
 export type JobStatus = 'pending' | 'running' | 'completed' | 'failed';
 
 export interface Job {
@@ -109,6 +110,12 @@ async function processQueue(): Promise<void> {
         case 'scrape':
           job.result = await processScrapeJob(job.data);
           break;
+        case 'crawl':
+          job.result = await processCrawlJob(job.data);
+          break;
+        case 'market':
+          job.result = await processMarketJob(job.data);
+          break;
         case 'score':
           job.result = await processScoreJob(job.data);
           break;
@@ -185,6 +192,47 @@ async function processScrapeJob(data: any): Promise<any> {
   return result;
 }
 
+/**
+ * Process crawl job: many dealership sites at once through the crawl orchestrator
+ */
+async function processCrawlJob(data: any): Promise<any> {
+  const { startCrawl } = await import('./crawl-orchestrator');
+  const targets = data.targets || await dealershipCrawlTargets();
+  const summary = await startCrawl(targets, { concurrency: data.concurrency, perDomain: data.perDomain });
+  return { success: true, ...summary };
+}
+
+/**
+ * Process market job: refresh the stalest competitor searches for the current inventory
+ */
+async function processMarketJob(data: any): Promise<any> {
+  const { marketSnapshots } = await import('./market-snapshots');
+  const { inventoryStore } = await import('./inventory-store');
+  const summary = await marketSnapshots.refresh(data.vehicles || inventoryStore.toArray(), { maxQueries: data.maxQueries });
+  return { success: true, ...summary };
+}
+
+/**
+ * Used and new inventory pages of every active dealership
+ */
+async function dealershipCrawlTargets(): Promise<CrawlTarget[]> {
+  const { listActiveDealerships } = await import('./multi-tenant');
+  const dealerships = await listActiveDealerships();
+  const targets: CrawlTarget[] = [];
+  for (const d of dealerships) {
+    if (!d.website_url) continue;
+    for (const [kind, inventoryPath] of [['used', d.used_inventory_path], ['new', d.new_inventory_path]]) {
+      if (!inventoryPath) continue;
+      try {
+        targets.push({ id: `${d.id}:${kind}`, url: new URL(inventoryPath, d.website_url).href });
+      } catch (_e) {
+        console.warn(`[JOB] Skipping invalid ${kind} inventory URL for dealership ${d.id}`);
+      }
+    }
+  }
+  return targets;
+}
+
 /**
  * Process score job
  */
@@ -298,9 +346,14 @@ export function clearCompletedJobs(): number {
  */
 export function scheduleAutoScrape(cronExpression: string = '0 */6 * * *'): void {
   // Run every 6 hours by default
-  cron.schedule(cronExpression, () => {
+  cron.schedule(cronExpression, async () => {
     console.log('[CRON] Running scheduled scrape job');
-    addJob('scrape', { url: 'http://localhost:10000/api/scrape/devon?limit=50' });
+    const targets = await dealershipCrawlTargets();
+    if (targets.length > 0) {
+      addJob('crawl', { targets });
+    } else {
+      addJob('scrape', { url: 'http://localhost:10000/api/scrape/devon?limit=50' });
+    }
   });
   
   console.log(`[CRON] Auto-scrape scheduled: ${cronExpression}`);
@@ -319,12 +372,38 @@ export function scheduleCacheCleanup(cronExpression: string = '0 0 * * *'): void
   console.log(`[CRON] Cache cleanup scheduled: ${cronExpression}`);
 }
 
+/**
+ * Schedule market snapshot refresh (each run only re-fetches searches older than a day)
+ */
+export function scheduleMarketRefresh(cronExpression: string = '30 */2 * * *'): void {
+  cron.schedule(cronExpression, () => {
+    console.log('[CRON] Running scheduled market snapshot refresh');
+    addJob('market', {}, 1);
+  });
+  
+  console.log(`[CRON] Market refresh scheduled: ${cronExpression}`);
+}
+
+/**
+ * Pick up a crawl that was cut short by a restart
+ */
+export function resumeInterruptedCrawl(): void {
+  import('./crawl-orchestrator')
+    .then(({ resumeCrawl }) => resumeCrawl())
+    .then(summary => {
+      if (summary) console.log(`[CRON] Resumed crawl ${summary.runId} finished`);
+    })
+    .catch(error => console.error('[CRON] Failed to resume crawl:', error));
+}
+
 /**
  * Initialize scheduled jobs
  */
 export function initializeScheduledJobs(): void {
   scheduleAutoScrape('0 */6 * * *'); // Every 6 hours
   scheduleCacheCleanup('0 0 * * *'); // Daily at midnight
+  scheduleMarketRefresh('30 */2 * * *'); // Every 2 hours, stalest searches first
+  resumeInterruptedCrawl();
   
   console.log('[CRON] All scheduled jobs initialized');
 }
@@ -0,0 +1,331 @@
+/**
+ * BROWSER POOL
+ * Warm headless Chromium instances shared by every scraper. Pages are leased from the pool,
+ * resource-blocked and recycled; browsers are rotated after a page budget or a failed health check.
+ */
+
+import { Browser, Page, HTTPRequest } from 'puppeteer';
+import logger from '../utils/logger';
+
+export interface PageLeaseOptions {
+  userAgent?: string;
+  headers?: Record<string, string>;
+  blockResources?: string[];   // resource types to abort; [] loads everything
+  viewport?: { width: number; height: number; deviceScaleFactor?: number };
+}
+
+export interface FetchPageOptions extends PageLeaseOptions {
+  waitUntil?: 'load' | 'domcontentloaded' | 'networkidle0' | 'networkidle2';
+  timeout?: number;
+  waitForSelector?: string;
+  settleMs?: number;           // extra pause after navigation
+}
+
+export interface PageLease {
+  page: Page;
+  release: (broken?: boolean) => Promise<void>;
+}
+
+export interface BrowserPoolStats {
+  browsers: number;
+  activePages: number;
+  idlePages: number;
+  queued: number;
+  launched: number;
+  rotated: number;
+  pagesServed: number;
+}
+
+interface PooledBrowser {
+  id: number;
+  browser: Browser;
+  activePages: number;
+  pagesServed: number;
+  idle: Page[];
+  retiring: boolean;
+  lastUsed: number;
+}
+
+const POOL_SIZE = Math.max(1, parseInt(process.env.BROWSER_POOL_SIZE || '2', 10) || 2);
+const PAGES_PER_BROWSER = Math.max(1, parseInt(process.env.BROWSER_PAGES_PER_BROWSER || '4', 10) || 4);
+const MAX_PAGES_BEFORE_ROTATION = Math.max(1, parseInt(process.env.BROWSER_MAX_PAGES || '100', 10) || 100);
+const HEALTH_CHECK_INTERVAL_MS = 60 * 1000;
+const HEALTH_CHECK_TIMEOUT_MS = 5000;
+const IDLE_CLOSE_MS = 5 * 60 * 1000;
+
+const DEFAULT_USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/121.0 Safari/537.36';
+const DEFAULT_BLOCKED_RESOURCES = ['image', 'stylesheet', 'font', 'media'];
+const LAUNCH_ARGS = [
+  '--no-sandbox',
+  '--disable-setuid-sandbox',
+  '--disable-dev-shm-usage',
+  '--disable-blink-features=AutomationControlled',
+  '--disable-gpu',
+];
+
+const browsers: PooledBrowser[] = [];
+const launches: Set<Promise<PooledBrowser>> = new Set();
+const blockedByPage: WeakMap<Page, Set<string>> = new WeakMap();
+const stats = { launched: 0, rotated: 0, pagesServed: 0 };
+let nextBrowserId = 1;
+let healthTimer: NodeJS.Timeout | null = null;
+let launcher: (() => Promise<Browser>) | null = null;
+
+// Page slots across the pool; a released slot is handed straight to the next waiter
+let activeSlots = 0;
+const slotWaiters: Array<() => void> = [];
+
+function acquireSlot(): Promise<void> {
+  if (activeSlots < POOL_SIZE * PAGES_PER_BROWSER) {
+    activeSlots++;
+    return Promise.resolve();
+  }
+  return new Promise<void>(resolve => slotWaiters.push(resolve));
+}
+
+function releaseSlot(): void {
+  const next = slotWaiters.shift();
+  if (next) next();
+  else activeSlots--;
+}
+
+async function defaultLaunch(): Promise<Browser> {
+  const mod: any = await import('puppeteer');
+  const puppeteer = mod.default || mod;
+  return puppeteer.launch({
+    headless: process.env.BROWSER_HEADLESS !== 'false',
+    args: LAUNCH_ARGS,
+  });
+}
+
+/**
+ * Replace how browsers are launched (e.g. a stub in tests); null restores puppeteer
+ */
+export function setBrowserLauncher(launch: (() => Promise<Browser>) | null): void {
+  launcher = launch;
+}
+
+// Launch a browser with one page already reserved for the lease that asked for it
+function launchBrowser(): Promise<PooledBrowser> {
+  const launch = (async () => {
+    const browser = await (launcher || defaultLaunch)();
+    const entry: PooledBrowser = {
+      id: nextBrowserId++,
+      browser,
+      activePages: 1,
+      pagesServed: 0,
+      idle: [],
+      retiring: false,
+      lastUsed: Date.now(),
+    };
+    browser.on('disconnected', () => {
+      const idx = browsers.indexOf(entry);
+      if (idx >= 0) browsers.splice(idx, 1);
+      logger.warn(`[BrowserPool] Browser ${entry.id} disconnected`);
+    });
+    browsers.push(entry);
+    stats.launched++;
+    startHealthChecks();
+    logger.info(`[BrowserPool] Launched browser ${entry.id} (${browsers.length}/${POOL_SIZE})`);
+    return entry;
+  })();
+  launches.add(launch);
+  launch.then(() => launches.delete(launch), () => launches.delete(launch));
+  return launch;
+}
+
+function reservePage(entry: PooledBrowser): PooledBrowser {
+  entry.activePages++;
+  return entry;
+}
+
+/**
+ * Least-loaded healthy browser with a free page, launching up to POOL_SIZE browsers as needed.
+ * The page is reserved before returning, so waiters woken together cannot overfill one browser.
+ */
+async function pickBrowser(): Promise<PooledBrowser> {
+  for (;;) {
+    const live = browsers.filter(b => !b.retiring && b.browser.isConnected());
+    const open = live.filter(b => b.activePages < PAGES_PER_BROWSER);
+    const warmIdle = open.find(b => b.activePages === 0);
+    if (warmIdle) return reservePage(warmIdle);
+    if (live.length + launches.size < POOL_SIZE) return launchBrowser();
+    if (open.length > 0) return reservePage(open.reduce((a, b) => (b.activePages < a.activePages ? b : a)));
+    if (launches.size === 0) return launchBrowser();
+    await Promise.race(Array.from(launches)).catch(() => undefined);
+  }
+}
+
+async function newPooledPage(entry: PooledBrowser): Promise<Page> {
+  const page = await entry.browser.newPage();
+  await page.setRequestInterception(true);
+  page.on('request', (req: HTTPRequest) => {
+    const blocked = blockedByPage.get(page);
+    if (blocked && blocked.has(req.resourceType())) req.abort().catch(() => undefined);
+    else req.continue().catch(() => undefined);
+  });
+  await page.evaluateOnNewDocument(() => {
+    Object.defineProperty(navigator, 'webdriver', { get: () => undefined });
+    Object.defineProperty(navigator, 'plugins', { get: () => [1, 2, 3, 4, 5] });
+    Object.defineProperty(navigator, 'languages', { get: () => ['en-CA', 'en-US', 'en'] });
+  });
+  return page;
+}
+
+async function closeQuietly(target: { close: () => Promise<void> }): Promise<void> {
+  try {
+    await target.close();
+  } catch (_e) {
+    // already gone
+  }
+}
+
+async function retireBrowser(entry: PooledBrowser, reason: string): Promise<void> {
+  if (!entry.retiring) {
+    entry.retiring = true;
+    stats.rotated++;
+    logger.info(`[BrowserPool] Retiring browser ${entry.id}: ${reason}`);
+  }
+  if (entry.activePages > 0) return; // closed when its last page is released
+  const idx = browsers.indexOf(entry);
+  if (idx >= 0) browsers.splice(idx, 1);
+  entry.idle = [];
+  await closeQuietly(entry.browser);
+}
+
+// Take a slot, pick a browser and prepare a page (fresh or recycled) for this lease
+async function leasePage(options: PageLeaseOptions): Promise<{ entry: PooledBrowser; page: Page }> {
+  await acquireSlot();
+  try {
+    const entry = await pickBrowser();
+    entry.pagesServed++;
+    entry.lastUsed = Date.now();
+    stats.pagesServed++;
+    try {
+      const page = entry.idle.pop() || await newPooledPage(entry);
+      blockedByPage.set(page, new Set(options.blockResources ?? DEFAULT_BLOCKED_RESOURCES));
+      await page.setUserAgent(options.userAgent || DEFAULT_USER_AGENT);
+      await page.setExtraHTTPHeaders({ 'Accept-Language': 'en-CA,en-US;q=0.9,en;q=0.8', ...options.headers });
+      if (options.viewport) await page.setViewport(options.viewport);
+      return { entry, page };
+    } catch (error) {
+      entry.activePages--;
+      retireBrowser(entry, 'page setup failed').catch(() => undefined);
+      throw error;
+    }
+  } catch (error) {
+    releaseSlot();
+    throw error;
+  }
+}
+
+/**
+ * Lease a configured page. Always call release(); pass true if the page misbehaved so it is
+ * discarded instead of recycled.
+ */
+export async function acquirePage(options: PageLeaseOptions = {}): Promise<PageLease> {
+  const { entry, page } = await leasePage(options);
+
+  let released = false;
+  const release = async (broken: boolean = false): Promise<void> => {
+    if (released) return;
+    released = true;
+    try {
+      const recycle = !broken && !entry.retiring && entry.browser.isConnected() && !page.isClosed();
+      if (recycle) {
+        try {
+          await page.goto('about:blank', { timeout: 5000 });
+          entry.idle.push(page);
+        } catch (_e) {
+          await closeQuietly(page);
+        }
+      } else {
+        await closeQuietly(page);
+      }
+    } finally {
+      entry.activePages--;
+      entry.lastUsed = Date.now();
+      if (entry.pagesServed >= MAX_PAGES_BEFORE_ROTATION || entry.retiring) {
+        retireBrowser(entry, `served ${entry.pagesServed} pages`).catch(() => undefined);
+      }
+      releaseSlot();
+    }
+  };
+  return { page, release };
+}
+
+/**
+ * Run fn with a leased page; the page goes back to the pool afterwards (discarded if fn throws)
+ */
+export async function withPage<T>(fn: (page: Page) => Promise<T>, options: PageLeaseOptions = {}): Promise<T> {
+  const lease = await acquirePage(options);
+  let broken = false;
+  try {
+    return await fn(lease.page);
+  } catch (error) {
+    broken = true;
+    throw error;
+  } finally {
+    await lease.release(broken);
+  }
+}
+
+/**
+ * Navigate a pooled page to url and return the rendered HTML
+ */
+export async function fetchPageHtml(url: string, options: FetchPageOptions = {}): Promise<string> {
+  return withPage(async page => {
+    await page.goto(url, { waitUntil: options.waitUntil || 'domcontentloaded', timeout: options.timeout || 30000 });
+    if (options.waitForSelector) await page.waitForSelector(options.waitForSelector, { timeout: 30000 });
+    if (options.settleMs) await new Promise(resolve => setTimeout(resolve, options.settleMs));
+    return page.content();
+  }, options);
+}
+
+// Periodically probe idle browsers and close ones that are unresponsive or unused for a while
+function startHealthChecks(): void {
+  if (healthTimer) return;
+  healthTimer = setInterval(() => {
+    const now = Date.now();
+    for (const entry of browsers.slice()) {
+      if (entry.retiring || entry.activePages > 0) continue;
+      if (now - entry.lastUsed > IDLE_CLOSE_MS) {
+        retireBrowser(entry, 'idle').catch(() => undefined);
+        continue;
+      }
+      const probe = entry.browser.version();
+      const timeout = new Promise<never>((_, reject) =>
+        setTimeout(() => reject(new Error('health check timed out')), HEALTH_CHECK_TIMEOUT_MS).unref()
+      );
+      Promise.race([probe, timeout]).catch(error => {
+        retireBrowser(entry, `health check failed (${(error as Error).message})`).catch(() => undefined);
+      });
+    }
+    if (browsers.length === 0 && healthTimer) {
+      clearInterval(healthTimer);
+      healthTimer = null;
+    }
+  }, HEALTH_CHECK_INTERVAL_MS);
+  healthTimer.unref();
+}
+
+export function getBrowserPoolStats(): BrowserPoolStats {
+  return {
+    browsers: browsers.length,
+    activePages: browsers.reduce((sum, b) => sum + b.activePages, 0),
+    idlePages: browsers.reduce((sum, b) => sum + b.idle.length, 0),
+    queued: slotWaiters.length,
+    ...stats,
+  };
+}
+
+/**
+ * Close every browser (e.g. on shutdown); leased pages fail and later leases relaunch
+ */
+export async function closeBrowserPool(): Promise<void> {
+  const all = browsers.splice(0, browsers.length);
+  await Promise.all(all.map(entry => {
+    entry.retiring = true;
+    return closeQuietly(entry.browser);
+  }));
+}
@@ -0,0 +1,118 @@
+/**
+ * CONDITIONAL FETCH
+ * Per-URL validators (ETag, Last-Modified, body hash) plus the vehicles extracted last time,
+ * so an unchanged listing page is answered from what was already parsed
+ */
+
+import { AxiosInstance } from 'axios';
+import crypto from 'crypto';
+import { Vehicle } from '../types/types';
+import { TieredCache, TieredCacheStats } from './tiered-cache';
+import { httpClient } from './http-client';
+
+export interface ConditionalFetchOptions {
+  headers?: Record<string, string>;
+  timeout?: number;
+  client?: AxiosInstance;
+  key?: string;           // cache key when the same URL is parsed more than one way (default: url)
+}
+
+export type ConditionalPage =
+  | { unchanged: true; vehicles: Vehicle[] }
+  | { unchanged: false; html: string; remember: (vehicles: Vehicle[]) => void };
+
+export interface ConditionalFetchStats {
+  notModified: number;    // 304 from the server
+  sameBody: number;       // 200, but the body hash matched
+  changed: number;
+  validators: TieredCacheStats;
+  vehicles: TieredCacheStats;
+}
+
+interface PageValidators {
+  etag?: string;
+  lastModified?: string;
+  hash: string;
+}
+
+// Vehicles tagged with the body hash they were parsed from
+interface PageVehicles {
+  hash: string;
+  vehicles: Vehicle[];
+}
+
+// Validators and vehicles are stored apart so revalidating an unchanged page never rewrites
+// its vehicles; the vehicles change only when remember() is called
+const pageValidators = new TieredCache<PageValidators>({
+  name: 'page-validators',
+  ttlMs: 7 * 24 * 60 * 60 * 1000,
+  maxEntries: 2000,
+});
+const pageVehicles = new TieredCache<PageVehicles>({
+  name: 'page-vehicles',
+  ttlMs: 7 * 24 * 60 * 60 * 1000,
+  maxEntries: 2000,
+});
+const counters = { notModified: 0, sameBody: 0, changed: 0 };
+
+function headerValue(value: unknown): string | undefined {
+  if (Array.isArray(value)) return value[0] ? String(value[0]) : undefined;
+  return value ? String(value) : undefined;
+}
+
+/**
+ * GET url, revalidating against the last response. An unchanged page (304, or the same body)
+ * returns the vehicles stored for it; otherwise the caller parses html and passes the result to
+ * remember() so the next fetch can skip it. Throws like axios on network/HTTP errors.
+ */
+export async function fetchConditional(url: string, options: ConditionalFetchOptions = {}): Promise<ConditionalPage> {
+  const key = options.key || url;
+  const validators = pageValidators.get(key);
+  const stored = validators && pageVehicles.get(key);
+  // Only revalidate when the stored vehicles were parsed from the body the validators describe
+  const previous = validators && stored && stored.hash === validators.hash ? { ...validators, vehicles: stored.vehicles } : undefined;
+
+  const headers: Record<string, string> = { ...options.headers };
+  if (previous?.etag) headers['If-None-Match'] = previous.etag;
+  if (previous?.lastModified) headers['If-Modified-Since'] = previous.lastModified;
+
+  const response = await (options.client || httpClient).get(url, {
+    headers,
+    timeout: options.timeout,
+    responseType: 'text',
+    validateStatus: status => (status >= 200 && status < 300) || (status === 304 && !!previous),
+  });
+
+  if (response.status === 304 && previous) {
+    counters.notModified++;
+    return { unchanged: true, vehicles: previous.vehicles.map(v => ({ ...v })) };
+  }
+
+  const html = String(response.data);
+  const hash = crypto.createHash('sha1').update(html).digest('hex');
+  const etag = headerValue(response.headers['etag']);
+  const lastModified = headerValue(response.headers['last-modified']);
+
+  if (previous && previous.hash === hash) {
+    counters.sameBody++;
+    if (etag !== previous.etag || lastModified !== previous.lastModified) {
+      pageValidators.set(key, { etag, lastModified, hash });
+    }
+    return { unchanged: true, vehicles: previous.vehicles.map(v => ({ ...v })) };
+  }
+
+  counters.changed++;
+  return {
+    unchanged: false,
+    html,
+    // Copies, so callers can normalize their vehicles without touching the stored ones
+    remember: vehicles => {
+      pageVehicles.set(key, { hash, vehicles: vehicles.map(v => ({ ...v })) });
+      pageValidators.set(key, { etag, lastModified, hash });
+    },
+  };
+}
+
+export function getConditionalFetchStats(): ConditionalFetchStats {
+  return { ...counters, validators: pageValidators.stats(), vehicles: pageVehicles.stats() };
+}
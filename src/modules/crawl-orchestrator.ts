@@ -0,0 +1,319 @@
+/**
+ * CRAWL ORCHESTRATOR
+ * Crawls many dealership sites at once under a global worker budget and per-domain caps,
+ * stalest inventory first, checkpointing to disk so an interrupted run resumes where it stopped
+ */
+
+import fs from 'fs';
+import path from 'path';
+import { Vehicle } from '../types/types';
+import { ProgressTracker, normalizeStockNumber } from './scraper-utils';
+import { CACHE_DIR } from './tiered-cache';
+
+export interface CrawlTarget {
+  id: string;           // dealership id (or any stable key)
+  url: string;          // inventory listing URL
+  priority?: number;    // higher runs first; ties go to the site crawled longest ago
+  maxPages?: number;
+}
+
+export type CrawlSiteStatus = 'pending' | 'running' | 'done' | 'failed';
+
+export interface CrawlSiteState {
+  target: CrawlTarget;
+  status: CrawlSiteStatus;
+  attempts: number;
+  vehicles?: number;
+  error?: string;
+  startedAt?: number;
+  finishedAt?: number;
+}
+
+/** Crawl one site; call onPage once per listing page fetched */
+export type SiteCrawler = (target: CrawlTarget, onPage: () => void) => Promise<Vehicle[]>;
+
+export interface CrawlOptions {
+  concurrency?: number;     // sites crawled at once across all domains
+  perDomain?: number;       // sites crawled at once per host
+  maxAttempts?: number;
+  checkpointFile?: string;
+  crawler?: SiteCrawler;
+}
+
+export interface CrawlSummary {
+  runId: string;
+  done: number;
+  failed: number;
+  vehicles: number;
+}
+
+export interface CrawlProgress {
+  runId: string | null;
+  running: boolean;
+  sites: { progress: number; current: number; total: number };
+  perSite: Array<{
+    id: string;
+    url: string;
+    status: CrawlSiteStatus;
+    attempts: number;
+    vehicles?: number;
+    error?: string;
+    pages: { progress: number; current: number; total: number };
+  }>;
+}
+
+interface Checkpoint {
+  runId: string | null;
+  sites: CrawlSiteState[];
+  lastCrawled: Record<string, number>;   // url → finishedAt of the last successful crawl
+}
+
+interface CrawlRun {
+  id: string;
+  sites: CrawlSiteState[];
+  pages: Map<string, ProgressTracker>;
+  overall: ProgressTracker;
+  options: Required<CrawlOptions>;
+}
+
+const DEFAULT_CONCURRENCY = Math.max(1, parseInt(process.env.CRAWL_CONCURRENCY || '4', 10) || 4);
+const DEFAULT_PER_DOMAIN = Math.max(1, parseInt(process.env.CRAWL_PER_DOMAIN || '1', 10) || 1);
+const DEFAULT_CHECKPOINT_FILE = process.env.CRAWL_CHECKPOINT_FILE
+  || path.join(CACHE_DIR, 'crawl-checkpoint.json');
+const DEFAULT_MAX_PAGES = 10;
+
+let current: CrawlRun | null = null;
+let currentPromise: Promise<CrawlSummary> | null = null;
+let lastCrawled: Record<string, number> = {};
+
+function domainOf(url: string): string {
+  try {
+    return new URL(url).host.toLowerCase();
+  } catch (_e) {
+    return url;
+  }
+}
+
+function readCheckpoint(file: string): Checkpoint | null {
+  try {
+    return JSON.parse(fs.readFileSync(file, 'utf8')) as Checkpoint;
+  } catch (error) {
+    if ((error as NodeJS.ErrnoException).code !== 'ENOENT') {
+      console.error(`[CRAWL] Ignoring unreadable checkpoint ${file}:`, error);
+    }
+    return null;
+  }
+}
+
+// Written to a temp file and renamed so a crash never leaves a torn checkpoint
+function writeCheckpoint(file: string, checkpoint: Checkpoint): void {
+  try {
+    fs.mkdirSync(path.dirname(file), { recursive: true });
+    const tmp = `${file}.${process.pid}.tmp`;
+    fs.writeFileSync(tmp, JSON.stringify(checkpoint), 'utf8');
+    fs.renameSync(tmp, file);
+  } catch (error) {
+    console.error(`[CRAWL] Failed to write checkpoint ${file}:`, error);
+  }
+}
+
+/**
+ * Scrape one dealership with the production scraper and refresh the scraper cache
+ */
+export async function scrapeSite(target: CrawlTarget, onPage: () => void): Promise<Vehicle[]> {
+  const { ProductionDealershipScraper } = await import('./production-scraper');
+  const { setCachedVehicles } = await import('./scraper-cache');
+  const scraper = new ProductionDealershipScraper({
+    baseUrl: target.url,
+    maxPages: target.maxPages || DEFAULT_MAX_PAGES,
+    minScore: 50,
+    headless: true,
+    onPage,
+  });
+  const vehicles = await scraper.scrapeInventory();
+  vehicles.forEach(v => {
+    if (v.id) v.id = normalizeStockNumber(v.id);
+  });
+  if (vehicles.length > 0) await setCachedVehicles(target.url, vehicles);
+  return vehicles;
+}
+
+/**
+ * Next pending site whose domain is under its cap: highest priority, then longest since last crawl
+ */
+function pickNext(sites: CrawlSiteState[], domainActive: Map<string, number>, perDomain: number): CrawlSiteState | null {
+  let best: CrawlSiteState | null = null;
+  for (const site of sites) {
+    if (site.status !== 'pending') continue;
+    if ((domainActive.get(domainOf(site.target.url)) || 0) >= perDomain) continue;
+    if (!best) {
+      best = site;
+      continue;
+    }
+    const byPriority = (site.target.priority || 0) - (best.target.priority || 0);
+    const byStaleness = (lastCrawled[best.target.url] || 0) - (lastCrawled[site.target.url] || 0);
+    if (byPriority > 0 || (byPriority === 0 && byStaleness > 0)) best = site;
+  }
+  return best;
+}
+
+function execute(run: CrawlRun): Promise<CrawlSummary> {
+  const { concurrency, perDomain, maxAttempts, checkpointFile, crawler } = run.options;
+  const domainActive: Map<string, number> = new Map();
+  let active = 0;
+
+  const checkpoint = () => writeCheckpoint(checkpointFile, { runId: run.id, sites: run.sites, lastCrawled });
+
+  return new Promise<CrawlSummary>(resolve => {
+    const pump = () => {
+      while (active < concurrency) {
+        const site = pickNext(run.sites, domainActive, perDomain);
+        if (!site) break;
+        launch(site);
+      }
+      if (active === 0) {
+        const summary: CrawlSummary = { runId: run.id, done: 0, failed: 0, vehicles: 0 };
+        for (const site of run.sites) {
+          if (site.status === 'done') summary.done++;
+          if (site.status === 'failed') summary.failed++;
+          summary.vehicles += site.vehicles || 0;
+        }
+        writeCheckpoint(checkpointFile, { runId: null, sites: [], lastCrawled });
+        console.log(`[CRAWL] Run ${run.id} finished: ${summary.done} done, ${summary.failed} failed, ${summary.vehicles} vehicles`);
+        resolve(summary);
+      }
+    };
+
+    const launch = (site: CrawlSiteState) => {
+      const domain = domainOf(site.target.url);
+      const pages = new ProgressTracker(site.target.maxPages || DEFAULT_MAX_PAGES);  // fresh per attempt
+      run.pages.set(site.target.id, pages);
+      site.status = 'running';
+      site.attempts++;
+      site.startedAt = Date.now();
+      active++;
+      domainActive.set(domain, (domainActive.get(domain) || 0) + 1);
+      checkpoint();
+      console.log(`[CRAWL] Starting ${site.target.id} (${site.target.url}), attempt ${site.attempts}`);
+
+      crawler(site.target, () => pages.increment())
+        .then(vehicles => {
+          site.status = 'done';
+          site.vehicles = vehicles.length;
+          site.error = undefined;
+          site.finishedAt = Date.now();
+          lastCrawled[site.target.url] = site.finishedAt;
+          run.overall.increment();
+        })
+        .catch(error => {
+          site.error = (error as Error).message;
+          if (site.attempts < maxAttempts) {
+            site.status = 'pending';
+            console.warn(`[CRAWL] ${site.target.id} failed (${site.error}), will retry`);
+          } else {
+            site.status = 'failed';
+            site.finishedAt = Date.now();
+            run.overall.increment();
+            console.error(`[CRAWL] ${site.target.id} failed after ${site.attempts} attempts: ${site.error}`);
+          }
+        })
+        .finally(() => {
+          active--;
+          domainActive.set(domain, (domainActive.get(domain) || 1) - 1);
+          checkpoint();
+          pump();
+        });
+    };
+
+    pump();
+  });
+}
+
+function beginRun(id: string, sites: CrawlSiteState[], options: CrawlOptions): Promise<CrawlSummary> {
+  const resolved: Required<CrawlOptions> = {
+    concurrency: Math.max(1, options.concurrency || DEFAULT_CONCURRENCY),
+    perDomain: Math.max(1, options.perDomain || DEFAULT_PER_DOMAIN),
+    maxAttempts: Math.max(1, options.maxAttempts || 2),
+    checkpointFile: options.checkpointFile || DEFAULT_CHECKPOINT_FILE,
+    crawler: options.crawler || scrapeSite,
+  };
+  const finished = sites.filter(s => s.status === 'done' || s.status === 'failed').length;
+  const overall = new ProgressTracker(sites.length, (progress, done, total) =>
+    console.log(`[CRAWL] ${done}/${total} sites (${progress}%)`)
+  );
+  for (let i = 0; i < finished; i++) overall.increment();
+
+  const pages: Map<string, ProgressTracker> = new Map();
+  for (const site of sites) pages.set(site.target.id, new ProgressTracker(site.target.maxPages || DEFAULT_MAX_PAGES));
+
+  const run: CrawlRun = { id, sites, pages, overall, options: resolved };
+  const promise = execute(run).finally(() => {
+    if (current === run) {
+      current = null;
+      currentPromise = null;
+    }
+  });
+  current = run;
+  currentPromise = promise;
+  return promise;
+}
+
+/**
+ * Crawl every target (duplicate ids are crawled once). If a run is already in progress the new
+ * one starts after it finishes.
+ */
+export async function startCrawl(targets: CrawlTarget[], options: CrawlOptions = {}): Promise<CrawlSummary> {
+  while (currentPromise) await currentPromise.catch(() => undefined);
+
+  const checkpointFile = options.checkpointFile || DEFAULT_CHECKPOINT_FILE;
+  lastCrawled = readCheckpoint(checkpointFile)?.lastCrawled || lastCrawled;
+
+  const seen = new Set<string>();
+  const sites: CrawlSiteState[] = [];
+  for (const target of targets) {
+    if (!target.url || seen.has(target.id)) continue;
+    seen.add(target.id);
+    sites.push({ target, status: 'pending', attempts: 0 });
+  }
+  const id = `CRAWL-${Date.now()}-${Math.random().toString(36).substr(2, 6)}`;
+  if (sites.length === 0) return { runId: id, done: 0, failed: 0, vehicles: 0 };
+  console.log(`[CRAWL] Run ${id}: ${sites.length} sites`);
+  return beginRun(id, sites, options);
+}
+
+/**
+ * Continue the run recorded in the checkpoint, if it did not finish (sites that were mid-crawl
+ * start over). Returns null when there is nothing to resume.
+ */
+export function resumeCrawl(options: CrawlOptions = {}): Promise<CrawlSummary> | null {
+  if (current) return null;
+  const checkpoint = readCheckpoint(options.checkpointFile || DEFAULT_CHECKPOINT_FILE);
+  if (!checkpoint) return null;
+  lastCrawled = checkpoint.lastCrawled || {};
+  if (!checkpoint.runId || !checkpoint.sites.some(s => s.status === 'pending' || s.status === 'running')) return null;
+
+  const sites = checkpoint.sites.map(site => (site.status === 'running' ? { ...site, status: 'pending' as CrawlSiteStatus } : site));
+  console.log(`[CRAWL] Resuming run ${checkpoint.runId} (${sites.filter(s => s.status === 'pending').length} sites left)`);
+  return beginRun(checkpoint.runId, sites, options);
+}
+
+export function getCrawlProgress(): CrawlProgress {
+  if (!current) {
+    return { runId: null, running: false, sites: { progress: 100, current: 0, total: 0 }, perSite: [] };
+  }
+  const run = current;
+  return {
+    runId: run.id,
+    running: true,
+    sites: run.overall.getProgress(),
+    perSite: run.sites.map(site => ({
+      id: site.target.id,
+      url: site.target.url,
+      status: site.status,
+      attempts: site.attempts,
+      vehicles: site.vehicles,
+      error: site.error,
+      pages: run.pages.get(site.target.id)!.getProgress(),
+    })),
+  };
+}
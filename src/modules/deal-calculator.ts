@@ -1,4 +1,4 @@
-import { getPaymentSummary } from './payment-calculator';
+import { getPaymentSummary, getAnnuityFactor } from './payment-calculator';
 import { findRule } from './rules-library';
 import { ApprovalSpec, TradeInfo, Vehicle } from '../types/types';
 
@@ -221,3 +221,86 @@ export function optimizeDeal(
 
   return null;
 }
+
+export interface SensitivityGrid {
+  terms: number[];
+  rates: number[];
+  downPayments: number[];
+}
+
+/**
+ * Payment, amount financed and gross over terms × rates × down payments.
+ * Flat arrays indexed [(termIndex * rates.length + rateIndex) * downPayments.length + downIndex];
+ * cells outside the payment calculator's valid range are null.
+ */
+export interface SensitivityMatrix extends SensitivityGrid {
+  shape: [number, number, number];
+  payment: (number | null)[];
+  principal: number[];
+  gross: number[];
+}
+
+const MAX_SWEEP_CELLS = 5000;
+
+/**
+ * Evaluate calculateDeal over a full term/rate/down grid in one pass.
+ * Amount financed depends only on the down payment and each (rate, term) annuity factor is
+ * cached, so each cell is a multiply and a round; payments match calculateDeal's.
+ */
+export function calculateSensitivitySweep(
+  vehicle: Vehicle,
+  customer: CustomerProfile,
+  grid: SensitivityGrid
+): SensitivityMatrix {
+  const { terms, rates, downPayments } = grid;
+  const cells = terms.length * rates.length * downPayments.length;
+  if (cells === 0) {
+    throw new Error('Sweep grid needs at least one term, rate and down payment');
+  }
+  if (cells > MAX_SWEEP_CELLS) {
+    throw new Error(`Sweep grid too large: ${cells} cells (max ${MAX_SWEEP_CELLS})`);
+  }
+
+  const vehiclePrice = vehicle.suggestedPrice || 0;
+  const tradeAllowance = customer.tradeAllowance || 0;
+  const tradeEquity = tradeAllowance - (customer.tradeLien || 0);
+  const fees = 495;
+  const taxes = vehiclePrice * 0.05;
+
+  // Same front gross as calculateDeal; it does not depend on the grid
+  const cost = vehicle.yourCost || vehiclePrice * 0.85;
+  const frontGross = vehiclePrice - cost + (tradeAllowance > 0 ? Math.max(0, tradeAllowance - (vehicle.blackBookValue || tradeAllowance * 0.9)) : 0);
+
+  const financedByDown = downPayments.map(down =>
+    Math.max(0, vehiclePrice - (down || 0) - tradeEquity + fees + taxes)
+  );
+
+  const payment = new Array<number | null>(cells);
+  const principal = new Array<number>(cells);
+  const gross = new Array<number>(cells);
+
+  let i = 0;
+  for (const term of terms) {
+    const termValid = Number.isInteger(term) && term >= 24 && term <= 84;
+    for (const apr of rates) {
+      const valid = termValid && apr >= 5 && apr <= 35;
+      const factor = valid ? getAnnuityFactor(apr, term) : 0;
+      for (let d = 0; d < financedByDown.length; d++, i++) {
+        const amountFinanced = financedByDown[d];
+        payment[i] = valid && amountFinanced > 0 ? Math.round((amountFinanced * factor) / 5) * 5 : null;
+        principal[i] = amountFinanced;
+        gross[i] = frontGross + amountFinanced * (apr * 0.01) * 0.02;
+      }
+    }
+  }
+
+  return {
+    terms,
+    rates,
+    downPayments,
+    shape: [terms.length, rates.length, downPayments.length],
+    payment,
+    principal,
+    gross,
+  };
+}
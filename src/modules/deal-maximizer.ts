@@ -1,24 +1,52 @@
 /**
  * MODULE 6: DEAL MAXIMIZER ALGORITHM (CORE ENGINE)
  * Scans inventory, applies filters, calculates compliance, ranks by gross profit
+ *
+ * Two phases: each vehicle's best compliant bundle is found numerically (payment, gross,
+ * DSR/LTV pass) into a bounded top-10 list, then full Deal objects are built for the winners only.
  */
 
-import { Deal, Vehicle, FindDealsRequest, LenderType, ProductBundle } from '../types/types';
-import { calculateMonthlyPayment } from './payment-calculator';
+import { Deal, Vehicle, FindDealsRequest, LenderProgram, ProductBundle } from '../types/types';
+import { calculatePaymentAmount, getAnnuityFactor } from './payment-calculator';
 import { calculateTradeInEquity } from './trade-in-equity';
 import { validateCompliance } from './compliance-validator';
-import { recommendBundles, validateProductFit } from './aftermarket-products';
-import { getLenderProgram, getBaseReserve } from './lender-programs';
+import { recommendBundles, validateProductFit, rankBundlesByContribution, selectBestBundle } from './aftermarket-products';
+import { getLenderProgram, getBaseReserve, getEffectiveLTV } from './lender-programs';
+
+const TOP_DEALS = 10;
+// Keeps the LTV finance ceiling from pruning a bundle that the exact ratio check would pass
+const LTV_BOUND_SLACK = 0.01;
 
 function generateDealId(): string {
   return `DEAL-${Date.now()}-${Math.random().toString(36).substr(2, 9)}`;
 }
 
+/**
+ * Numeric view of a vehicle and its best compliant bundle
+ */
+interface DealCandidate {
+  vehicle: Vehicle;
+  bundle: ProductBundle;
+  financeAmount: number;
+  monthlyPayment: number;
+  rateUpsell: number;
+  vehicleGross: number;
+  total: number;
+}
+
+interface MaximizerContext {
+  request: FindDealsRequest;
+  program: LenderProgram;
+  tradeCredit: number;
+  rolledAmount: number;
+  maxFinanceByPayment: number;
+  rankedBundles: Map<number, ProductBundle[]>; // keyed by Black Book value
+}
+
 export function findOptimalDeals(
   request: FindDealsRequest,
   inventory: Vehicle[]
 ): Deal[] {
-  const deals: Deal[] = [];
   const program = getLenderProgram(request.lender, request.tier);
 
   if (!program) {
@@ -33,95 +61,143 @@ export function findOptimalDeals(
     filtered = filtered.filter(v => v.mileage <= request.inventoryFilter!.maxMileage!);
   }
 
+  // Trade equity depends only on the request, not the vehicle
+  const tradeEquity = request.tradeInValue
+    ? calculateTradeInEquity(request.tradeInValue, request.tradeInBalance || 0, request.lender, request.tier)
+    : { type: 'zero' as const, equityAmount: 0, canRollover: false, rolledAmount: 0 };
+  const tradeCredit = tradeEquity.type === 'positive' ? tradeEquity.equityAmount : 0;
+  const rolledAmount = tradeEquity.canRollover ? tradeEquity.rolledAmount : 0;
+
+  // Payment cap as a finance ceiling: payments are whole $5 steps, so allow one extra step of slack
+  const paymentFactor = getAnnuityFactor(program.rate, request.term);
+  const maxPayment = (program.maxDsr * request.monthlyIncome) / 100;
+  const maxFinanceByPayment = request.monthlyIncome > 0
+    ? ((Math.floor(maxPayment / 5) + 1) * 5) / paymentFactor
+    : Number.POSITIVE_INFINITY;
+
+  const ctx: MaximizerContext = {
+    request,
+    program,
+    tradeCredit,
+    rolledAmount,
+    maxFinanceByPayment,
+    rankedBundles: new Map(),
+  };
+
+  // Phase 1: numeric evaluation, keeping only the running top 10 compliant candidates
+  const top: DealCandidate[] = [];
   for (const vehicle of filtered) {
-    const vehicleDeals = processVehicle(
-      vehicle,
-      request,
-      program
-    );
-    deals.push(...vehicleDeals);
+    const candidate = bestCandidateForVehicle(vehicle, ctx);
+    if (!candidate) continue;
+    if (top.length === TOP_DEALS && !(candidate.total > top[TOP_DEALS - 1].total)) continue;
+    insertTopDeal(top, candidate);
   }
 
-  const compliantDeals = deals.filter(d => d.compliance.overall);
-  compliantDeals.sort((a, b) => b.grossProfit.total - a.grossProfit.total);
-
-  return compliantDeals.slice(0, 10).map((deal, idx) => ({
-    ...deal,
+  // Phase 2: materialize the winners
+  return top.map((c, idx) => ({
+    id: generateDealId(),
     rank: idx + 1,
+    vehicle: c.vehicle,
+    lender: request.lender,
+    tier: request.tier,
+    salePrice: c.vehicle.suggestedPrice,
+    downPayment: request.downPayment,
+    financeAmount: c.financeAmount,
+    monthlyPayment: c.monthlyPayment,
+    term: request.term,
+    compliance: validateCompliance(
+      c.monthlyPayment,
+      request.monthlyIncome,
+      c.financeAmount,
+      c.vehicle.blackBookValue,
+      request.lender,
+      request.tier,
+      c.vehicle.year
+    ),
+    productBundle: c.bundle,
+    grossProfit: {
+      vehicleGross: c.vehicleGross,
+      lenderReserve: getBaseReserve(program),
+      rateUpsell: c.rateUpsell,
+      productMargin: c.bundle.totalMargin,
+      total: c.total,
+    },
+    dealertrackCopy: generateDealertrackCopy(c.vehicle, c.monthlyPayment, c.financeAmount, program),
   }));
 }
 
-function processVehicle(
-  vehicle: Vehicle,
-  request: FindDealsRequest,
-  program: any
-): Deal[] {
-  const deals: Deal[] = [];
-
-  const tradeEquity = request.tradeInValue
-    ? calculateTradeInEquity(request.tradeInValue, request.tradeInBalance || 0, request.lender, request.tier)
-    : { type: 'zero' as const, equityAmount: 0, canRollover: false, rolledAmount: 0 };
-
-  let baseFinance = vehicle.suggestedPrice - request.downPayment - (tradeEquity.type === 'positive' ? tradeEquity.equityAmount : 0);
-  if (tradeEquity.canRollover) {
-    baseFinance += tradeEquity.rolledAmount;
+/**
+ * Highest-gross compliant bundle for one vehicle.
+ * Bundles are tried in order of gross contribution (margin + rate upsell on their retail);
+ * LTV and payment caps bound the retail a bundle may add, so over-cap bundles are pruned
+ * without a payment calculation and the first compliant bundle dominates the rest.
+ */
+function bestCandidateForVehicle(vehicle: Vehicle, ctx: MaximizerContext): DealCandidate | null {
+  const { request, program } = ctx;
+  let baseFinance = vehicle.suggestedPrice - request.downPayment - ctx.tradeCredit;
+  if (ctx.rolledAmount) {
+    baseFinance += ctx.rolledAmount;
   }
   baseFinance += program.fee;
-
-  const bundles = recommendBundles(vehicle.blackBookValue, request.lender);
-
-  for (const bundle of bundles) {
-    const productFit = validateProductFit(bundle, vehicle.blackBookValue, request.lender);
-    if (!productFit.fits) continue;
-
-    const financeAmount = baseFinance + bundle.totalRetail;
-
-    const paymentCalc = calculateMonthlyPayment(financeAmount, program.rate, request.term);
-
-    const compliance = validateCompliance(
-      paymentCalc.monthlyPayment,
-      request.monthlyIncome,
-      financeAmount,
-      vehicle.blackBookValue,
-      request.lender,
-      request.tier,
-      vehicle.year
+  const bb = vehicle.blackBookValue;
+  const vehicleGross = vehicle.suggestedPrice - vehicle.yourCost;
+  const lenderReserve = getBaseReserve(program);
+
+  // Same DSR/LTV pass rules as validateCompliance, without building the result object
+  const effectiveLTV = vehicle.year ? getEffectiveLTV(request.lender, request.tier, vehicle.year) : program.ltv;
+  const maxFinanceByLTV = bb > 0 ? (effectiveLTV * bb) / 100 + LTV_BOUND_SLACK : Number.POSITIVE_INFINITY;
+  const maxRetail = Math.min(maxFinanceByLTV, ctx.maxFinanceByPayment) - baseFinance;
+
+  let ranked = ctx.rankedBundles.get(bb);
+  if (!ranked) {
+    ranked = rankBundlesByContribution(
+      recommendBundles(bb, request.lender),
+      (b) => b.totalMargin + (b.totalRetail * (program.rateUpsell || 0)) / 100
     );
-
-    const vehicleGross = vehicle.suggestedPrice - vehicle.yourCost;
-    const lenderReserve = getBaseReserve(program);
-    const rateUpsell = (financeAmount * (program.rateUpsell || 0)) / 100;
-
-    const deal: Deal = {
-      id: generateDealId(),
-      rank: 0,
-      vehicle,
-      lender: request.lender,
-      tier: request.tier,
-      salePrice: vehicle.suggestedPrice,
-      downPayment: request.downPayment,
-      financeAmount,
-      monthlyPayment: paymentCalc.monthlyPayment,
-      term: request.term,
-      compliance,
-      productBundle: bundle,
-      grossProfit: {
-        vehicleGross,
-        lenderReserve,
-        rateUpsell,
-        productMargin: bundle.totalMargin,
-        total: vehicleGross + lenderReserve + rateUpsell + bundle.totalMargin,
-      },
-      dealertrackCopy: generateDealertrackCopy(vehicle, paymentCalc.monthlyPayment, financeAmount, program),
-    };
-
-    deals.push(deal);
+    ctx.rankedBundles.set(bb, ranked);
   }
 
-  return deals;
+  let monthlyPayment = 0;
+  const bundle = selectBestBundle(ranked, maxRetail, (candidate) => {
+    if (!validateProductFit(candidate, bb, request.lender).fits) return false;
+    const financeAmount = baseFinance + candidate.totalRetail;
+    monthlyPayment = calculatePaymentAmount(financeAmount, program.rate, request.term);
+    const dsr = request.monthlyIncome > 0 ? (monthlyPayment / request.monthlyIncome) * 100 : 0;
+    const ltv = bb > 0 ? (financeAmount / bb) * 100 : 0;
+    return dsr <= program.maxDsr && ltv <= effectiveLTV;
+  });
+  if (!bundle) return null;
+
+  const financeAmount = baseFinance + bundle.totalRetail;
+  const rateUpsell = (financeAmount * (program.rateUpsell || 0)) / 100;
+  return {
+    vehicle,
+    bundle,
+    financeAmount,
+    monthlyPayment,
+    rateUpsell,
+    vehicleGross,
+    total: vehicleGross + lenderReserve + rateUpsell + bundle.totalMargin,
+  };
+}
+
+/**
+ * Keep the best TOP_DEALS candidates sorted by total gross; earlier candidates win ties,
+ * matching a stable sort of every candidate followed by slice(0, 10)
+ */
+function insertTopDeal(top: DealCandidate[], candidate: DealCandidate): void {
+  let lo = 0;
+  let hi = top.length;
+  while (lo < hi) {
+    const mid = (lo + hi) >>> 1;
+    if (top[mid].total >= candidate.total) lo = mid + 1;
+    else hi = mid;
+  }
+  top.splice(lo, 0, candidate);
+  if (top.length > TOP_DEALS) top.pop();
 }
 
-function generateDealertrackCopy(vehicle: Vehicle, payment: number, finance: number, program: any): string {
+function generateDealertrackCopy(vehicle: Vehicle, payment: number, finance: number, program: LenderProgram): string {
   return `Vehicle: ${vehicle.year} ${vehicle.make} ${vehicle.model}
 Stock: ${vehicle.id}
 VIN: ${vehicle.vin}
@@ -5,6 +5,7 @@
 
 import ExcelJS from 'exceljs';
 import { Vehicle, ScoredVehicleRow } from '../types/types';
+import { iterateAmortizationSchedule } from './payment-calculator';
 
 /**
  * Export inventory to Excel
@@ -256,3 +257,34 @@ export async function exportAnalyticsToExcel(data: {
 
   return await workbook.xlsx.writeBuffer();
 }
+
+/**
+ * Stream an amortization schedule to Excel; rows are generated and committed one at a time
+ */
+export async function streamAmortizationToExcel(
+  output: NodeJS.WritableStream,
+  principal: number,
+  annualRate: number,
+  termMonths: number
+): Promise<void> {
+  // Validates inputs before anything is written to the stream
+  const rows = iterateAmortizationSchedule(principal, annualRate, termMonths);
+
+  const workbook = new ExcelJS.stream.xlsx.WorkbookWriter({ stream: output as any });
+  const worksheet = workbook.addWorksheet('Amortization');
+  worksheet.columns = [
+    { header: 'Month', key: 'month', width: 8 },
+    { header: 'Payment', key: 'payment', width: 12, style: { numFmt: '$#,##0.00' } },
+    { header: 'Principal', key: 'principal', width: 12, style: { numFmt: '$#,##0.00' } },
+    { header: 'Interest', key: 'interest', width: 12, style: { numFmt: '$#,##0.00' } },
+    { header: 'Balance', key: 'balance', width: 14, style: { numFmt: '$#,##0.00' } },
+  ];
+  worksheet.getRow(1).font = { bold: true };
+
+  for (const row of rows) {
+    worksheet.addRow(row).commit();
+  }
+
+  worksheet.commit();
+  await workbook.commit();
+}
@@ -0,0 +1,166 @@
+/**
+ * HTTP CLIENT
+ * Shared outbound HTTP layer for scraping and sync: keep-alive sockets pooled per host with
+ * bounded totals, cached DNS, gzip/deflate/brotli decoding and per-host timing metrics
+ */
+
+import axios, { AxiosInstance, AxiosRequestConfig } from 'axios';
+import dns from 'dns';
+import http from 'http';
+import https from 'https';
+
+export interface HostTimings {
+  requests: number;
+  errors: number;
+  avgMs: number;
+  maxMs: number;
+  lastStatus?: number;
+}
+
+export interface HttpClientStats {
+  sockets: { active: number; idle: number; queued: number };
+  dns: { entries: number; hits: number; misses: number };
+  hosts: Record<string, HostTimings>;
+}
+
+interface DnsEntry {
+  addresses: dns.LookupAddress[];
+  expiresAt: number;
+}
+
+const MAX_SOCKETS_PER_HOST = Math.max(1, parseInt(process.env.HTTP_MAX_SOCKETS_PER_HOST || '8', 10) || 8);
+const MAX_TOTAL_SOCKETS = Math.max(1, parseInt(process.env.HTTP_MAX_TOTAL_SOCKETS || '64', 10) || 64);
+const MAX_IDLE_SOCKETS_PER_HOST = 4;
+const IDLE_SOCKET_TIMEOUT_MS = 30 * 1000;
+const DNS_TTL_MS = 5 * 60 * 1000;
+
+const dnsCache: Map<string, DnsEntry> = new Map();
+const dnsStats = { hits: 0, misses: 0 };
+const hostTimings: Map<string, { requests: number; errors: number; totalMs: number; maxMs: number; lastStatus?: number }> = new Map();
+
+/**
+ * dns.lookup with a TTL cache. Handles both the single-address and `all` forms sockets use.
+ */
+export function cachedLookup(hostname: string, options: any, callback: (...args: any[]) => void): void {
+  const opts = typeof options === 'function' ? {} : options || {};
+  const cb = typeof options === 'function' ? options : callback;
+  const key = `${hostname}|${opts.family || 0}`;
+
+  const reply = (addresses: dns.LookupAddress[]) => {
+    if (opts.all) cb(null, addresses);
+    else cb(null, addresses[0].address, addresses[0].family);
+  };
+
+  const cached = dnsCache.get(key);
+  if (cached && cached.expiresAt > Date.now()) {
+    dnsStats.hits++;
+    reply(cached.addresses);
+    return;
+  }
+
+  dnsStats.misses++;
+  dns.lookup(hostname, { ...opts, all: true } as dns.LookupAllOptions, (error, addresses) => {
+    if (error || addresses.length === 0) {
+      cb(error || new Error(`No addresses for ${hostname}`));
+      return;
+    }
+    dnsCache.set(key, { addresses, expiresAt: Date.now() + DNS_TTL_MS });
+    reply(addresses);
+  });
+}
+
+const agentOptions = {
+  keepAlive: true,
+  keepAliveMsecs: 1000,
+  maxSockets: MAX_SOCKETS_PER_HOST,
+  maxTotalSockets: MAX_TOTAL_SOCKETS,
+  maxFreeSockets: MAX_IDLE_SOCKETS_PER_HOST,
+  timeout: IDLE_SOCKET_TIMEOUT_MS,
+  scheduling: 'lifo' as const,
+  lookup: cachedLookup as any,
+};
+
+export const httpAgent = new http.Agent(agentOptions);
+export const httpsAgent = new https.Agent(agentOptions);
+
+function hostOf(config: AxiosRequestConfig): string {
+  try {
+    return new URL(config.url || '', config.baseURL).host;
+  } catch (_e) {
+    return 'unknown';
+  }
+}
+
+function record(host: string, startedAt: number | undefined, status?: number, failed: boolean = false): void {
+  if (!startedAt) return;
+  const ms = Date.now() - startedAt;
+  const timing = hostTimings.get(host) || { requests: 0, errors: 0, totalMs: 0, maxMs: 0 };
+  timing.requests++;
+  if (failed) timing.errors++;
+  timing.totalMs += ms;
+  timing.maxMs = Math.max(timing.maxMs, ms);
+  if (status) timing.lastStatus = status;
+  hostTimings.set(host, timing);
+}
+
+/**
+ * Axios instance on the shared agents. Per-client defaults (headers, timeout) go in config;
+ * responses are decompressed (gzip, deflate, br) and timed per host.
+ */
+export function createHttpClient(config: AxiosRequestConfig = {}): AxiosInstance {
+  const client = axios.create({
+    timeout: 30000,
+    maxRedirects: 5,
+    decompress: true,
+    ...config,
+    headers: { 'Accept-Encoding': 'gzip, deflate, br', ...(config.headers as Record<string, string>) },
+    httpAgent,
+    httpsAgent,
+  });
+
+  client.interceptors.request.use(request => {
+    (request as any).startedAt = Date.now();
+    return request;
+  });
+  client.interceptors.response.use(
+    response => {
+      record(hostOf(response.config), (response.config as any).startedAt, response.status);
+      return response;
+    },
+    error => {
+      if (error?.config) record(hostOf(error.config), error.config.startedAt, error.response?.status, true);
+      return Promise.reject(error);
+    }
+  );
+  return client;
+}
+
+// Default client for callers without their own defaults
+export const httpClient = createHttpClient();
+
+function countSockets(pools: NodeJS.ReadOnlyDict<any[]>): number {
+  return Object.values(pools).reduce((sum: number, list) => sum + (list ? list.length : 0), 0);
+}
+
+export function getHttpClientStats(): HttpClientStats {
+  const agents = [httpAgent, httpsAgent];
+  const hosts: Record<string, HostTimings> = {};
+  for (const [host, t] of hostTimings.entries()) {
+    hosts[host] = {
+      requests: t.requests,
+      errors: t.errors,
+      avgMs: t.requests > 0 ? Math.round(t.totalMs / t.requests) : 0,
+      maxMs: t.maxMs,
+      lastStatus: t.lastStatus,
+    };
+  }
+  return {
+    sockets: {
+      active: agents.reduce((sum, a) => sum + countSockets(a.sockets), 0),
+      idle: agents.reduce((sum, a) => sum + countSockets(a.freeSockets), 0),
+      queued: agents.reduce((sum, a) => sum + countSockets(a.requests), 0),
+    },
+    dns: { entries: dnsCache.size, ...dnsStats },
+    hosts,
+  };
+}
@@ -0,0 +1,253 @@
+/**
+ * INCREMENTAL SCORING MODULE
+ * Materialized score lists per active approval, patched on inventory change events
+ */
+
+import { Vehicle, ApprovalSpec, TradeInfo, ScoredVehicleRow } from '../types/types';
+import { scoreInventory } from './approvals-engine';
+import { scoreInventoryAsync } from './scoring-pool';
+import { onInventoryChanges, InventoryChange } from './inventory-sync';
+
+interface MaterializedScoreList {
+  key: string;
+  approval: ApprovalSpec;
+  trade: TradeInfo;
+  rows: ScoredVehicleRow[];           // sorted by totalGross desc
+  source: Vehicle[] | null;           // inventory array the rows were computed from
+  rescoring: Promise<void> | null;    // full re-score in flight on the scoring pool
+  target: Vehicle[] | null;           // inventory array that re-score is computing
+  queued: ChangeBatch[];              // changes that arrived during the re-score
+  updatedAt: number;
+  fullScores: number;
+  incrementalScores: number;
+}
+
+interface ChangeBatch {
+  latest: Map<string, InventoryChange>;
+  rescore: Vehicle[];
+  inventory?: Vehicle[];
+}
+
+const MAX_ACTIVE_LISTS = 20;
+const activeLists: Map<string, MaterializedScoreList> = new Map();
+
+function vehicleKey(v: { id?: string; vin?: string }): string {
+  return String(v.id || v.vin || '');
+}
+
+function rowKey(row: ScoredVehicleRow): string {
+  return String(row.vehicleId || row.vin || '');
+}
+
+/**
+ * Insert a row keeping totalGross descending; ties go after existing equal rows
+ */
+function insertSorted(rows: ScoredVehicleRow[], row: ScoredVehicleRow): void {
+  let lo = 0;
+  let hi = rows.length;
+  while (lo < hi) {
+    const mid = (lo + hi) >>> 1;
+    if (rows[mid].totalGross >= row.totalGross) lo = mid + 1;
+    else hi = mid;
+  }
+  rows.splice(lo, 0, row);
+}
+
+/**
+ * Re-score the whole inventory on the scoring pool. A newer re-score supersedes this one;
+ * changes that arrive meanwhile are queued and spliced into the fresh rows when they land.
+ */
+function rescoreFull(list: MaterializedScoreList, inventory: Vehicle[]): Promise<void> {
+  const run: Promise<void> = scoreInventoryAsync(inventory, list.approval, list.trade).then(
+    rows => {
+      if (list.rescoring !== run) return;
+      list.rows = rows;
+      list.source = inventory;
+      list.updatedAt = Date.now();
+      list.fullScores++;
+      const queued = list.queued;
+      list.rescoring = null;
+      list.queued = [];
+      for (const batch of queued) patchList(list, batch);
+    },
+    error => {
+      if (list.rescoring === run) {
+        list.rescoring = null;
+        list.queued = [];
+      }
+      throw error;
+    }
+  );
+  list.rescoring = run;
+  list.target = inventory;
+  list.queued = [];
+  return run;
+}
+
+async function settledRows(list: MaterializedScoreList): Promise<ScoredVehicleRow[]> {
+  while (list.rescoring) await list.rescoring;
+  return list.rows;
+}
+
+/**
+ * Register (or replace) an approval whose scored list should be kept materialized
+ */
+export async function registerApproval(
+  key: string,
+  approval: ApprovalSpec,
+  trade: TradeInfo,
+  inventory: Vehicle[]
+): Promise<ScoredVehicleRow[]> {
+  activeLists.delete(key);
+  const list: MaterializedScoreList = {
+    key,
+    approval,
+    trade,
+    rows: [],
+    source: null,
+    rescoring: null,
+    target: null,
+    queued: [],
+    updatedAt: 0,
+    fullScores: 0,
+    incrementalScores: 0,
+  };
+  activeLists.set(key, list);
+
+  // Keep only the most recently registered approvals
+  while (activeLists.size > MAX_ACTIVE_LISTS) {
+    const oldest = activeLists.keys().next().value as string;
+    activeLists.delete(oldest);
+  }
+  rescoreFull(list, inventory);
+  return settledRows(list);
+}
+
+export function unregisterApproval(key: string): boolean {
+  return activeLists.delete(key);
+}
+
+/**
+ * Get the materialized rows for an approval.
+ * If the inventory array was replaced without change events, falls back to a full re-score on the pool.
+ */
+export async function getScoredRows(key: string, inventory?: Vehicle[]): Promise<ScoredVehicleRow[] | null> {
+  const list = activeLists.get(key);
+  if (!list) return null;
+  if (inventory && boundInventory(list) !== inventory) {
+    rescoreFull(list, inventory);
+  }
+  return settledRows(list);
+}
+
+function boundInventory(list: MaterializedScoreList): Vehicle[] | null {
+  return list.rescoring ? list.target : list.source;
+}
+
+/**
+ * Apply a batch of inventory changes to every materialized list.
+ * Only the affected vehicles are re-scored and spliced into the sorted rows.
+ * When the changes produced a new inventory array, pass it along with the array it replaced
+ * so lists scored against either stay bound; lists scored against anything else are rebuilt.
+ */
+export function applyInventoryChanges(
+  changes: InventoryChange[],
+  inventory?: Vehicle[],
+  previousInventory?: Vehicle[]
+): void {
+  patchLists(changes, inventory, previousInventory, true);
+}
+
+/**
+ * Like applyInventoryChanges, for changes to an inventory other than the one lists are usually
+ * scored against: only lists bound to inventory or previousInventory are patched, the rest are
+ * left alone
+ */
+export function applySourceChanges(changes: InventoryChange[], inventory: Vehicle[], previousInventory: Vehicle[]): void {
+  patchLists(changes, inventory, previousInventory, false);
+}
+
+function patchLists(
+  changes: InventoryChange[],
+  inventory: Vehicle[] | undefined,
+  previousInventory: Vehicle[] | undefined,
+  rebuildUnbound: boolean
+): void {
+  if (changes.length === 0 || activeLists.size === 0) return;
+
+  // Last change per vehicle wins
+  const latest: Map<string, InventoryChange> = new Map();
+  for (const change of changes) {
+    const key = vehicleKey(change.vehicle);
+    if (key) latest.set(key, change);
+  }
+  const rescore: Vehicle[] = [];
+  for (const change of latest.values()) {
+    if (change.type !== 'removed') rescore.push(change.vehicle);
+  }
+
+  const batch: ChangeBatch = { latest, rescore, inventory };
+  for (const list of activeLists.values()) {
+    const bound = boundInventory(list);
+    if (inventory && bound !== inventory && bound !== (previousInventory ?? inventory)) {
+      if (rebuildUnbound) {
+        rescoreFull(list, inventory).catch(e => console.error('[SCORING] Full re-score failed:', (e as Error).message));
+      }
+      continue;
+    }
+    if (list.rescoring) {
+      list.queued.push(batch);
+      if (inventory) list.target = inventory;
+    } else {
+      patchList(list, batch);
+    }
+  }
+}
+
+/**
+ * Drop the changed vehicles' rows and splice their fresh scores back in (inline; batches are small)
+ */
+function patchList(list: MaterializedScoreList, batch: ChangeBatch): void {
+  list.rows = list.rows.filter(row => !batch.latest.has(rowKey(row)));
+  if (batch.rescore.length > 0) {
+    const fresh = scoreInventory(batch.rescore, list.approval, list.trade);
+    for (const row of fresh) insertSorted(list.rows, row);
+  }
+  if (batch.inventory) list.source = batch.inventory;
+  list.updatedAt = Date.now();
+  list.incrementalScores += batch.rescore.length;
+}
+
+export function getIncrementalScoringStats(): Array<{
+  key: string;
+  bank: string;
+  program: string;
+  rows: number;
+  updatedAt: number;
+  fullScores: number;
+  incrementalScores: number;
+}> {
+  return Array.from(activeLists.values()).map(list => ({
+    key: list.key,
+    bank: list.approval.bank,
+    program: list.approval.program,
+    rows: list.rows.length,
+    updatedAt: list.updatedAt,
+    fullScores: list.fullScores,
+    incrementalScores: list.incrementalScores,
+  }));
+}
+
+export function clearScoredLists(): void {
+  activeLists.clear();
+}
+
+// Sync runs upsert into the shared inventory store; patch the lists scored against its snapshot
+// and leave lists scored against other inventories (e.g. the mirrored one) alone
+onInventoryChanges((changes, inventory, previousInventory) => {
+  try {
+    applySourceChanges(changes, inventory, previousInventory);
+  } catch (e) {
+    console.error('[SCORING] Incremental re-score failed:', (e as Error).message);
+  }
+});
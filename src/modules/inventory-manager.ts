@@ -1,158 +1,291 @@
 /**
  * MODULE 9: INVENTORY MANAGER
- * Handles CSV loading, vehicle parsing, VIN decoding
+ * Handles CSV loading (buffered or streamed in batches), vehicle parsing, VIN decoding
  */
 
 import { Vehicle } from '../types/types';
-import { decodeVIN, getVehicleValuation } from './vin-decoder';
+import { StringDecoder } from 'string_decoder';
+import { decodeVIN } from './vin-decoder';
+import { valueVehicles } from './valuation-service';
 
-export function loadInventoryFromCSV(csvContent: string): Vehicle[] {
-  const lines = csvContent.trim().split('\n');
-  if (lines.length < 2) throw new Error('CSV must have header and at least one data row');
-  const normalize = (s: string) => s.trim().toLowerCase().replace(/[^a-z0-9]+/g, '_').replace(/^_+|_+$/g, '');
-  const header = parseCSVLine(lines[0]).map(h => normalize(h));
-  const vehicles: Vehicle[] = [];
-
-  for (let i = 1; i < lines.length; i++) {
-    const row = parseCSVLine(lines[i]).map(v => v.trim());
-    const vehicleData: Record<string, any> = {};
-
-    header.forEach((col, idx) => {
-      vehicleData[col] = row[idx];
-    });
-
-    // Helpers for flexible header mapping
-    const pick = (...keys: string[]) => {
-      for (const k of keys) {
-        if (vehicleData[k] !== undefined && vehicleData[k] !== '') return vehicleData[k];
-      }
-      return undefined;
-    };
-
-    const num = (val: any, dflt = 0): number => {
-      if (val === undefined || val === null || val === '') return dflt;
-      let s = String(val).trim();
-      const parenNeg = /^\(.*\)$/.test(s);
-      const minusNeg = /^\s*-/.test(s);
-      const isNeg = parenNeg || minusNeg;
-      s = s.replace(/[^0-9.()\-]/g, '');
-      s = s.replace(/[()]/g, '');
-      s = s.replace(/^\-/, '');
-      const n = parseFloat(s);
-      if (isNaN(n)) return dflt;
-      return isNeg ? -n : n;
-    };
-
-    try {
-      const vin = (pick('vin') || '') as string;
-      const vinData = vin.length === 17 ? decodeVIN(vin) : null;
-
-      const csvMake = (pick('make','vehicle_make','veh_make','manufacturer','brand') as string) || '';
-      const csvModel = (pick('model','vehicle_model') as string) || '';
-      const csvYear = (pick('year','vehicle_year') as string) || '';
-      const vehicle: Vehicle = {
-        id: (pick('stock','stock_number','stocknum','stockno','stock_no','stockid','stock_id','id','vehicleid','vehicle_id') as string) || `STOCK-${i}`,
-        vin,
-        year: (parseInt(csvYear) || 0) || (vinData?.year || 0),
-        make: (csvMake || vinData?.make || 'Unknown'),
-        model: (csvModel || vinData?.model || 'Unknown'),
-        trim: (pick('trim') as string) || '',
-        mileage: num(pick('mileage','kms','km','kilometers','odometer','odometer_km'), 0) || 0,
-        color: (pick('color','exterior_color') as string) || '',
-        engine: vinData?.engine || (pick('engine','motor') as string) || 'Unknown',
-        transmission: (pick('transmission','trans','gearbox') as string) || 'Unknown',
-        blackBookValue:
-          num(pick('black_book_value','blackbookvalue','black_book','blackbook','bb_value','bbvalue','bb','cbb_wholesale','cbbwholesale','bb_wholesale','bbwholesale')) || 0,
-        yourCost:
-          num(pick(
-            'your_cost','yourcost','cost','purchase_cost','our_cost','acquisition_cost','base_cost','vehicle_cost','unit_cost','net_cost','cost_value',
-            'inventory_value','inventoryvalue','inventory','inv_value','invvalue','your_cost_$','yourcost$','your_cost$','cost_$',
-            'inventory_value_$','inventory_value$','inventory_$','inventory$','inv_value_$','invvalue_$','inv_$','inv$',
-            'buy_cost','buy_price','purchase_price','acquisition_price'
-          )),
-        suggestedPrice:
-          num(pick('suggested_price','suggestedprice','price','retail_price','list_price','asking_price','sale_price','msrp','retail','retail_$','retail_value','sale_price_$','asking','retail$')),
-        inStock: (function(){
-          const v = (pick('in_stock','instock','available','status') as string) || '';
-          const val = String(v).toLowerCase();
-          if (!val) return true;
-          return !(val === 'false' || val === 'no' || val === '0' || val === 'sold' || val === 'unavailable');
-        })(),
-        imageUrl: (pick('image_url','imageurl','image','photo_url','photourl','photo','picture_url','picture') as string) || undefined,
-      };
-
-      vehicles.push(vehicle);
-    } catch (e) {
-      console.warn(`Skipping row ${i + 1}: ${(e as Error).message}`);
+// Vehicles per batch yielded by streamInventoryFromCSV
+export const CSV_BATCH_SIZE = 500;
+
+// Accepted header spellings per field (normalized); the first non-empty column wins per row
+const HEADER_KEYS = {
+  id: ['stock','stock_number','stocknum','stockno','stock_no','stockid','stock_id','id','vehicleid','vehicle_id'],
+  vin: ['vin'],
+  make: ['make','vehicle_make','veh_make','manufacturer','brand'],
+  model: ['model','vehicle_model'],
+  year: ['year','vehicle_year'],
+  trim: ['trim'],
+  mileage: ['mileage','kms','km','kilometers','odometer','odometer_km'],
+  color: ['color','exterior_color'],
+  engine: ['engine','motor'],
+  transmission: ['transmission','trans','gearbox'],
+  blackBookValue: ['black_book_value','blackbookvalue','black_book','blackbook','bb_value','bbvalue','bb','cbb_wholesale','cbbwholesale','bb_wholesale','bbwholesale'],
+  yourCost: [
+    'your_cost','yourcost','cost','purchase_cost','our_cost','acquisition_cost','base_cost','vehicle_cost','unit_cost','net_cost','cost_value',
+    'inventory_value','inventoryvalue','inventory','inv_value','invvalue','your_cost_$','yourcost$','your_cost$','cost_$',
+    'inventory_value_$','inventory_value$','inventory_$','inventory$','inv_value_$','invvalue_$','inv_$','inv$',
+    'buy_cost','buy_price','purchase_price','acquisition_price'
+  ],
+  suggestedPrice: ['suggested_price','suggestedprice','price','retail_price','list_price','asking_price','sale_price','msrp','retail','retail_$','retail_value','sale_price_$','asking','retail$'],
+  inStock: ['in_stock','instock','available','status'],
+  imageUrl: ['image_url','imageurl','image','photo_url','photourl','photo','picture_url','picture'],
+};
+
+export type HeaderMap = Record<keyof typeof HEADER_KEYS, number[]>;
+
+const normalizeHeader = (s: string) => s.trim().toLowerCase().replace(/[^a-z0-9]+/g, '_').replace(/^_+|_+$/g, '');
+
+/**
+ * Resolve each field's header spellings to column indexes once per file.
+ * A repeated header maps to its last column (later columns overwrite earlier ones).
+ */
+export function compileHeaderMap(header: string[]): HeaderMap {
+  const columns = header.map(normalizeHeader);
+  const map = {} as HeaderMap;
+  for (const field of Object.keys(HEADER_KEYS) as (keyof typeof HEADER_KEYS)[]) {
+    const indexes: number[] = [];
+    for (const key of HEADER_KEYS[field]) {
+      const idx = columns.lastIndexOf(key);
+      if (idx >= 0 && !indexes.includes(idx)) indexes.push(idx);
     }
+    map[field] = indexes;
   }
-
-  return vehicles;
+  return map;
 }
 
-export function addVehicle(vehicle: Vehicle, inventory: Vehicle[]): Vehicle[] {
-  return [...inventory, vehicle];
+function pickColumn(row: string[], indexes: number[]): string | undefined {
+  for (const idx of indexes) {
+    const value = row[idx];
+    if (value === undefined) continue;
+    const trimmed = value.trim();
+    if (trimmed !== '') return trimmed;
+  }
+  return undefined;
 }
 
-export function removeVehicle(vehicleId: string, inventory: Vehicle[]): Vehicle[] {
-  return inventory.filter(v => v.id !== vehicleId);
+function parseAmount(val: string | undefined, dflt = 0): number {
+  if (val === undefined || val === null || val === '') return dflt;
+  let s = String(val).trim();
+  const parenNeg = /^\(.*\)$/.test(s);
+  const minusNeg = /^\s*-/.test(s);
+  const isNeg = parenNeg || minusNeg;
+  s = s.replace(/[^0-9.()\-]/g, '');
+  s = s.replace(/[()]/g, '');
+  s = s.replace(/^\-/, '');
+  const n = parseFloat(s);
+  if (isNaN(n)) return dflt;
+  return isNeg ? -n : n;
 }
 
-export function updateVehicle(vehicleId: string, updates: Partial<Vehicle>, inventory: Vehicle[]): Vehicle[] {
-  return inventory.map(v =>
-    v.id === vehicleId ? { ...v, ...updates } : v
-  );
+/**
+ * Build a Vehicle from one CSV record; rowNumber is the 1-based data row (used for missing stock numbers)
+ */
+export function csvRowToVehicle(row: string[], map: HeaderMap, rowNumber: number): Vehicle {
+  const pick = (field: keyof HeaderMap) => pickColumn(row, map[field]);
+
+  const vin = pick('vin') || '';
+  const vinData = vin.length === 17 ? decodeVIN(vin) : null;
+
+  const csvMake = pick('make') || '';
+  const csvModel = pick('model') || '';
+  const csvYear = pick('year') || '';
+  return {
+    id: pick('id') || `STOCK-${rowNumber}`,
+    vin,
+    year: (parseInt(csvYear) || 0) || (vinData?.year || 0),
+    make: (csvMake || vinData?.make || 'Unknown'),
+    model: (csvModel || vinData?.model || 'Unknown'),
+    trim: pick('trim') || '',
+    mileage: parseAmount(pick('mileage'), 0) || 0,
+    color: pick('color') || '',
+    engine: (vinData && vinData.engine !== 'Unknown' ? vinData.engine : '') || pick('engine') || 'Unknown',
+    transmission: pick('transmission') || 'Unknown',
+    blackBookValue: parseAmount(pick('blackBookValue')) || 0,
+    yourCost: parseAmount(pick('yourCost')),
+    suggestedPrice: parseAmount(pick('suggestedPrice')),
+    inStock: (function(){
+      const val = String(pick('inStock') || '').toLowerCase();
+      if (!val) return true;
+      return !(val === 'false' || val === 'no' || val === '0' || val === 'sold' || val === 'unavailable');
+    })(),
+    imageUrl: pick('imageUrl') || undefined,
+  };
 }
 
-export async function enrichWithVinAuditValuations(inventory: Vehicle[]): Promise<Vehicle[]> {
-  const key = process.env.VINAUDIT_API_KEY;
-  if (!key) return inventory;
-
-  const updated: Vehicle[] = [];
-  for (const v of inventory) {
-    try {
-      const valuation = await getVehicleValuation(v.vin, v.mileage);
-      updated.push({
-        ...v,
-        blackBookValue: valuation.wholesale,
-      });
-    } catch (_e) {
-      updated.push(v);
+const QUOTE = 34;  // "
+const COMMA = 44;  // ,
+const LF = 10;     // \n
+const CR = 13;     // \r
+
+/**
+ * Incremental CSV tokenizer: feed text chunks of any size, get back completed records.
+ * Quoted fields may contain commas, doubled quotes and line breaks, and may span chunks.
+ * Blank lines are skipped.
+ */
+export class CSVTokenizer {
+  private field = '';
+  private record: string[] = [];
+  private inQuotes = false;
+  private closedQuote = false;  // previous char closed a quoted section ("" inside quotes is a literal quote)
+
+  push(chunk: string): string[][] {
+    const records: string[][] = [];
+    let start = 0;
+    for (let i = 0; i < chunk.length; i++) {
+      const c = chunk.charCodeAt(i);
+      if (this.inQuotes) {
+        if (c === QUOTE) {
+          this.field += chunk.slice(start, i);
+          start = i + 1;
+          this.inQuotes = false;
+          this.closedQuote = true;
+        }
+        continue;
+      }
+      if (c === QUOTE) {
+        this.field += chunk.slice(start, i);
+        if (this.closedQuote) this.field += '"';
+        start = i + 1;
+        this.inQuotes = true;
+        this.closedQuote = false;
+        continue;
+      }
+      this.closedQuote = false;
+      if (c === COMMA) {
+        this.record.push(this.field + chunk.slice(start, i));
+        this.field = '';
+        start = i + 1;
+      } else if (c === LF) {
+        this.field += chunk.slice(start, i);
+        start = i + 1;
+        this.endRecord(records);
+      } else if (c === CR) {
+        this.field += chunk.slice(start, i);
+        start = i + 1;
+      }
     }
+    this.field += chunk.slice(start);
+    return records;
+  }
+
+  /** Flush the last record (an unterminated quote keeps what was read) */
+  end(): string[][] {
+    const records: string[][] = [];
+    if (this.field !== '' || this.record.length > 0) this.endRecord(records);
+    this.inQuotes = false;
+    this.closedQuote = false;
+    return records;
+  }
+
+  private endRecord(records: string[][]): void {
+    this.record.push(this.field);
+    this.field = '';
+    const blank = this.record.length === 1 && this.record[0].trim() === '';
+    if (!blank) records.push(this.record);
+    this.record = [];
   }
-  return updated;
 }
 
-// Robust CSV line parser that handles quotes, commas, and escaped quotes
-function parseCSVLine(line: string): string[] {
-  const result: string[] = [];
-  let current = '';
-  let insideQuotes = false;
+/**
+ * Chunked CSV → Vehicle reader: the first record is the header, resolved to a HeaderMap once
+ */
+export class CSVInventoryReader {
+  private tokenizer = new CSVTokenizer();
+  private headerMap: HeaderMap | null = null;
+  private rowNumber = 0;
 
-  for (let i = 0; i < line.length; i++) {
-    const char = line[i];
-    const next = line[i + 1];
+  get rowCount(): number {
+    return this.rowNumber;
+  }
 
-    if (char === '"' && next === '"') { // escaped quote
-      current += '"';
-      i++;
-      continue;
-    }
+  push(chunk: string): Vehicle[] {
+    return this.toVehicles(this.tokenizer.push(chunk));
+  }
+
+  end(): Vehicle[] {
+    return this.toVehicles(this.tokenizer.end());
+  }
 
-    if (char === '"') {
-      insideQuotes = !insideQuotes;
-      continue;
+  private toVehicles(records: string[][]): Vehicle[] {
+    const vehicles: Vehicle[] = [];
+    for (const record of records) {
+      if (!this.headerMap) {
+        this.headerMap = compileHeaderMap(record);
+        continue;
+      }
+      this.rowNumber++;
+      try {
+        vehicles.push(csvRowToVehicle(record, this.headerMap, this.rowNumber));
+      } catch (e) {
+        console.warn(`Skipping row ${this.rowNumber + 1}: ${(e as Error).message}`);
+      }
     }
+    return vehicles;
+  }
+}
 
-    if (char === ',' && !insideQuotes) {
-      result.push(current);
-      current = '';
-      continue;
+export function loadInventoryFromCSV(csvContent: string): Vehicle[] {
+  const reader = new CSVInventoryReader();
+  const vehicles = [...reader.push(csvContent), ...reader.end()];
+  if (reader.rowCount === 0) throw new Error('CSV must have header and at least one data row');
+  return vehicles;
+}
+
+/**
+ * Parse a CSV byte/text stream into batches of vehicles without buffering the file.
+ * The source is only read as fast as the consumer pulls batches, so awaiting work
+ * (enrichment, store merge, Supabase writes) between batches applies backpressure.
+ */
+export async function* streamInventoryFromCSV(
+  source: AsyncIterable<string | Buffer>,
+  batchSize: number = CSV_BATCH_SIZE
+): AsyncGenerator<Vehicle[]> {
+  const size = Math.max(1, Math.floor(batchSize));
+  const reader = new CSVInventoryReader();
+  const decoder = new StringDecoder('utf8');
+  let batch: Vehicle[] = [];
+
+  const take = function* (vehicles: Vehicle[]) {
+    for (const v of vehicles) {
+      batch.push(v);
+      if (batch.length >= size) {
+        yield batch;
+        batch = [];
+      }
     }
+  };
 
-    current += char;
+  for await (const chunk of source) {
+    yield* take(reader.push(typeof chunk === 'string' ? chunk : decoder.write(chunk)));
   }
+  yield* take(reader.push(decoder.end()));
+  yield* take(reader.end());
+
+  if (reader.rowCount === 0) throw new Error('CSV must have header and at least one data row');
+  if (batch.length > 0) yield batch;
+}
+
+export function addVehicle(vehicle: Vehicle, inventory: Vehicle[]): Vehicle[] {
+  return [...inventory, vehicle];
+}
+
+export function removeVehicle(vehicleId: string, inventory: Vehicle[]): Vehicle[] {
+  return inventory.filter(v => v.id !== vehicleId);
+}
 
-  result.push(current);
-  return result;
+export function updateVehicle(vehicleId: string, updates: Partial<Vehicle>, inventory: Vehicle[]): Vehicle[] {
+  return inventory.map(v =>
+    v.id === vehicleId ? { ...v, ...updates } : v
+  );
+}
+
+/**
+ * Value every vehicle via VinAudit (cached, coalesced and concurrency-limited; see valuation-service)
+ */
+export async function enrichWithVinAuditValuations(inventory: Vehicle[]): Promise<Vehicle[]> {
+  return valueVehicles(inventory);
 }
@@ -0,0 +1,115 @@
+/**
+ * INVENTORY MERGE
+ * Linear-time merge of an incoming feed into the inventory store, keyed by normalized
+ * VIN (or stock number when a side has no VIN), producing the change set to persist
+ */
+
+import { Vehicle } from '../types/types';
+import { InventoryChange } from './inventory-sync';
+import { normalizeVin, normalizeStock, InventoryStore } from './inventory-store';
+
+export type MergeRow = (existing: Vehicle, incoming: Vehicle) => Vehicle;
+
+export interface StoreMergeResult {
+  added: Vehicle[];
+  updated: Array<{ previous: Vehicle; vehicle: Vehicle }>;
+  unchanged: Vehicle[];
+  changes: InventoryChange[];
+}
+
+// Bookkeeping fields that do not make a row "changed" on their own
+const IGNORED_FIELDS = new Set(['lastUpdated']);
+
+/**
+ * Change events for a merged vehicle; a changed id re-keys the scored row
+ */
+export function mergeChangeEvents(existing: Vehicle, merged: Vehicle): InventoryChange[] {
+  const timestamp = new Date();
+  if (String(existing.id || existing.vin) !== String(merged.id || merged.vin)) {
+    return [
+      { type: 'removed', vehicle: existing, timestamp },
+      { type: 'added', vehicle: merged, timestamp },
+    ];
+  }
+  if (existing.suggestedPrice !== merged.suggestedPrice) {
+    return [{ type: 'price_change', vehicle: merged, oldValue: existing.suggestedPrice, newValue: merged.suggestedPrice, timestamp }];
+  }
+  return [{ type: 'updated', vehicle: merged, timestamp }];
+}
+
+function sameValue(a: any, b: any): boolean {
+  if (a === b) return true;
+  if (Array.isArray(a) && Array.isArray(b)) {
+    return a.length === b.length && a.every((x, i) => sameValue(x, b[i]));
+  }
+  return typeof a === 'number' && typeof b === 'number' && isNaN(a) && isNaN(b);
+}
+
+/**
+ * True when merging changed any field other than bookkeeping ones
+ */
+export function vehicleChanged(previous: Vehicle, next: Vehicle): boolean {
+  const keys = new Set([...Object.keys(previous), ...Object.keys(next)]);
+  for (const key of keys) {
+    if (IGNORED_FIELDS.has(key)) continue;
+    if (!sameValue((previous as any)[key], (next as any)[key])) return true;
+  }
+  return false;
+}
+
+/**
+ * Merge `incoming` into a store in place, O(m) for m incoming rows whatever the store size.
+ * Rows match on normalized VIN when both have one, otherwise on stock number; the first incoming
+ * row for a key wins. Updated rows keep their slot; new rows are appended.
+ */
+export function mergeIntoStore(
+  store: InventoryStore,
+  incoming: Vehicle[],
+  mergeRow: MergeRow = (e, i) => ({ ...e, ...i })
+): StoreMergeResult {
+  const result: StoreMergeResult = { added: [], updated: [], unchanged: [], changes: [] };
+  const seen = new Set<string>();
+
+  for (const v of incoming) {
+    const vin = normalizeVin(v.vin);
+    const stock = normalizeStock(v.id);
+    const key = vin ? `v:${vin}` : stock ? `s:${stock}` : '';
+    if (key && seen.has(key)) continue;
+    if (key) seen.add(key);
+
+    let row: Vehicle | undefined;
+    if (vin) {
+      row = store.getByVin(vin);
+      if (!row && stock) {
+        const byStock = store.getByStock(stock);
+        if (byStock && !normalizeVin(byStock.vin)) row = byStock;
+      }
+    } else if (stock) {
+      row = store.getByStock(stock);
+    }
+
+    if (!row) {
+      store.add(v);
+      result.added.push(v);
+      result.changes.push({ type: 'added', vehicle: v, timestamp: new Date() });
+      continue;
+    }
+
+    const merged = mergeRow(row, v);
+    if (vehicleChanged(row, merged)) {
+      store.replace(row, merged);
+      result.updated.push({ previous: row, vehicle: merged });
+      result.changes.push(...mergeChangeEvents(row, merged));
+    } else {
+      result.unchanged.push(row);
+    }
+  }
+  return result;
+}
+
+/**
+ * Rows that need writing after a merge (added + updated)
+ */
+export function changedRows(result: Pick<StoreMergeResult, 'added' | 'updated'>): Vehicle[] {
+  return [...result.added, ...result.updated.map(u => u.vehicle)];
+}
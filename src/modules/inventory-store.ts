@@ -0,0 +1,281 @@
+/**
+ * INVENTORY STORE
+ * Indexed in-memory inventory: O(1) lookups and upserts by VIN or stock number,
+ * sorted views on price/year/mileage, and a version counter for cache invalidation
+ */
+
+import { Vehicle } from '../types/types';
+
+export type SortedField = 'suggestedPrice' | 'year' | 'mileage';
+
+export interface UpsertResult {
+  type: 'added' | 'updated';
+  vehicle: Vehicle;
+  previous?: Vehicle;
+}
+
+export function normalizeVin(vin: unknown): string {
+  return vin == null ? '' : String(vin).trim().toUpperCase();
+}
+
+export function normalizeStock(id: unknown): string {
+  return id == null ? '' : String(id).trim().toUpperCase();
+}
+
+// Compact tombstoned slots once they outnumber live rows (and there are enough to matter)
+const COMPACT_MIN_REMOVED = 32;
+
+export class InventoryStore {
+  private rows: (Vehicle | undefined)[] = [];
+  private removed = 0;
+  private byVin: Map<string, number> = new Map();
+  private byStock: Map<string, number> = new Map();
+  private _version = 0;
+
+  // Derived views, rebuilt lazily when the version moves on
+  private snapshot: Vehicle[] | null = null;
+  private sorted: Map<SortedField, { slots: Int32Array; keys: Float64Array }> = new Map();
+  private derivedVersion = -1;
+
+  constructor(vehicles: Vehicle[] = []) {
+    if (vehicles.length > 0) this.replaceAll(vehicles);
+  }
+
+  /** Incremented on every change; derived caches compare against it */
+  get version(): number {
+    return this._version;
+  }
+
+  get size(): number {
+    return this.rows.length - this.removed;
+  }
+
+  /**
+   * Replace the whole inventory. Row order is kept; duplicate keys index their first row.
+   */
+  replaceAll(vehicles: Vehicle[]): void {
+    this.rows = vehicles.slice();
+    this.removed = 0;
+    this.reindex();
+    this.touch();
+  }
+
+  getByVin(vin: string): Vehicle | undefined {
+    const slot = this.byVin.get(normalizeVin(vin));
+    return slot === undefined ? undefined : this.rows[slot];
+  }
+
+  getByStock(id: string): Vehicle | undefined {
+    const slot = this.byStock.get(normalizeStock(id));
+    return slot === undefined ? undefined : this.rows[slot];
+  }
+
+  /**
+   * Existing row for a vehicle, matched by VIN first and then by stock number
+   */
+  find(vehicle: Pick<Vehicle, 'vin' | 'id'>): Vehicle | undefined {
+    const slot = this.slotOf(vehicle);
+    return slot === undefined ? undefined : this.rows[slot];
+  }
+
+  /**
+   * Insert or replace a vehicle (matched by VIN, then stock number)
+   */
+  upsert(vehicle: Vehicle): UpsertResult {
+    const slot = this.slotOf(vehicle);
+    if (slot === undefined) {
+      this.add(vehicle);
+      return { type: 'added', vehicle };
+    }
+
+    const previous = this.rows[slot]!;
+    this.unindexSlot(previous, slot);
+    this.rows[slot] = vehicle;
+    this.indexSlot(vehicle, slot);
+    this.touch();
+    return { type: 'updated', vehicle, previous };
+  }
+
+  /**
+   * Append a vehicle as a new row without matching it against existing ones
+   */
+  add(vehicle: Vehicle): void {
+    const slot = this.rows.length;
+    this.rows.push(vehicle);
+    this.indexSlot(vehicle, slot);
+    this.touch();
+  }
+
+  /**
+   * Replace a row obtained from this store with a new version of it, in place.
+   * Unlike upsert, a changed VIN or stock number on `next` cannot redirect the write to another row.
+   */
+  replace(previous: Vehicle, next: Vehicle): boolean {
+    const slot = this.slotOfRow(previous);
+    if (slot === undefined) return false;
+    this.unindexSlot(previous, slot);
+    this.rows[slot] = next;
+    this.indexSlot(next, slot);
+    this.touch();
+    return true;
+  }
+
+  /**
+   * Shallow-merge updates into the row matching `key`; returns the previous and merged rows
+   */
+  patch(key: Pick<Vehicle, 'vin' | 'id'>, updates: Partial<Vehicle>): UpsertResult | null {
+    const existing = this.find(key);
+    if (!existing) return null;
+    const vehicle = { ...existing, ...updates } as Vehicle;
+    this.replace(existing, vehicle);
+    return { type: 'updated', vehicle, previous: existing };
+  }
+
+  remove(key: Pick<Vehicle, 'vin' | 'id'>): Vehicle | undefined {
+    const slot = this.slotOf(key);
+    if (slot === undefined) return undefined;
+    const previous = this.rows[slot]!;
+    this.unindexSlot(previous, slot);
+    this.rows[slot] = undefined;
+    this.removed++;
+    if (this.removed >= COMPACT_MIN_REMOVED && this.removed * 2 > this.rows.length) {
+      this.rows = this.rows.filter((v): v is Vehicle => v !== undefined);
+      this.removed = 0;
+      this.reindex();
+    }
+    this.touch();
+    return previous;
+  }
+
+  /**
+   * All vehicles in insertion order. The array is shared and stays the same object until the
+   * next change, so callers can key caches on its identity (and must not mutate it).
+   */
+  toArray(): Vehicle[] {
+    this.refreshDerived();
+    if (!this.snapshot) {
+      this.snapshot = this.removed === 0
+        ? this.rows.slice() as Vehicle[]
+        : this.rows.filter((v): v is Vehicle => v !== undefined);
+    }
+    return this.snapshot;
+  }
+
+  /**
+   * Vehicles ordered by a numeric field (ascending, missing values last; ties keep insertion order)
+   */
+  sortedBy(field: SortedField): Vehicle[] {
+    const { slots } = this.sortedIndex(field);
+    const out: Vehicle[] = new Array(slots.length);
+    for (let i = 0; i < slots.length; i++) out[i] = this.rows[slots[i]]!;
+    return out;
+  }
+
+  /**
+   * Vehicles with min <= field <= max, ascending by that field
+   */
+  rangeBy(field: SortedField, min: number = -Infinity, max: number = Infinity): Vehicle[] {
+    const { slots, keys } = this.sortedIndex(field);
+    const start = lowerBound(keys, min, false);
+    const end = lowerBound(keys, max, true);
+    const out: Vehicle[] = [];
+    for (let i = start; i < end; i++) out.push(this.rows[slots[i]]!);
+    return out;
+  }
+
+  private slotOf(vehicle: Pick<Vehicle, 'vin' | 'id'>): number | undefined {
+    const vin = normalizeVin(vehicle.vin);
+    if (vin) {
+      const slot = this.byVin.get(vin);
+      if (slot !== undefined) return slot;
+    }
+    const stock = normalizeStock(vehicle.id);
+    return stock ? this.byStock.get(stock) : undefined;
+  }
+
+  private slotOfRow(row: Vehicle): number | undefined {
+    const vinSlot = this.byVin.get(normalizeVin(row.vin));
+    if (vinSlot !== undefined && this.rows[vinSlot] === row) return vinSlot;
+    const stockSlot = this.byStock.get(normalizeStock(row.id));
+    if (stockSlot !== undefined && this.rows[stockSlot] === row) return stockSlot;
+    return undefined;
+  }
+
+  private indexSlot(vehicle: Vehicle, slot: number): void {
+    const vin = normalizeVin(vehicle.vin);
+    if (vin && !this.byVin.has(vin)) this.byVin.set(vin, slot);
+    const stock = normalizeStock(vehicle.id);
+    if (stock && !this.byStock.has(stock)) this.byStock.set(stock, slot);
+  }
+
+  private unindexSlot(vehicle: Vehicle, slot: number): void {
+    const vin = normalizeVin(vehicle.vin);
+    if (vin && this.byVin.get(vin) === slot) this.byVin.delete(vin);
+    const stock = normalizeStock(vehicle.id);
+    if (stock && this.byStock.get(stock) === slot) this.byStock.delete(stock);
+  }
+
+  private reindex(): void {
+    this.byVin.clear();
+    this.byStock.clear();
+    this.rows.forEach((v, slot) => {
+      if (v) this.indexSlot(v, slot);
+    });
+  }
+
+  private touch(): void {
+    this._version++;
+  }
+
+  private refreshDerived(): void {
+    if (this.derivedVersion === this._version) return;
+    this.snapshot = null;
+    this.sorted.clear();
+    this.derivedVersion = this._version;
+  }
+
+  private sortedIndex(field: SortedField): { slots: Int32Array; keys: Float64Array } {
+    this.refreshDerived();
+    let index = this.sorted.get(field);
+    if (!index) {
+      // Typed mirror of the field for live rows, then sort slots by it
+      const live: number[] = [];
+      this.rows.forEach((v, slot) => {
+        if (v) live.push(slot);
+      });
+      const values = new Float64Array(this.rows.length);
+      for (const slot of live) values[slot] = Number(this.rows[slot]![field]);
+      live.sort((a, b) => {
+        const va = values[a];
+        const vb = values[b];
+        if (isNaN(va)) return isNaN(vb) ? a - b : 1;
+        if (isNaN(vb)) return -1;
+        return va - vb || a - b;
+      });
+      const slots = Int32Array.from(live);
+      const keys = Float64Array.from(live, slot => values[slot]);
+      index = { slots, keys };
+      this.sorted.set(field, index);
+    }
+    return index;
+  }
+}
+
+/**
+ * First index whose key is >= x (or > x when `after`); NaN keys sort last and never match
+ */
+function lowerBound(keys: Float64Array, x: number, after: boolean): number {
+  let lo = 0;
+  let hi = keys.length;
+  while (lo < hi) {
+    const mid = (lo + hi) >>> 1;
+    const k = keys[mid];
+    const before = !isNaN(k) && (after ? k <= x : k < x);
+    if (before) lo = mid + 1;
+    else hi = mid;
+  }
+  return lo;
+}
+
+/** Shared store behind state.inventory */
+export const inventoryStore = new InventoryStore();
@@ -4,8 +4,9 @@
  */
 
 import { Vehicle } from '../types/types';
+import { InventoryStore, inventoryStore } from './inventory-store';
 import logger from '../utils/logger';
-import axios from 'axios';
+import { httpClient } from './http-client';
 
 interface SyncConfig {
   enabled: boolean;
@@ -34,7 +35,7 @@ interface SyncResult {
   duration: number;
 }
 
-interface InventoryChange {
+export interface InventoryChange {
   type: 'added' | 'updated' | 'removed' | 'price_change';
   vehicle: Vehicle;
   oldValue?: any;
@@ -52,28 +53,26 @@ const syncConfig: SyncConfig = {
 const syncHistory: SyncResult[] = [];
 const changeLog: InventoryChange[] = [];
 let syncInterval: NodeJS.Timeout | null = null;
-let inventoryStore: Vehicle[] = [];
+/** Receives a sync run's changes with the shared inventory snapshot after and before the run */
+export type InventoryChangeListener = (changes: InventoryChange[], inventory: Vehicle[], previousInventory: Vehicle[]) => void;
+
+const changeListeners: InventoryChangeListener[] = [];
 
 async function getInventory(): Promise<Vehicle[]> {
-  return [...inventoryStore];
+  return [...inventoryStore.toArray()];
 }
 
 async function syncVehicle(vehicle: Vehicle): Promise<void> {
-  const index = inventoryStore.findIndex(v => v.vin === vehicle.vin || v.id === vehicle.id);
-  if (index >= 0) {
-    inventoryStore[index] = vehicle;
-  } else {
-    inventoryStore.push(vehicle);
-  }
+  inventoryStore.upsert(vehicle);
 }
 
 export function setInventoryStore(vehicles: Vehicle[]): void {
-  inventoryStore = [...vehicles];
+  inventoryStore.replaceAll(vehicles);
   logger.info('Inventory store updated', { count: vehicles.length });
 }
 
 export function getInventoryStore(): Vehicle[] {
-  return [...inventoryStore];
+  return [...inventoryStore.toArray()];
 }
 
 export function configureSyncService(config: Partial<SyncConfig>): void {
@@ -88,6 +87,30 @@ export function configureSyncService(config: Partial<SyncConfig>): void {
   logger.info('Inventory sync configured', { config: syncConfig });
 }
 
+/**
+ * Subscribe to inventory change events emitted by sync runs.
+ * Listeners receive the batch of changes once per sync; returns an unsubscribe function.
+ */
+export function onInventoryChanges(listener: InventoryChangeListener): () => void {
+  changeListeners.push(listener);
+  return () => {
+    const index = changeListeners.indexOf(listener);
+    if (index >= 0) changeListeners.splice(index, 1);
+  };
+}
+
+function emitChanges(changes: InventoryChange[], previousInventory: Vehicle[]): void {
+  if (changes.length === 0) return;
+  const inventory = inventoryStore.toArray();
+  for (const listener of changeListeners) {
+    try {
+      listener(changes, inventory, previousInventory);
+    } catch (error: any) {
+      logger.error('Inventory change listener failed', { error: error.message });
+    }
+  }
+}
+
 export function getSyncConfig(): SyncConfig {
   return { ...syncConfig };
 }
@@ -161,8 +184,11 @@ export async function performSync(): Promise<SyncResult> {
 
   logger.info('Starting inventory sync');
 
+  const previousSnapshot = inventoryStore.toArray();
   const currentInventory = await getInventory();
+  const currentIndex = new InventoryStore(currentInventory);
   const currentVINs = new Set(currentInventory.map((v: Vehicle) => v.vin).filter((vin: string) => vin));
+  const runChanges: InventoryChange[] = [];
 
   for (const source of syncConfig.sources) {
     if (!source.enabled) continue;
@@ -172,7 +198,7 @@ export async function performSync(): Promise<SyncResult> {
       
       for (const vehicle of vehicles) {
         try {
-          const existing = currentInventory.find((v: Vehicle) => v.vin === vehicle.vin || v.id === vehicle.id);
+          const existing = currentIndex.find(vehicle);
           
           if (!existing) {
             await syncVehicle(vehicle);
@@ -181,7 +207,7 @@ export async function performSync(): Promise<SyncResult> {
               type: 'added',
               vehicle,
               timestamp: new Date(),
-            });
+            }, runChanges);
           } else {
             const hasChanges = detectChanges(existing, vehicle);
             if (hasChanges) {
@@ -195,13 +221,13 @@ export async function performSync(): Promise<SyncResult> {
                   oldValue: existing.suggestedPrice,
                   newValue: vehicle.suggestedPrice,
                   timestamp: new Date(),
-                });
+                }, runChanges);
               } else {
                 logChange({
                   type: 'updated',
                   vehicle,
                   timestamp: new Date(),
-                });
+                }, runChanges);
               }
             }
           }
@@ -223,6 +249,7 @@ export async function performSync(): Promise<SyncResult> {
 
   result.duration = Date.now() - startTime;
   syncHistory.push(result);
+  emitChanges(runChanges, previousSnapshot);
   
   if (syncHistory.length > 100) {
     syncHistory.shift();
@@ -245,12 +272,12 @@ export async function performSync(): Promise<SyncResult> {
 
 async function fetchFromSource(source: SyncSource): Promise<Vehicle[]> {
   if (source.type === 'scraper' && source.url) {
-    const response = await axios.get(source.url, { timeout: 30000 });
+    const response = await httpClient.get(source.url, { timeout: 30000 });
     return response.data.vehicles || [];
   }
   
   if (source.type === 'api' && source.url) {
-    const response = await axios.get(source.url, { timeout: 30000 });
+    const response = await httpClient.get(source.url, { timeout: 30000 });
     return response.data.vehicles || response.data || [];
   }
 
@@ -266,8 +293,9 @@ function detectChanges(existing: Vehicle, updated: Vehicle): boolean {
   );
 }
 
-function logChange(change: InventoryChange): void {
+function logChange(change: InventoryChange, batch?: InventoryChange[]): void {
   changeLog.push(change);
+  if (batch) batch.push(change);
   
   if (changeLog.length > 1000) {
     changeLog.shift();
@@ -284,7 +312,7 @@ async function sendSyncNotification(result: SyncResult): Promise<void> {
   if (!syncConfig.webhookUrl) return;
 
   try {
-    await axios.post(
+    await httpClient.post(
       syncConfig.webhookUrl,
       {
         event: 'inventory_sync',
@@ -348,19 +376,24 @@ export async function manualSync(sourceName?: string): Promise<SyncResult> {
 
     try {
       const vehicles = await fetchFromSource(source);
-      const currentInventory = await getInventory();
+      const previousSnapshot = inventoryStore.toArray();
+      const currentIndex = new InventoryStore(await getInventory());
+      const runChanges: InventoryChange[] = [];
       
       for (const vehicle of vehicles) {
-        const existing = currentInventory.find((v: Vehicle) => v.vin === vehicle.vin || v.id === vehicle.id);
+        const existing = currentIndex.find(vehicle);
         
         if (!existing) {
           await syncVehicle(vehicle);
           result.vehiclesAdded++;
+          runChanges.push({ type: 'added', vehicle, timestamp: new Date() });
         } else if (detectChanges(existing, vehicle)) {
           await syncVehicle(vehicle);
           result.vehiclesUpdated++;
+          runChanges.push({ type: 'updated', vehicle, timestamp: new Date() });
         }
       }
+      emitChanges(runChanges, previousSnapshot);
       
       source.lastSync = new Date();
       source.lastError = undefined;
@@ -17,6 +17,7 @@
  */
 
 import { LenderProgram, LenderType } from '../types/types';
+import { compileStepTable, lookupStep, lookupSteps, StepTable } from './reserve-lookup';
 
 /**
  * Calculate TD reserve based on amount financed
@@ -28,14 +29,13 @@ import { LenderProgram, LenderType } from '../types/types';
  * $10,000-$14,999: $300
  * $7,500-$9,999: $200
  */
+const TD_RESERVE_STEPS = compileStepTable(
+  [{ from: 7500 }, { from: 10000 }, { from: 15000 }, { from: 20000 }, { from: 25000 }, { from: 40000 }],
+  [0, 200, 300, 400, 500, 600, 700]
+);
+
 export function calculateTDReserve(amountFinanced: number): number {
-  if (amountFinanced >= 40000) return 700;
-  if (amountFinanced >= 25000) return 600;
-  if (amountFinanced >= 20000) return 500;
-  if (amountFinanced >= 15000) return 400;
-  if (amountFinanced >= 10000) return 300;
-  if (amountFinanced >= 7500) return 200;
-  return 0;
+  return lookupStep(TD_RESERVE_STEPS, amountFinanced);
 }
 
 /**
@@ -48,14 +48,13 @@ export function calculateTDReserve(amountFinanced: number): number {
  * $10,001-$15,000 = $300
  * < $10,000 = $100
  */
+const IA_RESERVE_STEPS = compileStepTable(
+  [{ from: 10001 }, { from: 15001 }, { from: 20001 }, { from: 35001 }, { from: 45001 }, { from: 50000, strict: true }],
+  [100, 300, 450, 500, 600, 750, 1000]
+);
+
 export function calculateIAReserve(amountFinanced: number): number {
-  if (amountFinanced > 50000) return 1000;
-  if (amountFinanced >= 45001) return 750;
-  if (amountFinanced >= 35001) return 600;
-  if (amountFinanced >= 20001) return 500;
-  if (amountFinanced >= 15001) return 450;
-  if (amountFinanced >= 10001) return 300;
-  return 100;
+  return lookupStep(IA_RESERVE_STEPS, amountFinanced);
 }
 
 /**
@@ -67,13 +66,13 @@ export function calculateIAReserve(amountFinanced: number): number {
  * $10,001-$15,000 = $300
  * Up to $10,000 = $250
  */
+const EDEN_PARK_RESERVE_STEPS = compileStepTable(
+  [{ from: 10001 }, { from: 15001 }, { from: 20001 }, { from: 25001 }, { from: 45001 }],
+  [250, 300, 450, 500, 600, 750]
+);
+
 export function calculateEdenParkReserve(amountFinanced: number): number {
-  if (amountFinanced >= 45001) return 750;
-  if (amountFinanced >= 25001) return 600;
-  if (amountFinanced >= 20001) return 500;
-  if (amountFinanced >= 15001) return 450;
-  if (amountFinanced >= 10001) return 300;
-  return 250;
+  return lookupStep(EDEN_PARK_RESERVE_STEPS, amountFinanced);
 }
 
 /**
@@ -89,12 +88,13 @@ export function calculateAutoCapitalReserve(amountFinanced: number): number {
  * Calculate Prefera reserve based on amount financed
  * $200-$600 (based on ATF)
  */
+const PREFERA_RESERVE_STEPS = compileStepTable(
+  [{ from: 15000 }, { from: 20000 }, { from: 30000 }, { from: 40000 }],
+  [200, 300, 400, 500, 600]
+);
+
 export function calculatePreferaReserve(amountFinanced: number): number {
-  if (amountFinanced >= 40000) return 600;
-  if (amountFinanced >= 30000) return 500;
-  if (amountFinanced >= 20000) return 400;
-  if (amountFinanced >= 15000) return 300;
-  return 200;
+  return lookupStep(PREFERA_RESERVE_STEPS, amountFinanced);
 }
 
 /**
@@ -168,6 +168,50 @@ export function getSubventedRate(
   return null;
 }
 
+/**
+ * TD Prime rate-based reserve grid from Holiday Special/Eco/Standard programs.
+ * Term bucket -> rate -> percentage per amount-financed bucket
+ * (7.5k-19k, 20k-29k, 30k-39k, 40k-49k, 50k-99k, 100k+); 0 where the grid has no entry.
+ */
+const TD_PRIME_RESERVE_GRID: Map<number, Map<number, Float64Array>> = new Map([
+  // 48-78 month terms
+  [48, new Map([
+    [6.89, Float64Array.of(0, 0, 0.0015, 0.0020, 0.0030, 0.0030)],
+    [7.39, Float64Array.of(0, 0, 0.0030, 0.0050, 0.0050, 0.0060)],
+    [7.89, Float64Array.of(0, 0.0025, 0.0080, 0.0100, 0.0115, 0.0115)],
+    [8.39, Float64Array.of(0, 0.0050, 0.0085, 0.0140, 0.0170, 0.0170)],
+    [8.89, Float64Array.of(0.0010, 0.0100, 0.0180, 0.0215, 0.0235, 0)],
+    [9.39, Float64Array.of(0.0060, 0.0145, 0.0235, 0.0290, 0, 0)],
+  ])],
+  // 84 month terms
+  [84, new Map([
+    [6.89, Float64Array.of(0, 0, 0.0020, 0.0025, 0.0035, 0.0035)],
+    [7.39, Float64Array.of(0, 0, 0.0020, 0.0050, 0.0050, 0.0060)],
+    [7.89, Float64Array.of(0, 0.0025, 0.0080, 0.0100, 0.0115, 0.0120)],
+    [8.39, Float64Array.of(0, 0.0040, 0.0075, 0.0110, 0.0135, 0.0145)],
+    [8.89, Float64Array.of(0.0010, 0.0050, 0.0095, 0.0150, 0.0165, 0)],
+    [9.39, Float64Array.of(0.0050, 0.0085, 0.0160, 0.0210, 0, 0)],
+  ])],
+  // 90-96 month terms
+  [90, new Map([
+    [7.39, Float64Array.of(0, 0, 0.0020, 0.0040, 0.0050, 0.0050)],
+    [7.89, Float64Array.of(0, 0, 0.0050, 0.0080, 0.0100, 0.0110)],
+  ])],
+]);
+
+const TD_PRIME_AMOUNT_BUCKETS: StepTable = compileStepTable(
+  [{ from: 20000 }, { from: 30000 }, { from: 40000 }, { from: 50000 }, { from: 100000 }],
+  [0, 1, 2, 3, 4, 5]
+);
+
+function getTDPrimeRateRow(rate: number, termMonths: number): Float64Array | undefined {
+  // Determine term bucket
+  let termBucket = 48;
+  if (termMonths >= 90) termBucket = 90;
+  else if (termMonths >= 84) termBucket = 84;
+  return TD_PRIME_RESERVE_GRID.get(termBucket)?.get(rate);
+}
+
 /**
  * Calculate TD Prime reserve percentage based on rate, term, and amount financed
  * Returns percentage (e.g., 0.0115 for 1.15%)
@@ -177,54 +221,23 @@ export function calculateTDPrimeReservePercent(
   termMonths: number,
   amountFinanced: number
 ): number {
-  // Rate-based reserve grid from Holiday Special/Eco/Standard programs
-  const reserveGrid: Record<number, Record<number, Record<string, number>>> = {
-    // 48-78 month terms
-    48: {
-      6.89: { '100k+': 0.0030, '50k-99k': 0.0030, '40k-49k': 0.0020, '30k-39k': 0.0015 },
-      7.39: { '100k+': 0.0060, '50k-99k': 0.0050, '40k-49k': 0.0050, '30k-39k': 0.0030 },
-      7.89: { '100k+': 0.0115, '50k-99k': 0.0115, '40k-49k': 0.0100, '30k-39k': 0.0080, '20k-29k': 0.0025 },
-      8.39: { '100k+': 0.0170, '50k-99k': 0.0170, '40k-49k': 0.0140, '30k-39k': 0.0085, '20k-29k': 0.0050 },
-      8.89: { '50k-99k': 0.0235, '40k-49k': 0.0215, '30k-39k': 0.0180, '20k-29k': 0.0100, '7.5k-19k': 0.0010 },
-      9.39: { '40k-49k': 0.0290, '30k-39k': 0.0235, '20k-29k': 0.0145, '7.5k-19k': 0.0060 },
-    },
-    // 84 month terms
-    84: {
-      6.89: { '100k+': 0.0035, '50k-99k': 0.0035, '40k-49k': 0.0025, '30k-39k': 0.0020 },
-      7.39: { '100k+': 0.0060, '50k-99k': 0.0050, '40k-49k': 0.0050, '30k-39k': 0.0020 },
-      7.89: { '100k+': 0.0120, '50k-99k': 0.0115, '40k-49k': 0.0100, '30k-39k': 0.0080, '20k-29k': 0.0025 },
-      8.39: { '100k+': 0.0145, '50k-99k': 0.0135, '40k-49k': 0.0110, '30k-39k': 0.0075, '20k-29k': 0.0040 },
-      8.89: { '50k-99k': 0.0165, '40k-49k': 0.0150, '30k-39k': 0.0095, '20k-29k': 0.0050, '7.5k-19k': 0.0010 },
-      9.39: { '40k-49k': 0.0210, '30k-39k': 0.0160, '20k-29k': 0.0085, '7.5k-19k': 0.0050 },
-    },
-    // 90-96 month terms
-    90: {
-      7.39: { '100k+': 0.0050, '50k-99k': 0.0050, '40k-49k': 0.0040, '30k-39k': 0.0020 },
-      7.89: { '100k+': 0.0110, '50k-99k': 0.0100, '40k-49k': 0.0080, '30k-39k': 0.0050 },
-    },
-  };
-
-  // Determine term bucket
-  let termBucket = 48;
-  if (termMonths >= 90) termBucket = 90;
-  else if (termMonths >= 84) termBucket = 84;
-
-  // Determine amount bucket
-  let amountBucket = '7.5k-19k';
-  if (amountFinanced >= 100000) amountBucket = '100k+';
-  else if (amountFinanced >= 50000) amountBucket = '50k-99k';
-  else if (amountFinanced >= 40000) amountBucket = '40k-49k';
-  else if (amountFinanced >= 30000) amountBucket = '30k-39k';
-  else if (amountFinanced >= 20000) amountBucket = '20k-29k';
-
-  // Find closest rate
-  const termGrid = reserveGrid[termBucket];
-  if (!termGrid) return 0;
-
-  const rateGrid = termGrid[rate];
-  if (!rateGrid) return 0;
+  const row = getTDPrimeRateRow(rate, termMonths);
+  if (!row) return 0;
+  return row[lookupStep(TD_PRIME_AMOUNT_BUCKETS, amountFinanced)];
+}
 
-  return rateGrid[amountBucket] || 0;
+/**
+ * calculateTDPrimeReservePercent for many amounts financed at one rate and term
+ */
+export function calculateTDPrimeReservePercents(
+  rate: number,
+  termMonths: number,
+  amountsFinanced: ArrayLike<number>
+): Float64Array {
+  const row = getTDPrimeRateRow(rate, termMonths);
+  if (!row) return new Float64Array(amountsFinanced.length);
+  const buckets = lookupSteps(TD_PRIME_AMOUNT_BUCKETS, amountsFinanced);
+  return buckets.map(bucket => row[bucket]);
 }
 
 const LENDER_PROGRAMS: Record<string, Record<string, LenderProgram>> = {
@@ -0,0 +1,386 @@
+/**
+ * MARKET SNAPSHOTS
+ * Local store of competitor listings (CarGurus, AutoTrader, Apify) indexed by make, model, year,
+ * mileage bucket and region. Refreshed incrementally in the background, so price bands for the
+ * whole inventory come from one batch lookup instead of live scrapes.
+ */
+
+import { Vehicle } from '../types/types';
+import { TieredCache, TieredCacheStats } from './tiered-cache';
+import { RateLimiter } from './scraper-utils';
+
+export type MarketSource = 'cargurus' | 'autotrader' | 'apify';
+
+export interface MarketListing {
+  source: MarketSource;
+  vin?: string;
+  url?: string;
+  year: number;
+  make: string;
+  model: string;
+  trim?: string;
+  mileage: number;
+  price: number;
+  seenAt: number;
+}
+
+export interface MarketRegion {
+  id: string;           // index key, e.g. 'alberta'
+  postalCode: string;   // CarGurus search origin
+  location: string;     // AutoTrader / Apify search location
+  radiusKm: number;
+}
+
+export interface MarketQuery {
+  year: number;
+  make: string;
+  model: string;
+}
+
+/** Pulls current competitor listings for one year/make/model in a region */
+export interface MarketFetcher {
+  source: MarketSource;
+  fetch: (query: MarketQuery, region: MarketRegion) => Promise<MarketListing[]>;
+}
+
+export interface PriceBand {
+  vehicleId: string;
+  sampleSize: number;
+  widened: boolean;      // neighbouring mileage buckets were pooled to reach the minimum sample
+  p10: number;
+  p25: number;
+  p50: number;
+  p75: number;
+  p90: number;
+  percentile: number | null;   // where the unit's suggestedPrice sits among the comparables (0-100)
+}
+
+export interface MarketRefreshOptions {
+  region?: MarketRegion;
+  maxQueries?: number;   // year/make/model searches per run
+  maxAgeMs?: number;     // refresh searches older than this
+  fetchers?: MarketFetcher[];
+}
+
+export interface MarketRefreshSummary {
+  queried: number;
+  fresh: number;         // skipped, refreshed within maxAgeMs
+  deferred: number;      // stale but over this run's maxQueries
+  listings: number;
+  failures: number;
+}
+
+export interface MarketSnapshotStats {
+  segments: TieredCacheStats;
+  refreshes: TieredCacheStats;
+  refreshing: boolean;
+  lastRefresh: (MarketRefreshSummary & { finishedAt: number }) | null;
+}
+
+interface MarketSegment {
+  listings: MarketListing[];
+  updatedAt: number;
+}
+
+type ScrapedListing = Pick<MarketListing, 'vin' | 'url' | 'year' | 'make' | 'model' | 'trim' | 'mileage' | 'price'>;
+
+const MILEAGE_BUCKET_KM = 20000;
+const MAX_MILEAGE_BUCKET = 10;            // 200,000 km and up share one bucket
+const MIN_SAMPLE = 5;
+const LISTING_MAX_AGE_MS = 14 * 24 * 60 * 60 * 1000;
+const REFRESH_MAX_AGE_MS = (parseFloat(process.env.MARKET_REFRESH_HOURS || '24') || 24) * 60 * 60 * 1000;
+const REFRESH_BATCH = Math.max(1, parseInt(process.env.MARKET_REFRESH_BATCH || '25', 10) || 25);
+const SOURCE_DELAY_MS = 2000;
+
+export const DEFAULT_MARKET_REGION: MarketRegion = {
+  id: (process.env.MARKET_REGION || 'alberta').toLowerCase(),
+  postalCode: process.env.MARKET_POSTAL_CODE || 'T5J',
+  location: process.env.MARKET_LOCATION || 'Alberta',
+  radiusKm: parseInt(process.env.MARKET_RADIUS_KM || '250', 10) || 250,
+};
+
+function norm(value: string): string {
+  return (value || '').trim().toLowerCase().replace(/\s+/g, ' ');
+}
+
+export function mileageBucket(mileage: number): number {
+  return Math.min(MAX_MILEAGE_BUCKET, Math.max(0, Math.floor((mileage || 0) / MILEAGE_BUCKET_KM)));
+}
+
+function segmentKey(make: string, model: string, year: number, bucket: number, region: string): string {
+  return `${norm(make)}|${norm(model)}|${year}|${bucket}|${norm(region)}`;
+}
+
+function queryKey(query: MarketQuery, region: string): string {
+  return `${norm(query.make)}|${norm(query.model)}|${query.year}|${norm(region)}`;
+}
+
+// Same listing seen again (possibly at a new price) replaces the old copy
+function listingKey(listing: MarketListing): string {
+  return `${listing.source}:${listing.vin || listing.url || `${listing.mileage}|${listing.price}`}`;
+}
+
+function mergeSorted(lists: Float64Array[]): Float64Array {
+  const out = new Float64Array(lists.reduce((sum, list) => sum + list.length, 0));
+  let offset = 0;
+  for (const list of lists) {
+    out.set(list, offset);
+    offset += list.length;
+  }
+  return out.sort();
+}
+
+// Linear interpolation between closest ranks
+function quantile(sorted: Float64Array, q: number): number {
+  if (sorted.length === 0) return 0;
+  const pos = (sorted.length - 1) * q;
+  const lo = Math.floor(pos);
+  const hi = Math.ceil(pos);
+  return Math.round(sorted[lo] + (sorted[hi] - sorted[lo]) * (pos - lo));
+}
+
+// Share of comparables priced below `price`, counting ties as half
+function percentileOf(sorted: Float64Array, price: number): number {
+  let below = 0;
+  let equal = 0;
+  for (const p of sorted) {
+    if (p < price) below++;
+    else if (p === price) equal++;
+  }
+  return Math.round(((below + equal / 2) / sorted.length) * 1000) / 10;
+}
+
+export class MarketSnapshotStore {
+  private segments: TieredCache<MarketSegment>;
+  private refreshedAt: TieredCache<number>;   // year/make/model/region search → last refresh
+  private attemptedAt: Map<string, number> = new Map();   // search → last refresh attempt
+  private sortedPrices: Map<string, { updatedAt: number; prices: Float64Array }> = new Map();
+  private refreshing: Promise<MarketRefreshSummary> | null = null;
+  private lastRefresh: (MarketRefreshSummary & { finishedAt: number }) | null = null;
+
+  constructor(dir?: string) {
+    this.segments = new TieredCache<MarketSegment>({ name: 'market-segments', ttlMs: LISTING_MAX_AGE_MS, dir });
+    this.refreshedAt = new TieredCache<number>({ name: 'market-refreshes', ttlMs: 30 * 24 * 60 * 60 * 1000, dir });
+  }
+
+  /**
+   * Merge competitor listings into the store. Listings are matched by VIN or URL within their
+   * source; anything not seen for 14 days drops out. Returns the number of listings accepted.
+   */
+  ingest(listings: MarketListing[], region: string = DEFAULT_MARKET_REGION.id): number {
+    const now = Date.now();
+    const grouped: Map<string, MarketListing[]> = new Map();
+    let accepted = 0;
+
+    for (const listing of listings) {
+      if (!listing.year || !listing.make || !listing.model || !(listing.price > 0)) continue;
+      const key = segmentKey(listing.make, listing.model, listing.year, mileageBucket(listing.mileage), region);
+      const group = grouped.get(key) || [];
+      group.push(listing);
+      grouped.set(key, group);
+      accepted++;
+    }
+
+    for (const [key, incoming] of grouped.entries()) {
+      const merged: Map<string, MarketListing> = new Map();
+      for (const listing of this.segments.get(key)?.listings || []) {
+        if (now - listing.seenAt < LISTING_MAX_AGE_MS) merged.set(listingKey(listing), listing);
+      }
+      for (const listing of incoming) merged.set(listingKey(listing), listing);
+      this.segments.set(key, { listings: Array.from(merged.values()), updatedAt: now });
+    }
+    return accepted;
+  }
+
+  /**
+   * Price bands for many vehicles in one pass. Each unit is compared against listings of the
+   * same make, model, year and mileage bucket; thin segments are pooled with the neighbouring
+   * buckets, then with every bucket of that year, until MIN_SAMPLE listings are found.
+   */
+  priceBands(vehicles: Vehicle[], region: string = DEFAULT_MARKET_REGION.id): PriceBand[] {
+    const comparables: Map<string, { prices: Float64Array; widened: boolean }> = new Map();
+
+    return vehicles.map(vehicle => {
+      const bucket = mileageBucket(vehicle.mileage);
+      const memoKey = segmentKey(vehicle.make, vehicle.model, vehicle.year, bucket, region);
+      let found = comparables.get(memoKey);
+      if (!found) {
+        const bucketPrices = (b: number) => this.pricesFor(segmentKey(vehicle.make, vehicle.model, vehicle.year, b, region));
+        let prices = bucketPrices(bucket);
+        let widened = false;
+        if (prices.length < MIN_SAMPLE) {
+          widened = true;
+          prices = mergeSorted([bucketPrices(bucket - 1), prices, bucketPrices(bucket + 1)]);
+        }
+        if (prices.length < MIN_SAMPLE) {
+          const all: Float64Array[] = [];
+          for (let b = 0; b <= MAX_MILEAGE_BUCKET; b++) all.push(bucketPrices(b));
+          prices = mergeSorted(all);
+        }
+        found = { prices, widened };
+        comparables.set(memoKey, found);
+      }
+
+      const { prices, widened } = found;
+      return {
+        vehicleId: vehicle.id,
+        sampleSize: prices.length,
+        widened,
+        p10: quantile(prices, 0.1),
+        p25: quantile(prices, 0.25),
+        p50: quantile(prices, 0.5),
+        p75: quantile(prices, 0.75),
+        p90: quantile(prices, 0.9),
+        percentile: prices.length > 0 && vehicle.suggestedPrice > 0 ? percentileOf(prices, vehicle.suggestedPrice) : null,
+      };
+    });
+  }
+
+  /**
+   * Refresh listings for the year/make/model combinations in `vehicles`: only searches not
+   * refreshed within maxAgeMs, stalest first, at most maxQueries per run. A call made while a
+   * refresh is running returns that run.
+   */
+  refresh(vehicles: Vehicle[], options: MarketRefreshOptions = {}): Promise<MarketRefreshSummary> {
+    if (this.refreshing) return this.refreshing;
+    this.refreshing = this.runRefresh(vehicles, options).finally(() => {
+      this.refreshing = null;
+    });
+    return this.refreshing;
+  }
+
+  stats(): MarketSnapshotStats {
+    return {
+      segments: this.segments.stats(),
+      refreshes: this.refreshedAt.stats(),
+      refreshing: !!this.refreshing,
+      lastRefresh: this.lastRefresh,
+    };
+  }
+
+  private pricesFor(key: string): Float64Array {
+    const segment = this.segments.get(key);
+    if (!segment) return new Float64Array(0);
+    const memo = this.sortedPrices.get(key);
+    if (memo && memo.updatedAt === segment.updatedAt) return memo.prices;
+
+    const cutoff = Date.now() - LISTING_MAX_AGE_MS;
+    const prices = Float64Array.from(segment.listings.filter(l => l.seenAt > cutoff).map(l => l.price)).sort();
+    this.sortedPrices.set(key, { updatedAt: segment.updatedAt, prices });
+    return prices;
+  }
+
+  private async runRefresh(vehicles: Vehicle[], options: MarketRefreshOptions): Promise<MarketRefreshSummary> {
+    const region = options.region || DEFAULT_MARKET_REGION;
+    const maxAgeMs = options.maxAgeMs ?? REFRESH_MAX_AGE_MS;
+    const maxQueries = options.maxQueries || REFRESH_BATCH;
+    const fetchers = options.fetchers || defaultMarketFetchers();
+    const now = Date.now();
+
+    const queries: Map<string, MarketQuery> = new Map();
+    for (const v of vehicles) {
+      if (!v.year || !v.make || !v.model) continue;
+      queries.set(queryKey(v, region.id), { year: v.year, make: v.make, model: v.model });
+    }
+
+    const stale: Array<{ key: string; query: MarketQuery; at: number }> = [];
+    let fresh = 0;
+    for (const [key, query] of queries.entries()) {
+      const at = this.refreshedAt.get(key) || 0;
+      if (now - at < maxAgeMs) fresh++;
+      // Searches that came back empty stay stale but queue behind ones not tried as recently
+      else stale.push({ key, query, at: Math.max(at, this.attemptedAt.get(key) || 0) });
+    }
+    stale.sort((a, b) => a.at - b.at);
+    const batch = stale.slice(0, maxQueries);
+
+    const summary: MarketRefreshSummary = { queried: 0, fresh, deferred: stale.length - batch.length, listings: 0, failures: 0 };
+    const limiter = new RateLimiter(SOURCE_DELAY_MS);
+    for (const { key, query } of batch) {
+      // Scrapers can swallow a block or error and return nothing, so only listings count as a refresh
+      let accepted = 0;
+      for (const fetcher of fetchers) {
+        try {
+          await limiter.waitIfNeeded();
+          accepted += this.ingest(await fetcher.fetch(query, region), region.id);
+        } catch (error) {
+          summary.failures++;
+          console.error(`[MARKET] ${fetcher.source} failed for ${query.year} ${query.make} ${query.model}:`, (error as Error).message);
+        }
+      }
+      summary.queried++;
+      summary.listings += accepted;
+      this.attemptedAt.set(key, Date.now());
+      if (accepted > 0) this.refreshedAt.set(key, Date.now());
+    }
+
+    console.log(`[MARKET] Refreshed ${summary.queried} searches (${summary.listings} listings, ${summary.fresh} fresh, ${summary.deferred} deferred)`);
+    this.lastRefresh = { ...summary, finishedAt: Date.now() };
+    return summary;
+  }
+}
+
+/**
+ * Convert scraper results (CarGurus/AutoTrader listings, Apify actor results) for ingestion
+ */
+export function toMarketListings(source: MarketSource, listings: ScrapedListing[], seenAt: number = Date.now()): MarketListing[] {
+  return listings.map(l => ({
+    source,
+    vin: l.vin || undefined,
+    url: l.url || undefined,
+    year: l.year,
+    make: l.make,
+    model: l.model,
+    trim: l.trim || undefined,
+    mileage: l.mileage,
+    price: l.price,
+    seenAt,
+  }));
+}
+
+/**
+ * Default sources: CarGurus and AutoTrader scrapers, plus Apify when a token is configured
+ */
+export function defaultMarketFetchers(): MarketFetcher[] {
+  const fetchers: MarketFetcher[] = [
+    {
+      source: 'cargurus',
+      fetch: async (query, region) => {
+        const { searchMarketData } = await import('./scrapers/cargurus-ca');
+        const result = await searchMarketData(query.year, query.make, query.model, region.radiusKm, region.postalCode);
+        return toMarketListings('cargurus', result.listings);
+      },
+    },
+    {
+      source: 'autotrader',
+      fetch: async (query, region) => {
+        const { searchCompetitorPricing } = await import('./scrapers/autotrader-ca');
+        const result = await searchCompetitorPricing(query.year, query.make, query.model, region.radiusKm, region.location);
+        return toMarketListings('autotrader', result.listings);
+      },
+    },
+  ];
+  if (process.env.APIFY_API_TOKEN) {
+    fetchers.push({
+      source: 'apify',
+      fetch: async (query, region) => {
+        // Raw actor results keep each listing's URL, so listings without a VIN stay distinct
+        const { ApifyScraperService } = await import('./scrapers/apify-integration');
+        const apify = new ApifyScraperService();
+        const params = {
+          make: query.make, model: query.model, yearMin: query.year, yearMax: query.year,
+          location: region.location, radiusKm: region.radiusKm, limit: 50,
+        };
+        const runs = await Promise.allSettled([apify.scrapeAutoTraderCA(params), apify.scrapeCarGurusCA(params)]);
+        const failed = runs.filter((r): r is PromiseRejectedResult => r.status === 'rejected');
+        if (failed.length === runs.length) throw failed[0].reason;
+        const listings: ScrapedListing[] = [];
+        for (const run of runs) if (run.status === 'fulfilled') listings.push(...run.value);
+        return toMarketListings('apify', listings);
+      },
+    });
+  }
+  return fetchers;
+}
+
+export const marketSnapshots = new MarketSnapshotStore();
@@ -112,6 +112,31 @@ export async function getDealershipById(dealershipId: string): Promise<Dealershi
   }
 }
 
+/**
+ * List active dealerships (empty when Supabase is not configured)
+ */
+export async function listActiveDealerships(): Promise<Dealership[]> {
+  const sb = getSupabase();
+  if (!sb) return [];
+
+  try {
+    const { data, error } = await sb
+      .from('dealerships')
+      .select('*')
+      .eq('is_active', true);
+
+    if (error) {
+      console.error('Failed to list dealerships:', error);
+      return [];
+    }
+
+    return (data || []) as Dealership[];
+  } catch (error) {
+    console.error('Error in listActiveDealerships:', error);
+    return [];
+  }
+}
+
 /**
  * Update dealership configuration
  */
@@ -22,19 +22,71 @@ export function calculateMonthlyPayment(
   annualRate: number,
   numberOfMonths: number
 ): PaymentCalculationResult {
-  // Validate inputs
-  const validationErrors = validatePaymentInputs(principal, annualRate, numberOfMonths);
-  if (validationErrors.length > 0) {
-    throw new Error(
-      `Payment calculation validation failed:\n${validationErrors
-        .map((e) => `  - ${e.message}`)
-        .join("\n")}`
-    );
-  }
+  assertValidPaymentInputs(principal, annualRate, numberOfMonths);
 
   // Calculate monthly interest rate
   const monthlyRate = annualRate / 12 / 100;
+  const monthlyPayment = roundedMonthlyPayment(principal, monthlyRate, numberOfMonths);
+
+  // Total interest in closed form; the schedule itself is only built if someone reads it
+  const totalInterest = closedFormTotalInterest(principal, monthlyRate, monthlyPayment, numberOfMonths);
+  const totalAmortized = monthlyPayment * numberOfMonths;
+
+  let schedule: AmortizationEntry[] | null = null;
+  return {
+    monthlyPayment,
+    totalInterest: Math.round(totalInterest * 100) / 100,
+    totalAmortized,
+    get amortizationSchedule(): AmortizationEntry[] {
+      if (!schedule) {
+        schedule = Array.from(amortizationRows(principal, monthlyRate, monthlyPayment, numberOfMonths, 1, numberOfMonths));
+      }
+      return schedule;
+    },
+  };
+}
+
+/**
+ * Monthly payment only (rounded to nearest $5), without building the amortization schedule.
+ * Same validation and result as calculateMonthlyPayment(...).monthlyPayment; use in hot loops.
+ */
+export function calculatePaymentAmount(
+  principal: number,
+  annualRate: number,
+  numberOfMonths: number
+): number {
+  assertValidPaymentInputs(principal, annualRate, numberOfMonths);
+  return roundedMonthlyPayment(principal, annualRate / 12 / 100, numberOfMonths);
+}
+
+const annuityFactorCache: Map<string, number> = new Map();
+
+/**
+ * Payment per dollar financed for a (rate, term): r(1+r)^n / [(1+r)^n - 1], or 1/n at 0%.
+ * Cached per (rate, term) since the same handful of programs is priced over and over.
+ */
+export function getAnnuityFactor(annualRate: number, numberOfMonths: number): number {
+  const key = `${annualRate}|${numberOfMonths}`;
+  let factor = annuityFactorCache.get(key);
+  if (factor === undefined) {
+    const monthlyRate = annualRate / 12 / 100;
+    if (monthlyRate === 0) {
+      factor = 1 / numberOfMonths;
+    } else {
+      const growth = Math.pow(1 + monthlyRate, numberOfMonths);
+      factor = (monthlyRate * growth) / (growth - 1);
+    }
+    if (annuityFactorCache.size >= 1000) annuityFactorCache.clear();
+    annuityFactorCache.set(key, factor);
+  }
+  return factor;
+}
 
+/**
+ * Amortized payment rounded to nearest $5
+ * @private
+ */
+function roundedMonthlyPayment(principal: number, monthlyRate: number, numberOfMonths: number): number {
   // Handle edge case: 0% interest
   let monthlyPaymentRaw: number;
   if (monthlyRate === 0) {
@@ -47,26 +99,22 @@ export function calculateMonthlyPayment(
   }
 
   // Round to nearest $5
-  const monthlyPayment = Math.round(monthlyPaymentRaw / 5) * 5;
-
-  // Generate full amortization schedule
-  const amortizationSchedule = generateAmortizationSchedule(
-    principal,
-    monthlyRate,
-    monthlyPayment,
-    numberOfMonths
-  );
-
-  // Calculate totals
-  const totalInterest = amortizationSchedule.reduce((sum, entry) => sum + entry.interest, 0);
-  const totalAmortized = monthlyPayment * numberOfMonths;
+  return Math.round(monthlyPaymentRaw / 5) * 5;
+}
 
-  return {
-    monthlyPayment,
-    totalInterest: Math.round(totalInterest * 100) / 100,
-    totalAmortized,
-    amortizationSchedule,
-  };
+/**
+ * Throws if payment inputs are invalid
+ * @private
+ */
+function assertValidPaymentInputs(principal: number, annualRate: number, numberOfMonths: number): void {
+  const validationErrors = validatePaymentInputs(principal, annualRate, numberOfMonths);
+  if (validationErrors.length > 0) {
+    throw new Error(
+      `Payment calculation validation failed:\n${validationErrors
+        .map((e) => `  - ${e.message}`)
+        .join("\n")}`
+    );
+  }
 }
 
 /**
@@ -146,19 +194,38 @@ function validatePaymentInputs(
 }
 
 /**
- * Generates complete amortization schedule
+ * Interest paid over the loan: n·M − (P − B_n), with the balance after n payments
+ * B_n = P(1+r)^n − M[(1+r)^n − 1]/r (the rounded payment rarely retires the loan exactly)
  * @private
  */
-function generateAmortizationSchedule(
+function closedFormTotalInterest(
   principal: number,
   monthlyRate: number,
   monthlyPayment: number,
   numberOfMonths: number
-): AmortizationEntry[] {
-  const schedule: AmortizationEntry[] = [];
+): number {
+  if (monthlyRate === 0) return 0;
+  const growth = Math.pow(1 + monthlyRate, numberOfMonths);
+  const finalBalance = principal * growth - (monthlyPayment * (growth - 1)) / monthlyRate;
+  return monthlyPayment * numberOfMonths - (principal - finalBalance);
+}
+
+/**
+ * Amortization rows for months [fromMonth, toMonth], generated on demand
+ * @private
+ */
+function* amortizationRows(
+  principal: number,
+  monthlyRate: number,
+  monthlyPayment: number,
+  numberOfMonths: number,
+  fromMonth: number,
+  toMonth: number
+): Generator<AmortizationEntry> {
   let remainingBalance = principal;
+  const lastMonth = Math.min(toMonth, numberOfMonths);
 
-  for (let month = 1; month <= numberOfMonths; month++) {
+  for (let month = 1; month <= lastMonth; month++) {
     // Calculate interest for this month
     const interestPayment = remainingBalance * monthlyRate;
 
@@ -168,19 +235,62 @@ function generateAmortizationSchedule(
     // Update balance
     remainingBalance -= principalPayment;
 
+    if (month < fromMonth) continue;
+
     // Handle final month rounding
     const finalBalance = month === numberOfMonths ? 0 : remainingBalance;
 
-    schedule.push({
+    yield {
       month,
       payment: monthlyPayment,
       principal: Math.round(principalPayment * 100) / 100,
       interest: Math.round(interestPayment * 100) / 100,
       balance: Math.round(finalBalance * 100) / 100,
-    });
+    };
   }
+}
 
-  return schedule;
+/**
+ * Lazy amortization schedule: rows are computed only as they are consumed,
+ * so a worksheet page or a streamed export never materializes the whole loan.
+ *
+ * @param fromMonth - First month to yield (1-based, default 1)
+ * @param toMonth - Last month to yield (default: the full term)
+ */
+export function iterateAmortizationSchedule(
+  principal: number,
+  annualRate: number,
+  numberOfMonths: number,
+  fromMonth: number = 1,
+  toMonth: number = numberOfMonths
+): Generator<AmortizationEntry> {
+  assertValidPaymentInputs(principal, annualRate, numberOfMonths);
+  const monthlyRate = annualRate / 12 / 100;
+  const monthlyPayment = roundedMonthlyPayment(principal, monthlyRate, numberOfMonths);
+  return amortizationRows(principal, monthlyRate, monthlyPayment, numberOfMonths, fromMonth, toMonth);
+}
+
+/** Values per month in a packed schedule: month, principal, interest, balance */
+export const AMORTIZATION_STRIDE = 4;
+
+/**
+ * Amortization schedule packed into one Float64Array (AMORTIZATION_STRIDE values per month),
+ * with the same rounded values as iterateAmortizationSchedule
+ */
+export function packAmortizationSchedule(
+  principal: number,
+  annualRate: number,
+  numberOfMonths: number
+): Float64Array {
+  const packed = new Float64Array(numberOfMonths * AMORTIZATION_STRIDE);
+  let offset = 0;
+  for (const row of iterateAmortizationSchedule(principal, annualRate, numberOfMonths)) {
+    packed[offset++] = row.month;
+    packed[offset++] = row.principal;
+    packed[offset++] = row.interest;
+    packed[offset++] = row.balance;
+  }
+  return packed;
 }
 
 /**
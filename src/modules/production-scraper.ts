@@ -12,9 +12,81 @@
  * 7. Stealth bot detection bypass
  */
 
-import axios from 'axios';
 import { load as cheerioLoad } from 'cheerio';
 import { Vehicle } from '../types/types';
+import { withPage } from './browser-pool';
+import { fetchPagesConcurrently, getHostRateLimiter } from './scraper-utils';
+import { fetchConditional, ConditionalPage } from './conditional-fetch';
+import { httpClient } from './http-client';
+import { DEALER_SELECTOR_SETS, DealerSelectorSet } from '../config/scraper-selectors';
+import { PaginationPattern, SiteProfile, getSiteProfile, saveSiteProfile, forgetSiteProfile } from './site-profiles';
+
+// Listing pages fetched at once per scrape, and minimum spacing between requests to one host
+const PAGE_CONCURRENCY = 4;
+const HOST_DELAY_MS = 500;
+
+// Extraction strategies in fallback order; dom:<id> entries come from DEALER_SELECTOR_SETS
+const EXTRACTION_STRATEGIES: string[] = [
+  'json-ld',
+  'open-graph',
+  'microdata',
+  'rdfa',
+  ...DEALER_SELECTOR_SETS.map(set => `dom:${set.id}`),
+  'regex',
+];
+
+// Structured-data layers always get a look before a remembered DOM/regex strategy
+const STRUCTURED_STRATEGIES = ['json-ld', 'microdata', 'rdfa'];
+// Single-page or last-resort layers that are never remembered for a domain
+const UNREMEMBERED_STRATEGIES = new Set(['open-graph', 'regex']);
+// A page yielding less than this share of the remembered strategy's usual yield falls through
+const MIN_YIELD_RATIO = 0.5;
+
+// Strategy that last produced vehicles, per domain, and the most vehicles it found on one page
+const winningStrategies: Map<string, string> = new Map();
+const strategyYields: Map<string, number> = new Map();
+
+// Image containers tried for vehicle photos, in order
+const GALLERY_SELECTORS = [
+  '.vehicle-gallery img',
+  '.image-gallery img',
+  '.carousel img',
+  '.slider img',
+  '[class*="gallery"] img',
+  '[class*="photo"] img',
+  '[id*="gallery"] img',
+  '[data-gallery] img',
+];
+
+// Selectors learned for one site (persisted in its SiteProfile); price/mileage belong to selectorSet
+interface LearnedSelectors {
+  gallerySelector?: string;
+  selectorSet?: string;
+  priceSelector?: string;
+  mileageSelector?: string;
+}
+
+function hostOf(url: string): string {
+  try {
+    return new URL(url).host.toLowerCase();
+  } catch (_e) {
+    return url;
+  }
+}
+
+/**
+ * Strategy ids in the order extractVehicles tries them. A remembered structured strategy runs
+ * first; any other remembered strategy runs right after the structured layers.
+ */
+export function extractionOrder(remembered?: string): string[] {
+  if (!remembered || UNREMEMBERED_STRATEGIES.has(remembered) || !EXTRACTION_STRATEGIES.includes(remembered)) {
+    return EXTRACTION_STRATEGIES;
+  }
+  const rest = EXTRACTION_STRATEGIES.filter(id => id !== remembered);
+  if (STRUCTURED_STRATEGIES.includes(remembered)) return [remembered, ...rest];
+  const structured = rest.filter(id => STRUCTURED_STRATEGIES.includes(id));
+  return [...structured, remembered, ...rest.filter(id => !STRUCTURED_STRATEGIES.includes(id))];
+}
 
 interface ScraperConfig {
   baseUrl: string;
@@ -22,12 +94,8 @@ interface ScraperConfig {
   minScore?: number;
   headless?: boolean;
   useCache?: boolean;
-}
-
-interface PaginationPattern {
-  type: 'query' | 'offset' | 'path' | 'next-link' | 'none';
-  param?: string;
-  pageSize?: number;
+  concurrency?: number;   // listing pages in flight (query/path pagination)
+  onPage?: (page: number, vehicles: number) => void;  // progress hook, called per listing page fetched
 }
 
 interface DataQualityScore {
@@ -39,7 +107,9 @@ interface DataQualityScore {
 class ProductionDealershipScraper {
   private config: ScraperConfig;
   private allVehicles: Vehicle[] = [];
-  private browser: any = null;
+  private learned: LearnedSelectors = {};
+  private bestPageYield = 0;   // most vehicles found on one listing page this run
+  private prefetched: Map<string, Vehicle[]> = new Map();  // listing pages already fetched this run
   private userAgents: string[] = [
     'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/121.0.0.0 Safari/537.36',
     'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/121.0.0.0 Safari/537.36',
@@ -65,35 +135,101 @@ class ProductionDealershipScraper {
     console.log(`[SCRAPER] Starting scrape of ${this.config.baseUrl}`);
     const startTime = Date.now();
 
-    try {
-      // STEP 1: Detect pagination pattern
-      const paginationPattern = await this.detectPagination();
+    // STEP 1: Pagination and extraction from the learned site profile, or detect them
+    const domain = hostOf(this.config.baseUrl);
+    const profile = this.config.useCache ? getSiteProfile(domain) : null;
+    let paginationPattern: PaginationPattern;
+    if (profile) {
+      paginationPattern = profile.pagination;
+      this.learned = {
+        gallerySelector: profile.gallerySelector,
+        selectorSet: profile.strategy?.startsWith('dom:') ? profile.strategy.slice(4) : undefined,
+        priceSelector: profile.priceSelector,
+        mileageSelector: profile.mileageSelector,
+      };
+      if (profile.strategy && !UNREMEMBERED_STRATEGIES.has(profile.strategy)) {
+        winningStrategies.set(domain, profile.strategy);
+        if (profile.pageYield) strategyYields.set(domain, profile.pageYield);
+      }
+      console.log(`[SCRAPER] Using learned profile for ${domain}: ${paginationPattern.type} pagination, ${profile.strategy || 'no'} strategy`);
+    } else {
+      paginationPattern = await this.detectPagination();
       console.log(`[SCRAPER] Detected pagination: ${paginationPattern.type}`);
+    }
 
-      // STEP 2: Fetch all pages with pagination
-      await this.fetchAllPages(paginationPattern);
-      console.log(`[SCRAPER] Fetched ${this.allVehicles.length} total vehicles`);
+    // A profile is valid while its first listing page still yields close to what a page used to;
+    // otherwise forget it and learn from scratch before crawling the rest of the site
+    let previous = profile;
+    if (profile) {
+      const firstUrl = this.firstPageUrl(paginationPattern);
+      const first = await this.fetchPageVehicles(firstUrl);
+      const expectedYield = profile.pageYield || 1;
+      if (first.length >= Math.max(1, Math.ceil(expectedYield * MIN_YIELD_RATIO))) {
+        this.prefetched.set(firstUrl, first);
+      } else {
+        console.log(`[SCRAPER] Learned profile for ${domain} found ${first.length} vehicles on the first page (expected ${expectedYield}), re-learning`);
+        previous = null;
+        forgetSiteProfile(domain);
+        // Keep a strategy the first page has just switched to; an unchanged refetch will not re-run it
+        if (winningStrategies.get(domain) === profile.strategy) {
+          winningStrategies.delete(domain);
+          strategyYields.delete(domain);
+        }
+        this.learned = {};
+        this.bestPageYield = 0;
+        paginationPattern = await this.detectPagination();
+        console.log(`[SCRAPER] Detected pagination: ${paginationPattern.type}`);
+      }
+    }
 
-      // STEP 3: Deduplicate vehicles by VIN or stock number
-      const deduplicated = this.deduplicateVehicles();
-      console.log(`[SCRAPER] Deduplicated to ${deduplicated.length} unique vehicles`);
+    // STEP 2: Fetch all pages with pagination
+    await this.fetchAllPages(paginationPattern);
+    this.prefetched.clear();
+    console.log(`[SCRAPER] Fetched ${this.allVehicles.length} total vehicles`);
 
-      // STEP 4: Filter by quality score (adjusted thresholds)
-      this.allVehicles = deduplicated;
-      const filtered = this.filterByQuality();
-      console.log(`[SCRAPER] Filtered to ${filtered.length} quality vehicles`);
+    if (this.config.useCache && this.allVehicles.length > 0) {
+      this.saveProfile(domain, paginationPattern, previous);
+    }
 
-      // STEP 4: Validate and enrich data
-      const validated = this.validateVehicles(filtered);
-      console.log(`[SCRAPER] Final validated count: ${validated.length}`);
+    // STEP 3: Deduplicate vehicles by VIN or stock number
+    const deduplicated = this.deduplicateVehicles();
+    console.log(`[SCRAPER] Deduplicated to ${deduplicated.length} unique vehicles`);
 
-      const duration = ((Date.now() - startTime) / 1000).toFixed(2);
-      console.log(`[SCRAPER] Scrape completed in ${duration}s`);
+    // STEP 4: Filter by quality score (adjusted thresholds)
+    this.allVehicles = deduplicated;
+    const filtered = this.filterByQuality();
+    console.log(`[SCRAPER] Filtered to ${filtered.length} quality vehicles`);
 
-      return validated;
-    } finally {
-      await this.cleanup();
-    }
+    // STEP 4: Validate and enrich data
+    const validated = this.validateVehicles(filtered);
+    console.log(`[SCRAPER] Final validated count: ${validated.length}`);
+
+    const duration = ((Date.now() - startTime) / 1000).toFixed(2);
+    console.log(`[SCRAPER] Scrape completed in ${duration}s`);
+
+    return validated;
+  }
+
+  /**
+   * Record what worked for this site. Price/mileage selectors are kept only while their
+   * selector set is still the winning strategy.
+   */
+  private saveProfile(domain: string, pagination: PaginationPattern, previous: SiteProfile | null): void {
+    const remembered = winningStrategies.get(domain) || previous?.strategy;
+    const strategy = remembered && !UNREMEMBERED_STRATEGIES.has(remembered) ? remembered : undefined;
+    const fieldsApply = !!this.learned.selectorSet && strategy === `dom:${this.learned.selectorSet}`;
+    const now = Date.now();
+    saveSiteProfile({
+      domain,
+      pagination,
+      strategy,
+      gallerySelector: this.learned.gallerySelector,
+      priceSelector: fieldsApply ? this.learned.priceSelector : undefined,
+      mileageSelector: fieldsApply ? this.learned.mileageSelector : undefined,
+      pageYield: this.bestPageYield || undefined,
+      learnedAt: previous && previous.strategy === strategy ? previous.learnedAt : now,
+      validatedAt: now,
+    });
   }
 
   /**
@@ -139,9 +275,9 @@ class ProductionDealershipScraper {
     // If no pagination detected, just fetch the single page
     if (pagination.type === 'none') {
       console.log('[SCRAPER] No pagination detected - fetching single page');
-      const html = await this.fetchHtmlFast(this.config.baseUrl);
-      const vehicles = await this.extractVehicles(html, this.config.baseUrl);
+      const vehicles = await this.fetchPageVehicles(this.config.baseUrl);
       this.allVehicles.push(...vehicles);
+      this.config.onPage?.(1, vehicles.length);
       console.log(`[SCRAPER] Extracted ${vehicles.length} vehicles from single page`);
       return;
     }
@@ -151,29 +287,22 @@ class ProductionDealershipScraper {
       return;
     }
 
-    // Query string or path-based pagination
-    for (let page = 1; page <= (this.config.maxPages || 10); page++) {
-      const url = this.buildPaginatedUrl(page, pagination);
-      console.log(`[SCRAPER] Fetching page ${page}: ${url}`);
-
-      try {
-        const html = await this.fetchHtmlFast(url);
-        const vehicles = await this.extractVehicles(html, url);
-
-        if (vehicles.length === 0) {
-          console.log(`[SCRAPER] No vehicles on page ${page}, stopping pagination`);
-          break;
-        }
-
-        this.allVehicles.push(...vehicles);
-
-        // Respectful rate limiting with randomization
-        await this.delay(500 + Math.random() * 500);
-      } catch (error) {
-        console.error(`[SCRAPER] Error on page ${page}:`, error);
-        break;
-      }
-    }
+    // Query string or path-based pagination: several pages in flight per host, each parsed on arrival
+    const maxPages = this.config.maxPages || 10;
+    const vehicles = await fetchPagesConcurrently(
+      maxPages,
+      this.config.concurrency || PAGE_CONCURRENCY,
+      async page => {
+        const url = this.buildPaginatedUrl(page, pagination);
+        console.log(`[SCRAPER] Fetching page ${page}: ${url}`);
+        const found = await this.fetchPageVehicles(url);
+        this.config.onPage?.(page, found.length);
+        if (found.length === 0) console.log(`[SCRAPER] No vehicles on page ${page}, stopping pagination`);
+        return found;
+      },
+      getHostRateLimiter(this.config.baseUrl, HOST_DELAY_MS)
+    );
+    this.allVehicles.push(...vehicles);
   }
 
   /**
@@ -183,7 +312,10 @@ class ProductionDealershipScraper {
     let currentUrl: string | null = this.config.baseUrl;
     let pageCount = 0;
 
+    const limiter = getHostRateLimiter(this.config.baseUrl, HOST_DELAY_MS);
+
     while (currentUrl && pageCount < (this.config.maxPages || 10)) {
+      await limiter.waitIfNeeded();
       console.log(`[SCRAPER] Fetching page ${pageCount + 1}: ${currentUrl}`);
 
       try {
@@ -191,7 +323,8 @@ class ProductionDealershipScraper {
         const $: cheerio.Root = cheerioLoad(html);
 
         // Extract vehicles from current page
-        const vehicles = await this.extractVehicles(html, currentUrl);
+        const vehicles = await this.extractVehicles(html, currentUrl, $);
+        this.config.onPage?.(pageCount + 1, vehicles.length);
         if (vehicles.length === 0) break;
 
         this.allVehicles.push(...vehicles);
@@ -201,7 +334,6 @@ class ProductionDealershipScraper {
         currentUrl = nextLink ? new URL(nextLink, currentUrl).href : null;
 
         pageCount++;
-        await this.delay(500 + Math.random() * 500);
       } catch (error) {
         console.error(`[SCRAPER] Error following next link:`, error);
         break;
@@ -209,6 +341,15 @@ class ProductionDealershipScraper {
     }
   }
 
+  /**
+   * URL of the first listing page fetchAllPages requests for a pattern
+   */
+  private firstPageUrl(pagination: PaginationPattern): string {
+    return pagination.type === 'query' || pagination.type === 'path'
+      ? this.buildPaginatedUrl(1, pagination)
+      : this.config.baseUrl;
+  }
+
   /**
    * Build paginated URL based on pattern
    */
@@ -230,49 +371,56 @@ class ProductionDealershipScraper {
   }
 
   /**
-   * FIX #4: Extract vehicles using 6-layer fallback strategy
+   * FIX #4: Extract vehicles using 6-layer fallback strategy.
+   * The page is parsed once and every layer reads the same document. The strategy that last
+   * worked for this domain skips the DOM probing, but structured data still runs ahead of a
+   * remembered DOM strategy, and a page where it yields well under its usual count falls
+   * through to the remaining layers (the largest result wins; regex only if nothing else hit).
    */
-  private async extractVehicles(html: string, baseUrl: string): Promise<Vehicle[]> {
-    // Layer 1: JSON-LD structured data
-    let vehicles = this.extractFromJsonLd(html, baseUrl);
-    if (vehicles.length > 0) {
-      console.log(`[SCRAPER] ✓ Extracted ${vehicles.length} from JSON-LD`);
-      return vehicles;
+  private async extractVehicles(html: string, baseUrl: string, $: cheerio.Root = cheerioLoad(html)): Promise<Vehicle[]> {
+    const domain = hostOf(baseUrl);
+    const remembered = winningStrategies.get(domain);
+    const expected = remembered ? strategyYields.get(domain) || 0 : 0;
+    const minYield = Math.max(1, Math.ceil(expected * MIN_YIELD_RATIO));
+
+    let best: { id: string; vehicles: Vehicle[] } | null = null;
+    for (const id of extractionOrder(remembered)) {
+      if (id === 'regex' && best) break;
+      const vehicles = this.runStrategy(id, $, html, baseUrl);
+      if (vehicles.length > (best?.vehicles.length || 0)) best = { id, vehicles };
+      if (vehicles.length >= minYield) break;
     }
 
-    // Layer 2: Open Graph meta tags
-    vehicles = this.extractFromOpenGraph(html, baseUrl);
-    if (vehicles.length > 0) {
-      console.log(`[SCRAPER] ✓ Extracted ${vehicles.length} from Open Graph`);
-      return vehicles;
+    if (!best) {
+      console.log('[SCRAPER] ✓ Extracted 0 vehicles (no strategy matched)');
+      return [];
     }
-
-    // Layer 3: Microdata (Schema.org)
-    vehicles = this.extractFromMicrodata(html, baseUrl);
-    if (vehicles.length > 0) {
-      console.log(`[SCRAPER] ✓ Extracted ${vehicles.length} from Microdata`);
-      return vehicles;
-    }
-
-    // Layer 4: RDFa markup
-    vehicles = this.extractFromRDFa(html, baseUrl);
-    if (vehicles.length > 0) {
-      console.log(`[SCRAPER] ✓ Extracted ${vehicles.length} from RDFa`);
-      return vehicles;
+    const { id, vehicles } = best;
+    this.bestPageYield = Math.max(this.bestPageYield, vehicles.length);
+    console.log(`[SCRAPER] ✓ Extracted ${vehicles.length} using ${id}${id === remembered ? ' (remembered)' : ''}`);
+    if (!UNREMEMBERED_STRATEGIES.has(id)) {
+      if (id !== remembered) {
+        winningStrategies.set(domain, id);
+        strategyYields.set(domain, vehicles.length);
+      } else if (vehicles.length > expected) {
+        strategyYields.set(domain, vehicles.length);
+      }
     }
+    return vehicles;
+  }
 
-    // Layer 5: DOM parsing with multiple selector sets
-    vehicles = this.extractFromDOM(html, baseUrl);
-    if (vehicles.length > 0) {
-      console.log(`[SCRAPER] ✓ Extracted ${vehicles.length} from DOM`);
-      return vehicles;
+  private runStrategy(id: string, $: cheerio.Root, html: string, baseUrl: string): Vehicle[] {
+    switch (id) {
+      case 'json-ld': return this.extractFromJsonLd(html, baseUrl);
+      case 'open-graph': return this.extractFromOpenGraph($, baseUrl);
+      case 'microdata': return this.extractFromMicrodata($, baseUrl);
+      case 'rdfa': return this.extractFromRDFa($, baseUrl);
+      case 'regex': return this.extractFromRegex(html, baseUrl);
+      default: {
+        const set = DEALER_SELECTOR_SETS.find(candidate => `dom:${candidate.id}` === id);
+        return set ? this.extractFromDOM($, set, baseUrl) : [];
+      }
     }
-
-    // Layer 6: Regex-based extraction (last resort)
-    vehicles = this.extractFromRegex(html, baseUrl);
-    console.log(`[SCRAPER] ✓ Extracted ${vehicles.length} using regex patterns`);
-
-    return vehicles;
   }
 
   /**
@@ -317,8 +465,7 @@ class ProductionDealershipScraper {
   /**
    * FIX #4 - Layer 2: Extract from Open Graph meta tags
    */
-  private extractFromOpenGraph(html: string, baseUrl: string): Vehicle[] {
-    const $ = cheerioLoad(html);
+  private extractFromOpenGraph($: cheerio.Root, baseUrl: string): Vehicle[] {
     const vehicle: Partial<Vehicle> = {};
 
     const ogTitle = $('meta[property="og:title"]').attr('content');
@@ -358,8 +505,7 @@ class ProductionDealershipScraper {
   /**
    * FIX #4 - Layer 3: Extract from Microdata (Schema.org)
    */
-  private extractFromMicrodata(html: string, baseUrl: string): Vehicle[] {
-    const $ = cheerioLoad(html);
+  private extractFromMicrodata($: cheerio.Root, baseUrl: string): Vehicle[] {
     const vehicles: Vehicle[] = [];
 
     $('[itemtype*="schema.org/Vehicle"], [itemtype*="schema.org/Car"]').each((idx, el) => {
@@ -391,8 +537,7 @@ class ProductionDealershipScraper {
   /**
    * FIX #4 - Layer 4: Extract from RDFa markup
    */
-  private extractFromRDFa(html: string, baseUrl: string): Vehicle[] {
-    const $ = cheerioLoad(html);
+  private extractFromRDFa($: cheerio.Root, baseUrl: string): Vehicle[] {
     const vehicles: Vehicle[] = [];
 
     $('[typeof*="Vehicle"], [typeof*="Car"]').each((idx, el) => {
@@ -420,67 +565,73 @@ class ProductionDealershipScraper {
   }
 
   /**
-   * FIX #4 - Layer 5: Extract from DOM with multiple selector sets
+   * FIX #4 - Layer 5: Extract from DOM with one selector set (see DEALER_SELECTOR_SETS)
    */
-  private extractFromDOM(html: string, baseUrl: string): Vehicle[] {
-    const $ = cheerioLoad(html);
+  private extractFromDOM($: cheerio.Root, selectors: DealerSelectorSet, baseUrl: string): Vehicle[] {
     const vehicles: Vehicle[] = [];
+    const known: LearnedSelectors = this.learned.selectorSet === selectors.id ? this.learned : {};
+    const found: LearnedSelectors = { selectorSet: selectors.id };
 
-    const selectorSets = [
-      { card: 'div.vehicle-card, div.vehicle-listing, div[data-vehicle]', title: 'h2, h3, .title, .vehicle-title', price: '.price, .vehicle-price, [class*="price"]', mileage: '.mileage, .odometer, [class*="mileage"]', vin: '.vin, [data-vin]' },
-      { card: 'article.vehicle, article.car, article[data-vehicle-id]', title: 'h2, h3, .heading', price: '.price, .cost', mileage: '.km, .kms', vin: '.vin' },
-      { card: 'li.car-listing, li.vehicle-item', title: '.name, .title', price: '.price', mileage: '.mileage', vin: '.vin' },
-      { card: 'div[class*="inventory"], div[class*="listing"]', title: 'h2, h3', price: '[class*="price"]', mileage: '[class*="mile"], [class*="km"]', vin: '[class*="vin"]' },
-    ];
-
-    for (const selectors of selectorSets) {
-      $(selectors.card).each((idx, el) => {
-        const $el = $(el);
-        
-        const titleText = $el.find(selectors.title).first().text().trim();
-        const parsed = this.parseTitle(titleText);
-        
-        const priceText = $el.find(selectors.price).first().text().trim();
-        const price = this.parsePrice(priceText);
-        
-        const mileageText = $el.find(selectors.mileage).first().text().trim();
-        const mileage = this.parseMileage(mileageText);
-        
-        const vinText = $el.find(selectors.vin).first().text().trim() || $el.text();
-        const vin = this.extractVin(vinText);
-        
-        const images = this.extractImages($el, baseUrl);
-
-        const vehicle: Vehicle = {
-          id: vin || `DOM-${Date.now()}-${idx}`,
-          vin: vin || '',
-          year: parsed.year || 0,
-          make: parsed.make || 'Unknown',
-          model: parsed.model || 'Unknown',
-          trim: parsed.trim || '',
-          mileage: mileage,
-          color: undefined,
-          engine: 'Unknown',
-          transmission: 'Unknown',
-          blackBookValue: 0,
-          yourCost: 0,
-          suggestedPrice: price,
-          inStock: true,
-          imageUrl: images[0],
-          imageUrls: images.length > 0 ? images : undefined,
-        };
+    $(selectors.card).each((idx, el) => {
+      const $el = $(el);
+      
+      const titleText = $el.find(selectors.title).first().text().trim();
+      const parsed = this.parseTitle(titleText);
+      
+      const priceField = this.fieldText($el, selectors.price, known.priceSelector);
+      const price = this.parsePrice(priceField.text);
+      if (!found.priceSelector) found.priceSelector = priceField.selector;
+      
+      const mileageField = this.fieldText($el, selectors.mileage, known.mileageSelector);
+      const mileage = this.parseMileage(mileageField.text);
+      if (!found.mileageSelector) found.mileageSelector = mileageField.selector;
+      
+      const vinText = $el.find(selectors.vin).first().text().trim() || $el.text();
+      const vin = this.extractVin(vinText);
+      
+      const images = this.extractImages($el, baseUrl);
 
-        if (vehicle.make && vehicle.model && vehicle.suggestedPrice > 0) {
-          vehicles.push(vehicle);
-        }
-      });
+      const vehicle: Vehicle = {
+        id: vin || `DOM-${Date.now()}-${idx}`,
+        vin: vin || '',
+        year: parsed.year || 0,
+        make: parsed.make || 'Unknown',
+        model: parsed.model || 'Unknown',
+        trim: parsed.trim || '',
+        mileage: mileage,
+        color: undefined,
+        engine: 'Unknown',
+        transmission: 'Unknown',
+        blackBookValue: 0,
+        yourCost: 0,
+        suggestedPrice: price,
+        inStock: true,
+        imageUrl: images[0],
+        imageUrls: images.length > 0 ? images : undefined,
+      };
 
-      if (vehicles.length > 0) break;
-    }
+      if (vehicle.make && vehicle.model && vehicle.suggestedPrice > 0) {
+        vehicles.push(vehicle);
+      }
+    });
 
+    if (vehicles.length > 0) Object.assign(this.learned, found);
     return vehicles;
   }
 
+  /**
+   * Text of the first selector in a comma-separated list that matches inside a card, trying the
+   * selector learned for this site first. Returns the selector that matched so it can be learned.
+   */
+  private fieldText($el: any, candidates: string, learned?: string): { text: string; selector?: string } {
+    const selectors = candidates.split(',').map(c => c.trim());
+    for (const selector of learned ? [learned, ...selectors.filter(c => c !== learned)] : selectors) {
+      const text = $el.find(selector).first().text().trim();
+      if (text) return { text, selector };
+    }
+    return { text: '' };
+  }
+
   /**
    * FIX #4 - Layer 6: Extract from regex patterns (last resort)
    */
@@ -574,19 +725,12 @@ class ProductionDealershipScraper {
       /banner/i,
     ];
 
-    // Find images in gallery/carousel first
-    const gallerySelectors = [
-      '.vehicle-gallery img',
-      '.image-gallery img',
-      '.carousel img',
-      '.slider img',
-      '[class*="gallery"] img',
-      '[class*="photo"] img',
-      '[id*="gallery"] img',
-      '[data-gallery] img',
-    ];
+    // Find images in gallery/carousel first; the selector learned for this site alone is enough
+    const learned = this.learned.gallerySelector;
+    const gallerySelectors = learned ? [learned, ...GALLERY_SELECTORS.filter(g => g !== learned)] : GALLERY_SELECTORS;
 
     for (const selector of gallerySelectors) {
+      const before = allImages.length;
       $el.find(selector).each((_: number, img: any) => {
         let src = $el.constructor(img).attr('src') || 
                   $el.constructor(img).attr('data-src') || 
@@ -604,6 +748,10 @@ class ProductionDealershipScraper {
           } catch {}
         }
       });
+      if (allImages.length > before) {
+        if (!this.learned.gallerySelector) this.learned.gallerySelector = selector;
+        if (selector === learned) break;
+      }
     }
 
     // Fallback to og:image
@@ -788,20 +936,11 @@ class ProductionDealershipScraper {
     const timeout = setTimeout(() => controller.abort(), 15000); // 15s timeout
 
     try {
-      // TRY 1: Fast HTTP request with axios
-      const response = await axios.get(url, {
+      // TRY 1: Fast HTTP request over the shared keep-alive client
+      const response = await httpClient.get(url, {
         timeout: 10000,
         signal: controller.signal as any,
-        headers: {
-          'User-Agent': this.randomUserAgent(),
-          'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
-          'Accept-Language': 'en-CA,en-US;q=0.9,en;q=0.8',
-          'Accept-Encoding': 'gzip, deflate, br',
-          'Connection': 'keep-alive',
-          'Upgrade-Insecure-Requests': '1',
-          'Cache-Control': 'max-age=0',
-          'Referer': 'https://www.google.com/',
-        },
+        headers: this.requestHeaders(),
         maxRedirects: 5,
       });
       
@@ -817,73 +956,83 @@ class ProductionDealershipScraper {
   }
 
   /**
-   * FIX #6 & #7: Puppeteer with stealth and optimized timeouts
+   * Vehicles on one listing page. With useCache the request is conditional: a page that has not
+   * changed since the last scrape (304 or identical body) reuses the vehicles extracted then.
+   */
+  private async fetchPageVehicles(url: string): Promise<Vehicle[]> {
+    const prefetched = this.prefetched.get(url);
+    if (prefetched) {
+      this.prefetched.delete(url);
+      return prefetched;
+    }
+    if (!this.config.useCache) {
+      return this.extractVehicles(await this.fetchHtmlFast(url), url);
+    }
+
+    let page: ConditionalPage;
+    try {
+      page = await fetchConditional(url, { headers: this.requestHeaders(), timeout: 10000 });
+    } catch (error) {
+      console.log(`[SCRAPER] HTTP failed for ${url}, trying Puppeteer...`);
+      return this.extractVehicles(await this.fetchWithPuppeteer(url), url);
+    }
+
+    if (page.unchanged) {
+      console.log(`[SCRAPER] ✓ Unchanged since last scrape, reusing ${page.vehicles.length} vehicles: ${url}`);
+      this.bestPageYield = Math.max(this.bestPageYield, page.vehicles.length);
+      return page.vehicles;
+    }
+    const vehicles = await this.extractVehicles(page.html, url);
+    page.remember(vehicles);
+    return vehicles;
+  }
+
+  private requestHeaders(): Record<string, string> {
+    return {
+      'User-Agent': this.randomUserAgent(),
+      'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
+      'Accept-Language': 'en-CA,en-US;q=0.9,en;q=0.8',
+      'Accept-Encoding': 'gzip, deflate, br',
+      'Connection': 'keep-alive',
+      'Upgrade-Insecure-Requests': '1',
+      'Cache-Control': 'max-age=0',
+      'Referer': 'https://www.google.com/',
+    };
+  }
+
+  /**
+   * FIX #6 & #7: Puppeteer with stealth and optimized timeouts (page leased from the shared browser pool)
    */
   private async fetchWithPuppeteer(url: string): Promise<string> {
-    if (!this.browser) {
-      const puppeteer = await import('puppeteer');
-      this.browser = await puppeteer.default.launch({
-        headless: this.config.headless !== false,
-        args: [
-          '--no-sandbox',
-          '--disable-setuid-sandbox',
-          '--disable-dev-shm-usage',
-          '--disable-blink-features=AutomationControlled',
-          '--disable-features=IsolateOrigins,site-per-process',
-        ],
+    return withPage(async page => {
+      // FIX #6: Optimized navigation timeout
+      await page.goto(url, {
+        waitUntil: 'domcontentloaded', // Don't wait for all resources
+        timeout: 30000, // 30s max
       });
-    }
 
-    const page = await this.browser.newPage();
+      // Simulate human behavior
+      await new Promise(resolve => setTimeout(resolve, 1000 + Math.random() * 1000));
 
-    try {
+      return page.content();
+    }, {
       // FIX #7: Stealth settings
-      await page.setUserAgent(this.randomUserAgent());
-      
+      userAgent: this.randomUserAgent(),
       // Randomize viewport
-      await page.setViewport({
+      viewport: {
         width: 1920 + Math.floor(Math.random() * 100),
         height: 1080 + Math.floor(Math.random() * 100),
         deviceScaleFactor: 1 + Math.random() * 0.2,
-      });
-      
+      },
       // Set realistic headers
-      await page.setExtraHTTPHeaders({
+      headers: {
         'Accept-Language': 'en-CA,en-US;q=0.9,en;q=0.8',
         'Accept-Encoding': 'gzip, deflate, br',
         'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
         'Referer': 'https://www.google.com/',
         'DNT': '1',
-      });
-
-      // Block unnecessary resources for speed
-      await page.setRequestInterception(true);
-      page.on('request', (request: any) => {
-        const resourceType = request.resourceType();
-        if (['image', 'stylesheet', 'font', 'media'].includes(resourceType)) {
-          request.abort();
-        } else {
-          request.continue();
-        }
-      });
-
-      // FIX #6: Optimized navigation timeout
-      await page.goto(url, {
-        waitUntil: 'domcontentloaded', // Don't wait for all resources
-        timeout: 30000, // 30s max
-      });
-
-      // Simulate human behavior
-      await new Promise(resolve => setTimeout(resolve, 1000 + Math.random() * 1000));
-
-      const html = await page.content();
-      await page.close();
-
-      return html;
-    } catch (error) {
-      await page.close();
-      throw error;
-    }
+      },
+    });
   }
 
   /**
@@ -1013,27 +1162,6 @@ class ProductionDealershipScraper {
       return null;
     }
   }
-
-  /**
-   * Helper: Delay for rate limiting
-   */
-  private delay(ms: number): Promise<void> {
-    return new Promise(resolve => setTimeout(resolve, ms));
-  }
-
-  /**
-   * Cleanup resources
-   */
-  private async cleanup(): Promise<void> {
-    if (this.browser) {
-      try {
-        await this.browser.close();
-        this.browser = null;
-      } catch (error) {
-        console.error('[SCRAPER] Error closing browser:', error);
-      }
-    }
-  }
 }
 
 export { ProductionDealershipScraper };
@@ -13,8 +13,8 @@
 
 import { ApprovalSpec, Vehicle, TradeInfo } from '../types/types';
 import { getLenderProgram, getSubventedRate, calculateTDReserve, calculateIAReserve, calculateEdenParkReserve, calculateAutoCapitalReserve, calculatePreferaReserve } from './lender-programs';
-import { calculateMonthlyPayment } from './payment-calculator';
 import { getPPSAFee } from '../constants/provincial-fees';
+import { getAnnuityFactor } from './payment-calculator';
 
 export interface ProfitScenario {
   lender: string;
@@ -52,16 +52,22 @@ export function calculateMaximumAdvance(
   annualRate: number,
   termMonths: number
 ): number {
-  const monthlyRate = annualRate / 100 / 12;
-  
-  if (monthlyRate === 0) {
+  if (annualRate / 100 / 12 === 0) {
     return monthlyPayment * termMonths;
   }
   
-  const maxPrincipal = monthlyPayment * ((1 - Math.pow(1 + monthlyRate, -termMonths)) / monthlyRate);
+  const maxPrincipal = monthlyPayment * getAdvanceFactor(annualRate, termMonths);
   return Math.floor(maxPrincipal);
 }
 
+/**
+ * Present-value factor (1 - (1 + r)^-n) / r per (rate, term): the reciprocal of the cached
+ * annuity factor, so both directions share one cache.
+ */
+export function getAdvanceFactor(annualRate: number, termMonths: number): number {
+  return 1 / getAnnuityFactor(annualRate, termMonths);
+}
+
 /**
  * Get dynamic reserve based on lender and amount financed
  */
@@ -93,6 +99,27 @@ function getDynamicReserve(lender: string, program: string, amountFinanced: numb
   return programData?.reserve || 0;
 }
 
+const FCA_BRANDS = ['chrysler', 'dodge', 'jeep', 'ram'];
+
+/**
+ * Subvented rate for new 2024-2026 FCA vehicles, or null when the approval's rate applies
+ */
+function getVehicleSubventedRate(vehicle: Vehicle, approval: ApprovalSpec): number | null {
+  if (vehicle.year >= 2024 && vehicle.year <= 2026) {
+    if (FCA_BRANDS.includes((vehicle.make || '').toLowerCase())) {
+      return getSubventedRate(
+        approval.bank,
+        approval.program || '',
+        vehicle.year,
+        vehicle.make || '',
+        0, // We'll calculate this properly below
+        vehicle.model
+      );
+    }
+  }
+  return null;
+}
+
 /**
  * Calculate profit scenario for a vehicle with a specific approval
  * Factors in subvented rates for new FCA vehicles
@@ -107,27 +134,9 @@ export function calculateProfitScenario(
   const termMonths = approval.termMonths || 84;
   
   // Check if subvented rate applies (new 2024-2026 FCA vehicles)
-  let rate = approval.apr;
-  let isSubvented = false;
-  
-  if (vehicle.year >= 2024 && vehicle.year <= 2026) {
-    const fcaBrands = ['chrysler', 'dodge', 'jeep', 'ram'];
-    if (fcaBrands.includes((vehicle.make || '').toLowerCase())) {
-      const subventedRate = getSubventedRate(
-        approval.bank,
-        approval.program || '',
-        vehicle.year,
-        vehicle.make || '',
-        0, // We'll calculate this properly below
-        vehicle.model
-      );
-      
-      if (subventedRate !== null) {
-        rate = subventedRate;
-        isSubvented = true;
-      }
-    }
-  }
+  const subventedRate = getVehicleSubventedRate(vehicle, approval);
+  const rate = subventedRate !== null ? subventedRate : approval.apr;
+  const isSubvented = subventedRate !== null;
   
   // Calculate maximum advance at full payment
   const maxAdvance = calculateMaximumAdvance(approval.paymentMax, rate, termMonths);
@@ -189,14 +198,185 @@ export function calculateAllProfitScenarios(
   province: string = 'AB',
   docFee: number = 799
 ): ProfitScenario[] {
-  const scenarios = approvals.map(approval => 
-    calculateProfitScenario(vehicle, approval, trade, province, docFee)
-  );
+  const matrix = calculateProfitMatrix([vehicle], approvals, trade, province, docFee);
+  const scenarios = approvals.map((approval, a) => profitScenarioAt(matrix, 0, a));
   
   // Sort by total gross (highest profit first)
   return scenarios.sort((a, b) => b.totalGross - a.totalGross);
 }
 
+// ========================================
+// VECTORIZED PROFIT ENGINE
+// ========================================
+
+/**
+ * Profit figures for vehicles × approvals, stored column-wise.
+ * Cell (v, a) lives at index v * approvalCount + a.
+ */
+export interface ProfitMatrix {
+  vehicleCount: number;
+  approvalCount: number;
+  lenders: string[];
+  programs: string[];
+  rate: Float64Array;
+  isSubvented: Uint8Array;
+  maxAdvance: Float64Array;
+  maxSellingPrice: Float64Array;
+  frontGross: Float64Array;
+  reserve: Float64Array;
+  aftermarketCapacity: Float64Array;
+  backGross: Float64Array;
+  totalGross: Float64Array;
+}
+
+/**
+ * Vehicle-independent figures for one approval at one rate
+ */
+interface RateTerms {
+  maxAdvance: number;
+  maxSellingPrice: number;
+  reserve: number;
+  aftermarketCapacity: number;
+}
+
+interface ApprovalTerms {
+  approval: ApprovalSpec;
+  termMonths: number;
+  totalFees: number;
+  downPayment: number;
+  tradeNet: number;
+  byRate: Map<number, RateTerms>;
+}
+
+function prepareApprovalTerms(
+  approval: ApprovalSpec,
+  tradeNet: number,
+  ppsaFee: number,
+  docFee: number
+): ApprovalTerms {
+  const programData = getLenderProgram(approval.bank as any, approval.program || '');
+  const lenderFee = programData?.fee || 0;
+  return {
+    approval,
+    termMonths: approval.termMonths || 84,
+    totalFees: docFee + ppsaFee + lenderFee,
+    downPayment: approval.downPayment || 0,
+    tradeNet,
+    byRate: new Map(),
+  };
+}
+
+function getRateTerms(terms: ApprovalTerms, rate: number): RateTerms {
+  let rt = terms.byRate.get(rate);
+  if (!rt) {
+    const { approval, totalFees, downPayment, tradeNet } = terms;
+    const maxAdvance = calculateMaximumAdvance(approval.paymentMax, rate, terms.termMonths);
+    const maxSellingPrice = maxAdvance - totalFees + downPayment + tradeNet;
+    rt = {
+      maxAdvance,
+      maxSellingPrice,
+      reserve: getDynamicReserve(approval.bank, approval.program || '', maxAdvance),
+      aftermarketCapacity: Math.max(0, maxAdvance - maxSellingPrice - totalFees + downPayment + tradeNet),
+    };
+    terms.byRate.set(rate, rt);
+  }
+  return rt;
+}
+
+/**
+ * Batch form of calculateProfitScenario for every vehicle × approval.
+ * Fees, max advance, reserve and aftermarket capacity are worked out once per approval and rate
+ * (subvented rates add at most a few extra rates), so each cell is just the vehicle's front gross.
+ * Values match calculateProfitScenario exactly.
+ */
+export function calculateProfitMatrix(
+  vehicles: Vehicle[],
+  approvals: ApprovalSpec[],
+  trade: TradeInfo,
+  province: string = 'AB',
+  docFee: number = 799
+): ProfitMatrix {
+  const vehicleCount = vehicles.length;
+  const approvalCount = approvals.length;
+  const cells = vehicleCount * approvalCount;
+  const matrix: ProfitMatrix = {
+    vehicleCount,
+    approvalCount,
+    lenders: approvals.map(a => a.bank),
+    programs: approvals.map(a => a.program || ''),
+    rate: new Float64Array(cells),
+    isSubvented: new Uint8Array(cells),
+    maxAdvance: new Float64Array(cells),
+    maxSellingPrice: new Float64Array(cells),
+    frontGross: new Float64Array(cells),
+    reserve: new Float64Array(cells),
+    aftermarketCapacity: new Float64Array(cells),
+    backGross: new Float64Array(cells),
+    totalGross: new Float64Array(cells),
+  };
+
+  const ppsaFee = getPPSAFee(province);
+  const tradeNet = (trade.allowance || 0) - (trade.lienBalance || 0);
+  const terms = approvals.map(approval => prepareApprovalTerms(approval, tradeNet, ppsaFee, docFee));
+
+  for (let v = 0; v < vehicleCount; v++) {
+    const vehicle = vehicles[v];
+    const vehicleCost = vehicle.yourCost || vehicle.blackBookValue || 0;
+    for (let a = 0; a < approvalCount; a++) {
+      const i = v * approvalCount + a;
+      const subventedRate = getVehicleSubventedRate(vehicle, approvals[a]);
+      const rate = subventedRate !== null ? subventedRate : approvals[a].apr;
+      const rt = getRateTerms(terms[a], rate);
+      const frontGross = Math.max(0, (rt.maxSellingPrice - vehicleCost) + rt.reserve);
+      const backGross = rt.aftermarketCapacity * 0.5;
+
+      matrix.rate[i] = rate;
+      matrix.isSubvented[i] = subventedRate !== null ? 1 : 0;
+      matrix.maxAdvance[i] = rt.maxAdvance;
+      matrix.maxSellingPrice[i] = rt.maxSellingPrice;
+      matrix.frontGross[i] = frontGross;
+      matrix.reserve[i] = rt.reserve;
+      matrix.aftermarketCapacity[i] = rt.aftermarketCapacity;
+      matrix.backGross[i] = backGross;
+      matrix.totalGross[i] = frontGross + backGross;
+    }
+  }
+
+  return matrix;
+}
+
+/**
+ * Materialize one matrix cell as a ProfitScenario
+ */
+export function profitScenarioAt(matrix: ProfitMatrix, vehicleIndex: number, approvalIndex: number): ProfitScenario {
+  const i = vehicleIndex * matrix.approvalCount + approvalIndex;
+  return {
+    lender: matrix.lenders[approvalIndex],
+    program: matrix.programs[approvalIndex],
+    rate: matrix.rate[i],
+    isSubvented: matrix.isSubvented[i] === 1,
+    maxAdvance: matrix.maxAdvance[i],
+    maxSellingPrice: matrix.maxSellingPrice[i],
+    frontGross: matrix.frontGross[i],
+    reserve: matrix.reserve[i],
+    aftermarketCapacity: matrix.aftermarketCapacity[i],
+    backGross: matrix.backGross[i],
+    totalGross: matrix.totalGross[i],
+    profitRank: matrix.totalGross[i],
+  };
+}
+
+/**
+ * Profit scenarios for a vehicle row of the matrix, sorted by profit potential (highest first)
+ */
+export function profitScenariosForVehicle(matrix: ProfitMatrix, vehicleIndex: number): ProfitScenario[] {
+  const scenarios: ProfitScenario[] = [];
+  for (let a = 0; a < matrix.approvalCount; a++) {
+    scenarios.push(profitScenarioAt(matrix, vehicleIndex, a));
+  }
+  return scenarios.sort((a, b) => b.totalGross - a.totalGross);
+}
+
 /**
  * Rank approvals by profit potential
  * Returns approvals sorted by maximum advance capacity (higher = more profit potential)
@@ -0,0 +1,142 @@
+/**
+ * RESERVE LOOKUP
+ * Reserve brackets and amount-financed grids compiled once into sorted breakpoints,
+ * looked up with a binary search instead of scanning bracket arrays per vehicle
+ */
+
+import { ReserveBracket } from '../types/types';
+
+/**
+ * A step function over sorted thresholds: a value passes threshold i when it is
+ * >= thresholds[i] (or > when strict[i]); the result is values[number of thresholds passed]
+ */
+export interface StepTable {
+  thresholds: Float64Array;
+  strict: Uint8Array;
+  values: Float64Array;
+}
+
+export function compileStepTable(
+  steps: { from: number; strict?: boolean }[],
+  values: number[]
+): StepTable {
+  if (values.length !== steps.length + 1) {
+    throw new Error('Step table needs one more value than thresholds');
+  }
+  return {
+    thresholds: Float64Array.from(steps.map(s => s.from)),
+    strict: Uint8Array.from(steps.map(s => (s.strict ? 1 : 0))),
+    values: Float64Array.from(values),
+  };
+}
+
+/**
+ * Number of thresholds passed by x (NaN passes none, matching a chain of failed comparisons)
+ */
+function stepIndex(table: StepTable, x: number): number {
+  let lo = 0;
+  let hi = table.thresholds.length;
+  while (lo < hi) {
+    const mid = (lo + hi) >>> 1;
+    const t = table.thresholds[mid];
+    if (table.strict[mid] ? x > t : x >= t) lo = mid + 1;
+    else hi = mid;
+  }
+  return lo;
+}
+
+export function lookupStep(table: StepTable, x: number): number {
+  return table.values[stepIndex(table, x)];
+}
+
+export function lookupSteps(table: StepTable, xs: ArrayLike<number>): Float64Array {
+  const out = new Float64Array(xs.length);
+  for (let i = 0; i < xs.length; i++) out[i] = table.values[stepIndex(table, xs[i])];
+  return out;
+}
+
+/**
+ * Inclusive [minFinanced, maxFinanced] brackets compiled to their boundary points.
+ * Between consecutive boundaries no bracket starts or ends, so the matching bracket is fixed
+ * for each boundary point and each open gap between boundaries. Overlaps resolve to the first
+ * bracket in the original order, exactly like brackets.find(...).
+ */
+export interface CompiledReserveBrackets {
+  bounds: Float64Array;
+  atBound: Int32Array;     // bracket index matching bounds[i] itself, -1 for none
+  afterBound: Int32Array;  // bracket index matching the open gap (bounds[i], bounds[i + 1])
+  amounts: Float64Array;
+}
+
+const compiledCache: WeakMap<ReserveBracket[], CompiledReserveBrackets> = new WeakMap();
+
+export function compileReserveBrackets(brackets: ReserveBracket[]): CompiledReserveBrackets {
+  const cached = compiledCache.get(brackets);
+  if (cached) return cached;
+
+  const bounds = Float64Array.from(
+    Array.from(new Set(brackets.flatMap(b => [b.minFinanced, b.maxFinanced])))
+      .filter(x => !isNaN(x))
+      .sort((a, b) => a - b)
+  );
+  const firstMatch = (test: (b: ReserveBracket) => boolean): number => brackets.findIndex(test);
+  const atBound = new Int32Array(bounds.length);
+  const afterBound = new Int32Array(bounds.length);
+  for (let i = 0; i < bounds.length; i++) {
+    const x = bounds[i];
+    atBound[i] = firstMatch(b => x >= b.minFinanced && x <= b.maxFinanced);
+    const next = i + 1 < bounds.length ? bounds[i + 1] : Number.POSITIVE_INFINITY;
+    afterBound[i] = x === Number.POSITIVE_INFINITY
+      ? -1
+      : firstMatch(b => b.minFinanced <= x && b.maxFinanced >= next);
+  }
+
+  const compiled: CompiledReserveBrackets = {
+    bounds,
+    atBound,
+    afterBound,
+    amounts: Float64Array.from(brackets.map(b => b.amount)),
+  };
+  compiledCache.set(brackets, compiled);
+  return compiled;
+}
+
+/**
+ * Index of the bracket containing amountFinanced, or -1
+ */
+export function findReserveBracketIndex(compiled: CompiledReserveBrackets, amountFinanced: number): number {
+  const { bounds } = compiled;
+  if (isNaN(amountFinanced) || bounds.length === 0 || amountFinanced < bounds[0]) return -1;
+  // Last boundary <= amountFinanced
+  let lo = 0;
+  let hi = bounds.length - 1;
+  while (lo < hi) {
+    const mid = (lo + hi + 1) >>> 1;
+    if (bounds[mid] <= amountFinanced) lo = mid;
+    else hi = mid - 1;
+  }
+  return bounds[lo] === amountFinanced ? compiled.atBound[lo] : compiled.afterBound[lo];
+}
+
+/**
+ * Amount of the bracket containing amountFinanced, or 0 when no bracket applies
+ */
+export function lookupReserveBracket(compiled: CompiledReserveBrackets, amountFinanced: number): number {
+  const idx = findReserveBracketIndex(compiled, amountFinanced);
+  return idx < 0 ? 0 : compiled.amounts[idx];
+}
+
+/**
+ * Batch lookup for an array of amounts financed
+ */
+export function lookupReserveBrackets(
+  brackets: ReserveBracket[] | CompiledReserveBrackets,
+  amountsFinanced: ArrayLike<number>
+): Float64Array {
+  const compiled = Array.isArray(brackets) ? compileReserveBrackets(brackets) : brackets;
+  const out = new Float64Array(amountsFinanced.length);
+  for (let i = 0; i < amountsFinanced.length; i++) {
+    out[i] = lookupReserveBracket(compiled, amountsFinanced[i]);
+  }
+  return out;
+}
@@ -5,6 +5,8 @@ import * as path from 'path';
 
 // In-memory dynamic rules store (uploaded monthly via API)
 let RULES: LenderRuleSet[] = [];
+// Bumped on every upload so copies of the rules (e.g. scoring workers) know when to refresh
+let RULES_VERSION = 0;
 // Attempt to auto-load bundled default rules so uploads are only needed for new programs
 try {
   const seedPath = path.resolve(__dirname, '..', 'config', 'rules-seed.json');
@@ -119,11 +121,17 @@ try {
 
 export function setRules(rules: LenderRuleSet[]) {
   RULES = Array.isArray(rules) ? [...rules] : [];
+  RULES_VERSION++;
 }
 
 export function addRules(rules: LenderRuleSet[]) {
   if (!Array.isArray(rules)) return;
   RULES.push(...rules);
+  RULES_VERSION++;
+}
+
+export function getRulesVersion(): number {
+  return RULES_VERSION;
 }
 
 export function listRules(): LenderRuleSet[] {
@@ -0,0 +1,529 @@
+/**
+ * SCORING POOL MODULE
+ * worker_threads pool that keeps CPU-bound scoring off the Express event loop.
+ * Inventory is shipped as a columnar snapshot (numeric columns in a SharedArrayBuffer),
+ * partitioned across workers, and the sorted partial results are merged back in order.
+ */
+
+import os from 'os';
+import path from 'path';
+import { Worker } from 'worker_threads';
+import { Vehicle, ApprovalSpec, TradeInfo, ScoredVehicleRow, Deal, FindDealsRequest, LenderRuleSet } from '../types/types';
+import { scoreInventory } from './approvals-engine';
+import { calculateProfitMatrix, profitScenariosForVehicle, ProfitScenario } from './profit-maximizer';
+import { findOptimalDeals } from './deal-maximizer';
+import { listRules, getRulesVersion } from './rules-library';
+import { inventoryStore } from './inventory-store';
+
+export type ScoringTaskKind = 'score' | 'profit' | 'deals';
+
+export interface ScoringOptions {
+  timeoutMs?: number;
+  topK?: number;
+}
+
+export interface VehicleProfitResult {
+  vehicle: Vehicle;
+  bestScenario: ProfitScenario | undefined;
+  allScenarios: ProfitScenario[];
+  profitPotential: number;
+}
+
+/**
+ * Columnar inventory partition as seen by a worker
+ */
+export interface InventoryPartition {
+  numeric: SharedArrayBuffer; // NUMERIC_COLUMNS.length x rowCount Float64 values, column-major
+  rowCount: number;
+  start: number;              // first row (inclusive) of this partition
+  end: number;                // last row (exclusive) of this partition
+  fields?: Array<Partial<Vehicle>>; // every other field of each row (see vehicleFields)...
+  fieldsStart: number;              // ...starting at this row
+  snapshotId?: number;        // store snapshot the fields belong to; sent once per worker, then omitted
+}
+
+export interface ScoringTaskMessage {
+  taskId: number;
+  kind: ScoringTaskKind;
+  partition: InventoryPartition;
+  payload: any;
+  rules?: { version: number; rules: LenderRuleSet[] };
+}
+
+export interface ScoringResultMessage {
+  taskId: number;
+  ok: boolean;
+  result?: any;
+  error?: string;
+}
+
+const NUMERIC_COLUMNS = ['year', 'mileage', 'blackBookValue', 'yourCost', 'suggestedPrice', 'inStock'] as const;
+
+const DEFAULT_TIMEOUT_MS = 30000;
+// Below this size the message round-trip costs more than scoring inline
+const MIN_POOL_INVENTORY = 250;
+const MIN_PARTITION_SIZE = 100;
+// SCORING_POOL_SIZE=0 disables the pool and scores inline
+const POOL_SIZE = process.env.SCORING_POOL_SIZE !== undefined && !isNaN(parseInt(process.env.SCORING_POOL_SIZE, 10))
+  ? Math.max(0, parseInt(process.env.SCORING_POOL_SIZE, 10))
+  : Math.max(1, os.cpus().length - 1);
+
+function toNumber(value: any): number {
+  if (value === null || value === undefined || value === '') return NaN;
+  return Number(value);
+}
+
+/**
+ * Encode the numeric vehicle fields into a shared column-major Float64 buffer.
+ * Missing values become NaN, which the scoring code already treats as missing.
+ */
+export function buildNumericColumns(inventory: Vehicle[]): SharedArrayBuffer {
+  const rowCount = inventory.length;
+  const buffer = new SharedArrayBuffer(NUMERIC_COLUMNS.length * rowCount * Float64Array.BYTES_PER_ELEMENT);
+  const columns = new Float64Array(buffer);
+  for (let i = 0; i < rowCount; i++) {
+    const v: any = inventory[i];
+    columns[i] = toNumber(v.year);
+    columns[rowCount + i] = toNumber(v.mileage);
+    columns[2 * rowCount + i] = toNumber(v.blackBookValue);
+    columns[3 * rowCount + i] = toNumber(v.yourCost);
+    columns[4 * rowCount + i] = toNumber(v.suggestedPrice);
+    columns[5 * rowCount + i] = v.inStock ? 1 : 0;
+  }
+  return buffer;
+}
+
+interface StoreSnapshot {
+  id: number;
+  numeric: SharedArrayBuffer;
+  fields: Array<Partial<Vehicle>>;
+}
+
+// Columnar mirror of the shared inventory store, rebuilt only when the store version changes
+let storeColumns: { version: number; snapshot: StoreSnapshot } | null = null;
+let nextSnapshotId = 1;
+
+function getStoreSnapshot(inventory: Vehicle[]): StoreSnapshot | null {
+  if (inventory !== inventoryStore.toArray()) return null;
+  if (!storeColumns || storeColumns.version !== inventoryStore.version) {
+    storeColumns = {
+      version: inventoryStore.version,
+      snapshot: { id: nextSnapshotId++, numeric: buildNumericColumns(inventory), fields: inventory.map(vehicleFields) },
+    };
+  }
+  return storeColumns.snapshot;
+}
+
+/**
+ * The fields of a vehicle that do not travel in the numeric columns: every non-column field, plus
+ * any column value that is not a plain number/boolean (missing, null, string), kept as-is
+ */
+export function vehicleFields(vehicle: Vehicle): Partial<Vehicle> {
+  const fields: any = { ...vehicle };
+  for (const column of NUMERIC_COLUMNS) {
+    const value = fields[column];
+    const encoded = column === 'inStock'
+      ? typeof value === 'boolean'
+      : typeof value === 'number' && !Number.isNaN(value);
+    if (encoded) delete fields[column];
+  }
+  return fields;
+}
+
+/**
+ * Rebuild the vehicles of a partition: its per-row fields plus the numeric columns they omit,
+ * equal to the caller's vehicles field for field
+ */
+export function vehiclesFromPartition(partition: InventoryPartition): Vehicle[] {
+  if (!partition.fields) throw new Error(`Row fields missing for inventory snapshot ${partition.snapshotId}`);
+  const columns = new Float64Array(partition.numeric);
+  const n = partition.rowCount;
+  const vehicles: Vehicle[] = [];
+  for (let row = partition.start; row < partition.end; row++) {
+    const fields = partition.fields[row - partition.fieldsStart];
+    const vehicle: any = { ...fields };
+    NUMERIC_COLUMNS.forEach((column, c) => {
+      if (column in fields) return;
+      const value = columns[c * n + row];
+      if (column === 'inStock') vehicle.inStock = value === 1;
+      else if (!Number.isNaN(value)) vehicle[column] = value;
+    });
+    vehicles.push(vehicle as Vehicle);
+  }
+  return vehicles;
+}
+
+/**
+ * Merge partitions that are each sorted descending; ties keep partition order,
+ * so the result matches sorting the whole inventory in one pass.
+ */
+export function mergeSortedDesc<T>(parts: T[][], score: (item: T) => number, limit?: number): T[] {
+  const cursors = parts.map(() => 0);
+  const merged: T[] = [];
+  const max = limit ?? Number.POSITIVE_INFINITY;
+  while (merged.length < max) {
+    let bestPart = -1;
+    let bestScore = Number.NEGATIVE_INFINITY;
+    for (let p = 0; p < parts.length; p++) {
+      if (cursors[p] >= parts[p].length) continue;
+      const s = score(parts[p][cursors[p]]);
+      if (bestPart === -1 || s > bestScore) {
+        bestPart = p;
+        bestScore = s;
+      }
+    }
+    if (bestPart === -1) break;
+    merged.push(parts[bestPart][cursors[bestPart]++]);
+  }
+  return merged;
+}
+
+/**
+ * Run one task kind against a list of vehicles; shared by the workers and the inline path
+ */
+export function runScoringTask(kind: ScoringTaskKind, vehicles: Vehicle[], payload: any): any[] {
+  if (kind === 'score') {
+    return scoreInventory(vehicles, payload.approval, payload.trade);
+  }
+  if (kind === 'profit') {
+    const matrix = calculateProfitMatrix(vehicles, payload.approvals, payload.trade, payload.province, payload.docFee);
+    const results = vehicles.map((_, index) => {
+      const scenarios = profitScenariosForVehicle(matrix, index);
+      return {
+        index,
+        bestScenario: scenarios[0],
+        allScenarios: scenarios,
+        profitPotential: scenarios[0]?.totalGross || 0,
+      };
+    });
+    return results.sort((a, b) => b.profitPotential - a.profitPotential);
+  }
+  // deals: return the vehicle's position instead of the (rebuilt) vehicle itself
+  const positions = new Map<Vehicle, number>();
+  vehicles.forEach((v, i) => positions.set(v, i));
+  return findOptimalDeals(payload.request, vehicles).map(deal => ({
+    index: positions.get(deal.vehicle) ?? -1,
+    deal: { ...deal, vehicle: undefined },
+  }));
+}
+
+// ========================================
+// POOL
+// ========================================
+
+interface QueuedTask {
+  message: ScoringTaskMessage;
+  snapshot: StoreSnapshot | null;
+  request: PoolRequest;
+  resolve: (result: any[]) => void;
+  reject: (error: Error) => void;
+}
+
+interface PoolWorker {
+  worker: Worker;
+  rulesVersion: number;
+  snapshotId: number;
+  current: QueuedTask | null;
+}
+
+interface PoolRequest {
+  cancelled: boolean;
+}
+
+const workers: PoolWorker[] = [];
+const queue: QueuedTask[] = [];
+let nextTaskId = 1;
+
+const stats = {
+  requests: 0,
+  inlineRequests: 0,
+  tasksCompleted: 0,
+  tasksFailed: 0,
+  timeouts: 0,
+  workerRestarts: 0,
+  snapshotsShipped: 0,
+  totalDurationMs: 0,
+  maxQueueDepth: 0,
+};
+
+function workerEntry(): { file: string; execArgv?: string[] } {
+  const ext = path.extname(__filename);
+  const file = path.join(__dirname, `scoring-worker${ext}`);
+  // Under ts-node the worker must register the TypeScript loader itself
+  return ext === '.ts' ? { file, execArgv: ['-r', 'ts-node/register/transpile-only'] } : { file };
+}
+
+function spawnWorker(): PoolWorker {
+  const entry = workerEntry();
+  const worker = new Worker(entry.file, { execArgv: entry.execArgv });
+  const slot: PoolWorker = { worker, rulesVersion: -1, snapshotId: -1, current: null };
+  worker.unref();
+
+  worker.on('message', (msg: ScoringResultMessage) => {
+    const task = slot.current;
+    slot.current = null;
+    if (task && task.message.taskId === msg.taskId) {
+      if (msg.ok) {
+        stats.tasksCompleted++;
+        task.resolve(msg.result || []);
+      } else {
+        stats.tasksFailed++;
+        task.reject(new Error(msg.error || 'Scoring task failed'));
+      }
+    }
+    dispatch();
+  });
+
+  worker.on('error', (error: Error) => {
+    console.error('[SCORING_POOL] Worker error:', error.message);
+    replaceWorker(slot, error);
+  });
+
+  worker.on('exit', (code: number) => {
+    if (code !== 0 && workers.includes(slot)) {
+      replaceWorker(slot, new Error(`Scoring worker exited with code ${code}`));
+    }
+  });
+
+  return slot;
+}
+
+function replaceWorker(slot: PoolWorker, reason: Error): void {
+  const index = workers.indexOf(slot);
+  if (index < 0) return;
+  const task = slot.current;
+  slot.current = null;
+  workers.splice(index, 1);
+  slot.worker.terminate().catch(() => {});
+  if (task) {
+    stats.tasksFailed++;
+    task.reject(reason);
+  }
+  workers.push(spawnWorker());
+  stats.workerRestarts++;
+  dispatch();
+}
+
+function ensurePool(): void {
+  while (workers.length < POOL_SIZE) {
+    workers.push(spawnWorker());
+  }
+}
+
+function dispatch(): void {
+  for (const slot of workers) {
+    if (slot.current) continue;
+    let task = queue.shift();
+    while (task && task.request.cancelled) {
+      task.reject(new Error('Scoring request cancelled'));
+      task = queue.shift();
+    }
+    if (!task) return;
+
+    // Ship the rule pack only when this worker has not seen the current version
+    const version = getRulesVersion();
+    let message: ScoringTaskMessage = slot.rulesVersion === version
+      ? task.message
+      : { ...task.message, rules: { version, rules: listRules() } };
+    slot.rulesVersion = version;
+    // Likewise the row fields of a store snapshot: the worker keeps the last one it was sent
+    if (task.snapshot && slot.snapshotId !== task.snapshot.id) {
+      message = { ...message, partition: { ...message.partition, fields: task.snapshot.fields, fieldsStart: 0 } };
+      slot.snapshotId = task.snapshot.id;
+      stats.snapshotsShipped++;
+    }
+    slot.current = task;
+    slot.worker.postMessage(message);
+  }
+}
+
+// Settle the queued tasks of a cancelled request now instead of leaving them pending
+function dropQueued(request: PoolRequest, reason: Error): void {
+  for (let i = queue.length - 1; i >= 0; i--) {
+    if (queue[i].request !== request) continue;
+    const [task] = queue.splice(i, 1);
+    task.reject(reason);
+  }
+}
+
+function partitionBounds(rowCount: number): Array<[number, number]> {
+  const parts = Math.max(1, Math.min(workers.length, Math.ceil(rowCount / MIN_PARTITION_SIZE)));
+  const size = Math.ceil(rowCount / parts);
+  const bounds: Array<[number, number]> = [];
+  for (let start = 0; start < rowCount; start += size) {
+    bounds.push([start, Math.min(rowCount, start + size)]);
+  }
+  return bounds;
+}
+
+/**
+ * Partition the inventory across the pool and resolve with the per-partition results
+ */
+async function runPartitioned(
+  kind: ScoringTaskKind,
+  inventory: Vehicle[],
+  payload: any,
+  timeoutMs: number
+): Promise<{ parts: any[][]; bounds: Array<[number, number]> } | null> {
+  if (POOL_SIZE === 0 || inventory.length < MIN_POOL_INVENTORY) return null;
+  ensurePool();
+
+  const snapshot = getStoreSnapshot(inventory);
+  const numeric = snapshot ? snapshot.numeric : buildNumericColumns(inventory);
+  const bounds = partitionBounds(inventory.length);
+  const request: PoolRequest = { cancelled: false };
+  const started = Date.now();
+
+  const partials = bounds.map(([start, end]) => new Promise<any[]>((resolve, reject) => {
+    // Store snapshots reference fields the workers already hold; other arrays ship their slice
+    const partition: InventoryPartition = snapshot
+      ? { numeric, rowCount: inventory.length, start, end, fieldsStart: 0, snapshotId: snapshot.id }
+      : { numeric, rowCount: inventory.length, start, end, fieldsStart: start, fields: inventory.slice(start, end).map(vehicleFields) };
+    const message: ScoringTaskMessage = { taskId: nextTaskId++, kind, payload, partition };
+    queue.push({ message, snapshot, request, resolve, reject });
+  }));
+  stats.maxQueueDepth = Math.max(stats.maxQueueDepth, queue.length);
+  dispatch();
+
+  let timer: NodeJS.Timeout | undefined;
+  const timeout = new Promise<never>((_resolve, reject) => {
+    timer = setTimeout(() => {
+      request.cancelled = true;
+      stats.timeouts++;
+      dropQueued(request, new Error('Scoring timed out'));
+      // Workers still busy with this request are stuck on it; replace them
+      for (const slot of [...workers]) {
+        if (slot.current?.request === request) replaceWorker(slot, new Error('Scoring timed out'));
+      }
+      reject(new Error(`Scoring timed out after ${timeoutMs}ms`));
+    }, timeoutMs);
+  });
+
+  try {
+    const parts = await Promise.race([Promise.all(partials), timeout]);
+    stats.totalDurationMs += Date.now() - started;
+    return { parts, bounds };
+  } catch (error) {
+    request.cancelled = true;
+    dropQueued(request, error as Error);
+    throw error;
+  } finally {
+    if (timer) clearTimeout(timer);
+  }
+}
+
+/**
+ * scoreInventory off the event loop; rows come back sorted by total gross (highest first)
+ */
+export async function scoreInventoryAsync(
+  inventory: Vehicle[],
+  approval: ApprovalSpec,
+  trade: TradeInfo,
+  options: ScoringOptions = {}
+): Promise<ScoredVehicleRow[]> {
+  stats.requests++;
+  const run = await runPartitioned('score', inventory, { approval, trade }, options.timeoutMs ?? DEFAULT_TIMEOUT_MS);
+  if (!run) {
+    stats.inlineRequests++;
+    const rows = scoreInventory(inventory, approval, trade);
+    return options.topK != null ? rows.slice(0, options.topK) : rows;
+  }
+  return mergeSortedDesc<ScoredVehicleRow>(run.parts, r => r.totalGross, options.topK);
+}
+
+/**
+ * Profit scenarios for every vehicle (calculateAllProfitScenarios), sorted by profit potential (highest first)
+ */
+export async function scoreProfitScenariosAsync(
+  inventory: Vehicle[],
+  approvals: ApprovalSpec[],
+  trade: TradeInfo,
+  province: string = 'AB',
+  docFee: number = 799,
+  options: ScoringOptions = {}
+): Promise<VehicleProfitResult[]> {
+  stats.requests++;
+  const payload = { approvals, trade, province, docFee };
+  const run = await runPartitioned('profit', inventory, payload, options.timeoutMs ?? DEFAULT_TIMEOUT_MS);
+  const parts = run ? run.parts : [runScoringTask('profit', inventory, payload)];
+  const bounds = run ? run.bounds : [[0, inventory.length] as [number, number]];
+  if (!run) stats.inlineRequests++;
+
+  // Re-attach the caller's vehicle objects (workers only see the columnar copy)
+  const withVehicles = parts.map((part, p) => part.map((r: any) => ({
+    vehicle: inventory[bounds[p][0] + r.index],
+    bestScenario: r.bestScenario,
+    allScenarios: r.allScenarios,
+    profitPotential: r.profitPotential,
+  })));
+  return mergeSortedDesc<VehicleProfitResult>(withVehicles, r => r.profitPotential, options.topK);
+}
+
+/**
+ * findOptimalDeals off the event loop; each partition keeps its top 10 and the winners are merged
+ */
+export async function findOptimalDealsAsync(
+  request: FindDealsRequest,
+  inventory: Vehicle[],
+  options: ScoringOptions = {}
+): Promise<Deal[]> {
+  stats.requests++;
+  const run = await runPartitioned('deals', inventory, { request }, options.timeoutMs ?? DEFAULT_TIMEOUT_MS);
+  if (!run) {
+    stats.inlineRequests++;
+    return findOptimalDeals(request, inventory);
+  }
+  const parts: Deal[][] = run.parts.map((part, p) => part.map((r: any) => ({
+    ...r.deal,
+    vehicle: inventory[run.bounds[p][0] + r.index],
+  })));
+  return mergeSortedDesc<Deal>(parts, d => d.grossProfit.total, 10).map((deal, idx) => ({
+    ...deal,
+    rank: idx + 1,
+  }));
+}
+
+/**
+ * Pool metrics (queue depth is the number of partitions waiting for a worker)
+ */
+export function getScoringPoolStats(): {
+  size: number;
+  busy: number;
+  queueDepth: number;
+  requests: number;
+  inlineRequests: number;
+  tasksCompleted: number;
+  tasksFailed: number;
+  timeouts: number;
+  workerRestarts: number;
+  snapshotsShipped: number;
+  maxQueueDepth: number;
+  avgPooledDurationMs: number;
+} {
+  const pooled = stats.requests - stats.inlineRequests;
+  return {
+    size: workers.length,
+    busy: workers.filter(w => w.current !== null).length,
+    queueDepth: queue.length,
+    requests: stats.requests,
+    inlineRequests: stats.inlineRequests,
+    tasksCompleted: stats.tasksCompleted,
+    tasksFailed: stats.tasksFailed,
+    timeouts: stats.timeouts,
+    workerRestarts: stats.workerRestarts,
+    snapshotsShipped: stats.snapshotsShipped,
+    maxQueueDepth: stats.maxQueueDepth,
+    avgPooledDurationMs: pooled > 0 ? Math.round(stats.totalDurationMs / pooled) : 0,
+  };
+}
+
+export async function shutdownScoringPool(): Promise<void> {
+  const slots = workers.splice(0, workers.length);
+  for (const task of queue.splice(0, queue.length)) {
+    task.reject(new Error('Scoring pool shut down'));
+  }
+  await Promise.all(slots.map(slot => {
+    if (slot.current) slot.current.reject(new Error('Scoring pool shut down'));
+    return slot.worker.terminate();
+  }));
+}
@@ -0,0 +1,37 @@
+/**
+ * SCORING WORKER
+ * worker_threads entry point for the scoring pool (see scoring-pool.ts)
+ */
+
+import { isMainThread, parentPort } from 'worker_threads';
+import { Vehicle } from '../types/types';
+import { setRules } from './rules-library';
+import { runScoringTask, vehiclesFromPartition, ScoringTaskMessage, ScoringResultMessage } from './scoring-pool';
+
+if (!isMainThread && parentPort) {
+  const port = parentPort;
+  let rulesVersion = -1;
+  let snapshot: { id: number; fields: Array<Partial<Vehicle>> } | null = null;
+
+  port.on('message', (msg: ScoringTaskMessage) => {
+    const reply: ScoringResultMessage = { taskId: msg.taskId, ok: true };
+    try {
+      // Keep this worker's rule pack in step with uploads on the main thread
+      if (msg.rules && msg.rules.version !== rulesVersion) {
+        setRules(msg.rules.rules);
+        rulesVersion = msg.rules.version;
+      }
+      // Row fields of the shared store arrive once per snapshot; later tasks only name the snapshot
+      const partition = msg.partition;
+      if (partition.snapshotId !== undefined) {
+        if (partition.fields) snapshot = { id: partition.snapshotId, fields: partition.fields };
+        else if (snapshot?.id === partition.snapshotId) partition.fields = snapshot.fields;
+      }
+      reply.result = runScoringTask(msg.kind, vehiclesFromPartition(msg.partition), msg.payload);
+    } catch (e) {
+      reply.ok = false;
+      reply.error = (e as Error).message;
+    }
+    port.postMessage(reply);
+  });
+}
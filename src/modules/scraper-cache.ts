@@ -1,121 +1,317 @@
 /**
  * SCRAPER CACHE MODULE
- * 7-day persistent cache for scraped inventory data
+ * 7-day persistent cache for scraped inventory data: a byte/entry-bounded LRU in memory
+ * (payloads gzip-compressed by default) in front of Supabase, with stale-while-revalidate,
+ * a background sweeper and single-flight lookups/scrapes per normalized URL
  */
 
+import zlib from 'zlib';
 import { Vehicle } from '../types/types';
 import { saveScraperCacheToSupabase, fetchScraperCacheFromSupabase } from './supabase';
 
 interface CacheEntry {
   url: string;
-  vehicles: Vehicle[];
+  payload: Vehicle[] | Buffer;   // Buffer when stored compressed
+  vehicleCount: number;
+  bytes: number;
   timestamp: number;
   expiresAt: number;
 }
 
+/** Re-scrapes a URL; used to refresh a stale entry in the background */
+export type CacheRevalidator = () => Promise<Vehicle[]>;
+
+export interface CachedScrapeResult {
+  vehicles: Vehicle[];
+  cached: boolean;
+}
+
+export interface ScraperCacheStats {
+  totalEntries: number;
+  totalVehicles: number;
+  oldestEntry: number | null;
+  newestEntry: number | null;
+  bytes: number;
+  maxBytes: number;
+  maxEntries: number;
+  compressed: boolean;
+  hits: number;
+  staleHits: number;
+  dbHits: number;
+  misses: number;
+  hitRate: number;
+  evictions: number;
+  expired: number;
+  revalidations: number;
+  revalidationFailures: number;
+  revalidating: number;
+  coalesced: number;
+  inFlight: number;
+  pendingWrites: number;
+}
+
 const CACHE_DURATION_MS = 7 * 24 * 60 * 60 * 1000; // 7 days
-const inMemoryCache: Map<string, CacheEntry> = new Map();
+// Entries older than this are still served, but trigger a background re-scrape
+const FRESH_MS = (parseFloat(process.env.SCRAPER_CACHE_FRESH_HOURS || '6') || 6) * 60 * 60 * 1000;
+const MAX_BYTES = (parseInt(process.env.SCRAPER_CACHE_MAX_MB || '64', 10) || 64) * 1024 * 1024;
+const MAX_ENTRIES = Math.max(1, parseInt(process.env.SCRAPER_CACHE_MAX_ENTRIES || '200', 10) || 200);
+const COMPRESS = process.env.SCRAPER_CACHE_COMPRESS !== 'false';
+const SWEEP_INTERVAL_MS = 10 * 60 * 1000;
+
+const inMemoryCache: Map<string, CacheEntry> = new Map();  // insertion order = LRU order
+const revalidating: Map<string, Promise<void>> = new Map();
+const inFlight: Map<string, Promise<unknown>> = new Map();
+const counters = {
+  hits: 0, staleHits: 0, dbHits: 0, misses: 0, evictions: 0, expired: 0,
+  revalidations: 0, revalidationFailures: 0, coalesced: 0,
+};
+let totalBytes = 0;
+let pendingWrites = 0;
+let sweeper: NodeJS.Timeout | null = null;
 
 /**
- * Get cached vehicles if not expired
+ * Cache key for a listing URL: lowercase host, no default port or fragment, sorted query
+ * parameters. Anything unparseable is used as-is.
  */
-export async function getCachedVehicles(url: string): Promise<Vehicle[] | null> {
+export function normalizeCacheUrl(url: string): string {
+  try {
+    const parsed = new URL(url);
+    parsed.hash = '';
+    parsed.searchParams.sort();
+    return parsed.href;
+  } catch (_e) {
+    return url;
+  }
+}
+
+// Callers asking for the same key while a call is running share its promise
+function singleFlight<T>(key: string, fn: () => Promise<T>): Promise<T> {
+  const running = inFlight.get(key);
+  if (running) {
+    counters.coalesced++;
+    return running as Promise<T>;
+  }
+  const promise: Promise<T> = fn().finally(() => {
+    if (inFlight.get(key) === promise) inFlight.delete(key);
+  });
+  inFlight.set(key, promise);
+  return promise;
+}
+
+function encode(vehicles: Vehicle[]): { payload: Vehicle[] | Buffer; bytes: number } {
+  const json = JSON.stringify(vehicles);
+  if (!COMPRESS) return { payload: vehicles, bytes: Buffer.byteLength(json) };
+  const payload = zlib.gzipSync(json);
+  return { payload, bytes: payload.length };
+}
+
+function decode(entry: CacheEntry): Vehicle[] {
+  return Buffer.isBuffer(entry.payload)
+    ? JSON.parse(zlib.gunzipSync(entry.payload).toString('utf8'))
+    : entry.payload;
+}
+
+function remove(url: string): void {
+  const entry = inMemoryCache.get(url);
+  if (!entry) return;
+  inMemoryCache.delete(url);
+  totalBytes -= entry.bytes;
+}
+
+// Insert as most recently used, then evict from the cold end until back under budget
+function store(url: string, vehicles: Vehicle[], timestamp: number, expiresAt: number): void {
+  remove(url);
+  const { payload, bytes } = encode(vehicles);
+  if (bytes > MAX_BYTES) {
+    console.warn(`[CACHE] Not caching ${url} in memory: ${bytes} bytes exceeds the ${MAX_BYTES} byte budget`);
+    return;
+  }
+  inMemoryCache.set(url, { url, payload, vehicleCount: vehicles.length, bytes, timestamp, expiresAt });
+  totalBytes += bytes;
+
+  while (inMemoryCache.size > MAX_ENTRIES || totalBytes > MAX_BYTES) {
+    remove(inMemoryCache.keys().next().value as string);
+    counters.evictions++;
+  }
+  startSweeper();
+}
+
+function startSweeper(): void {
+  if (sweeper) return;
+  sweeper = setInterval(clearExpiredCache, SWEEP_INTERVAL_MS);
+  sweeper.unref();
+}
+
+// One background re-scrape per URL at a time; failures keep the stale copy
+function revalidateInBackground(url: string, revalidate: CacheRevalidator): void {
+  if (revalidating.has(url)) return;
+  counters.revalidations++;
+  const refresh = revalidate()
+    .then(async vehicles => {
+      if (vehicles.length > 0) await setCachedVehicles(url, vehicles);
+    })
+    .catch(error => {
+      counters.revalidationFailures++;
+      console.error(`[CACHE] Background refresh failed for ${url}:`, (error as Error).message);
+    })
+    .finally(() => revalidating.delete(url));
+  revalidating.set(url, refresh);
+}
+
+/**
+ * Get cached vehicles if not expired. An entry past its fresh window is still returned; when
+ * revalidate is given it also starts a background re-scrape that replaces the entry.
+ * Concurrent lookups of the same URL share one database read.
+ */
+export function getCachedVehicles(url: string, revalidate?: CacheRevalidator): Promise<Vehicle[] | null> {
+  const key = normalizeCacheUrl(url);
+  return singleFlight(`read|${key}`, () => readThrough(key, revalidate));
+}
+
+async function readThrough(url: string, revalidate?: CacheRevalidator): Promise<Vehicle[] | null> {
+  const now = Date.now();
+
   // Check in-memory cache first
   const cached = inMemoryCache.get(url);
-  if (cached && Date.now() < cached.expiresAt) {
-    console.log(`[CACHE] Hit (in-memory): ${url}`);
-    return cached.vehicles;
+  if (cached && now < cached.expiresAt) {
+    inMemoryCache.delete(url);
+    inMemoryCache.set(url, cached);
+    if (now - cached.timestamp >= FRESH_MS) {
+      counters.staleHits++;
+      if (revalidate) revalidateInBackground(url, revalidate);
+    } else {
+      counters.hits++;
+    }
+    return decode(cached);
+  }
+  if (cached) {
+    remove(url);
+    counters.expired++;
   }
 
   // Check Supabase cache
   try {
     const dbCache = await fetchScraperCacheFromSupabase(url);
-    if (dbCache && Date.now() < dbCache.expiresAt) {
-      console.log(`[CACHE] Hit (database): ${url}`);
-      // Populate in-memory cache
-      inMemoryCache.set(url, dbCache);
+    if (dbCache && now < dbCache.expiresAt) {
+      counters.dbHits++;
+      store(url, dbCache.vehicles, dbCache.timestamp, dbCache.expiresAt);
+      if (revalidate && now - dbCache.timestamp >= FRESH_MS) revalidateInBackground(url, revalidate);
       return dbCache.vehicles;
     }
   } catch (error) {
     console.error('[CACHE] Error fetching from database:', error);
   }
 
+  counters.misses++;
   console.log(`[CACHE] Miss: ${url}`);
   return null;
 }
 
 /**
- * Save vehicles to cache
+ * Save vehicles to cache. The in-memory copy is stored before this returns; the Supabase
+ * write runs in the background.
  */
 export async function setCachedVehicles(url: string, vehicles: Vehicle[]): Promise<void> {
-  const entry: CacheEntry = {
-    url,
-    vehicles,
-    timestamp: Date.now(),
-    expiresAt: Date.now() + CACHE_DURATION_MS
-  };
+  const key = normalizeCacheUrl(url);
+  const timestamp = Date.now();
+  const expiresAt = timestamp + CACHE_DURATION_MS;
 
   // Save to in-memory cache
-  inMemoryCache.set(url, entry);
-  console.log(`[CACHE] Saved (in-memory): ${url} - ${vehicles.length} vehicles`);
+  store(key, vehicles, timestamp, expiresAt);
+  console.log(`[CACHE] Saved (in-memory): ${key} - ${vehicles.length} vehicles`);
 
   // Save to Supabase
-  try {
-    await saveScraperCacheToSupabase(entry);
-    console.log(`[CACHE] Saved (database): ${url}`);
-  } catch (error) {
-    console.error('[CACHE] Error saving to database:', error);
-  }
+  pendingWrites++;
+  saveScraperCacheToSupabase({ url: key, vehicles, timestamp, expiresAt })
+    .then(() => console.log(`[CACHE] Saved (database): ${key}`))
+    .catch(error => console.error('[CACHE] Error saving to database:', error))
+    .finally(() => pendingWrites--);
 }
 
 /**
- * Clear expired cache entries
+ * Cached vehicles for url, or scrape and cache them. Concurrent callers for the same URL share
+ * one cache lookup and one scrape. With useCache false the cache is skipped entirely, but
+ * simultaneous uncached scrapes of one URL are still shared (with each other, not with cached
+ * callers).
+ */
+export function getOrScrapeVehicles(
+  url: string,
+  scrape: CacheRevalidator,
+  useCache: boolean = true
+): Promise<CachedScrapeResult> {
+  const key = normalizeCacheUrl(url);
+  // Cached and uncached callers never share a scrape: the scrape callback may itself depend on useCache
+  const runScrape = () => singleFlight(`scrape|${useCache ? 'cached' : 'fresh'}|${key}`, scrape);
+  if (!useCache) return runScrape().then(vehicles => ({ vehicles, cached: false }));
+
+  return singleFlight(`lookup|${key}`, async () => {
+    const cached = await getCachedVehicles(key, runScrape);
+    if (cached) return { vehicles: cached, cached: true };
+
+    const vehicles = await runScrape();
+    if (vehicles.length > 0) await setCachedVehicles(key, vehicles);
+    return { vehicles, cached: false };
+  });
+}
+
+/**
+ * Clear expired cache entries (runs every 10 minutes while the cache holds entries)
  */
 export function clearExpiredCache(): void {
   const now = Date.now();
   let cleared = 0;
-  
-  for (const [url, entry] of inMemoryCache.entries()) {
+
+  for (const [url, entry] of Array.from(inMemoryCache.entries())) {
     if (now >= entry.expiresAt) {
-      inMemoryCache.delete(url);
+      remove(url);
       cleared++;
     }
   }
-  
+  counters.expired += cleared;
+
   if (cleared > 0) {
     console.log(`[CACHE] Cleared ${cleared} expired entries`);
   }
+  if (inMemoryCache.size === 0 && sweeper) {
+    clearInterval(sweeper);
+    sweeper = null;
+  }
 }
 
 /**
  * Get cache statistics
  */
-export function getCacheStats(): {
-  totalEntries: number;
-  totalVehicles: number;
-  oldestEntry: number | null;
-  newestEntry: number | null;
-} {
+export function getCacheStats(): ScraperCacheStats {
   let totalVehicles = 0;
   let oldestEntry: number | null = null;
   let newestEntry: number | null = null;
 
   for (const entry of inMemoryCache.values()) {
-    totalVehicles += entry.vehicles.length;
-    
+    totalVehicles += entry.vehicleCount;
+
     if (oldestEntry === null || entry.timestamp < oldestEntry) {
       oldestEntry = entry.timestamp;
     }
-    
+
     if (newestEntry === null || entry.timestamp > newestEntry) {
       newestEntry = entry.timestamp;
     }
   }
 
+  const lookups = counters.hits + counters.staleHits + counters.dbHits + counters.misses;
   return {
     totalEntries: inMemoryCache.size,
     totalVehicles,
     oldestEntry,
-    newestEntry
+    newestEntry,
+    bytes: totalBytes,
+    maxBytes: MAX_BYTES,
+    maxEntries: MAX_ENTRIES,
+    compressed: COMPRESS,
+    ...counters,
+    hitRate: lookups > 0 ? (counters.hits + counters.staleHits + counters.dbHits) / lookups : 0,
+    revalidating: revalidating.size,
+    inFlight: inFlight.size,
+    pendingWrites,
   };
 }
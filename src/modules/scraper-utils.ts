@@ -43,18 +43,80 @@ export class RateLimiter {
 
   async waitIfNeeded(): Promise<void> {
     const now = Date.now();
-    const timeSinceLastRequest = now - this.lastRequestTime;
+    // Reserve the next slot before sleeping so concurrent callers queue up behind each other
+    const waitTime = Math.max(0, this.lastRequestTime + this.delayMs - now);
+    this.lastRequestTime = now + waitTime;
     
-    if (timeSinceLastRequest < this.delayMs) {
-      const waitTime = this.delayMs - timeSinceLastRequest;
+    if (waitTime > 0) {
       console.log(`[RATE_LIMIT] Waiting ${waitTime}ms before next request`);
       await sleep(waitTime);
     }
-    
-    this.lastRequestTime = Date.now();
   }
 }
 
+// One limiter per host, shared by every scraper instance hitting that host
+const hostLimiters: Map<string, RateLimiter> = new Map();
+
+/**
+ * Rate limiter for the host of url (created with delayMs on first use)
+ */
+export function getHostRateLimiter(url: string, delayMs: number = 500): RateLimiter {
+  let host: string;
+  try {
+    host = new URL(url).host.toLowerCase();
+  } catch (_e) {
+    host = url;
+  }
+  let limiter = hostLimiters.get(host);
+  if (!limiter) {
+    limiter = new RateLimiter(delayMs);
+    hostLimiters.set(host, limiter);
+  }
+  return limiter;
+}
+
+/**
+ * Fetch numbered pages 1..maxPages with up to `concurrency` in flight, each start gated by the
+ * limiter. fetchPage should fetch and parse one page; an empty result or an error ends pagination
+ * there: no later page is started and results past it are dropped. Returns results in page order,
+ * exactly what a one-page-at-a-time loop would have collected.
+ */
+export async function fetchPagesConcurrently<T>(
+  maxPages: number,
+  concurrency: number,
+  fetchPage: (page: number) => Promise<T[]>,
+  limiter?: RateLimiter
+): Promise<T[]> {
+  const pages: Map<number, T[]> = new Map();
+  let nextPage = 1;
+  let stopAt = maxPages + 1;  // first page that came back empty or failed
+
+  const worker = async (): Promise<void> => {
+    for (;;) {
+      const page = nextPage++;
+      if (page >= stopAt) return;
+      if (limiter) await limiter.waitIfNeeded();
+      if (page >= stopAt) return;
+      try {
+        const items = await fetchPage(page);
+        if (items.length === 0) stopAt = Math.min(stopAt, page);
+        else pages.set(page, items);
+      } catch (error) {
+        console.error(`[PAGINATION] Error on page ${page}:`, error);
+        stopAt = Math.min(stopAt, page);
+      }
+    }
+  };
+  await Promise.all(Array.from({ length: Math.max(1, Math.min(concurrency, maxPages)) }, worker));
+
+  const results: T[] = [];
+  for (let page = 1; page < stopAt; page++) {
+    const items = pages.get(page);
+    if (items) results.push(...items);
+  }
+  return results;
+}
+
 /**
  * Sleep utility
  */
@@ -3,7 +3,7 @@
  * Replaces brittle HTML scrapers with stable API-based scraping
  */
 
-import axios from 'axios';
+import { httpClient } from '../http-client';
 import { Vehicle } from '../../types/types';
 import logger from '../../utils/logger';
 
@@ -89,7 +89,7 @@ export class ApifyScraperService {
         proxyConfiguration: { useApifyProxy: true },
       };
 
-      const runResponse = await axios.post(
+      const runResponse = await httpClient.post(
         `https://api.apify.com/v2/acts/${this.autotraderActorId}/runs?token=${this.apiToken}`,
         input,
         { headers: { 'Content-Type': 'application/json' } }
@@ -122,7 +122,7 @@ export class ApifyScraperService {
         proxyConfiguration: { useApifyProxy: true },
       };
 
-      const runResponse = await axios.post(
+      const runResponse = await httpClient.post(
         `https://api.apify.com/v2/acts/${this.cargurusActorId}/runs?token=${this.apiToken}`,
         input,
         { headers: { 'Content-Type': 'application/json' } }
@@ -187,7 +187,7 @@ export class ApifyScraperService {
     const pollInterval = 2000;
 
     while (Date.now() - startTime < maxWaitMs) {
-      const statusResponse = await axios.get(
+      const statusResponse = await httpClient.get(
         `https://api.apify.com/v2/actor-runs/${runId}?token=${this.apiToken}`
       );
 
@@ -196,7 +196,7 @@ export class ApifyScraperService {
 
       if (status === 'SUCCEEDED') {
         const datasetId = statusResponse.data.data.defaultDatasetId;
-        const dataResponse = await axios.get(
+        const dataResponse = await httpClient.get(
           `https://api.apify.com/v2/datasets/${datasetId}/items?token=${this.apiToken}`
         );
         return dataResponse.data;
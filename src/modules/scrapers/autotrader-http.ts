@@ -3,7 +3,7 @@
  * Uses direct HTTP requests instead of Puppeteer (faster, no bot detection)
  */
 
-import axios from 'axios';
+import { httpClient } from '../http-client';
 import * as cheerio from 'cheerio';
 import { Vehicle } from '../../types/types';
 import logger from '../../utils/logger';
@@ -27,7 +27,7 @@ export async function scrapeAutoTraderHTTP(params: AutoTraderParams): Promise<Ve
     const url = buildAutoTraderURL(params);
     logger.info('[AutoTrader-HTTP] Fetching:', url);
     
-    const response = await axios.get(url, {
+    const response = await httpClient.get(url, {
       headers: {
         'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
         'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
@@ -3,7 +3,7 @@
  * Uses direct HTTP requests with proper headers to avoid bot detection
  */
 
-import axios from 'axios';
+import { httpClient } from '../http-client';
 import * as cheerio from 'cheerio';
 import { Vehicle } from '../../types/types';
 import logger from '../../utils/logger';
@@ -39,7 +39,7 @@ export async function scrapeCarGurusHTTP(params: CarGurusParams): Promise<Vehicl
     
     for (const ua of userAgents) {
       try {
-        const response = await axios.get(url, {
+        const response = await httpClient.get(url, {
           headers: {
             'User-Agent': ua,
             'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
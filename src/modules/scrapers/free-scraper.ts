@@ -12,11 +12,11 @@
  * - Database storage via Supabase
  */
 
-import puppeteer, { Browser, Page } from 'puppeteer';
 import * as cheerio from 'cheerio';
 import { Vehicle } from '../../types/types';
 import { AUTOTRADER_SELECTORS, CARGURUS_SELECTORS, buildAutoTraderURL, buildCarGurusURL } from '../../config/scraper-selectors';
 import logger from '../../utils/logger';
+import { acquirePage, PageLeaseOptions } from '../browser-pool';
 
 export interface ScrapeParams {
   make?: string;
@@ -52,7 +52,6 @@ export interface ScrapedListing {
 }
 
 export class FreeVehicleScraper {
-  private browser: Browser | null = null;
   private delay = 3000; // 3 second delay between requests (increased for reliability)
   private maxRetries = 3;
   private blockedCount = 0;
@@ -60,40 +59,11 @@ export class FreeVehicleScraper {
   private selectorTimeout = 30000; // 30 second selector wait timeout
 
   /**
-   * Initialize browser instance
+   * No-op: pages are leased from the shared browser pool and released after each scrape, so one
+   * scraper must not close browsers other requests are using. The pool is closed on process
+   * shutdown (server.ts).
    */
-  private async initBrowser(): Promise<Browser> {
-    if (this.browser) {
-      return this.browser;
-    }
-
-    logger.info('[FreeScraper] Launching browser...');
-    
-    this.browser = await puppeteer.launch({
-      headless: true,
-      args: [
-        '--no-sandbox',
-        '--disable-setuid-sandbox',
-        '--disable-blink-features=AutomationControlled',
-        '--disable-dev-shm-usage',
-        '--disable-accelerated-2d-canvas',
-        '--disable-gpu'
-      ]
-    });
-
-    return this.browser;
-  }
-
-  /**
-   * Close browser instance
-   */
-  async closeBrowser(): Promise<void> {
-    if (this.browser) {
-      await this.browser.close();
-      this.browser = null;
-      logger.info('[FreeScraper] Browser closed');
-    }
-  }
+  async closeBrowser(): Promise<void> {}
 
   /**
    * Sleep utility
@@ -121,51 +91,21 @@ export class FreeVehicleScraper {
   }
 
   /**
-   * Setup page with anti-detection measures
+   * Page settings for anti-detection; resource blocking and the navigator overrides are applied by the pool
    */
-  private async setupPage(page: Page): Promise<void> {
-    // Set realistic user agent
-    await page.setUserAgent(
-      'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
-    );
-
-    // Set extra headers
-    await page.setExtraHTTPHeaders({
-      'Accept-Language': 'en-CA,en-US;q=0.9,en;q=0.8',
-      'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
-      'Accept-Encoding': 'gzip, deflate, br',
-      'Connection': 'keep-alive',
-      'Upgrade-Insecure-Requests': '1'
-    });
-
-    // Block unnecessary resources to speed up
-    await page.setRequestInterception(true);
-    page.on('request', (req) => {
-      const resourceType = req.resourceType();
-      if (['image', 'stylesheet', 'font', 'media'].includes(resourceType)) {
-        req.abort();
-      } else {
-        req.continue();
-      }
-    });
-
-    // Inject anti-detection scripts
-    await page.evaluateOnNewDocument(() => {
-      // Override navigator.webdriver
-      Object.defineProperty(navigator, 'webdriver', {
-        get: () => undefined
-      });
-
-      // Override plugins
-      Object.defineProperty(navigator, 'plugins', {
-        get: () => [1, 2, 3, 4, 5]
-      });
-
-      // Override languages
-      Object.defineProperty(navigator, 'languages', {
-        get: () => ['en-CA', 'en-US', 'en']
-      });
-    });
+  private pageOptions(): PageLeaseOptions {
+    return {
+      // Set realistic user agent
+      userAgent: 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+      // Set extra headers
+      headers: {
+        'Accept-Language': 'en-CA,en-US;q=0.9,en;q=0.8',
+        'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
+        'Accept-Encoding': 'gzip, deflate, br',
+        'Connection': 'keep-alive',
+        'Upgrade-Insecure-Requests': '1'
+      },
+    };
   }
 
   /**
@@ -336,11 +276,11 @@ export class FreeVehicleScraper {
     logger.info('[FreeScraper] Starting AutoTrader.ca scrape', params);
     
     const listings: ScrapedListing[] = [];
-    const browser = await this.initBrowser();
-    const page = await browser.newPage();
+    const lease = await acquirePage(this.pageOptions());
+    const page = lease.page;
+    let failed = false;
     
     try {
-      await this.setupPage(page);
       
       const searchUrl = buildAutoTraderURL({
         make: params.make,
@@ -422,9 +362,10 @@ export class FreeVehicleScraper {
         });
       }
       
+      failed = true;
       throw error;
     } finally {
-      await page.close();
+      await lease.release(failed);
     }
   }
 
@@ -435,11 +376,11 @@ export class FreeVehicleScraper {
     logger.info('[FreeScraper] Starting CarGurus.ca scrape', params);
     
     const listings: ScrapedListing[] = [];
-    const browser = await this.initBrowser();
-    const page = await browser.newPage();
+    const lease = await acquirePage(this.pageOptions());
+    const page = lease.page;
+    let failed = false;
     
     try {
-      await this.setupPage(page);
       
       const searchUrl = buildCarGurusURL({
         make: params.make,
@@ -516,9 +457,10 @@ export class FreeVehicleScraper {
         });
       }
       
+      failed = true;
       throw error;
     } finally {
-      await page.close();
+      await lease.release(failed);
     }
   }
 
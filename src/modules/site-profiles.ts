@@ -0,0 +1,46 @@
+/**
+ * SITE PROFILES
+ * What the dealer scraper has learned about each site (pagination, extraction strategy, gallery
+ * and field selectors), kept in the shared cache directory so repeat scrapes skip detection
+ */
+
+import { TieredCache } from './tiered-cache';
+
+export interface PaginationPattern {
+  type: 'query' | 'offset' | 'path' | 'next-link' | 'none';
+  param?: string;
+  pageSize?: number;
+}
+
+export interface SiteProfile {
+  domain: string;
+  pagination: PaginationPattern;
+  strategy?: string;          // extraction strategy id (json-ld, microdata, dom:<set id>, ...)
+  gallerySelector?: string;   // image selector that found vehicle photos
+  priceSelector?: string;     // selector inside a listing card holding the price
+  mileageSelector?: string;   // selector inside a listing card holding the mileage
+  pageYield?: number;         // most vehicles one listing page produced on the last good scrape
+  learnedAt: number;
+  validatedAt: number;
+}
+
+const siteProfiles = new TieredCache<SiteProfile>({
+  name: 'site-profiles',
+  ttlMs: 30 * 24 * 60 * 60 * 1000,
+  maxEntries: 1000,
+});
+
+export function getSiteProfile(domain: string): SiteProfile | null {
+  return siteProfiles.get(domain.toLowerCase()) || null;
+}
+
+export function saveSiteProfile(profile: SiteProfile): void {
+  siteProfiles.set(profile.domain.toLowerCase(), profile);
+}
+
+/**
+ * Forget a profile that no longer matches the site; the next scrape learns it again
+ */
+export function forgetSiteProfile(domain: string): void {
+  siteProfiles.delete(domain.toLowerCase());
+}
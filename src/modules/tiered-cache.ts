@@ -0,0 +1,370 @@
+/**
+ * TIERED CACHE
+ * Two-tier cache: an in-process LRU in front of an append-only log on disk that every process
+ * on the host reads and writes, with in-flight dedup and hit-rate metrics
+ */
+
+import fs from 'fs';
+import path from 'path';
+
+export interface TieredCacheOptions {
+  name: string;          // log file name (without extension)
+  ttlMs: number;
+  maxEntries?: number;   // LRU size
+  dir?: string;
+  syncIntervalMs?: number; // how stale a memory hit may be relative to other processes' writes
+}
+
+export interface TieredCacheStats {
+  name: string;
+  memoryHits: number;
+  diskHits: number;
+  misses: number;
+  coalesced: number;
+  hitRate: number;       // (memory + disk hits) / lookups
+  memoryEntries: number;
+  diskEntries: number;
+}
+
+interface CacheRecord<T> {
+  value: T;
+  expiresAt: number;
+}
+
+// Memory copy of a record; onDisk when the log holds the same write
+interface MemoryRecord<T> extends CacheRecord<T> {
+  onDisk: boolean;
+}
+
+// Where a live record sits in the log; values stay on disk until read
+interface LogEntry {
+  offset: number;
+  length: number;        // bytes, excluding the newline
+  expiresAt: number;
+}
+
+export const CACHE_DIR = process.env.CACHE_DIR || process.env.VIN_CACHE_DIR || path.join(process.cwd(), 'cache');
+const DEFAULT_MAX_ENTRIES = 5000;
+// Memory hits look at the log for other processes' writes at most this often
+const DEFAULT_SYNC_INTERVAL_MS = 1000;
+// Rewrite the log once superseded/expired lines outnumber live entries by this much
+const COMPACT_SLACK = 1000;
+const READ_CHUNK = 1024 * 1024;
+// A compaction lock older than this was left by a crashed process
+const LOCK_STALE_MS = 60 * 1000;
+
+/**
+ * Append-only JSON-lines log. Each process indexes keys to byte offsets and tails the file from
+ * its last offset on a miss, so entries written by other processes are picked up; values are
+ * read back from disk on a hit.
+ */
+class DiskLog<T> {
+  readonly file: string;
+  private index: Map<string, LogEntry> = new Map();
+  private offset = 0;
+  private inode = 0;
+  private lines = 0;
+  private checkedAt = 0;
+
+  constructor(file: string) {
+    this.file = file;
+  }
+
+  get size(): number {
+    return this.index.size;
+  }
+
+  get(key: string): CacheRecord<T> | undefined {
+    this.refresh();
+    const entry = this.index.get(key);
+    if (!entry) return undefined;
+    const record = this.read(key, entry);
+    if (!record) this.index.delete(key);
+    return record;
+  }
+
+  /**
+   * Expiry of the live record for key, without reading its value. The log is only re-checked
+   * once maxAgeMs has passed since the last check, so hot keys cost no disk I/O.
+   */
+  expiresAt(key: string, maxAgeMs: number): number | undefined {
+    if (Date.now() - this.checkedAt >= maxAgeMs) this.refresh();
+    return this.index.get(key)?.expiresAt;
+  }
+
+  /** Append a record; false if it could not be written */
+  append(key: string, record: CacheRecord<T>): boolean {
+    const line = Buffer.from(JSON.stringify({ k: key, v: record.value, e: record.expiresAt }) + '\n', 'utf8');
+    let fd: number | undefined;
+    try {
+      this.refresh();
+      fs.mkdirSync(path.dirname(this.file), { recursive: true });
+      fd = fs.openSync(this.file, 'a');
+      fs.writeSync(fd, line);
+      const stat = fs.fstatSync(fd);
+      // Index our own line only when nothing else was appended since the last read; otherwise
+      // the next refresh reads it along with the other process's lines
+      if ((stat.ino === this.inode || this.inode === 0) && stat.size - line.length === this.offset) {
+        this.inode = stat.ino;
+        this.setEntry(key, { offset: this.offset, length: line.length - 1, expiresAt: record.expiresAt });
+        this.offset = stat.size;
+        this.lines++;
+      }
+    } catch (error) {
+      console.error(`[TIERED_CACHE] Failed to write ${this.file}:`, error);
+      return false;
+    } finally {
+      if (fd !== undefined) fs.closeSync(fd);
+    }
+    if (this.lines > this.index.size * 2 + COMPACT_SLACK) this.compact();
+    return true;
+  }
+
+  private setEntry(key: string, entry: LogEntry): void {
+    if (entry.expiresAt > Date.now()) this.index.set(key, entry);
+    else this.index.delete(key);
+  }
+
+  private reset(inode: number): void {
+    this.index.clear();
+    this.offset = 0;
+    this.lines = 0;
+    this.inode = inode;
+  }
+
+  // Index whatever was appended since the last read (a rewritten file is re-read from the start)
+  private refresh(): void {
+    let fd: number | undefined;
+    this.checkedAt = Date.now();
+    try {
+      const stat = fs.statSync(this.file);
+      if (stat.ino !== this.inode || stat.size < this.offset) this.reset(stat.ino);
+      if (stat.size === this.offset) return;
+
+      fd = fs.openSync(this.file, 'r');
+      let pos = this.offset;               // file position of pending[0]
+      let pending = Buffer.alloc(0);       // bytes after the last complete line
+      while (pos + pending.length < stat.size) {
+        const chunk = Buffer.alloc(Math.min(READ_CHUNK, stat.size - pos - pending.length));
+        const read = fs.readSync(fd, chunk, 0, chunk.length, pos + pending.length);
+        if (read === 0) break;
+        const buf = pending.length ? Buffer.concat([pending, chunk.subarray(0, read)]) : chunk.subarray(0, read);
+        let start = 0;
+        for (let nl = buf.indexOf(10); nl >= 0; nl = buf.indexOf(10, start)) {
+          this.indexLine(buf, start, nl, pos + start);
+          start = nl + 1;
+        }
+        pos += start;
+        pending = buf.subarray(start);     // only complete lines are consumed
+      }
+      this.offset = pos;
+    } catch (error) {
+      if ((error as NodeJS.ErrnoException).code === 'ENOENT') this.reset(0);
+      else console.error(`[TIERED_CACHE] Failed to read ${this.file}:`, error);
+    } finally {
+      if (fd !== undefined) fs.closeSync(fd);
+    }
+  }
+
+  private indexLine(buf: Buffer, start: number, end: number, offset: number): void {
+    if (end === start) return;
+    this.lines++;
+    try {
+      const { k, e } = JSON.parse(buf.toString('utf8', start, end));
+      this.setEntry(k, { offset, length: end - start, expiresAt: e });
+    } catch (_e) {
+      // torn or foreign line; skip it
+    }
+  }
+
+  // Read a record back; undefined if it expired or the file was swapped under the index
+  private read(key: string, entry: LogEntry): CacheRecord<T> | undefined {
+    if (entry.expiresAt <= Date.now()) return undefined;
+    let fd: number | undefined;
+    try {
+      fd = fs.openSync(this.file, 'r');
+      const buf = Buffer.alloc(entry.length);
+      fs.readSync(fd, buf, 0, entry.length, entry.offset);
+      const { k, v, e } = JSON.parse(buf.toString('utf8'));
+      return k === key ? { value: v, expiresAt: e } : undefined;
+    } catch (_e) {
+      return undefined;
+    } finally {
+      if (fd !== undefined) fs.closeSync(fd);
+    }
+  }
+
+  // Take the compaction lock, or clear a stale one so a later append can retry
+  private lock(): number | undefined {
+    const lockFile = `${this.file}.lock`;
+    try {
+      return fs.openSync(lockFile, 'wx');
+    } catch (error) {
+      if ((error as NodeJS.ErrnoException).code !== 'EEXIST') throw error;
+      try {
+        if (Date.now() - fs.statSync(lockFile).mtimeMs > LOCK_STALE_MS) fs.unlinkSync(lockFile);
+      } catch (_e) {
+        // released meanwhile
+      }
+      return undefined;
+    }
+  }
+
+  /**
+   * Under a lock file: catch up on other processes' appends, copy live lines to a temp file and
+   * swap it in. Other processes notice the new inode and re-read it.
+   */
+  private compact(): void {
+    let lockFd: number | undefined;
+    let src: number | undefined;
+    let out: number | undefined;
+    const tmp = `${this.file}.${process.pid}.tmp`;
+    try {
+      lockFd = this.lock();
+      if (lockFd === undefined) return;
+      this.refresh();
+
+      const now = Date.now();
+      const next: Map<string, LogEntry> = new Map();
+      let written = 0;
+      src = fs.openSync(this.file, 'r');
+      out = fs.openSync(tmp, 'w');
+      for (const [k, entry] of this.index.entries()) {
+        if (entry.expiresAt <= now) continue;
+        const buf = Buffer.alloc(entry.length + 1);
+        fs.readSync(src, buf, 0, entry.length, entry.offset);
+        buf[entry.length] = 10;
+        fs.writeSync(out, buf);
+        next.set(k, { offset: written, length: entry.length, expiresAt: entry.expiresAt });
+        written += buf.length;
+      }
+      fs.closeSync(out);
+      out = undefined;
+      fs.renameSync(tmp, this.file);
+
+      this.index = next;
+      this.inode = fs.statSync(this.file).ino;
+      this.offset = written;
+      this.lines = next.size;
+      console.log(`[TIERED_CACHE] Compacted ${path.basename(this.file)} to ${next.size} entries`);
+    } catch (error) {
+      console.error(`[TIERED_CACHE] Failed to compact ${this.file}:`, error);
+      fs.rmSync(tmp, { force: true });
+    } finally {
+      if (src !== undefined) fs.closeSync(src);
+      if (out !== undefined) fs.closeSync(out);
+      if (lockFd !== undefined) {
+        fs.closeSync(lockFd);
+        fs.rmSync(`${this.file}.lock`, { force: true });
+      }
+    }
+  }
+}
+
+export class TieredCache<T> {
+  readonly name: string;
+  private ttlMs: number;
+  private maxEntries: number;
+  private syncIntervalMs: number;
+  private memory: Map<string, MemoryRecord<T>> = new Map();  // insertion order = LRU order
+  private disk: DiskLog<T>;
+  private inFlight: Map<string, Promise<T>> = new Map();
+  private counters = { memoryHits: 0, diskHits: 0, misses: 0, coalesced: 0 };
+
+  constructor(options: TieredCacheOptions) {
+    this.name = options.name;
+    this.ttlMs = options.ttlMs;
+    this.maxEntries = options.maxEntries || DEFAULT_MAX_ENTRIES;
+    this.syncIntervalMs = options.syncIntervalMs ?? DEFAULT_SYNC_INTERVAL_MS;
+    this.disk = new DiskLog<T>(path.join(options.dir || CACHE_DIR, `${options.name}.jsonl`));
+  }
+
+  /**
+   * Cached value from memory, then disk (promoted into memory); undefined on a miss.
+   * A memory copy that was written to disk is served only while the log still holds that
+   * write, so deletes and newer sets from other processes are seen within syncIntervalMs.
+   */
+  get(key: string): T | undefined {
+    const now = Date.now();
+    const cached = this.memory.get(key);
+    if (cached && cached.expiresAt > now && (!cached.onDisk || this.disk.expiresAt(key, this.syncIntervalMs) === cached.expiresAt)) {
+      this.memory.delete(key);
+      this.memory.set(key, cached);
+      this.counters.memoryHits++;
+      return cached.value;
+    }
+    if (cached) this.memory.delete(key);
+
+    const stored = this.disk.get(key);
+    if (stored && stored.expiresAt > now) {
+      this.remember(key, { ...stored, onDisk: true });
+      this.counters.diskHits++;
+      return stored.value;
+    }
+
+    this.counters.misses++;
+    return undefined;
+  }
+
+  set(key: string, value: T, ttlMs: number = this.ttlMs): void {
+    const record = { value, expiresAt: Date.now() + ttlMs };
+    const onDisk = this.disk.append(key, record);
+    this.remember(key, { ...record, onDisk });
+  }
+
+  /**
+   * Drop key from both tiers; the tombstone in the log hides it from other processes too,
+   * including their memory copies (see get)
+   */
+  delete(key: string): void {
+    this.memory.delete(key);
+    this.disk.append(key, { value: null as unknown as T, expiresAt: 0 });
+  }
+
+  /**
+   * Cached value, or the loader's result (stored on success). Concurrent calls for the same key
+   * share one load; a failed load is not cached and rejects every waiter.
+   */
+  getOrLoad(key: string, loader: () => Promise<T>): Promise<T> {
+    const cached = this.get(key);
+    if (cached !== undefined) return Promise.resolve(cached);
+
+    const pending = this.inFlight.get(key);
+    if (pending) {
+      this.counters.coalesced++;
+      return pending;
+    }
+
+    const load = loader()
+      .then(value => {
+        this.set(key, value);
+        return value;
+      })
+      .finally(() => this.inFlight.delete(key));
+    this.inFlight.set(key, load);
+    return load;
+  }
+
+  stats(): TieredCacheStats {
+    const { memoryHits, diskHits, misses, coalesced } = this.counters;
+    const lookups = memoryHits + diskHits + misses;
+    return {
+      name: this.name,
+      memoryHits,
+      diskHits,
+      misses,
+      coalesced,
+      hitRate: lookups > 0 ? (memoryHits + diskHits) / lookups : 0,
+      memoryEntries: this.memory.size,
+      diskEntries: this.disk.size,
+    };
+  }
+
+  private remember(key: string, record: MemoryRecord<T>): void {
+    this.memory.delete(key);
+    this.memory.set(key, record);
+    if (this.memory.size > this.maxEntries) {
+      this.memory.delete(this.memory.keys().next().value as string);
+    }
+  }
+}
@@ -0,0 +1,149 @@
+/**
+ * VALUATION SERVICE
+ * VinAudit market valuations cached per (VIN, mileage bucket) in the shared VIN cache,
+ * with bounded concurrency and background enrichment
+ */
+
+import { Vehicle } from '../types/types';
+import { getVehicleValuation } from './vin-decoder';
+import { RateLimiter } from './scraper-utils';
+import { normalizeVin } from './inventory-store';
+import { vinValuationCache, CachedValuation } from './vin-cache';
+import { TieredCacheStats } from './tiered-cache';
+
+export type Valuation = CachedValuation;
+
+export interface ValuationStats {
+  cache: TieredCacheStats;
+  failures: number;
+  queued: number;
+}
+
+const MILEAGE_BUCKET_KM = 5000;
+const VALUATION_CONCURRENCY = Math.max(1, parseInt(process.env.VINAUDIT_CONCURRENCY || '4', 10) || 4);
+const BACKGROUND_BATCH_SIZE = 50;
+
+const rateLimiter = new RateLimiter(200);
+let failures = 0;
+let queued = 0;
+
+// Concurrency slots; a finished request hands its slot straight to the next waiter
+let activeRequests = 0;
+const slotWaiters: Array<() => void> = [];
+
+export function valuationsEnabled(): boolean {
+  return !!process.env.VINAUDIT_API_KEY;
+}
+
+/**
+ * Cache key: normalized VIN plus mileage rounded down to a 5,000 km bucket
+ */
+export function valuationCacheKey(vin: string, mileage?: number): string {
+  const bucket = Math.floor(Math.max(0, Number(mileage) || 0) / MILEAGE_BUCKET_KM);
+  return `${normalizeVin(vin)}|${bucket}`;
+}
+
+async function withSlot<T>(fn: () => Promise<T>): Promise<T> {
+  if (activeRequests >= VALUATION_CONCURRENCY) {
+    await new Promise<void>(resolve => slotWaiters.push(resolve));
+  } else {
+    activeRequests++;
+  }
+  try {
+    return await fn();
+  } finally {
+    const next = slotWaiters.shift();
+    if (next) next();
+    else activeRequests--;
+  }
+}
+
+/**
+ * Cached valuation for a VIN at this mileage, or null (never calls the API)
+ */
+export function getCachedValuation(vin: string, mileage?: number): Valuation | null {
+  return vinValuationCache.get(valuationCacheKey(vin, mileage)) || null;
+}
+
+/**
+ * Valuation from the cache or VinAudit. Concurrent requests for the same key share one call;
+ * API calls are rate limited and capped at VALUATION_CONCURRENCY. Resolves null on failure.
+ */
+export function fetchValuation(vin: string, mileage?: number): Promise<Valuation | null> {
+  if (!vin) return Promise.resolve(null);
+  return vinValuationCache
+    .getOrLoad(valuationCacheKey(vin, mileage), () => withSlot(async () => {
+      await rateLimiter.waitIfNeeded();
+      return getVehicleValuation(vin, mileage);
+    }))
+    .catch(() => {
+      failures++;
+      return null;
+    });
+}
+
+function applyValuation(vehicle: Vehicle, valuation: Valuation): Vehicle {
+  return { ...vehicle, blackBookValue: valuation.wholesale };
+}
+
+/**
+ * Value every vehicle (wholesale → blackBookValue); vehicles without a valuation are returned as-is
+ */
+export async function valueVehicles(vehicles: Vehicle[]): Promise<Vehicle[]> {
+  if (!valuationsEnabled()) return vehicles;
+  return Promise.all(vehicles.map(async v => {
+    const valuation = await fetchValuation(v.vin, v.mileage);
+    return valuation ? applyValuation(v, valuation) : v;
+  }));
+}
+
+/**
+ * Apply cached valuations synchronously; `pending` lists the vehicles that still need an API call
+ */
+export function applyCachedValuations(vehicles: Vehicle[]): { vehicles: Vehicle[]; pending: Vehicle[] } {
+  if (!valuationsEnabled()) return { vehicles, pending: [] };
+  const pending: Vehicle[] = [];
+  const valued = vehicles.map(v => {
+    const cached = v.vin ? getCachedValuation(v.vin, v.mileage) : null;
+    if (cached) return applyValuation(v, cached);
+    if (v.vin) pending.push(v);
+    return v;
+  });
+  return { vehicles: valued, pending };
+}
+
+/**
+ * Value vehicles after the caller has returned. onValued receives each batch of vehicles
+ * whose valuation came back (with blackBookValue set) so it can patch them into inventory.
+ */
+export function valueInBackground(
+  vehicles: Vehicle[],
+  onValued: (valued: Vehicle[]) => void | Promise<void>
+): void {
+  if (!valuationsEnabled() || vehicles.length === 0) return;
+  queued += vehicles.length;
+
+  (async () => {
+    for (let i = 0; i < vehicles.length; i += BACKGROUND_BATCH_SIZE) {
+      const batch = vehicles.slice(i, i + BACKGROUND_BATCH_SIZE);
+      const valued: Vehicle[] = [];
+      await Promise.all(batch.map(async v => {
+        const valuation = await fetchValuation(v.vin, v.mileage);
+        if (valuation) valued.push(applyValuation(v, valuation));
+      }));
+      queued -= batch.length;
+      if (valued.length > 0) {
+        try {
+          await onValued(valued);
+        } catch (error) {
+          console.error('[VALUATION] Failed to apply background valuations:', error);
+        }
+      }
+    }
+    console.log(`[VALUATION] Background valuation finished for ${vehicles.length} vehicles`);
+  })().catch(error => console.error('[VALUATION] Background valuation failed:', error));
+}
+
+export function getValuationStats(): ValuationStats {
+  return { cache: vinValuationCache.stats(), failures, queued };
+}
@@ -0,0 +1,27 @@
+/**
+ * VIN CACHE
+ * Tiered caches for VIN spec decodes and valuations (see tiered-cache.ts)
+ */
+
+import { VINDecodingResult } from '../types/types';
+import { TieredCache, TieredCacheStats } from './tiered-cache';
+
+export interface CachedValuation {
+  wholesale: number;
+  retail: number;
+}
+
+// Specs never change for a VIN; valuations move with the market
+export const vinSpecCache = new TieredCache<VINDecodingResult>({
+  name: 'vin-specs',
+  ttlMs: 365 * 24 * 60 * 60 * 1000,
+});
+
+export const vinValuationCache = new TieredCache<CachedValuation>({
+  name: 'vin-valuations',
+  ttlMs: 7 * 24 * 60 * 60 * 1000,
+});
+
+export function getVinCacheStats(): TieredCacheStats[] {
+  return [vinSpecCache.stats(), vinValuationCache.stats()];
+}
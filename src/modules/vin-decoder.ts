@@ -1,100 +1,169 @@
 /**
  * MODULE 8: VIN DECODER
- * Extracts vehicle information from VIN number
+ * Extracts vehicle information from VIN number (offline WMI/VDS tables, VinAudit on a miss)
  */
 
 import axios from 'axios';
 import { VINDecodingResult } from '../types/types';
+import { WMI_MAKES, WMI_PREFIX_MAKES, VDS_PATTERNS } from './vin-tables';
+import { vinSpecCache } from './vin-cache';
 
-export function decodeVIN(vin: string): VINDecodingResult {
-  if (!/^[A-HJ-NPR-Z0-9]{17}$/.test(vin)) {
+export interface VINDecodeDetail extends VINDecodingResult {
+  vin: string;
+  checkDigitValid: boolean;
+  match: 'vds' | 'wmi' | 'none';  // how much of the VIN the offline tables recognized
+}
+
+interface VdsEntry {
+  model: string;
+  body: string;
+  engine: string;
+}
+
+// Tables are indexed once at load: WMI code → make, WMI+VDS prefix → model/body/engine
+const WMI_INDEX: Map<string, string> = new Map(Object.entries(WMI_MAKES));
+const WMI_PREFIX_INDEX: Map<string, string> = new Map(Object.entries(WMI_PREFIX_MAKES));
+const VDS_INDEX: Map<string, VdsEntry> = new Map();
+let vdsMinPrefix = 8;
+let vdsMaxPrefix = 0;
+for (const row of VDS_PATTERNS) {
+  const [prefix, model, body, engine] = row.split('|');
+  VDS_INDEX.set(prefix, { model, body, engine: engine || 'Unknown' });
+  vdsMinPrefix = Math.min(vdsMinPrefix, prefix.length);
+  vdsMaxPrefix = Math.max(vdsMaxPrefix, prefix.length);
+}
+
+const VIN_PATTERN = /^[A-HJ-NPR-Z0-9]{17}$/;
+
+// Check digit (position 9): transliterated values weighted by position, mod 11 (10 → 'X')
+const CHECK_WEIGHTS = [8, 7, 6, 5, 4, 3, 2, 10, 0, 9, 8, 7, 6, 5, 4, 3, 2];
+const TRANSLITERATION = new Int8Array(128);
+'0123456789'.split('').forEach((c, i) => { TRANSLITERATION[c.charCodeAt(0)] = i; });
+'ABCDEFGH'.split('').forEach((c, i) => { TRANSLITERATION[c.charCodeAt(0)] = i + 1; });
+'JKLMN'.split('').forEach((c, i) => { TRANSLITERATION[c.charCodeAt(0)] = i + 1; });
+TRANSLITERATION['P'.charCodeAt(0)] = 7;
+TRANSLITERATION['R'.charCodeAt(0)] = 9;
+'STUVWXYZ'.split('').forEach((c, i) => { TRANSLITERATION[c.charCodeAt(0)] = i + 2; });
+
+// Model year codes (position 10), repeating every 30 years from 1980
+const YEAR_CODES = 'ABCDEFGHJKLMNPRSTVWXY123456789';
+
+/**
+ * Expected check digit for a well-formed VIN
+ */
+export function vinCheckDigit(vin: string): string {
+  let sum = 0;
+  for (let i = 0; i < 17; i++) sum += TRANSLITERATION[vin.charCodeAt(i)] * CHECK_WEIGHTS[i];
+  const remainder = sum % 11;
+  return remainder === 10 ? 'X' : String(remainder);
+}
+
+export function decodeVIN(vin: string): VINDecodeDetail {
+  const normalized = vin.trim().toUpperCase();
+  if (!VIN_PATTERN.test(normalized)) {
     throw new Error('Invalid VIN format');
   }
+  return decodeNormalizedVIN(normalized);
+}
 
-  const yearChar = vin.charAt(9);
-  const year = decodeModelYear(yearChar);
-  const manufacturer = decodeManufacturer(vin.substring(0, 3));
-  const modelInfo = decodeModel(vin.substring(3, 8));
+/**
+ * Decode many VINs offline; results line up with the input and are null for malformed VINs.
+ * Repeated VINs in the batch are decoded once.
+ */
+export function decodeVINs(vins: string[]): (VINDecodeDetail | null)[] {
+  const seen: Map<string, VINDecodeDetail | null> = new Map();
+  return vins.map(vin => {
+    const normalized = String(vin || '').trim().toUpperCase();
+    let result = seen.get(normalized);
+    if (result === undefined) {
+      result = VIN_PATTERN.test(normalized) ? decodeNormalizedVIN(normalized) : null;
+      seen.set(normalized, result);
+    }
+    return result;
+  });
+}
 
+function decodeNormalizedVIN(vin: string): VINDecodeDetail {
+  const make = WMI_INDEX.get(vin.substring(0, 3)) || WMI_PREFIX_INDEX.get(vin.substring(0, 2));
+  const vds = lookupVds(vin);
   return {
-    year,
-    make: manufacturer,
-    model: modelInfo.model,
-    body: modelInfo.body,
-    engine: modelInfo.engine,
+    vin,
+    year: decodeModelYear(vin),
+    make: make || 'Unknown',
+    model: vds?.model || 'Unknown',
+    body: vds?.body || 'Unknown',
+    engine: vds?.engine || 'Unknown',
     transmission: 'Unknown',
+    checkDigitValid: vin.charAt(8) === vinCheckDigit(vin),
+    match: vds ? 'vds' : make ? 'wmi' : 'none',
   };
 }
 
+// Longest WMI+VDS prefix present in the table
+function lookupVds(vin: string): VdsEntry | undefined {
+  for (let len = vdsMaxPrefix; len >= vdsMinPrefix; len--) {
+    const entry = VDS_INDEX.get(vin.substring(0, len));
+    if (entry) return entry;
+  }
+  return undefined;
+}
+
 const VINAUDIT_API_KEY = process.env.VINAUDIT_API_KEY;
 const VINAUDIT_BASE_URL = 'https://api.vinaudit.ca/v2';
 
 /**
- * Attempt to decode VIN via VinAudit Canada API.
- * Falls back to static decoder if API key is missing or API fails.
+ * Decode a VIN offline, falling back to the VinAudit Canada API (through the shared VIN cache)
+ * when the tables do not know the model. Returns the offline result if the API key is missing or the API fails.
  */
 export async function decodeVINWithVinAudit(vin: string): Promise<VINDecodingResult> {
   if (!/^[A-HJ-NPR-Z0-9]{17}$/.test(vin)) {
     throw new Error('Invalid VIN format: Must be 17 characters (excluding I, O, Q)');
   }
 
-  if (!VINAUDIT_API_KEY) {
-    return decodeVIN(vin);
+  // The offline tables answer most VINs; only go to the API when they miss the model
+  const local = decodeVIN(vin);
+  if (!VINAUDIT_API_KEY || local.match === 'vds') {
+    return local;
   }
 
   try {
-    const response = await axios.get(`${VINAUDIT_BASE_URL}/specifications`, {
-      params: { key: VINAUDIT_API_KEY, vin, format: 'json' },
-      timeout: 5000,
+    return await vinSpecCache.getOrLoad(vin, async () => {
+      const response = await axios.get(`${VINAUDIT_BASE_URL}/specifications`, {
+        params: { key: VINAUDIT_API_KEY, vin, format: 'json' },
+        timeout: 5000,
+      });
+      const data = response.data;
+      const specs = data?.attributes || {};
+
+      const year = parseInt(specs.year) || local.year;
+      return {
+        year,
+        make: specs.make || local.make,
+        model: specs.model || 'Unknown',
+        body: specs.body_style || 'Unknown',
+        engine: specs.engine || 'Unknown',
+        transmission: specs.transmission || 'Unknown',
+      };
     });
-    const data = response.data;
-    const specs = data?.attributes || {};
-
-    const year = parseInt(specs.year) || decodeModelYear(vin.charAt(9));
-    return {
-      year,
-      make: specs.make || 'Unknown',
-      model: specs.model || 'Unknown',
-      body: specs.body_style || 'Unknown',
-      engine: specs.engine || 'Unknown',
-      transmission: specs.transmission || 'Unknown',
-    };
   } catch (_e) {
-    return decodeVIN(vin);
+    return local;
   }
 }
 
-function decodeModelYear(char: string): number {
-  const yearMap: Record<string, number> = {
-    Y: 2000, Z: 2001, A: 2010, B: 2011, C: 2012, D: 2013, E: 2014,
-    F: 2015, G: 2016, H: 2017, J: 2018, K: 2019, L: 2020, M: 2021,
-    N: 2022, P: 2023, R: 2024, S: 2025, T: 2026, V: 2027, W: 2028,
-  };
-  return yearMap[char] || new Date().getFullYear();
-}
-
-function decodeManufacturer(code: string): string {
-  const manufacturers: Record<string, string> = {
-    JHM: 'Honda', JT2: 'Toyota', JT3: 'Toyota', JT4: 'Toyota',
-    JF1: 'Subaru', JF2: 'Subaru', KMH: 'Hyundai', KNA: 'Kia',
-    '1G1': 'Chevrolet', '1G3': 'Oldsmobile', '1GT': 'GMC',
-    '2G1': 'Pontiac', '2G6': 'Cadillac', '2HG': 'Honda',
-    '2T1': 'Toyota', '2T3': 'Toyota', '3G1': 'Chevrolet',
-    '3G2': 'Pontiac', '3G5': 'Chevrolet', '5TNM': 'Toyota',
-  };
-  return manufacturers[code] || 'Unknown';
-}
-
-function decodeModel(code: string): {
-  model: string;
-  body: string;
-  engine: string;
-} {
-  return {
-    model: 'Model',
-    body: 'Sedan',
-    engine: '2.0L',
-  };
+/**
+ * Model year from position 10. North American VINs (first digit 1-5) use position 7 to pick the
+ * cycle (letter → 2010+); otherwise the latest year not beyond next year is assumed.
+ */
+function decodeModelYear(vin: string): number {
+  const idx = YEAR_CODES.indexOf(vin.charAt(9));
+  if (idx < 0) return new Date().getFullYear();
+  const early = 1980 + idx;
+  const late = early + 30;
+  if (late > new Date().getFullYear() + 1) return early;
+  if (vin.charAt(0) >= '1' && vin.charAt(0) <= '5') {
+    return /[A-Z]/.test(vin.charAt(6)) ? late : early;
+  }
+  return late;
 }
 
 /**
@@ -0,0 +1,423 @@
+/**
+ * VIN TABLES
+ * Prebuilt WMI (positions 1-3) and VDS (positions 4-8) patterns for the offline decoder.
+ * VDS rows are "WMI+VDS prefix|model|body|engine"; the longest matching prefix wins and an
+ * empty engine means the pattern does not pin one down.
+ */
+
+// World Manufacturer Identifiers (3 characters)
+export const WMI_MAKES: Record<string, string> = {
+  // Acura / Honda
+  '19U': 'Acura', '2HN': 'Acura', '5J8': 'Acura', 'JH4': 'Acura',
+  '19X': 'Honda', '1HG': 'Honda', '2HG': 'Honda', '2HK': 'Honda', '2HJ': 'Honda', '5FN': 'Honda',
+  '5FP': 'Honda', '5J6': 'Honda', '3CZ': 'Honda', '7FA': 'Honda', 'JHL': 'Honda', 'JHM': 'Honda', 'SHH': 'Honda', 'SHS': 'Honda',
+  // Toyota / Lexus
+  '2T1': 'Toyota', '2T2': 'Lexus', '2T3': 'Toyota', '3TM': 'Toyota', '3TY': 'Toyota', '4T1': 'Toyota',
+  '4T3': 'Toyota', '4T4': 'Toyota', '5TD': 'Toyota', '5TF': 'Toyota', '5YF': 'Toyota', '7MU': 'Toyota',
+  'JT2': 'Toyota', 'JT3': 'Toyota', 'JT4': 'Toyota', 'JTD': 'Toyota', 'JTE': 'Toyota', 'JTK': 'Toyota',
+  'JTM': 'Toyota', 'JTN': 'Toyota', 'JTH': 'Lexus', 'JTJ': 'Lexus', '58A': 'Lexus',
+  // Nissan / Infiniti
+  '1N4': 'Nissan', '1N6': 'Nissan', '3N1': 'Nissan', '3N6': 'Nissan', '3N8': 'Nissan', '5N1': 'Nissan',
+  '1N8': 'Nissan', 'JN1': 'Nissan', 'JN8': 'Nissan', 'KNM': 'Nissan', '5N3': 'Infiniti', 'JNK': 'Infiniti',
+  'JNR': 'Infiniti',
+  // Mazda / Subaru / Mitsubishi
+  '3MZ': 'Mazda', '3MV': 'Mazda', 'JM1': 'Mazda', 'JM3': 'Mazda', 'JMZ': 'Mazda',
+  '4S3': 'Subaru', '4S4': 'Subaru', 'JF1': 'Subaru', 'JF2': 'Subaru',
+  '4A3': 'Mitsubishi', '4A4': 'Mitsubishi', 'JA3': 'Mitsubishi', 'JA4': 'Mitsubishi', 'ML3': 'Mitsubishi',
+  // Hyundai / Kia / Genesis
+  '5NM': 'Hyundai', '5NP': 'Hyundai', '5NT': 'Hyundai', 'KM8': 'Hyundai', 'KMH': 'Hyundai', 'KMF': 'Hyundai',
+  '3KP': 'Kia', '5XX': 'Kia', '5XY': 'Kia', 'KNA': 'Kia', 'KND': 'Kia', 'KMT': 'Genesis',
+  // Ford / Lincoln
+  '1FA': 'Ford', '1FB': 'Ford', '1FC': 'Ford', '1FD': 'Ford', '1FM': 'Ford', '1FT': 'Ford', '1ZV': 'Ford',
+  '2FA': 'Ford', '2FM': 'Ford', '2FT': 'Ford', '3FA': 'Ford', '3FM': 'Ford', '3FT': 'Ford', 'NM0': 'Ford',
+  'WF0': 'Ford', '1LN': 'Lincoln', '2LM': 'Lincoln', '5LM': 'Lincoln',
+  // General Motors
+  '1G1': 'Chevrolet', '1GC': 'Chevrolet', '1GN': 'Chevrolet', '1GB': 'Chevrolet', '2G1': 'Chevrolet',
+  '2GC': 'Chevrolet', '2GN': 'Chevrolet', '3G1': 'Chevrolet', '3GC': 'Chevrolet', '3GN': 'Chevrolet',
+  'KL7': 'Chevrolet', 'KL8': 'Chevrolet', 'KL4': 'Buick', '1G4': 'Buick', '2G4': 'Buick', '5GA': 'Buick',
+  'LRB': 'Buick', '1GT': 'GMC', '1GK': 'GMC', '2GT': 'GMC', '2GK': 'GMC', '3GT': 'GMC', '3GK': 'GMC',
+  '1G6': 'Cadillac', '1GY': 'Cadillac', '2G6': 'Cadillac', '1G3': 'Oldsmobile', '2G2': 'Pontiac',
+  '3G2': 'Pontiac', '1G8': 'Saturn',
+  // Stellantis
+  '1C3': 'Chrysler', '2C3': 'Chrysler', '2C4': 'Chrysler', '1C4': 'Jeep', '1J4': 'Jeep', '1J8': 'Jeep',
+  'ZAC': 'Jeep', '1B3': 'Dodge', '2B3': 'Dodge', '2D4': 'Dodge', '2D3': 'Dodge', '1D7': 'Ram', '3D7': 'Ram',
+  '1C6': 'Ram', '3C6': 'Ram', '3C7': 'Ram', '3C4': 'Chrysler', 'ZFA': 'Fiat', 'ZAM': 'Maserati',
+  // Volkswagen group
+  '3VW': 'Volkswagen', '3VV': 'Volkswagen', '1VW': 'Volkswagen', '1V2': 'Volkswagen', 'WVW': 'Volkswagen', 'WVG': 'Volkswagen',
+  'WV1': 'Volkswagen', 'WV2': 'Volkswagen', 'WAU': 'Audi', 'WA1': 'Audi', 'WUA': 'Audi', 'WP0': 'Porsche',
+  'WP1': 'Porsche',
+  // Other European
+  'WBA': 'BMW', 'WBS': 'BMW', 'WBX': 'BMW', '5UX': 'BMW', '5UJ': 'BMW', '4US': 'BMW', 'WMW': 'MINI',
+  'WDB': 'Mercedes-Benz', 'WDC': 'Mercedes-Benz', 'WDD': 'Mercedes-Benz', 'W1K': 'Mercedes-Benz',
+  'W1N': 'Mercedes-Benz', '4JG': 'Mercedes-Benz', '55S': 'Mercedes-Benz', 'WD3': 'Mercedes-Benz',
+  'W1Y': 'Mercedes-Benz', 'YV1': 'Volvo', 'YV4': 'Volvo', '7JR': 'Volvo', 'SAL': 'Land Rover',
+  'SAJ': 'Jaguar', 'SCC': 'Lotus', 'ZFF': 'Ferrari', 'ZHW': 'Lamborghini',
+  // Other
+  '5YJ': 'Tesla', '7SA': 'Tesla', 'LRW': 'Tesla', '7G2': 'Tesla', '1HD': 'Harley-Davidson',
+  '5XJ': 'Polaris', '3BP': 'Polaris', 'KNH': 'Kia', '1RN': 'Rivian', '7PD': 'Rivian',
+};
+
+// Two-character fallbacks for manufacturers whose full WMI is not listed above
+export const WMI_PREFIX_MAKES: Record<string, string> = {
+  JH: 'Honda', JT: 'Toyota', JN: 'Nissan', JM: 'Mazda', JF: 'Subaru', JA: 'Mitsubishi',
+  KM: 'Hyundai', KN: 'Kia', WB: 'BMW', WD: 'Mercedes-Benz', WV: 'Volkswagen', WA: 'Audi', WP: 'Porsche',
+  YV: 'Volvo', '5Y': 'Tesla',
+};
+
+export const VDS_PATTERNS: string[] = [
+  // Honda
+  '2HGFA1|Civic|Sedan|1.8L I4',
+  '2HGFB2|Civic|Sedan|1.8L I4',
+  '2HGFC1|Civic|Sedan|1.5L I4 Turbo',
+  '2HGFC2|Civic|Sedan|2.0L I4',
+  '2HGFC4|Civic|Coupe|1.5L I4 Turbo',
+  '2HGFE2|Civic|Sedan|2.0L I4',
+  '19XFC1|Civic|Sedan|1.5L I4 Turbo',
+  '19XFC2|Civic|Sedan|2.0L I4',
+  'SHHFK7|Civic|Hatchback|1.5L I4 Turbo',
+  '1HGCM5|Accord|Sedan|2.4L I4',
+  '1HGCM6|Accord|Sedan|3.0L V6',
+  '1HGCM8|Accord|Sedan|3.0L V6',
+  '1HGCP2|Accord|Sedan|2.4L I4',
+  '1HGCP3|Accord|Sedan|3.5L V6',
+  '1HGCR2|Accord|Sedan|2.4L I4',
+  '1HGCR3|Accord|Sedan|3.5L V6',
+  '1HGCV1|Accord|Sedan|1.5L I4 Turbo',
+  '1HGCV2|Accord|Sedan|2.0L I4 Turbo',
+  '2HKRM3|CR-V|SUV|2.4L I4',
+  '2HKRM4|CR-V|SUV|2.4L I4',
+  '2HKRW2|CR-V|SUV|1.5L I4 Turbo',
+  '5J6RM4|CR-V|SUV|2.4L I4',
+  '5J6RW2|CR-V|SUV|1.5L I4 Turbo',
+  '5J6RS|CR-V|SUV|1.5L I4 Turbo',
+  '3CZRU|HR-V|SUV|1.8L I4',
+  '5FNRL5|Odyssey|Minivan|3.5L V6',
+  '5FNRL6|Odyssey|Minivan|3.5L V6',
+  '5FNYF4|Pilot|SUV|3.5L V6',
+  '5FNYF6|Pilot|SUV|3.5L V6',
+  '5FPYK3|Ridgeline|Pickup|3.5L V6',
+  '5J8TB4|RDX|SUV|2.3L I4 Turbo',
+  '5J8TC|RDX|SUV|2.0L I4 Turbo',
+  '5J8YD|MDX|SUV|3.5L V6',
+  '19UUB|TLX|Sedan|',
+  // Toyota
+  '2T1BU4|Corolla|Sedan|1.8L I4',
+  '2T1BURHE|Corolla|Sedan|1.8L I4',
+  '5YFBURHE|Corolla|Sedan|1.8L I4',
+  '2T1BPRHE|Corolla|Sedan|1.8L I4',
+  '5YFB4MDE|Corolla|Sedan|2.0L I4',
+  '2T1B4MDE|Corolla|Sedan|2.0L I4',
+  'JTDEPRAE|Corolla|Sedan|1.8L I4',
+  'JTNK4RBE|Corolla|Hatchback|2.0L I4',
+  '4T1BE4|Camry|Sedan|2.5L I4',
+  '4T1BF1FK|Camry|Sedan|2.5L I4',
+  '4T1BK1FK|Camry|Sedan|3.5L V6',
+  '4T1B11HK|Camry|Sedan|2.5L I4',
+  '4T1G11AK|Camry|Sedan|2.5L I4',
+  '4T1B21HK|Camry Hybrid|Sedan|2.5L I4 Hybrid',
+  '2T3ZFREV|RAV4|SUV|2.5L I4',
+  '2T3RFREV|RAV4|SUV|2.5L I4',
+  '2T3BFREV|RAV4|SUV|2.5L I4',
+  '2T3DFREV|RAV4|SUV|2.5L I4',
+  '2T3P1RFV|RAV4|SUV|2.5L I4',
+  '2T3W1RFV|RAV4|SUV|2.5L I4',
+  '2T3R1RFV|RAV4|SUV|2.5L I4',
+  '2T3RWRFV|RAV4 Hybrid|SUV|2.5L I4 Hybrid',
+  '4T3RWRFV|RAV4 Hybrid|SUV|2.5L I4 Hybrid',
+  'JTMRWRFV|RAV4 Hybrid|SUV|2.5L I4 Hybrid',
+  '5TDJZRFH|Highlander|SUV|3.5L V6',
+  '5TDBZRFH|Highlander|SUV|3.5L V6',
+  '5TDGZRAH|Highlander|SUV|3.5L V6',
+  '5TDKDRAH|Highlander|SUV|3.5L V6',
+  '3TMCZ5AN|Tacoma|Pickup|3.5L V6',
+  '3TMDZ5BN|Tacoma|Pickup|3.5L V6',
+  '5TFDW5F1|Tundra|Pickup|5.7L V8',
+  '5TFDY5F1|Tundra|Pickup|5.7L V8',
+  '5TFUY5F1|Tundra|Pickup|5.7L V8',
+  '5TDYZ3DC|Sienna|Minivan|3.5L V6',
+  '5TDKZ3DC|Sienna|Minivan|3.5L V6',
+  'JTDKN3DU|Prius|Hatchback|1.8L I4 Hybrid',
+  'JTDKARFU|Prius|Hatchback|1.8L I4 Hybrid',
+  '7MUAAABG|Corolla Cross|SUV|2.0L I4',
+  'JTNKHMBX|C-HR|SUV|2.0L I4',
+  // Nissan
+  '1N4AL2|Altima|Sedan|2.5L I4',
+  '1N4AL3|Altima|Sedan|2.5L I4',
+  '1N4BL4|Altima|Sedan|2.5L I4',
+  '3N1AB6|Sentra|Sedan|2.0L I4',
+  '3N1AB7|Sentra|Sedan|1.8L I4',
+  '3N1AB8|Sentra|Sedan|2.0L I4',
+  '3N1CN7|Versa|Sedan|1.6L I4',
+  '3N1CN8|Versa|Sedan|1.6L I4',
+  '3N1CP5|Kicks|SUV|1.6L I4',
+  '5N1AT2|Rogue|SUV|2.5L I4',
+  '5N1AT3|Rogue|SUV|2.5L I4',
+  'JN8AT2|Rogue|SUV|2.5L I4',
+  'JN8AT3|Rogue|SUV|',
+  'JN1BJ1|Qashqai|SUV|2.0L I4',
+  'JN8AS5|Rogue|SUV|2.5L I4',
+  '5N1DR2|Pathfinder|SUV|3.5L V6',
+  '5N1AZ2|Murano|SUV|3.5L V6',
+  '1N6AD0|Frontier|Pickup|',
+  '1N6ED1|Frontier|Pickup|3.8L V6',
+  // Mazda
+  'JM1BL1|Mazda3|Sedan|2.0L I4',
+  'JM1BM1|Mazda3|Sedan|2.0L I4',
+  'JM1BN1|Mazda3|Hatchback|2.0L I4',
+  'JM1BPA|Mazda3|Sedan|2.5L I4',
+  '3MZBPA|Mazda3|Sedan|2.5L I4',
+  '3MZBPB|Mazda3|Hatchback|2.5L I4',
+  'JM1GJ1|Mazda6|Sedan|2.5L I4',
+  'JM1GL1|Mazda6|Sedan|2.5L I4',
+  'JM3KE2|CX-5|SUV|2.5L I4',
+  'JM3KE4|CX-5|SUV|2.5L I4',
+  'JM3KFB|CX-5|SUV|2.5L I4',
+  'JM3KFA|CX-5|SUV|2.5L I4',
+  'JM3TCB|CX-9|SUV|2.5L I4 Turbo',
+  '3MVDMB|CX-30|SUV|2.5L I4',
+  'JM1DKF|CX-3|SUV|2.0L I4',
+  'JM1NDA|MX-5|Convertible|2.0L I4',
+  // Subaru
+  'JF1GJA|Impreza|Sedan|2.0L H4',
+  'JF1GPA|Impreza|Hatchback|2.0L H4',
+  '4S3GT|Impreza|Sedan|2.0L H4',
+  'JF2GP|Crosstrek|SUV|2.0L H4',
+  'JF2GT|Crosstrek|SUV|2.0L H4',
+  'JF2SJ|Forester|SUV|2.5L H4',
+  'JF2SK|Forester|SUV|2.5L H4',
+  '4S4BS|Outback|Wagon|2.5L H4',
+  '4S4BT|Outback|Wagon|2.5L H4',
+  '4S4WM|Ascent|SUV|2.4L H4 Turbo',
+  '4S3BN|Legacy|Sedan|2.5L H4',
+  'JF1VA|WRX|Sedan|2.0L H4 Turbo',
+  // Hyundai / Kia / Genesis
+  'KMHD84|Elantra|Sedan|2.0L I4',
+  'KMHD74|Elantra|Sedan|1.4L I4 Turbo',
+  'KMHDH4|Elantra|Sedan|1.8L I4',
+  'KMHLM4|Elantra|Sedan|2.0L I4',
+  'KMHLS4|Elantra|Sedan|2.0L I4',
+  '5NPD84|Elantra|Sedan|2.0L I4',
+  '5NPDH4|Elantra|Sedan|1.8L I4',
+  '5NPLM4|Elantra|Sedan|2.0L I4',
+  'KMHH35|Elantra GT|Hatchback|2.0L I4',
+  'KMHC75|Ioniq|Hatchback|1.6L I4 Hybrid',
+  '5NPE24|Sonata|Sedan|2.4L I4',
+  '5NPE34|Sonata|Sedan|2.4L I4',
+  'KMHL14|Sonata|Sedan|2.5L I4',
+  'KM8J2|Tucson|SUV|2.0L I4',
+  'KM8J3|Tucson|SUV|2.0L I4',
+  'KM8JB|Tucson|SUV|2.5L I4',
+  'KM8JC|Tucson|SUV|2.5L I4',
+  'KM8SM|Santa Fe|SUV|3.3L V6',
+  'KM8SR|Santa Fe|SUV|2.4L I4',
+  'KM8S2|Santa Fe|SUV|2.4L I4',
+  '5NMS2|Santa Fe|SUV|2.4L I4',
+  '5NMS3|Santa Fe|SUV|2.4L I4',
+  'KM8K2|Kona|SUV|2.0L I4',
+  'KM8K3|Kona|SUV|1.6L I4 Turbo',
+  'KM8R5|Palisade|SUV|3.8L V6',
+  'KMHCT4|Accent|Sedan|1.6L I4',
+  'KMHCT5|Accent|Hatchback|1.6L I4',
+  '3KPA24|Rio|Sedan|1.6L I4',
+  '3KPF24|Forte|Sedan|2.0L I4',
+  '3KPF34|Forte|Sedan|2.0L I4',
+  'KNAFK4|Forte|Sedan|1.8L I4',
+  'KNAFX4|Forte|Sedan|2.0L I4',
+  'KNDJ23|Soul|Hatchback|2.0L I4',
+  'KNDJN2|Soul|Hatchback|1.6L I4',
+  'KNDJP3|Soul|Hatchback|2.0L I4',
+  'KNDPB3|Sportage|SUV|2.4L I4',
+  'KNDPM3|Sportage|SUV|2.4L I4',
+  'KNDPN3|Sportage|SUV|2.4L I4',
+  '5XYPG4|Sorento|SUV|2.4L I4',
+  '5XYPH4|Sorento|SUV|3.3L V6',
+  '5XYRG4|Sorento|SUV|2.5L I4',
+  '5XYP3D|Telluride|SUV|3.8L V6',
+  '5XYP5D|Telluride|SUV|3.8L V6',
+  'KNDNB4|Carnival|Minivan|3.5L V6',
+  'KNDMB5|Sedona|Minivan|3.3L V6',
+  'KMTG34|G70|Sedan|2.0L I4 Turbo',
+  // Ford / Lincoln
+  '1FTEW1CP|F-150|Pickup|2.7L V6 EcoBoost',
+  '1FTEW1EP|F-150|Pickup|2.7L V6 EcoBoost',
+  '1FTEW1EG|F-150|Pickup|3.5L V6 EcoBoost',
+  '1FTEW1CG|F-150|Pickup|3.5L V6 EcoBoost',
+  '1FTEW1EF|F-150|Pickup|5.0L V8',
+  '1FTEW1E5|F-150|Pickup|5.0L V8',
+  '1FTEW1|F-150|Pickup|',
+  '1FTFW1ET|F-150|Pickup|3.5L V6 EcoBoost',
+  '1FTFW1EF|F-150|Pickup|5.0L V8',
+  '1FTFW1|F-150|Pickup|',
+  '1FTEX1|F-150|Pickup|',
+  '1FTFX1|F-150|Pickup|',
+  '1FTMF1|F-150|Pickup|',
+  '1FT7W2|F-250 Super Duty|Pickup|',
+  '1FT8W3|F-350 Super Duty|Pickup|',
+  '1FTBW2|F-250 Super Duty|Pickup|',
+  '1FTER4|Ranger|Pickup|2.3L I4 EcoBoost',
+  '3FTTW8|Maverick|Pickup|',
+  '1FMCU0|Escape|SUV|',
+  '1FMCU9|Escape|SUV|',
+  '1FMCU9J9|Escape|SUV|1.5L I3 EcoBoost',
+  '1FMCU9HD|Escape|SUV|1.5L I3 EcoBoost',
+  '1FMCU9GD|Escape|SUV|1.6L I4 EcoBoost',
+  '1FMCU9J|Escape|SUV|2.0L I4 EcoBoost',
+  '1FM5K8|Explorer|SUV|',
+  '1FM5K7|Explorer|SUV|',
+  '1FMSK8|Explorer|SUV|',
+  '1FMJU1|Expedition|SUV|3.5L V6 EcoBoost',
+  '1FMJK1|Expedition Max|SUV|3.5L V6 EcoBoost',
+  '2FMPK4|Edge|SUV|',
+  '3FMCR9|Bronco Sport|SUV|',
+  '1FMEE5|Bronco|SUV|',
+  '3FMTK3|Mustang Mach-E|SUV|Electric',
+  '1FA6P8|Mustang|Coupe|',
+  '1FATP8|Mustang|Coupe|',
+  '3FA6P0|Fusion|Sedan|',
+  '1FADP3|Focus|Sedan|',
+  '3FADP4|Fiesta|Sedan|',
+  '1FM5K8GT|Explorer|SUV|3.5L V6 EcoBoost',
+  '1FM5K8D8|Explorer|SUV|3.5L V6',
+  '1FTYR1|Transit Connect|Van|',
+  '1FTBR1|Transit|Van|',
+  '5LMCJ3|Corsair|SUV|2.0L I4 Turbo',
+  '2LMPJ8|Nautilus|SUV|',
+  '5LMJJ2|Navigator|SUV|3.5L V6 Twin Turbo',
+  // GM
+  '1GCUYD|Silverado 1500|Pickup|',
+  '1GCUYE|Silverado 1500|Pickup|',
+  '1GCRYD|Silverado 1500|Pickup|',
+  '1GCPYB|Silverado 1500|Pickup|',
+  '1GCVKR|Silverado 1500|Pickup|',
+  '1GCVKRE|Silverado 1500|Pickup|5.3L V8',
+  '3GCUKRE|Silverado 1500|Pickup|5.3L V8',
+  '3GCUKSE|Silverado 1500|Pickup|5.3L V8',
+  '3GCPKSE|Silverado 1500|Pickup|5.3L V8',
+  '3GCUYD|Silverado 1500|Pickup|',
+  '1GC1KV|Silverado 2500HD|Pickup|',
+  '1GC4YN|Silverado 2500HD|Pickup|',
+  '1GTU9D|Sierra 1500|Pickup|',
+  '3GTU2N|Sierra 1500|Pickup|5.3L V8',
+  '3GTU2M|Sierra 1500|Pickup|5.3L V8',
+  '1GTUUE|Sierra 1500|Pickup|',
+  '2GNALB|Equinox|SUV|2.4L I4',
+  '2GNALC|Equinox|SUV|2.4L I4',
+  '2GNFLF|Equinox|SUV|2.4L I4',
+  '2GNAXH|Equinox|SUV|1.5L I4 Turbo',
+  '2GNAXJ|Equinox|SUV|1.5L I4 Turbo',
+  '2GNAXK|Equinox|SUV|1.5L I4 Turbo',
+  '2GNAXS|Equinox|SUV|1.5L I4 Turbo',
+  '2GNAXU|Equinox|SUV|1.5L I4 Turbo',
+  '3GNAXU|Equinox|SUV|1.5L I4 Turbo',
+  '3GNAXK|Equinox|SUV|1.5L I4 Turbo',
+  '3GNCJK|Trax|SUV|1.4L I4 Turbo',
+  'KL7CJK|Trax|SUV|1.4L I4 Turbo',
+  'KL79MP|Trailblazer|SUV|',
+  '1GNERF|Traverse|SUV|3.6L V6',
+  '1GNEVG|Traverse|SUV|3.6L V6',
+  '1GNSKB|Tahoe|SUV|5.3L V8',
+  '1GNSKC|Tahoe|SUV|5.3L V8',
+  '1GNSKS|Suburban|SUV|',
+  '1G1BE5|Cruze|Sedan|1.4L I4 Turbo',
+  '1G1PC5|Cruze|Sedan|1.4L I4 Turbo',
+  '1G1PE5|Cruze|Sedan|1.4L I4 Turbo',
+  '1G1ZB5|Malibu|Sedan|1.5L I4 Turbo',
+  '1G1ZD5|Malibu|Sedan|1.5L I4 Turbo',
+  '1G1ZE5|Malibu|Sedan|1.5L I4 Turbo',
+  '1G1FB1|Camaro|Coupe|',
+  '1G1FE1|Bolt EV|Hatchback|Electric',
+  '1G1FY6|Bolt EV|Hatchback|Electric',
+  '1G1YB2|Corvette|Coupe|6.2L V8',
+  '1GNKVG|Traverse|SUV|3.6L V6',
+  '1GKKNM|Acadia|SUV|',
+  '1GKKNS|Acadia|SUV|',
+  '3GKALM|Terrain|SUV|1.5L I4 Turbo',
+  '3GKALV|Terrain|SUV|1.5L I4 Turbo',
+  '2GKALM|Terrain|SUV|1.5L I4 Turbo',
+  '1GKS2B|Yukon|SUV|5.3L V8',
+  'KL4CJA|Encore|SUV|1.4L I4 Turbo',
+  'KL4MMB|Encore GX|SUV|',
+  '5GAEVA|Enclave|SUV|3.6L V6',
+  '1GYKNC|XT5|SUV|',
+  '1GYS4B|Escalade|SUV|6.2L V8',
+  // Stellantis
+  '1C6RR7|Ram 1500|Pickup|',
+  '1C6RR7LT|Ram 1500|Pickup|5.7L V8 HEMI',
+  '1C6RR7KT|Ram 1500|Pickup|5.7L V8 HEMI',
+  '1C6RR7LG|Ram 1500|Pickup|3.6L V6',
+  '1C6RR7GT|Ram 1500|Pickup|5.7L V8 HEMI',
+  '1C6SRF|Ram 1500|Pickup|',
+  '1C6SRFFT|Ram 1500|Pickup|5.7L V8 HEMI',
+  '1C6SRFJT|Ram 1500|Pickup|5.7L V8 HEMI',
+  '1C6SRFGT|Ram 1500|Pickup|5.7L V8 HEMI',
+  '1C6RRF|Ram 1500 Classic|Pickup|',
+  '3C6UR5|Ram 2500|Pickup|',
+  '3C6JR6|Ram 1500|Pickup|',
+  '3C6TRV|ProMaster|Van|',
+  '2C4RDG|Grand Caravan|Minivan|3.6L V6',
+  '2C4RC1|Pacifica|Minivan|3.6L V6',
+  '2C3CDX|Charger|Sedan|',
+  '2C3CDZ|Challenger|Coupe|',
+  '2C3CCA|300|Sedan|3.6L V6',
+  '1C4RJF|Grand Cherokee|SUV|',
+  '1C4RJFAG|Grand Cherokee|SUV|3.6L V6',
+  '1C4RJK|Grand Cherokee|SUV|',
+  '1C4PJM|Cherokee|SUV|',
+  '1C4NJD|Compass|SUV|2.4L I4',
+  '3C4NJD|Compass|SUV|2.4L I4',
+  '1C4HJX|Wrangler|SUV|',
+  '1C4GJX|Wrangler|SUV|',
+  '1C4BJW|Wrangler Unlimited|SUV|',
+  '1C4HJW|Wrangler Unlimited|SUV|',
+  '1C6HJT|Gladiator|Pickup|3.6L V6',
+  '1C6JJT|Gladiator|Pickup|3.6L V6',
+  'ZACNJA|Renegade|SUV|2.4L I4',
+  'ZACCJB|Renegade|SUV|2.4L I4',
+  '1C4SDJ|Durango|SUV|',
+  '3C4PDC|Journey|SUV|',
+  // Volkswagen / Audi
+  '3VW2B7|Jetta|Sedan|1.4L I4 Turbo',
+  '3VWC57|Jetta|Sedan|1.4L I4 Turbo',
+  '3VWD17|Jetta|Sedan|1.4L I4 Turbo',
+  '3VWDB7|Jetta|Sedan|1.4L I4 Turbo',
+  '3VWE57|Jetta|Sedan|1.4L I4 Turbo',
+  '3VWN57|Jetta|Sedan|1.4L I4 Turbo',
+  '3VW2K7|Jetta|Sedan|2.0L I4',
+  '3VWG57|Jetta|Sedan|1.4L I4 Turbo',
+  '3VV2B7|Tiguan|SUV|2.0L I4 Turbo',
+  '3VV3B7|Tiguan|SUV|2.0L I4 Turbo',
+  '3VV0B7|Tiguan|SUV|2.0L I4 Turbo',
+  'WVGBV7|Tiguan|SUV|2.0L I4 Turbo',
+  '1V2WR2|Atlas|SUV|',
+  '1V2DR2|Atlas|SUV|',
+  '3VWW57|Golf|Hatchback|1.8L I4 Turbo',
+  'WVWKR7|Golf|Hatchback|',
+  '3VWF17|Golf|Hatchback|',
+  'WVWZZZ|Golf|Hatchback|',
+  'WA1BNA|Q5|SUV|2.0L I4 Turbo',
+  'WA1ANA|Q5|SUV|2.0L I4 Turbo',
+  'WA1LFA|Q5|SUV|2.0L I4 Turbo',
+  'WAUANA|A4|Sedan|2.0L I4 Turbo',
+  'WAUENA|A4|Sedan|2.0L I4 Turbo',
+  // BMW / Mercedes-Benz
+  'WBA8E|3 Series|Sedan|2.0L I4 Turbo',
+  'WBA5R|3 Series|Sedan|2.0L I4 Turbo',
+  'WBA8B|3 Series|Sedan|',
+  '5UXKR0|X5|SUV|3.0L I6 Turbo',
+  '5UXCR6|X5|SUV|3.0L I6 Turbo',
+  '5UXTR9|X3|SUV|2.0L I4 Turbo',
+  '5UXTY5|X3|SUV|2.0L I4 Turbo',
+  'WBXHT3|X1|SUV|2.0L I4 Turbo',
+  'WDDWF4|C-Class|Sedan|2.0L I4 Turbo',
+  'W1KWF8|C-Class|Sedan|2.0L I4 Turbo',
+  'WDC0G4|GLC|SUV|2.0L I4 Turbo',
+  'W1N0G8|GLC|SUV|2.0L I4 Turbo',
+  '4JGDF6|GLE|SUV|',
+  'WDDZF4|E-Class|Sedan|',
+  // Tesla
+  '5YJ3E1|Model 3|Sedan|Electric',
+  '5YJYGD|Model Y|SUV|Electric',
+  '7SAYGD|Model Y|SUV|Electric',
+  '5YJSA1|Model S|Sedan|Electric',
+  '5YJXCB|Model X|SUV|Electric',
+];
@@ -135,6 +135,9 @@ function populateWorksheet(deal) {
   setElement('profitBack', formatCurrency(deal.backGross || 0));
   setElement('profitProduct', formatCurrency(deal.productMargin || 0));
   setElement('profitTotal', formatCurrency(deal.totalGross || 0));
+  
+  // New deal terms: any schedule already shown belongs to the old loan
+  resetAmortization();
 }
 
 function getTaxRate(province) {
@@ -201,6 +204,174 @@ document.getElementById('exportPdfBtn').addEventListener('click', () => {
   showToast('PDF export coming soon');
 });
 
+let sweepMatrix = null;
+
+async function runSweep() {
+  if (!dealData) {
+    showToast('No deal data available');
+    return;
+  }
+  const vehicle = dealData.vehicle || {};
+  const approval = dealData.approval || {};
+  const trade = dealData.trade || {};
+  
+  try {
+    const response = await fetch('/api/deals/sweep', {
+      method: 'POST',
+      headers: { 'Content-Type': 'application/json' },
+      body: JSON.stringify({
+        vehicle: { ...vehicle, suggestedPrice: dealData.salePrice || vehicle.suggestedPrice || 0 },
+        customer: {
+          monthlyIncome: 0,
+          downPayment: approval.downPayment || 0,
+          tradeAllowance: trade.allowance || 0,
+          tradeLien: trade.lienBalance || 0
+        }
+      })
+    });
+    const result = await response.json();
+    if (!result.success) {
+      showToast('Sweep failed: ' + (result.error || 'unknown'));
+      return;
+    }
+    
+    sweepMatrix = result.matrix;
+    const select = document.getElementById('sweepDown');
+    select.innerHTML = '';
+    sweepMatrix.downPayments.forEach((down, i) => {
+      const option = document.createElement('option');
+      option.value = i;
+      option.textContent = 'Down ' + formatCurrency(down);
+      select.appendChild(option);
+    });
+    select.style.display = '';
+    renderSweep(0);
+  } catch (error) {
+    console.error('Sweep error:', error);
+    showToast('Error running sweep');
+  }
+}
+
+// Rows are terms, columns are rates; cells shade from green (low payment) to red (high payment)
+function renderSweep(downIndex) {
+  const { terms, rates, downPayments, payment, gross } = sweepMatrix;
+  const paymentMax = (dealData.approval || {}).paymentMax;
+  const at = (t, r) => (t * rates.length + r) * downPayments.length + downIndex;
+  const values = payment.filter(p => p !== null);
+  const min = Math.min(...values);
+  const max = Math.max(...values);
+  
+  const table = document.getElementById('sweepTable');
+  table.innerHTML = '';
+  const header = document.createElement('tr');
+  header.appendChild(document.createElement('th'));
+  rates.forEach(rate => {
+    const th = document.createElement('th');
+    th.textContent = rate.toFixed(2) + '%';
+    header.appendChild(th);
+  });
+  table.appendChild(header);
+  
+  terms.forEach((term, t) => {
+    const tr = document.createElement('tr');
+    const th = document.createElement('th');
+    th.textContent = term + 'm';
+    tr.appendChild(th);
+    rates.forEach((_, r) => {
+      const td = document.createElement('td');
+      const value = payment[at(t, r)];
+      if (value === null) {
+        td.textContent = '-';
+      } else {
+        const share = max > min ? (value - min) / (max - min) : 0;
+        td.textContent = '$' + value;
+        td.title = 'Gross ' + formatCurrency(gross[at(t, r)]);
+        td.style.background = `hsla(${Math.round(120 - share * 120)}, 70%, 45%, 0.35)`;
+        if (paymentMax && value > paymentMax) td.style.opacity = '0.5';
+      }
+      tr.appendChild(td);
+    });
+    table.appendChild(tr);
+  });
+}
+
+document.getElementById('sweepBtn').addEventListener('click', runSweep);
+document.getElementById('sweepDown').addEventListener('change', (e) => renderSweep(parseInt(e.target.value, 10)));
+
+function getLoanTerms() {
+  const parse = (id) => parseFloat((document.getElementById(id)?.textContent || '').replace(/[^0-9.]/g, ''));
+  return {
+    principal: parse('dtAmountFinanced'),
+    apr: parse('dtApr'),
+    termMonths: parseInt(document.getElementById('dtTerm')?.textContent || '84', 10)
+  };
+}
+
+let amortizationOffset = 0;
+let amortizationTermsKey = null; // loan terms of the rows currently shown
+
+// Drop the loaded schedule so the next page starts from month 1 of the current loan
+function resetAmortization() {
+  amortizationOffset = 0;
+  amortizationTermsKey = null;
+  document.getElementById('amortizationRows').innerHTML = '';
+  document.getElementById('amortizationTable').style.display = 'none';
+  const btn = document.getElementById('amortizationBtn');
+  btn.textContent = '📅 Show Schedule';
+  btn.style.display = '';
+}
+
+// Fetch the schedule a year at a time, only when the user asks for more rows
+async function loadAmortizationPage() {
+  const terms = getLoanTerms();
+  const termsKey = JSON.stringify(terms);
+  if (termsKey !== amortizationTermsKey) {
+    resetAmortization();
+    amortizationTermsKey = termsKey;
+  }
+  try {
+    const response = await fetch('/api/deals/amortization', {
+      method: 'POST',
+      headers: { 'Content-Type': 'application/json' },
+      body: JSON.stringify({ ...terms, offset: amortizationOffset, limit: 12 })
+    });
+    const result = await response.json();
+    if (termsKey !== amortizationTermsKey) return; // terms changed while this page was loading
+    if (!result.success) {
+      showToast('Schedule unavailable: ' + (result.error || 'unknown'));
+      return;
+    }
+    
+    const tbody = document.getElementById('amortizationRows');
+    result.rows.forEach(row => {
+      const tr = document.createElement('tr');
+      [row.month, formatCurrency(row.payment), formatCurrency(row.principal), formatCurrency(row.interest), formatCurrency(row.balance)]
+        .forEach(value => {
+          const td = document.createElement('td');
+          td.textContent = value;
+          tr.appendChild(td);
+        });
+      tbody.appendChild(tr);
+    });
+    amortizationOffset += result.rows.length;
+    
+    document.getElementById('amortizationTable').style.display = '';
+    const btn = document.getElementById('amortizationBtn');
+    btn.textContent = '📅 Next 12 Months';
+    btn.style.display = result.hasMore ? '' : 'none';
+  } catch (error) {
+    console.error('Amortization error:', error);
+    showToast('Error loading schedule');
+  }
+}
+
+document.getElementById('amortizationBtn').addEventListener('click', loadAmortizationPage);
+
+document.getElementById('amortizationExcelBtn').addEventListener('click', () => {
+  const params = new URLSearchParams(getLoanTerms());
+  window.location.href = '/api/reports/export/excel/amortization?' + params.toString();
+});
+
 document.getElementById('printBtn').addEventListener('click', () => {
   window.print();
 });
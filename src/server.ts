@@ -6,6 +6,7 @@ import fs from 'fs';
 import cookieParser from 'cookie-parser';
 import config from './config/config';
 import logger from './utils/logger';
+import { closeBrowserPool } from './modules/browser-pool';
 import { requestLogger, errorHandler, healthCheck } from './api/middleware';
 import { injectDealershipContext } from './api/middleware/dealership-context';
 import dealsRouter from './api/routes/deals';
@@ -260,8 +261,25 @@ app.use(errorHandler);
   }
 })();
 
-app.listen(PORT, () => {
+const server = app.listen(PORT, () => {
   logger.info(`server listening`, { port: PORT });
 });
 
+// Pooled browsers are shared by every scrape, so they are closed once, when the process stops
+let shuttingDown = false;
+async function shutdown(signal: string): Promise<void> {
+  if (shuttingDown) return;
+  shuttingDown = true;
+  logger.info('shutting down', { signal });
+  server.close();
+  try {
+    await closeBrowserPool();
+  } catch (error) {
+    logger.warn('Failed to close browser pool', { error: (error as Error).message });
+  }
+  process.exit(0);
+}
+process.once('SIGTERM', () => shutdown('SIGTERM'));
+process.once('SIGINT', () => shutdown('SIGINT'));
+
 export default app;
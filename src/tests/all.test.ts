@@ -2,12 +2,51 @@
  * COMPREHENSIVE UNIT TESTS
  */
 
-import { calculateMonthlyPayment } from '../modules/payment-calculator';
-import { getLenderProgram } from '../modules/lender-programs';
+import dns from 'dns';
+import fs from 'fs';
+import { AxiosInstance } from 'axios';
+import os from 'os';
+import path from 'path';
+import { calculateMonthlyPayment, calculatePaymentAmount, iterateAmortizationSchedule, packAmortizationSchedule, AMORTIZATION_STRIDE } from '../modules/payment-calculator';
+import { getLenderProgram, calculateTDReserve, calculateIAReserve, calculateTDPrimeReservePercent, calculateTDPrimeReservePercents } from '../modules/lender-programs';
+import { compileReserveBrackets, lookupReserveBracket } from '../modules/reserve-lookup';
 import { calculateTradeInEquity } from '../modules/trade-in-equity';
 import { validateCompliance } from '../modules/compliance-validator';
+import { findOptimalDeals } from '../modules/deal-maximizer';
+import { calculateDeal, calculateSensitivitySweep } from '../modules/deal-calculator';
+import { calculateProfitScenario, calculateProfitMatrix, profitScenarioAt, calculateMaximumAdvance } from '../modules/profit-maximizer';
 import { recommendBundles } from '../modules/aftermarket-products';
 import { calculateTaxSavings } from '../modules/tax-calculator';
+import { scoreInventory, scoreInventoryScenarios } from '../modules/approvals-engine';
+import { registerApproval, applyInventoryChanges, applySourceChanges, getScoredRows } from '../modules/incremental-scoring';
+import { buildNumericColumns, vehiclesFromPartition, vehicleFields, mergeSortedDesc, scoreInventoryAsync, shutdownScoringPool, getScoringPoolStats } from '../modules/scoring-pool';
+import { InventoryStore, inventoryStore } from '../modules/inventory-store';
+import { addSyncSource, removeSyncSource, manualSync } from '../modules/inventory-sync';
+import { httpClient, cachedLookup, createHttpClient, getHttpClientStats } from '../modules/http-client';
+import { mergeIntoStore, changedRows } from '../modules/inventory-merge';
+import { loadInventoryFromCSV, streamInventoryFromCSV } from '../modules/inventory-manager';
+import { valuationCacheKey } from '../modules/valuation-service';
+import { decodeVIN, decodeVINs } from '../modules/vin-decoder';
+import { TieredCache } from '../modules/tiered-cache';
+import { fetchPagesConcurrently } from '../modules/scraper-utils';
+import { ProductionDealershipScraper, extractionOrder } from '../modules/production-scraper';
+import { getSiteProfile } from '../modules/site-profiles';
+import { startCrawl, resumeCrawl, CrawlTarget } from '../modules/crawl-orchestrator';
+import { getCachedVehicles, setCachedVehicles, getCacheStats, getOrScrapeVehicles } from '../modules/scraper-cache';
+import { MarketSnapshotStore, MarketListing } from '../modules/market-snapshots';
+import { fetchConditional, getConditionalFetchStats } from '../modules/conditional-fetch';
+import { acquirePage, withPage, closeBrowserPool, getBrowserPoolStats, setBrowserLauncher, PageLease } from '../modules/browser-pool';
+import { Vehicle, ApprovalSpec } from '../types/types';
+
+const testVehicle = (id: string, cost: number, bb: number): Vehicle => ({
+  id, vin: `VIN${id}`, year: 2021, make: 'Toyota', model: 'Corolla', mileage: 60000,
+  engine: '2.0L', transmission: 'Automatic', blackBookValue: bb, yourCost: cost,
+  suggestedPrice: bb, inStock: true,
+});
+
+const testApproval: ApprovalSpec = {
+  bank: 'TD', program: '5-Key', apr: 12.99, termMonths: 84, paymentMin: 0, paymentMax: 650,
+};
 
 describe('Finance-in-a-Box Test Suite', () => {
   describe('Payment Calculator', () => {
@@ -26,11 +65,27 @@ describe('Finance-in-a-Box Test Suite', () => {
       expect(() => calculateMonthlyPayment(150000, 15, 60)).toThrow();
     });
 
+    test('should match the full calculation when computing the payment only', () => {
+      expect(calculatePaymentAmount(20199, 21.99, 84)).toBe(calculateMonthlyPayment(20199, 21.99, 84).monthlyPayment);
+      expect(() => calculatePaymentAmount(0, 15, 60)).toThrow();
+    });
+
     test('should generate amortization schedule', () => {
       const result = calculateMonthlyPayment(10000, 15, 24);
       expect(result.amortizationSchedule.length).toBe(24);
       expect(result.amortizationSchedule[result.amortizationSchedule.length-1].balance).toBe(0);
     });
+
+    test('should page and pack the schedule lazily with closed-form interest', () => {
+      const result = calculateMonthlyPayment(20000, 12.99, 72);
+      const page = Array.from(iterateAmortizationSchedule(20000, 12.99, 72, 13, 24));
+      expect(page).toEqual(result.amortizationSchedule.slice(12, 24));
+      const packed = packAmortizationSchedule(20000, 12.99, 72);
+      expect(packed.length).toBe(72 * AMORTIZATION_STRIDE);
+      expect(packed[AMORTIZATION_STRIDE * 71 + 3]).toBe(0);
+      const summed = result.amortizationSchedule.reduce((sum, e) => sum + e.interest, 0);
+      expect(Math.abs(result.totalInterest - summed)).toBeLessThan(1);
+    });
   });
 
   describe('Lender Programs', () => {
@@ -74,6 +129,118 @@ describe('Finance-in-a-Box Test Suite', () => {
     });
   });
 
+  describe('Deal Maximizer', () => {
+    test('should return the top 10 compliant deals ranked by gross', () => {
+      const inventory = Array.from({ length: 15 }, (_, i) => testVehicle(`V${i}`, 12000 + i * 300, 20000 + i * 500));
+      const deals = findOptimalDeals({
+        lender: 'TD', tier: '2-Key', term: 72, monthlyIncome: 6000, downPayment: 2000, province: 'AB',
+      }, inventory);
+      expect(deals.length).toBeLessThanOrEqual(10);
+      deals.forEach((deal, i) => {
+        expect(deal.rank).toBe(i + 1);
+        expect(deal.compliance.overall).toBe(true);
+        if (i > 0) expect(deals[i - 1].grossProfit.total).toBeGreaterThanOrEqual(deal.grossProfit.total);
+      });
+    });
+
+    test('should pick one highest-gross compliant bundle per vehicle', () => {
+      const inventory = Array.from({ length: 5 }, (_, i) => testVehicle(`B${i}`, 14000, 24000 + i * 1000));
+      const deals = findOptimalDeals({
+        lender: 'TD', tier: '2-Key', term: 72, monthlyIncome: 6000, downPayment: 2000, province: 'AB',
+      }, inventory);
+      expect(new Set(deals.map(d => d.vehicle.id)).size).toBe(deals.length);
+    });
+  });
+
+  describe('Reserve Lookup', () => {
+    test('should match bracket.find for boundaries, gaps and overlaps', () => {
+      const brackets = [
+        { minFinanced: 15000, maxFinanced: 19999, amount: 300 },
+        { minFinanced: 0, maxFinanced: 14999, amount: 200 },
+        { minFinanced: 18000, maxFinanced: 25000, amount: 999 },
+      ];
+      const compiled = compileReserveBrackets(brackets);
+      [-1, 0, 14999, 14999.5, 15000, 18000, 19999, 19999.5, 25000, 25001, NaN].forEach(x => {
+        const br = brackets.find(b => x >= b.minFinanced && x <= b.maxFinanced);
+        expect(lookupReserveBracket(compiled, x)).toBe(br ? br.amount : 0);
+      });
+    });
+
+    test('should keep lender reserve steps and the TD Prime grid', () => {
+      expect(calculateTDReserve(7499)).toBe(0);
+      expect(calculateTDReserve(25000)).toBe(600);
+      expect(calculateIAReserve(50000)).toBe(750);
+      expect(calculateIAReserve(50000.5)).toBe(1000);
+      expect(calculateTDPrimeReservePercent(8.89, 84, 45000)).toBe(0.0150);
+      expect(calculateTDPrimeReservePercent(8.89, 60, 120000)).toBe(0);
+      expect(Array.from(calculateTDPrimeReservePercents(7.89, 96, [10000, 35000, 150000]))).toEqual([0, 0.0050, 0.0110]);
+    });
+  });
+
+  describe('Profit Matrix', () => {
+    test('should match calculateProfitScenario cell for cell', () => {
+      const trade = { allowance: 4000, acv: 3500, lienBalance: 1500 };
+      const inventory = [
+        testVehicle('P1', 12000, 18000),
+        { ...testVehicle('P2', 30000, 36000), year: 2025, make: 'Jeep', model: 'Grand Cherokee' },
+      ];
+      const approvals = [testApproval, { ...testApproval, bank: 'TD', program: '4-Key', apr: 0, termMonths: 72 }];
+      const matrix = calculateProfitMatrix(inventory, approvals, trade);
+      inventory.forEach((vehicle, v) => approvals.forEach((approval, a) => {
+        expect(profitScenarioAt(matrix, v, a)).toEqual(calculateProfitScenario(vehicle, approval, trade));
+      }));
+    });
+
+    test('should keep max advance equal to the original annuity formula', () => {
+      // Frozen copy of calculateMaximumAdvance before the cached advance factor
+      const baseline = (payment: number, apr: number, term: number) => {
+        const monthlyRate = apr / 100 / 12;
+        if (monthlyRate === 0) return payment * term;
+        return Math.floor(payment * ((1 - Math.pow(1 + monthlyRate, -term)) / monthlyRate));
+      };
+      expect([
+        calculateMaximumAdvance(650, 12.99, 84), calculateMaximumAdvance(700, 17.5, 84),
+        calculateMaximumAdvance(600, 19.99, 72), calculateMaximumAdvance(500, 0, 72), calculateMaximumAdvance(475, 21.99, 84),
+      ]).toEqual([35740, 33774, 25055, 36000, 20282]);
+      for (const apr of [0, 3.49, 8.89, 12.99, 17.5, 19.99, 21.99, 29.95]) {
+        for (const term of [36, 48, 60, 72, 84, 96]) {
+          for (const payment of [250, 475, 650, 1000]) {
+            expect(calculateMaximumAdvance(payment, apr, term)).toBe(baseline(payment, apr, term));
+          }
+        }
+      }
+
+      const inventory = [testVehicle('P1', 12000, 18000), { ...testVehicle('P2', 30000, 36000), year: 2025, make: 'Jeep', model: 'Wrangler' }];
+      const approvals = [testApproval, { ...testApproval, program: '4-Key', apr: 17.5, termMonths: 72, paymentMax: 700 }];
+      const matrix = calculateProfitMatrix(inventory, approvals, { allowance: 0, acv: 0, lienBalance: 0 });
+      inventory.forEach((_vehicle, v) => approvals.forEach((approval, a) => {
+        const cell = profitScenarioAt(matrix, v, a);
+        expect(cell.maxAdvance).toBe(baseline(approval.paymentMax, cell.rate, approval.termMonths));
+      }));
+    });
+  });
+
+  describe('Sensitivity Sweep', () => {
+    test('should match calculateDeal for every valid cell', () => {
+      const vehicle = testVehicle('S1', 18000, 22000);
+      const customer = { monthlyIncome: 5000, downPayment: 0, tradeAllowance: 3000, tradeLien: 1000 };
+      const grid = { terms: [48, 84, 96], rates: [6.99, 12.99], downPayments: [0, 2500] };
+      const matrix = calculateSensitivitySweep(vehicle, customer, grid);
+      expect(matrix.shape).toEqual([3, 2, 2]);
+      grid.terms.forEach((term, t) => grid.rates.forEach((apr, r) => grid.downPayments.forEach((down, d) => {
+        const i = (t * grid.rates.length + r) * grid.downPayments.length + d;
+        if (term > 84) {
+          expect(matrix.payment[i]).toBeNull();
+          return;
+        }
+        const deal = calculateDeal(vehicle, { ...customer, downPayment: down }, 'TD', apr, term);
+        expect(matrix.payment[i]).toBe(deal.monthlyPayment);
+        expect(matrix.principal[i]).toBe(deal.amountFinanced);
+        expect(matrix.gross[i]).toBeCloseTo(deal.totalGross, 6);
+      })));
+    });
+  });
+
   describe('Tax Calculator', () => {
     test('should calculate Alberta tax (5%)', () => {
       const result = calculateTaxSavings(22500, 8000, 'AB' as any);
@@ -85,4 +252,664 @@ describe('Finance-in-a-Box Test Suite', () => {
       expect(result.taxRate).toBe(0.13);
     });
   });
+
+  describe('Inventory Store', () => {
+    test('should upsert by VIN or stock and bump the version', () => {
+      const store = new InventoryStore([testVehicle('A', 10000, 15000), testVehicle('B', 12000, 18000)]);
+      const v0 = store.version;
+      const snapshot = store.toArray();
+      expect(store.toArray()).toBe(snapshot);
+
+      expect(store.upsert({ ...testVehicle('X', 9000, 21000), vin: ' vinb ' }).type).toBe('updated');
+      expect(store.upsert(testVehicle('C', 8000, 12000)).type).toBe('added');
+      expect(store.version).toBeGreaterThan(v0);
+      expect(store.toArray()).not.toBe(snapshot);
+      expect(store.size).toBe(3);
+      expect(store.getByStock('x')?.blackBookValue).toBe(21000);
+      expect(store.getByVin('VINA')?.id).toBe('A');
+    });
+
+    test('should answer sorted range queries', () => {
+      const store = new InventoryStore([testVehicle('A', 1, 30000), testVehicle('B', 1, 10000), testVehicle('C', 1, 20000)]);
+      expect(store.rangeBy('suggestedPrice', 15000, 30000).map(v => v.id)).toEqual(['C', 'A']);
+      store.remove({ id: 'C', vin: '' });
+      expect(store.sortedBy('suggestedPrice').map(v => v.id)).toEqual(['B', 'A']);
+    });
+  });
+
+  describe('Inventory Merge', () => {
+    test('should split a feed into added, updated and unchanged rows', () => {
+      const existing = [testVehicle('A', 10000, 15000), testVehicle('B', 12000, 18000), { ...testVehicle('C', 8000, 12000), vin: '' }];
+      const incoming = [
+        { ...testVehicle('B', 11000, 18000), vin: 'vinb' },
+        testVehicle('A', 10000, 15000),
+        { ...testVehicle('C', 7000, 12000), vin: '' },
+        testVehicle('D', 9000, 14000),
+        { ...testVehicle('E', 1, 1), vin: 'VINA' },
+      ];
+      const store = new InventoryStore(existing);
+      const result = mergeIntoStore(store, incoming);
+      expect(store.toArray().map(v => v.id)).toEqual(['A', 'B', 'C', 'D']);
+      expect(result.unchanged.map(v => v.id)).toEqual(['A']);
+      expect(result.updated.map(u => u.vehicle.yourCost)).toEqual([11000, 7000]);
+      expect(result.added.map(v => v.id)).toEqual(['D']);
+      expect(result.changes.map(c => [c.type, c.vehicle.id])).toEqual([['updated', 'B'], ['updated', 'C'], ['added', 'D']]);
+      expect(changedRows(result).map(v => v.id)).toEqual(['D', 'B', 'C']);
+    });
+
+    test('should re-key a row whose stock number changed under the same VIN', () => {
+      const store = new InventoryStore([testVehicle('A', 10000, 15000)]);
+      const result = mergeIntoStore(store, [{ ...testVehicle('A2', 10000, 15000), vin: 'VINA' }]);
+      expect(result.changes.map(c => [c.type, c.vehicle.id])).toEqual([['removed', 'A'], ['added', 'A2']]);
+      expect(store.getByStock('A2')?.vin).toBe('VINA');
+      expect(store.getByStock('A')).toBeUndefined();
+    });
+  });
+
+  describe('CSV Ingest', () => {
+    const csv = 'Stock #,VIN,Make,Model,Year,Price,Notes\r\n'
+      + 'S1,,Honda,Civic,2020,"$18,500","one owner, ""clean""\nno accidents"\r\n'
+      + '\n'
+      + 'S2,,Ford,Escape,2019,15000,\n';
+
+    test('should parse quoted multiline fields', () => {
+      const vehicles = loadInventoryFromCSV(csv);
+      expect(vehicles.map(v => v.id)).toEqual(['S1', 'S2']);
+      expect(vehicles[0].suggestedPrice).toBe(18500);
+      expect(vehicles[1].make).toBe('Ford');
+    });
+
+    test('should stream the same vehicles from small chunks in batches', async () => {
+      async function* chunks() {
+        const buf = Buffer.from(csv, 'utf8');
+        for (let i = 0; i < buf.length; i += 7) yield buf.subarray(i, i + 7);
+      }
+      const batches: Vehicle[][] = [];
+      for await (const batch of streamInventoryFromCSV(chunks(), 1)) batches.push(batch);
+      expect(batches.length).toBe(2);
+      expect(batches.flat()).toEqual(loadInventoryFromCSV(csv));
+    });
+  });
+
+  describe('Valuation Service', () => {
+    test('should key valuations by normalized VIN and mileage bucket', () => {
+      expect(valuationCacheKey(' 1hgcm82633a004352 ', 61000)).toBe(valuationCacheKey('1HGCM82633A004352', 64999));
+      expect(valuationCacheKey('1HGCM82633A004352', 61000)).not.toBe(valuationCacheKey('1HGCM82633A004352', 65000));
+    });
+  });
+
+  describe('VIN Decoder', () => {
+    test('should decode make, model and year offline with check digit', () => {
+      const result = decodeVIN('1HGCM82633A004352');
+      expect(result.make).toBe('Honda');
+      expect(result.model).toBe('Accord');
+      expect(result.year).toBe(2003);
+      expect(result.checkDigitValid).toBe(true);
+      expect(decodeVIN('1HGCM82643A004352').checkDigitValid).toBe(false);
+    });
+
+    test('should batch decode and null out malformed VINs', () => {
+      const results = decodeVINs(['1HGCM82633A004352', 'BAD', '1hgcm82633a004352']);
+      expect(results[1]).toBeNull();
+      expect(results[2]).toBe(results[0]);
+    });
+  });
+
+  describe('Tiered Cache', () => {
+    test('should share entries through disk and coalesce loads', async () => {
+      const dir = fs.mkdtempSync(path.join(os.tmpdir(), 'vin-cache-'));
+      const a = new TieredCache<number>({ name: 'test', ttlMs: 60000, dir });
+      const b = new TieredCache<number>({ name: 'test', ttlMs: 60000, dir });
+
+      let loads = 0;
+      const loader = async () => { loads++; return 42; };
+      const [x, y] = await Promise.all([a.getOrLoad('VIN1', loader), a.getOrLoad('VIN1', loader)]);
+      expect([x, y, loads]).toEqual([42, 42, 1]);
+
+      expect(b.get('VIN1')).toBe(42);
+      expect(b.stats().diskHits).toBe(1);
+      expect(a.get('VIN1')).toBe(42);
+      expect(a.stats().memoryHits).toBe(1);
+      fs.rmSync(dir, { recursive: true, force: true });
+    });
+
+    test('should read values back by offset across compaction', () => {
+      const dir = fs.mkdtempSync(path.join(os.tmpdir(), 'vin-cache-'));
+      const a = new TieredCache<string>({ name: 'test', ttlMs: 60000, dir });
+      const b = new TieredCache<string>({ name: 'test', ttlMs: 60000, dir });
+      a.set('VIN1', 'Škoda');
+      b.set('VIN2', 'Ford');
+      for (let i = 0; i < 2500; i++) a.set(`VIN${i % 10}`, `v${i}`);
+
+      const lines = fs.readFileSync(path.join(dir, 'test.jsonl'), 'utf8').split('\n').filter(Boolean);
+      expect(lines.length).toBeLessThan(1500);
+      expect(fs.existsSync(path.join(dir, 'test.jsonl.lock'))).toBe(false);
+      expect(b.get('VIN9')).toBe('v2499');
+      const c = new TieredCache<string>({ name: 'test', ttlMs: 60000, dir });
+      expect(c.get('VIN0')).toBe('v2490');
+      expect(c.stats().diskEntries).toBe(10);
+      fs.rmSync(dir, { recursive: true, force: true });
+    });
+
+    test('should hide deleted entries from other instances', () => {
+      const dir = fs.mkdtempSync(path.join(os.tmpdir(), 'vin-cache-'));
+      const a = new TieredCache<string>({ name: 'profiles', ttlMs: 60000, dir });
+      const b = new TieredCache<string>({ name: 'profiles', ttlMs: 60000, dir, syncIntervalMs: 0 });
+      a.set('dealer.example', 'dom:vehicle-card');
+      expect(b.get('dealer.example')).toBe('dom:vehicle-card');
+      a.delete('dealer.example');
+      expect(a.get('dealer.example')).toBeUndefined();
+      expect(b.get('dealer.example')).toBeUndefined();
+      expect(new TieredCache<string>({ name: 'profiles', ttlMs: 60000, dir }).get('dealer.example')).toBeUndefined();
+      fs.rmSync(dir, { recursive: true, force: true });
+    });
+
+    test('should serve memory hits without touching the disk log', () => {
+      const dir = fs.mkdtempSync(path.join(os.tmpdir(), 'vin-cache-'));
+      const cache = new TieredCache<number>({ name: 'hot', ttlMs: 60000, dir, syncIntervalMs: 60000 });
+      cache.set('VIN1', 7);
+      const stat = jest.spyOn(fs, 'statSync');
+      const open = jest.spyOn(fs, 'openSync');
+      for (let i = 0; i < 100; i++) expect(cache.get('VIN1')).toBe(7);
+      expect([stat.mock.calls.length, open.mock.calls.length, cache.stats().memoryHits]).toEqual([0, 0, 100]);
+      stat.mockRestore();
+      open.mockRestore();
+      fs.rmSync(dir, { recursive: true, force: true });
+    });
+  });
+
+  describe('Extraction Strategies', () => {
+    const cards = (n: number) => Array.from({ length: n }, (_, i) =>
+      `<div class="vehicle-card"><h2>2020 Honda Civic</h2><span class="price">$${18000 + i}</span></div>`).join('');
+    const jsonLd = (n: number) => `<script type="application/ld+json">${JSON.stringify(Array.from({ length: n }, (_, i) =>
+      ({ '@type': 'Car', brand: 'Toyota', model: 'Corolla', modelDate: '2021', sku: `JL${i}`, offers: { price: 21000 + i } })))}</script>`;
+
+    test('should keep structured layers ahead of a remembered DOM strategy', () => {
+      expect(extractionOrder()[0]).toBe('json-ld');
+      expect(extractionOrder('dom:article').slice(0, 4)).toEqual(['json-ld', 'microdata', 'rdfa', 'dom:article']);
+      expect(extractionOrder('microdata')[0]).toBe('microdata');
+      expect(extractionOrder('open-graph')).toEqual(extractionOrder());
+    });
+
+    test('should fall through when the remembered strategy yields well below its usual count', async () => {
+      const url = 'https://strategy-order.test/inventory';
+      const scraper = new ProductionDealershipScraper({ baseUrl: url, useCache: false }) as any;
+
+      expect((await scraper.extractVehicles(`<html>${cards(4)}</html>`, url)).length).toBe(4);
+      // JSON-LD still runs ahead of the remembered DOM set
+      const structured = await scraper.extractVehicles(`<html>${jsonLd(3)}${cards(4)}</html>`, url);
+      expect(structured.map((v: Vehicle) => v.make)).toEqual(['Toyota', 'Toyota', 'Toyota']);
+      // One JSON-LD row where three are usual: the DOM cards win instead
+      const fallback = await scraper.extractVehicles(`<html>${jsonLd(1)}${cards(4)}</html>`, url);
+      expect(fallback.map((v: Vehicle) => v.make)).toEqual(['Honda', 'Honda', 'Honda', 'Honda']);
+    });
+
+    test('should reuse a site profile while its first page holds up and re-learn when it does not', async () => {
+      const domain = `profile-${Date.now()}.test`;
+      const url = `https://${domain}/inventory`;
+      let body = '';
+      let requests = 0;
+      const get = jest.spyOn(httpClient, 'get').mockImplementation((async () => {
+        requests++;
+        return { status: 200, data: `<html>${body}</html>`, headers: {} };
+      }) as any);
+      const scrape = async (html: string) => {
+        body = html;
+        requests = 0;
+        await new ProductionDealershipScraper({ baseUrl: url, useCache: true }).scrapeInventory();
+        return requests;
+      };
+      try {
+        // First scrape detects pagination, then fetches the page
+        expect(await scrape(jsonLd(3))).toBe(2);
+        expect(getSiteProfile(domain)).toMatchObject({ pagination: { type: 'none' }, strategy: 'json-ld', pageYield: 3 });
+        expect(getSiteProfile(domain)?.priceSelector).toBeUndefined();
+
+        // The first page still yields enough: no detection, and that page is not fetched twice
+        expect(await scrape(cards(4))).toBe(1);
+        expect(getSiteProfile(domain)).toMatchObject({ strategy: 'dom:vehicle-card', pageYield: 4, priceSelector: '.price' });
+
+        // One vehicle where four were usual: forget the profile, detect again and refetch
+        expect(await scrape(jsonLd(1))).toBe(3);
+        expect(getSiteProfile(domain)).toMatchObject({ strategy: 'json-ld', pageYield: 1 });
+        expect(getSiteProfile(domain)?.priceSelector).toBeUndefined();
+      } finally {
+        get.mockRestore();
+      }
+    });
+  });
+
+  describe('Conditional Fetch', () => {
+    test('should revalidate with stored validators and reuse vehicles for unchanged pages', async () => {
+      const url = `https://conditional.test/inventory?run=${Date.now()}`;
+      const sent: Array<Record<string, string>> = [];
+      const responses = [
+        { status: 200, data: '<html>A</html>', headers: { etag: '"v1"', 'last-modified': 'Mon, 05 Jan 2026 10:00:00 GMT' } },
+        { status: 304, data: '', headers: {} },
+        { status: 200, data: '<html>A</html>', headers: { etag: '"v2"' } },
+        { status: 200, data: '<html>B</html>', headers: { etag: '"v3"' } },
+      ];
+      const client = {
+        get: async (_url: string, config: { headers: Record<string, string> }) => {
+          sent.push(config.headers);
+          return responses[sent.length - 1];
+        },
+      } as unknown as AxiosInstance;
+      const before = getConditionalFetchStats();
+
+      const first = await fetchConditional(url, { client });
+      expect(first.unchanged).toBe(false);
+      if (!first.unchanged) first.remember([testVehicle('P1', 10000, 15000)]);
+
+      const writes = jest.spyOn(TieredCache.prototype, 'set');
+      const notModified = await fetchConditional(url, { client });
+      expect(writes).not.toHaveBeenCalled();
+      expect(sent[1]).toEqual({ 'If-None-Match': '"v1"', 'If-Modified-Since': 'Mon, 05 Jan 2026 10:00:00 GMT' });
+      expect(notModified.unchanged && notModified.vehicles.map(v => v.id)).toEqual(['P1']);
+
+      const sameBody = await fetchConditional(url, { client });
+      expect(sameBody.unchanged && sameBody.vehicles.map(v => v.id)).toEqual(['P1']);
+      // Only the new ETag is written; the stored vehicles are left alone
+      expect(writes.mock.calls.map(([, value]) => Object.keys(value as object).sort())).toEqual([['etag', 'hash', 'lastModified']]);
+      writes.mockRestore();
+
+      const changed = await fetchConditional(url, { client });
+      expect(sent[3]['If-None-Match']).toBe('"v2"');
+      expect(changed.unchanged ? null : changed.html).toBe('<html>B</html>');
+      if (!changed.unchanged) changed.remember([testVehicle('P2', 11000, 16000)]);
+
+      responses.push({ status: 304, data: '', headers: {} });
+      const after = await fetchConditional(url, { client });
+      expect(sent[4]['If-None-Match']).toBe('"v3"');
+      expect(after.unchanged && after.vehicles.map(v => v.id)).toEqual(['P2']);
+
+      const stats = getConditionalFetchStats();
+      expect([stats.notModified - before.notModified, stats.sameBody - before.sameBody, stats.changed - before.changed]).toEqual([2, 1, 2]);
+    });
+  });
+
+  describe('HTTP Client', () => {
+    test('should cache DNS answers for every lookup form', async () => {
+      const host = `dns-${Date.now()}.test`;
+      const addresses = [{ address: '10.0.0.1', family: 4 }, { address: '10.0.0.2', family: 4 }];
+      const lookup = jest.spyOn(dns, 'lookup').mockImplementation(((_host: string, _options: any, cb: any) => cb(null, addresses)) as any);
+      const call = (...args: any[]) => new Promise<any[]>(resolve => (cachedLookup as any)(host, ...args, (...result: any[]) => resolve(result)));
+      const before = getHttpClientStats().dns;
+      try {
+        expect(await call({ all: true })).toEqual([null, addresses]);
+        expect(await call({})).toEqual([null, '10.0.0.1', 4]);
+        // options may be omitted, with the callback in their place
+        expect(await new Promise(resolve => cachedLookup(host, (...result: any[]) => resolve(result), undefined as any))).toEqual([null, '10.0.0.1', 4]);
+        expect(lookup).toHaveBeenCalledTimes(1);
+        expect(lookup.mock.calls[0][1]).toMatchObject({ all: true });
+
+        lookup.mockImplementation(((_host: string, _options: any, cb: any) => cb(null, [])) as any);
+        const [error] = await call({ family: 6 });
+        expect((error as Error).message).toBe(`No addresses for ${host}`);
+      } finally {
+        lookup.mockRestore();
+      }
+      const after = getHttpClientStats().dns;
+      expect([after.hits - before.hits, after.misses - before.misses]).toEqual([2, 2]);
+    });
+
+    test('should merge client headers and time requests per host', async () => {
+      const seen: any[] = [];
+      const client = createHttpClient({
+        headers: { 'X-Dealer': 'abc' },
+        adapter: async (config: any) => {
+          seen.push(config.headers);
+          if (config.url.includes('/down')) {
+            throw Object.assign(new Error('unavailable'), { config, response: { status: 503, data: '', headers: {} } });
+          }
+          return { data: 'ok', status: 200, statusText: 'OK', headers: {}, config };
+        },
+      });
+      const host = `timing-${Date.now()}.test`;
+      await client.get(`http://${host}/up`);
+      await expect(client.get(`http://${host}/down`)).rejects.toThrow('unavailable');
+
+      expect([seen[0]['Accept-Encoding'], seen[0]['X-Dealer']]).toEqual(['gzip, deflate, br', 'abc']);
+      expect(getHttpClientStats().hosts[host]).toMatchObject({ requests: 2, errors: 1, lastStatus: 503 });
+      const identity = createHttpClient({ headers: { 'Accept-Encoding': 'identity' }, adapter: async (config: any) => {
+        seen.push(config.headers);
+        return { data: '', status: 200, statusText: 'OK', headers: {}, config };
+      } });
+      await identity.get(`http://${host}/plain`);
+      expect(seen[2]['Accept-Encoding']).toBe('identity');
+    });
+  });
+
+  describe('Browser Pool', () => {
+    // Minimal stand-ins for puppeteer's Browser/Page; each browser records the pages it opened
+    const stubBrowsers: Array<{ pages: Array<{ closed: boolean }>; closed: boolean }> = [];
+    const stubBrowser = async (): Promise<any> => {
+      await new Promise(resolve => setTimeout(resolve, 5));
+      const record = { pages: [] as Array<{ closed: boolean }>, closed: false };
+      stubBrowsers.push(record);
+      return {
+        newPage: async () => {
+          const page: any = {
+            closed: false,
+            setRequestInterception: async () => undefined, on: () => undefined, evaluateOnNewDocument: async () => undefined,
+            setUserAgent: async () => undefined, setExtraHTTPHeaders: async () => undefined, setViewport: async () => undefined,
+            goto: async () => undefined, isClosed: () => page.closed, close: async () => { page.closed = true; },
+          };
+          record.pages.push(page);
+          return page;
+        },
+        isConnected: () => !record.closed,
+        on: () => undefined,
+        version: async () => 'stub',
+        close: async () => { record.closed = true; },
+      };
+    };
+    const open = (b: { pages: Array<{ closed: boolean }> }) => b.pages.filter(p => !p.closed).length;
+
+    beforeEach(async () => {
+      await closeBrowserPool();
+      stubBrowsers.length = 0;
+      setBrowserLauncher(stubBrowser);
+    });
+    afterAll(async () => {
+      await closeBrowserPool();
+      setBrowserLauncher(null);
+    });
+
+    test('should queue leases beyond capacity without overfilling a browser', async () => {
+      // Defaults: 2 browsers x 4 pages
+      const leases = await Promise.all(Array.from({ length: 8 }, () => acquirePage()));
+      expect(stubBrowsers.map(open)).toEqual([4, 4]);
+
+      let waited: PageLease | undefined;
+      const queued = acquirePage().then(lease => { waited = lease; });
+      await new Promise(resolve => setTimeout(resolve, 10));
+      expect([waited, getBrowserPoolStats().queued]).toEqual([undefined, 1]);
+
+      await leases[0].release();
+      await queued;
+      expect(waited!.page).toBe(leases[0].page);
+      await Promise.all([...leases.slice(1), waited!].map(lease => lease.release()));
+      expect(getBrowserPoolStats()).toMatchObject({ activePages: 0, idlePages: 8, queued: 0 });
+    });
+
+    test('should recycle released pages and discard broken ones', async () => {
+      const first = await acquirePage();
+      await first.release();
+      const second = await acquirePage();
+      expect(second.page).toBe(first.page);
+      await second.release(true);
+      expect((second.page as any).closed).toBe(true);
+      const third = await acquirePage();
+      expect(third.page).not.toBe(first.page);
+      await third.release();
+    });
+
+    test('should rotate a browser after its page budget', async () => {
+      const before = getBrowserPoolStats().rotated;
+      for (let i = 0; i < 100; i++) await withPage(async () => undefined);
+      expect([stubBrowsers.length, stubBrowsers[0].closed, getBrowserPoolStats().rotated - before]).toEqual([1, true, 1]);
+      await withPage(async () => undefined);
+      expect(stubBrowsers.length).toBe(2);
+    });
+  });
+
+  describe('Concurrent Pagination', () => {
+    test('should keep page order and stop at the first empty page', async () => {
+      const started: number[] = [];
+      const items = await fetchPagesConcurrently(10, 3, async page => {
+        started.push(page);
+        await new Promise(resolve => setTimeout(resolve, (4 - (page % 4)) * 5));
+        return page < 4 ? [page * 10, page * 10 + 1] : page === 5 ? [50] : [];
+      });
+      expect(items).toEqual([10, 11, 20, 21, 30, 31]);
+      expect(Math.max(...started)).toBeLessThan(10);
+    });
+  });
+
+  describe('Crawl Orchestrator', () => {
+    test('should cap crawls per domain and resume from a checkpoint', async () => {
+      const dir = fs.mkdtempSync(path.join(os.tmpdir(), 'crawl-'));
+      const checkpointFile = path.join(dir, 'checkpoint.json');
+      const active = new Map<string, number>();
+      let peak = 0;
+      const crawler = async (target: CrawlTarget, onPage: () => void) => {
+        const host = new URL(target.url).host;
+        active.set(host, (active.get(host) || 0) + 1);
+        peak = Math.max(peak, active.get(host)!);
+        onPage();
+        await new Promise(resolve => setTimeout(resolve, 5));
+        active.set(host, active.get(host)! - 1);
+        return [testVehicle(target.id, 10000, 15000)];
+      };
+      const targets = ['a.com/used', 'a.com/new', 'b.com/used'].map((u, i) => ({ id: `S${i}`, url: `https://${u}` }));
+      const summary = await startCrawl(targets, { concurrency: 3, perDomain: 1, checkpointFile, crawler });
+      expect([summary.done, summary.vehicles, peak]).toEqual([3, 3, 1]);
+
+      fs.writeFileSync(checkpointFile, JSON.stringify({
+        runId: 'CRAWL-test',
+        lastCrawled: {},
+        sites: [{ target: targets[0], status: 'done', attempts: 1, vehicles: 1 }, { target: targets[2], status: 'running', attempts: 1 }],
+      }));
+      const resumed = await resumeCrawl({ checkpointFile, crawler });
+      expect(resumed && [resumed.runId, resumed.done, resumed.vehicles]).toEqual(['CRAWL-test', 2, 2]);
+      fs.rmSync(dir, { recursive: true, force: true });
+    });
+  });
+
+  describe('Scraper Cache', () => {
+    test('should serve a stale entry while one background refresh replaces it', async () => {
+      const url = 'https://dealer.test/inventory/';
+      await setCachedVehicles(url, [testVehicle('C1', 10000, 15000)]);
+      expect((await getCachedVehicles(url))!.map(v => v.id)).toEqual(['C1']);
+
+      const realNow = Date.now;
+      const later = realNow() + 7 * 60 * 60 * 1000;
+      const now = jest.spyOn(Date, 'now').mockImplementation(() => later);
+      let refreshes = 0;
+      const revalidate = async () => {
+        refreshes++;
+        return [testVehicle('C2', 11000, 16000)];
+      };
+      const stale = await Promise.all([getCachedVehicles(url, revalidate), getCachedVehicles(url, revalidate)]);
+      expect(stale.map(list => list![0].id)).toEqual(['C1', 'C1']);
+      await new Promise(resolve => setImmediate(resolve));
+      expect((await getCachedVehicles(url, revalidate))![0].id).toBe('C2');
+      now.mockRestore();
+
+      const stats = getCacheStats();
+      expect([refreshes, stats.staleHits, stats.revalidations]).toEqual([1, 1, 1]);
+      expect(stats.bytes).toBeGreaterThan(0);
+    });
+
+    test('should share one scrape between concurrent requests for the same URL', async () => {
+      let scrapes = 0;
+      const scrape = async () => {
+        scrapes++;
+        await new Promise(resolve => setTimeout(resolve, 5));
+        return [testVehicle('D1', 10000, 15000)];
+      };
+      const results = await Promise.all([
+        getOrScrapeVehicles('https://Coalesce.test/inventory/?b=2&a=1', scrape),
+        getOrScrapeVehicles('https://coalesce.test/inventory/?a=1&b=2#top', scrape),
+      ]);
+      expect(scrapes).toBe(1);
+      expect(results.map(r => [r.cached, r.vehicles[0].id])).toEqual([[false, 'D1'], [false, 'D1']]);
+      expect((await getOrScrapeVehicles('https://coalesce.test/inventory/?a=1&b=2', scrape)).cached).toBe(true);
+    });
+
+    test('should not share a scrape between cached and uncached requests', async () => {
+      const modes: boolean[] = [];
+      const scraper = (useCache: boolean) => async () => {
+        modes.push(useCache);
+        await new Promise(resolve => setTimeout(resolve, 20));
+        return [testVehicle('F1', 10000, 15000)];
+      };
+      const url = 'https://fresh.test/inventory/';
+      await Promise.all([
+        getOrScrapeVehicles(url, scraper(false), false),
+        getOrScrapeVehicles(url, scraper(false), false),
+        getOrScrapeVehicles(url, scraper(true)),
+      ]);
+      expect(modes.sort()).toEqual([false, true]);
+    });
+  });
+
+  describe('Market Snapshots', () => {
+    test('should band inventory against stored listings and refresh only stale searches', async () => {
+      const dir = fs.mkdtempSync(path.join(os.tmpdir(), 'market-'));
+      const store = new MarketSnapshotStore(dir);
+      const listing = (price: number, mileage: number): MarketListing => ({
+        source: 'cargurus', url: `https://cargurus.test/${price}`, year: 2021, make: 'Toyota', model: 'Corolla',
+        mileage, price, seenAt: Date.now(),
+      });
+      let fetches = 0;
+      const fetchers = [{ source: 'cargurus' as const, fetch: async () => {
+        fetches++;
+        return [18000, 19000, 20000, 21000, 22000].map(p => listing(p, 65000));
+      } }];
+
+      const inventory = [testVehicle('M1', 15000, 20000), testVehicle('M2', 15000, 20000)];
+      const first = await store.refresh(inventory, { fetchers });
+      const second = await store.refresh(inventory, { fetchers });
+      expect([first.queried, first.listings, second.queried, second.fresh, fetches]).toEqual([1, 5, 0, 1, 1]);
+
+      store.ingest([listing(19000, 65000)]);
+      const [band] = store.priceBands([testVehicle('M1', 15000, 20000)]);
+      expect([band.sampleSize, band.widened, band.p50, band.p10, band.percentile]).toEqual([5, false, 20000, 18400, 50]);
+      fs.rmSync(dir, { recursive: true, force: true });
+    });
+
+    test('should keep a search stale when its sources return nothing', async () => {
+      const dir = fs.mkdtempSync(path.join(os.tmpdir(), 'market-'));
+      const store = new MarketSnapshotStore(dir);
+      let fetches = 0;
+      const fetchers = [{ source: 'apify' as const, fetch: async () => { fetches++; return []; } }];
+      const inventory = [testVehicle('M1', 15000, 20000)];
+      await store.refresh(inventory, { fetchers });
+      const second = await store.refresh(inventory, { fetchers });
+      expect([second.queried, second.fresh, fetches]).toEqual([1, 0, 2]);
+      fs.rmSync(dir, { recursive: true, force: true });
+    });
+  });
+
+  describe('Incremental Scoring', () => {
+    test('should match a full re-score after a cost change', async () => {
+      const trade = { allowance: 0, acv: 0, lienBalance: 0 };
+      const inventory = [testVehicle('A', 12000, 18000), testVehicle('B', 15000, 22000), testVehicle('C', 9000, 14000)];
+      await registerApproval('test', testApproval, trade, inventory);
+
+      const changed = { ...inventory[1], yourCost: 8000 };
+      const next = [inventory[0], changed, inventory[2]];
+      applyInventoryChanges([{ type: 'updated', vehicle: changed, timestamp: new Date() }], next, inventory);
+
+      const byId = (rows: { vehicleId: string; totalGross: number }[]) =>
+        Object.fromEntries(rows.map(r => [r.vehicleId, r.totalGross]));
+      const incremental = (await getScoredRows('test', next)) || [];
+      expect(byId(incremental)).toEqual(byId(scoreInventory(next, testApproval, trade)));
+      for (let i = 1; i < incremental.length; i++) {
+        expect(incremental[i - 1].totalGross).toBeGreaterThanOrEqual(incremental[i].totalGross);
+      }
+    });
+
+    test('should not patch lists bound to another inventory with its changes', async () => {
+      const trade = { allowance: 0, acv: 0, lienBalance: 0 };
+      const inventory = [testVehicle('A', 12000, 18000)];
+      const before = (await registerApproval('bound', testApproval, trade, inventory)).map(r => r.vehicleId);
+
+      const synced = testVehicle('S', 9000, 14000);
+      applySourceChanges([{ type: 'added', vehicle: synced, timestamp: new Date() }], [synced], []);
+      expect(((await getScoredRows('bound', inventory)) || []).map(r => r.vehicleId)).toEqual(before);
+    });
+
+    test('should patch lists scored against the shared inventory when a sync runs', async () => {
+      const trade = { allowance: 0, acv: 0, lienBalance: 0 };
+      inventoryStore.replaceAll([testVehicle('A', 12000, 18000), testVehicle('B', 15000, 22000)]);
+      await registerApproval('synced', testApproval, trade, inventoryStore.toArray());
+
+      const feed = [{ ...testVehicle('B', 15000, 22000), suggestedPrice: 21000 }, testVehicle('S', 9000, 14000)];
+      const get = jest.spyOn(httpClient, 'get').mockResolvedValue({ data: { vehicles: feed } });
+      addSyncSource({ type: 'api', name: 'test-feed', url: 'http://feed.test/vehicles', enabled: true });
+      const result = await manualSync('test-feed');
+      removeSyncSource('test-feed');
+      get.mockRestore();
+
+      const byId = (rows: { vehicleId: string; totalGross: number }[]) =>
+        Object.fromEntries(rows.map(r => [r.vehicleId, r.totalGross]));
+      expect([result.vehiclesAdded, result.vehiclesUpdated]).toEqual([1, 1]);
+      expect(byId((await getScoredRows('synced')) || [])).toEqual(byId(scoreInventory(inventoryStore.toArray(), testApproval, trade)));
+      inventoryStore.replaceAll([]);
+    });
+
+    test('should queue changes that arrive during a full re-score', async () => {
+      const trade = { allowance: 0, acv: 0, lienBalance: 0 };
+      const inventory = [testVehicle('A', 12000, 18000), testVehicle('B', 15000, 22000)];
+      const registered = registerApproval('queued', testApproval, trade, inventory);
+      const changed = { ...inventory[0], yourCost: 7000 };
+      const next = [changed, inventory[1]];
+      applyInventoryChanges([{ type: 'updated', vehicle: changed, timestamp: new Date() }], next, inventory);
+
+      const byId = (rows: { vehicleId: string; totalGross: number }[]) =>
+        Object.fromEntries(rows.map(r => [r.vehicleId, r.totalGross]));
+      expect(byId(await registered)).toEqual(byId(scoreInventory(next, testApproval, trade)));
+    });
+  });
+
+  describe('Batched Scenario Scoring', () => {
+    test('should match per-approval scoring for every scenario', () => {
+      const trade = { allowance: 0, acv: 0, lienBalance: 0 };
+      const inventory = [testVehicle('A', 12000, 18000), testVehicle('B', 15000, 22000)];
+      const approvals = [testApproval, { ...testApproval, paymentMax: 450 }];
+      const batched = Array.from(scoreInventoryScenarios(inventory, approvals, trade));
+      approvals.forEach((approval, i) => {
+        const single = scoreInventory(inventory, approval, trade);
+        for (const { vehicle, rows } of batched) {
+          expect(rows[i]).toEqual(single.find(r => r.vehicleId === vehicle.id) || null);
+        }
+      });
+    });
+  });
+
+  describe('Scoring Pool', () => {
+    test('should round-trip vehicles through the columnar snapshot', () => {
+      const inventory = [
+        testVehicle('A', 12000, 18000),
+        { ...testVehicle('B', 15000, 22000), trim: 'LE', color: 'Red', imageUrls: ['b.jpg'], mileage: undefined as any },
+      ];
+      const [v] = vehiclesFromPartition({
+        numeric: buildNumericColumns(inventory), rowCount: 2, start: 1, end: 2, fieldsStart: 1, fields: [vehicleFields(inventory[1])],
+      });
+      expect(v).toEqual(inventory[1]);
+      expect(v.mileage).toBeUndefined();
+    });
+
+    test('should score the same rows in the pool as inline', async () => {
+      const inventory = Array.from({ length: 300 }, (_, i) => ({
+        ...testVehicle(`P${i}`, 9000 + (i % 37) * 350, 14000 + (i % 23) * 600),
+        engine: i % 2 ? '2.0L' : '1.8L', trim: i % 3 ? 'LE' : undefined, color: 'Blue',
+        mileage: i % 50 === 0 ? (undefined as any) : 20000 + i * 150,
+      }));
+      const trade = { allowance: 2000, acv: 1500, lienBalance: 500 };
+      try {
+        const pooled = await scoreInventoryAsync(inventory, testApproval, trade, { timeoutMs: 60000 });
+        expect(pooled).toEqual(scoreInventory(inventory, testApproval, trade));
+
+        // Store snapshots ship their row fields to each worker once
+        inventoryStore.replaceAll(inventory);
+        const shipped = getScoringPoolStats().snapshotsShipped;
+        await scoreInventoryAsync(inventoryStore.toArray(), testApproval, trade, { timeoutMs: 60000 });
+        const firstRun = getScoringPoolStats().snapshotsShipped - shipped;
+        expect(await scoreInventoryAsync(inventoryStore.toArray(), testApproval, trade, { timeoutMs: 60000 })).toEqual(pooled);
+        expect(getScoringPoolStats().snapshotsShipped - shipped).toBe(firstRun);
+      } finally {
+        inventoryStore.replaceAll([]);
+        await shutdownScoringPool();
+      }
+    }, 60000);
+
+    test('should merge sorted partitions keeping partition order on ties', () => {
+      const merged = mergeSortedDesc([[{ k: 'a', s: 5 }, { k: 'b', s: 1 }], [{ k: 'c', s: 5 }, { k: 'd', s: 3 }]], x => x.s, 3);
+      expect(merged.map(x => x.k)).toEqual(['a', 'c', 'd']);
+    });
+  });
 });
@@ -82,7 +82,7 @@ export interface PaymentCalculationResult {
   monthlyPayment: number;
   totalInterest: number;
   totalAmortized: number;
-  amortizationSchedule: AmortizationEntry[];
+  amortizationSchedule: AmortizationEntry[]; // built on first access
 }
 
 /**